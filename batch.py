@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Smartclip AI - Batch Mode
+Proses semua video di satu folder tanpa GUI. Stages dari semua video
+dijadwalkan ke resource pools (prepare / vision / asr / encode) dengan
+concurrency limit sendiri-sendiri, lihat modules.batch_scheduler.
+
+Usage:
+    python batch.py /path/folder --output output/batch --options '{"podcast_mode": true}'
+"""
+
+import argparse
+import json
+import logging
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+from config import BATCH_SETTINGS, METRICS_SETTINGS
+from modules.analysis_schema import AnalysisResult
+from modules.batch_scheduler import BatchScheduler
+from modules.pipeline import get_pipeline
+
+# Setup logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def save_batch_results(batch_job, output_dir):
+    """analysis_results.json per video (schema sama dengan GUI)"""
+    results = batch_job.results or {}
+    payload = {
+        'video_path': batch_job.video_path,
+        'processed_at': datetime.now().isoformat(),
+        'processing_time': (batch_job.finished_at or time.time()) - (batch_job.started_at or time.time()),
+        'moments': results.get('moments') or [],
+        'face_data': results.get('face_data'),
+        'speaker_data': results.get('speaker_data'),
+        'subtitle_data': results.get('subtitle_data'),
+        'output_files': results.get('output_files') or []
+    }
+    if METRICS_SETTINGS['enabled'] and METRICS_SETTINGS['write_to_results'] and batch_job.job and batch_job.job.metrics:
+        payload['metrics'] = batch_job.job.metrics.to_dict()
+    try:
+        output_dir.mkdir(parents=True, exist_ok=True)
+        AnalysisResult.from_results(payload).export_json(output_dir / "analysis_results.json")
+    except Exception as e:
+        logger.error(f"Could not save analysis results for {batch_job.video_path}: {e}")
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Smartclip AI batch mode")
+    parser.add_argument('folder', help="Folder berisi video")
+    parser.add_argument('--output', default=BATCH_SETTINGS['output_dir'], help="Output folder (satu subfolder per video)")
+    parser.add_argument('--options', default='{}', help="Processing options (JSON), e.g. '{\"auto_subtitle\": false}'")
+    parser.add_argument('--recursive', action='store_true', help="Termasuk subfolders")
+    parser.add_argument('--max-active', type=int, default=BATCH_SETTINGS['max_active_jobs'],
+                        help="Jumlah video yang aktif bersamaan")
+    for pool, size in BATCH_SETTINGS['pools'].items():
+        parser.add_argument(f'--{pool}', type=int, default=size, help=f"Workers pool {pool}")
+    args = parser.parse_args()
+
+    try:
+        options = json.loads(args.options)
+    except json.JSONDecodeError as e:
+        print(f"❌ --options bukan JSON yang valid: {e}")
+        return 1
+
+    output_root = Path(args.output)
+
+    def on_event(batch_job, event, stage):
+        name = Path(batch_job.video_path).name
+        if event == 'stage':
+            print(f"▶️  {name}: {stage}")
+        elif event == 'done':
+            save_batch_results(batch_job, Path(batch_job.options['output_dir']))
+            output_files = (batch_job.results or {}).get('output_files') or []
+            print(f"✅ {name}: selesai ({len(output_files)} files)")
+        elif event in ('failed', 'cancelled'):
+            print(f"❌ {name}: {event} {batch_job.error or ''}")
+
+    scheduler = BatchScheduler(
+        pools={pool: getattr(args, pool) for pool in BATCH_SETTINGS['pools']},
+        max_active_jobs=args.max_active,
+        pipeline=get_pipeline(),
+        on_event=on_event
+    )
+    jobs = scheduler.submit_folder(args.folder, options, output_dir=output_root, recursive=args.recursive)
+    if not jobs:
+        print(f"Tidak ada video di {args.folder}")
+        return 1
+    print(f"🎬 {len(jobs)} video, pools: " + ', '.join(f"{pool}={size}" for pool, size in scheduler.pools.items()))
+
+    started = time.time()
+    scheduler.run()
+
+    done = sum(1 for job in jobs if job.status == 'done')
+    print(f"Batch selesai dalam {time.time() - started:.0f}s: {done}/{len(jobs)} video berhasil")
+    return 0 if done == len(jobs) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
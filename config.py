@@ -20,7 +20,10 @@ VIDEO_SETTINGS = {
     'max_clip_duration': 60,  # 1 minute maximum
     'default_quality': '720p',
     'fps': 30,
-    'audio_sample_rate': 44100
+    'audio_sample_rate': 44100,
+    'highlight_stream_copy': True,  # Highlights reel via stream copy + concat demuxer jika source cocok
+    'highlight_transition': 0.5,  # seconds, crossfade antar highlights
+    'preview_height': 360  # Preview moment selama processing
 }
 
 # AI Model settings
@@ -31,6 +34,14 @@ AI_SETTINGS = {
     'silence_threshold': -40,  # dB
     'min_speech_duration': 2.0,  # seconds
     'whisper_model': 'base',  # base, small, medium, large
+    'asr_backend': 'auto',  # auto, whisper, faster-whisper
+    'asr_compute_type': 'auto',  # faster-whisper: auto (int8 CPU / float16 GPU), int8, float16, float32
+    'asr_batch_size': 8,  # Jumlah window 30s yang di-decode sekaligus (faster-whisper)
+    'asr_benchmark_path': str(MODELS_DIR / "asr_benchmark.json"),  # Hasil benchmark per device, dipakai asr_backend 'auto'
+    'asr_language': None,  # Paksa language (e.g. 'id'), None = auto-detect
+    'asr_language_mode': 'job',  # job: detect sekali per job, region: detect per region (konten campuran bahasa)
+    'asr_language_samples': 3,  # Jumlah window 30s yang di-sample untuk language detection
+    'asr_region_seconds': 300,  # Panjang region untuk mode 'region'
     'speaker_embedding_model': 'speechbrain/spkrec-ecapa-voxceleb'
 }
 
@@ -38,10 +49,15 @@ AI_SETTINGS = {
 MOMENT_DETECTION = {
     'energy_threshold': 0.3,
     'face_prominence_weight': 0.3,
+    'face_sample_interval': 2.0,  # Face prominence di-sample tiap N detik lalu diinterpolasi
+    'face_detect_width': 320,  # Lebar frame (px) untuk Haar face detection prominence
     'audio_quality_weight': 0.4,
     'speech_clarity_weight': 0.3,
     'scene_change_sensitivity': 0.6,
-    'highlight_duration': 30  # seconds
+    'highlight_duration': 30,  # seconds
+    'min_score': 0.3,  # Moment dengan score di bawah ini dibuang
+    'scan_chunk_seconds': 120,  # Incremental analysis (iter_moments): chunk per scan step
+    'quick_min_confidence': 0.6  # "Top N cepat": stop setelah N moments dengan confidence ini
 }
 
 # Subtitle settings
@@ -52,7 +68,9 @@ SUBTITLE_SETTINGS = {
     'background_opacity': 0.7,
     'position': 'bottom',
     'margin': 50,
-    'max_chars_per_line': 50
+    'max_chars_per_line': 50,
+    'max_lines_per_subtitle': 2,
+    'max_chars_per_second': 17  # Reading speed; cue diperpanjang / dipecah sesuai ini
 }
 
 # Watermark settings
@@ -68,16 +86,117 @@ PODCAST_SETTINGS = {
     'split_ratio': 0.5,  # 50-50 split
     'transition_duration': 0.5,  # seconds
     'speaker_switch_threshold': 3.0,  # seconds
-    'face_crop_padding': 0.2  # 20% padding around face
+    'face_crop_padding': 0.2,  # 20% padding around face
+    'crop_smoothing': 1.5,  # seconds, moving average crop path
+    'crop_motion_threshold': 0.05  # Gerakan minimal (fraksi lebar crop) untuk keyframe crop baru
 }
 
 # Processing settings
 PROCESSING = {
     'max_workers': 4,
     'gpu_acceleration': True,
-    'batch_size': 8,
+    'batch_size': 8,  # Batch maksimal; diturunkan otomatis saat RAM mendekati memory budget
+    'memory_budget_gb': None,  # Batas RAM semua jobs (None = 70% RAM fisik), e.g. 6 untuk mesin 8 GB
+    'memory_wait': 600,  # Detik stage menunggu memory budget sebelum tetap lanjut
+    'stage_memory_mb': {  # Perkiraan working set per stage type (di-reserve dari memory budget)
+        'vision': 1024,
+        'asr': 1536,
+        'encode': 1536
+    },
+    'spill_threshold_mb': 256,  # Intermediate arrays sebesar ini di-spill ke memmap di TEMP_DIR
     'cache_embeddings': True,
-    'temp_cleanup': True
+    'temp_cleanup': True,  # Hapus intermediate files begitu consumer terakhir selesai
+    'temp_quota_gb': 20,  # Batas intermediate files di TEMP_DIR (None = tanpa batas)
+    'temp_quota_wait': 600,  # Detik producer menunggu quota sebelum tetap lanjut
+    'shard_min_duration': 600,  # Detik; video lebih panjang diproses per time shard
+    'shards_per_worker': 2
+}
+
+# Audio enhancement (noise gate, spectral noise reduction, loudness normalization)
+AUDIO_ENHANCEMENT = {
+    'frame_size': 2048,  # STFT frame (samples), hop = frame_size / 2
+    'frames_per_block': 512,  # Frames yang diproses sekaligus (bounded memory)
+    'noise_percentile': 10,  # Frame paling sepi (%) untuk estimasi noise profile
+    'noise_reduction': 1.5,  # Over-subtraction factor
+    'spectral_floor_db': -20,  # Gain minimum per frequency bin
+    'gate_margin_db': 6,  # Gate terbuka di atas noise floor + margin
+    'gate_attenuation_db': -25,  # Redaman saat gate tertutup
+    'gate_release': 0.15,  # seconds
+    'target_lufs': -16.0,  # Loudness target (speech / podcast)
+    'true_peak_db': -1.0
+}
+
+# Encoder planning per output type (lihat modules/encoder_planner.py)
+ENCODER_SETTINGS = {
+    'profiles': {  # Preset / CRF preferensi; priority rendah = diturunkan dulu jika over budget
+        'preview': {'preset': 'ultrafast', 'crf': 30, 'tune': 'fastdecode', 'priority': 0},
+        'clip': {'preset': 'veryfast', 'crf': 23, 'tune': None, 'priority': 1},
+        'reframe': {'preset': 'veryfast', 'crf': 23, 'tune': None, 'priority': 1},
+        'reel': {'preset': 'faster', 'crf': 23, 'tune': None, 'priority': 2},
+        'podcast': {'preset': 'fast', 'crf': 22, 'tune': None, 'priority': 2},
+        'master': {'preset': 'medium', 'crf': 20, 'tune': 'film', 'priority': 3}
+    },
+    'time_budget_factor': 1.5,  # Maksimal detik encode per detik video source (None = tanpa batas)
+    'auto_calibrate': True,  # Calibration run otomatis untuk preset yang belum terukur
+    'calibration_seconds': 2,
+    'calibration_path': str(MODELS_DIR / "encoder_calibration.json")
+}
+
+# Media index: fingerprint per source video untuk reuse analysis (duplicate / trimmed uploads)
+MEDIA_INDEX = {
+    'enabled': True,
+    'db_path': str(MODELS_DIR / "media_index.db"),
+    'cache_dir': str(MODELS_DIR / "analysis_cache"),
+    'frame_interval': 30,  # Detik antar frame pHash yang disimpan
+    'max_frame_samples': 120,
+    'min_correlation': 0.7,  # NCC chroma + energy minimal untuk block audio yang cocok
+    'align_block_seconds': 10,  # Panjang block audio yang dicari di video lama
+    'max_phash_distance': 12,  # Hamming distance pHash (dari 63 bits) untuk frame yang sama
+    'min_overlap_seconds': 10,  # Segment cocok lebih pendek dari ini diabaikan
+    'duplicate_coverage': 0.95  # Fraksi video yang cocok untuk dianggap duplicate penuh
+}
+
+# Metrics / instrumentation settings
+METRICS_SETTINGS = {
+    'enabled': True,
+    'write_to_results': True,  # Tambahkan metrics ke analysis_results.json
+    'prometheus_textfile': None,  # e.g. '/var/lib/node_exporter/textfile/smartclip.prom'
+    'http_port': None,  # e.g. 9108 untuk endpoint http://127.0.0.1:9108/metrics
+    'http_host': '127.0.0.1'
+}
+
+# Server mode (server.py) settings
+SERVER_SETTINGS = {
+    'host': '127.0.0.1',
+    'port': 8765,
+    'job_workers': 2,  # Jobs yang berjalan bersamaan (di stage yang berbeda)
+    'stage_limits': {  # Maksimal stage berjalan bersamaan per resource type
+        'vision': 1,
+        'asr': 1,
+        'encode': 1
+    },
+    'db_path': str(MODELS_DIR / "jobs.db"),
+    'jobs_output_dir': str(OUTPUT_DIR / "jobs"),
+    'preload_models': True
+}
+
+# Batch mode settings (batch.py)
+BATCH_SETTINGS = {
+    'pools': {  # Workers per resource pool
+        'prepare': 1,  # Media index lookup + audio extraction
+        'vision': 2,  # video_analysis + face_tracking
+        'asr': 2,  # speaker_diarization + subtitle_generation
+        'encode': 1  # video_editing (encoder sudah memakai semua cores)
+    },
+    'max_active_jobs': 3,  # Jobs yang aktif bersamaan (audio cache, previews di memory)
+    'output_dir': str(OUTPUT_DIR / "batch")
+}
+
+# Capability detection (packages, ffmpeg, CPU, GPU), di-cache per environment (lihat modules/capabilities.py)
+CAPABILITY_SETTINGS = {
+    'cache_path': str(MODELS_DIR / "capabilities.json"),
+    'max_age_days': 30,  # Deteksi ulang walaupun environment fingerprint sama
+    'full_mode_packages': ['torch', 'cv2', 'face_recognition', 'customtkinter']  # + satu ASR backend, selain itu Lite
 }
 
 # File formats
@@ -163,43 +163,41 @@ def install_speaker_diarization():
     return successful
 
 def test_ai_installation():
-    """Test AI package imports"""
-    print("\n🧪 Testing AI package imports...")
+    """Test AI packages dan simpan capability cache untuk startup berikutnya"""
+    print("\n🧪 Testing AI packages...")
     print("-" * 40)
     
-    test_packages = [
-        ("torch", "PyTorch"),
-        ("whisper", "OpenAI Whisper"), 
-        ("transformers", "Transformers"),
-        ("cv2", "OpenCV"),
-        ("face_recognition", "Face Recognition"),
-        ("librosa", "Librosa"),
-        ("sklearn", "Scikit-learn"),
-        ("scipy", "SciPy"),
-        ("pandas", "Pandas"),
-        ("matplotlib", "Matplotlib")
-    ]
+    from config import CAPABILITY_SETTINGS
+    from modules.capabilities import PACKAGES, get_capabilities
+    
+    # Deteksi ulang: packages baru saja di-install, cache lama tidak berlaku
+    caps = get_capabilities(refresh=True)
+    
+    test_packages = ["torch", "whisper", "faster_whisper", "transformers", "cv2",
+                     "face_recognition", "librosa", "sklearn", "scipy", "customtkinter"]
     
     working = 0
     total = len(test_packages)
     
-    for module, name in test_packages:
-        try:
-            __import__(module)
-            print(f"✅ {name} - Import successful")
+    for module in test_packages:
+        if caps.has(module):
+            print(f"✅ {PACKAGES[module]} - Available")
             working += 1
-        except ImportError as e:
-            print(f"❌ {name} - Import failed: {str(e)[:50]}...")
-        except Exception as e:
-            print(f"⚠️ {name} - Import error: {str(e)[:50]}...")
+        else:
+            print(f"❌ {PACKAGES[module]} - Not installed")
     
-    print(f"\n📊 AI Import Test: {working}/{total} packages working")
+    print(f"\n📊 AI Package Test: {working}/{total} packages available")
+    print(f"💻 CPU: {caps.cpu_count} cores, AVX2: {'yes' if caps.avx2 else 'no'}, CUDA: {'yes' if caps.cuda else 'no'}")
+    print(f"🎞️ ffmpeg: {caps.ffmpeg_version or 'not found'}, video encoder: {caps.video_encoder}")
     
-    if working >= 6:
+    if caps.mode == 'full':
         print("🎉 Enough AI packages working for advanced features!")
         return True
     else:
-        print("⚠️ Limited AI functionality - some features may not work")
+        missing = caps.missing(CAPABILITY_SETTINGS['full_mode_packages'])
+        if not caps.asr_backend:
+            missing.append('whisper')
+        print(f"⚠️ Limited AI functionality - missing: {', '.join(missing)}")
         return False
 
 def show_next_steps():
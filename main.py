@@ -7,7 +7,13 @@ Otomatis memilih versi berdasarkan dependencies yang tersedia
 import sys
 import importlib.util
 import os
+import queue
 from pathlib import Path
+from dataclasses import asdict, is_dataclass
+from datetime import datetime
+
+# GUI men-drain processing_queue setiap tick (10 Hz)
+UI_TICK_MS = 100
 
 def check_package(package_name):
     """Check apakah package tersedia"""
@@ -26,31 +32,53 @@ def print_startup_banner():
     print()
 
 def check_ai_dependencies():
-    """Check AI dependencies availability"""
+    """Check AI dependencies availability (dari capability cache, lihat modules/capabilities.py)"""
     print("🔍 Checking AI dependencies...")
+    from modules.capabilities import PACKAGES, get_capabilities
+    caps = get_capabilities()
     
     # Critical AI packages untuk full functionality
-    critical_packages = [
-        ('torch', 'PyTorch (Deep Learning)'),
-        ('whisper', 'OpenAI Whisper (Speech Recognition)'),
-        ('face_recognition', 'Face Recognition'),
-        ('cv2', 'OpenCV (Computer Vision)')
-    ]
+    critical_packages = ['torch', 'face_recognition', 'cv2']
+    for package in critical_packages:
+        status = "✅" if caps.has(package) else "❌"
+        print(f"{status} {PACKAGES[package]}")
+    print(f"{'✅' if caps.asr_backend else '❌'} Speech Recognition: {caps.asr_backend or 'whisper / faster-whisper not installed'}")
+    print(f"💻 CPU: {caps.cpu_count} cores{', AVX2' if caps.avx2 else ''}{', CUDA' if caps.cuda else ''}")
+    print(f"🎞️ ffmpeg: {caps.ffmpeg_version or 'not found'} (encoder: {caps.video_encoder})")
+    print()
+    
+    return caps.mode == 'full'
+
+if __name__ == "__main__":
+    print_startup_banner()
+    if not check_ai_dependencies():
+        print("⚠️ AI dependencies tidak lengkap, menjalankan Smartclip AI Lite...")
+        print("   Jalankan 'python install_ai.py' untuk full AI features")
+        print()
+        if not check_package('customtkinter'):
+            print("❌ CustomTkinter tidak terinstall: pip install customtkinter")
+            sys.exit(1)
+        from main_lite import main as main_lite
+        main_lite()
+        sys.exit(0)
+    print("🚀 Full AI mode")
+
+import tkinter as tk
+from tkinter import filedialog, messagebox
+import customtkinter as ctk
+import threading
+import time
+
 try:
-    from modules.youtube_downloader import YouTubeDownloader
-    print("YouTubeDownloader imported")
-    from modules.video_analyzer import VideoAnalyzer
-    print("VideoAnalyzer imported") 
-    from modules.face_tracker import FaceTracker
-    print("FaceTracker imported")
-    from modules.speaker_diarization import SpeakerDiarization
-    print("SpeakerDiarization imported")
-    from modules.subtitle_generator import SubtitleGenerator  
-    print("SubtitleGenerator imported")
-    from modules.video_editor import VideoEditor
-    print("VideoEditor imported")
+    # AI modules di-load lewat pipeline.get_module (lihat SmartclipAI.__init__)
     from modules.utils import Utils
     print("Utils imported")
+    from modules.metrics import MetricsCollector, get_metrics_registry
+    from modules.eta_estimator import ETAEstimator
+    from modules.pipeline import get_pipeline
+    from modules.analysis_schema import AnalysisResult
+    from modules.job_queue import JobCancelled
+    from config import OUTPUT_DIR, METRICS_SETTINGS
 except ImportError as e:
     print(f"Error importing modules: {e}")
     messagebox.showerror("Import Error", f"Failed to import required modules: {e}")
@@ -77,27 +105,40 @@ class SmartclipAI:
         # Initialize modules dengan error handling
         print("Initializing modules...")
         try:
-            self.youtube_dl = YouTubeDownloader()
+            # Module instances dimiliki pipeline (sama dengan server mode)
+            self.pipeline = get_pipeline()
+            
+            self.youtube_dl = self.pipeline.get_module('youtube_dl')
             print("✓ YouTubeDownloader initialized")
             
-            self.video_analyzer = VideoAnalyzer()
+            self.video_analyzer = self.pipeline.get_module('video_analyzer')
             print("✓ VideoAnalyzer initialized")
             
-            self.face_tracker = FaceTracker()
+            self.face_tracker = self.pipeline.get_module('face_tracker')
             print("✓ FaceTracker initialized")
             
-            self.speaker_diarization = SpeakerDiarization()
+            self.speaker_diarization = self.pipeline.get_module('speaker_diarization')
             print("✓ SpeakerDiarization initialized")
             
-            self.subtitle_generator = SubtitleGenerator()
+            self.subtitle_generator = self.pipeline.get_module('subtitle_generator')
             print("✓ SubtitleGenerator initialized")
             
-            self.video_editor = VideoEditor()
+            self.video_editor = self.pipeline.get_module('video_editor')
             print("✓ VideoEditor initialized")
             
             self.utils = Utils()
             print("✓ Utils initialized")
             
+            # Collector baru per job (lihat process_video), registry untuk export
+            self.metrics = MetricsCollector()
+            self.eta = ETAEstimator()
+            self._stage_message = ""
+            if METRICS_SETTINGS['enabled'] and METRICS_SETTINGS['http_port']:
+                get_metrics_registry().start_http_server(
+                    METRICS_SETTINGS['http_port'],
+                    host=METRICS_SETTINGS['http_host']
+                )
+            
         except Exception as e:
             print(f"Error initializing modules: {e}")
             messagebox.showerror("Initialization Error", f"Failed to initialize modules: {e}")
@@ -105,6 +146,18 @@ class SmartclipAI:
         
         print("Setting up UI...")
         self.setup_ui()
+        
+        # Worker threads hanya menulis ke processing_queue; GUI apply per tick
+        self._ui_handlers = {
+            'progress': self._update_progress_ui,
+            'status': lambda message: self.status_text.configure(text=message),
+            'preview': self._add_preview_row,
+            'review': self._show_review,
+            'controls': self._set_controls,
+            'completion': self.show_completion_dialog,
+            'error': lambda message: messagebox.showerror("Error", message)
+        }
+        self.root.after(UI_TICK_MS, self._drain_ui_queue)
         print("SmartclipAI initialized successfully!")
         
     def setup_ui(self):
@@ -258,6 +311,10 @@ class SmartclipAI:
         podcast_cb = ctk.CTkCheckBox(right_column, text="🎙️ Mode podcast (split atas-bawah)", variable=self.podcast_mode)
         podcast_cb.pack(anchor="w", padx=10, pady=5)
         
+        self.vertical_clips = tk.BooleanVar(value=False)
+        vertical_cb = ctk.CTkCheckBox(right_column, text="📱 Clips vertical 9:16 (auto-reframe)", variable=self.vertical_clips)
+        vertical_cb.pack(anchor="w", padx=10, pady=5)
+        
         self.scene_analysis = tk.BooleanVar(value=True)
         scene_cb = ctk.CTkCheckBox(right_column, text="🎬 Analisis perubahan scene", variable=self.scene_analysis)
         scene_cb.pack(anchor="w", padx=10, pady=5)
@@ -266,6 +323,18 @@ class SmartclipAI:
         audio_cb = ctk.CTkCheckBox(right_column, text="🔊 Peningkatan kualitas audio", variable=self.audio_enhancement)
         audio_cb.pack(anchor="w", padx=10, pady=5)
         
+        self.moment_previews = tk.BooleanVar(value=True)
+        previews_cb = ctk.CTkCheckBox(right_column, text="👁️ Preview moment selama proses", variable=self.moment_previews)
+        previews_cb.pack(anchor="w", padx=10, pady=5)
+        
+        self.quick_moments = tk.BooleanVar(value=False)
+        quick_cb = ctk.CTkCheckBox(right_column, text="⚡ Cepat: cukup 5 moment terbaik", variable=self.quick_moments)
+        quick_cb.pack(anchor="w", padx=10, pady=5)
+        
+        self.reuse_analysis = tk.BooleanVar(value=True)
+        reuse_cb = ctk.CTkCheckBox(right_column, text="♻️ Pakai ulang analysis video yang sama", variable=self.reuse_analysis)
+        reuse_cb.pack(anchor="w", padx=10, pady=5)
+        
     def setup_output_settings(self):
         """Setup pengaturan output"""
         output_frame = ctk.CTkFrame(self.main_frame)
@@ -376,7 +445,29 @@ class SmartclipAI:
             font=ctk.CTkFont(size=11),
             text_color="gray70"
         )
-        self.time_estimate.pack(anchor="w", padx=20, pady=(0, 20))
+        self.time_estimate.pack(anchor="w", padx=20, pady=(0, 10))
+        
+        # Preview moments: muncul satu per satu selama processing
+        self.preview_frame = ctk.CTkFrame(progress_frame)
+        self.preview_frame.pack(fill="x", padx=20, pady=(0, 20))
+        
+        self.preview_hint = ctk.CTkLabel(
+            self.preview_frame,
+            text="🎞️ Preview moment akan muncul di sini - hapus centang untuk skip clip",
+            font=ctk.CTkFont(size=11),
+            text_color="gray70"
+        )
+        self.preview_hint.pack(anchor="w", padx=10, pady=5)
+        self._moment_approvals = {}
+        
+        # Render final menunggu approval user setelah semua preview selesai
+        self.review_button = ctk.CTkButton(
+            self.preview_frame,
+            text="🎬 Render clip yang dipilih",
+            command=self._approve_review,
+            state="disabled"
+        )
+        self._review_approved = threading.Event()
         
     def setup_control_buttons(self):
         """Setup control buttons"""
@@ -479,6 +570,7 @@ class SmartclipAI:
         # Disable controls
         self.start_button.configure(state="disabled")
         self.stop_button.configure(state="normal")
+        self._clear_previews()
         
         # Start processing in thread
         self.is_processing = True
@@ -519,135 +611,251 @@ class SmartclipAI:
         """Main processing function"""
         try:
             start_time = time.time()
+            self.metrics = MetricsCollector()
+            self.metrics.add_listener(self.eta.on_metrics_event)
+            self.metrics.add_listener(self._on_stage_event)
             
             # Step 1: Download or load video
             if is_url:
-                self.update_progress(10, "📥 Mengunduh video dari YouTube...")
+                self.update_stage("📥 Mengunduh video dari YouTube...")
                 try:
                     video_path = self.youtube_dl.download(input_source)
                 except Exception as e:
                     self.update_status(f"Error downloading: {e}")
                     return
             else:
-                self.update_progress(10, "📂 Memuat file video...")
+                self.update_stage("📂 Memuat file video...")
                 video_path = input_source
                 
             if not video_path or not self.is_processing:
                 return
                 
-            # Step 2: Analyze video for best moments
-            moments = None
-            if self.detect_moments.get():
-                self.update_progress(25, "🎯 Menganalisis moment terbaik dengan AI...")
-                try:
-                    moments = self.video_analyzer.analyze_video(video_path)
-                except Exception as e:
-                    self.update_status(f"Warning: Video analysis failed - {e}")
-                    moments = None
-                
-            if not self.is_processing:
-                return
-                
-            # Step 3: Face tracking
-            face_data = None
-            if self.face_tracking.get():
-                self.update_progress(40, "👤 Melakukan face tracking...")
-                try:
-                    face_data = self.face_tracker.track_faces(video_path)
-                except Exception as e:
-                    self.update_status(f"Warning: Face tracking failed - {e}")
-                    face_data = None
-                
-            if not self.is_processing:
-                return
-                
-            # Step 4: Speaker diarization
-            speaker_data = None
-            if self.speaker_detection.get():
-                self.update_progress(55, "🎙️ Mengidentifikasi pembicara...")
-                try:
-                    speaker_data = self.speaker_diarization.identify_speakers(video_path)
-                except Exception as e:
-                    self.update_status(f"Warning: Speaker diarization failed - {e}")
-                    speaker_data = None
-                
-            if not self.is_processing:
-                return
-                
-            # Step 5: Generate subtitles
-            subtitle_data = None
-            if self.auto_subtitle.get():
-                self.update_progress(70, "📝 Menggenerate subtitle otomatis...")
-                try:
-                    subtitle_data = self.subtitle_generator.generate_subtitles(video_path)
-                except Exception as e:
-                    self.update_status(f"Warning: Subtitle generation failed - {e}")
-                    subtitle_data = None
-                
-            if not self.is_processing:
-                return
-                
-            # Step 6: Video editing and output
-            self.update_progress(85, "🎬 Mengedit dan memproses video final...")
+            output_options = self._collect_options()
+            self.eta.plan(0, [], job_id=self.metrics.job_id)  # Rencana dibuat setelah media index lookup (plan_callback)
             
-            output_options = {
-                'moments': moments,
-                'face_data': face_data,
-                'speaker_data': speaker_data,
-                'subtitle_data': subtitle_data,
-                'add_watermark': self.add_watermark.get(),
-                'podcast_mode': self.podcast_mode.get(),
-                'quality': self.quality_var.get(),
-                'format': self.format_var.get(),
-                'output_dir': self.output_dir_var.get()
-            }
+            # Step 2-6: Analysis, tracking, diarization, subtitle, editing
+            results = self.pipeline.run(
+                video_path, output_options,
+                stage_callback=lambda stage, message, percent: self.update_stage(message),
+                status_callback=self.update_status,
+                cancel_check=lambda: not self.is_processing,
+                preview_callback=self._on_preview,
+                moment_review=self._review_moments,
+                plan_callback=self._plan_eta,
+                metrics=self.metrics
+            )
+            output_options.update(results)
+            output_files = results['output_files']
             
-            try:
-                output_files = self.video_editor.process_video(video_path, output_options)
-            except Exception as e:
-                self.update_status(f"Error in video editing: {e}")
-                output_files = []
-            
-            if not self.is_processing:
-                return
-                
             # Step 7: Cleanup and finish
             self.update_progress(100, "✅ Proses selesai!")
             
             end_time = time.time()
             total_time = end_time - start_time
             
+            self._save_analysis_results(video_path, output_options, output_files, total_time)
+            
             # Show completion message
-            self.show_completion_dialog(output_files, total_time)
+            self._post_ui('completion', output_files, total_time)
             
+        except JobCancelled:
+            pass
         except Exception as e:
             if self.is_processing:
                 self.update_status(f"❌ Error: {str(e)}")
-                messagebox.showerror("Error", f"Terjadi kesalahan: {str(e)}")
+                self._post_ui('error', f"Terjadi kesalahan: {str(e)}")
                 print(f"Detailed error: {e}")  # For debugging
                 import traceback
                 traceback.print_exc()
         finally:
             # Reset controls
             if self.is_processing:
-                self.start_button.configure(state="normal")
-                self.stop_button.configure(state="disabled")
+                self._post_ui('controls', False)
                 self.is_processing = False
                 
+    def _save_analysis_results(self, video_path, output_options, output_files, total_time):
+        """Export analysis_results.json (versioned schema) beserta per-stage metrics"""
+        moments = output_options.get('moments') or []
+        
+        results = {
+            'video_path': str(video_path),
+            'processed_at': datetime.now().isoformat(),
+            'processing_time': total_time,
+            'moments': [asdict(m) if is_dataclass(m) else m for m in moments],
+            'face_data': output_options.get('face_data'),
+            'speaker_data': output_options.get('speaker_data'),
+            'subtitle_data': output_options.get('subtitle_data'),
+            'output_files': output_files
+        }
+        
+        if METRICS_SETTINGS['enabled'] and METRICS_SETTINGS['write_to_results']:
+            results['metrics'] = self.metrics.to_dict()
+            
+        results_path = Path(self.output_dir_var.get()) / "analysis_results.json"
+        try:
+            AnalysisResult.from_results(results).export_json(results_path)
+        except Exception as e:
+            print(f"Error saving analysis results: {e}")
+        
+        if METRICS_SETTINGS['enabled'] and METRICS_SETTINGS['prometheus_textfile']:
+            get_metrics_registry().write_prometheus(METRICS_SETTINGS['prometheus_textfile'])
+        
+    def _collect_options(self):
+        """Processing options dari GUI controls"""
+        return {
+            'detect_moments': self.detect_moments.get(),
+            'face_tracking': self.face_tracking.get(),
+            'speaker_detection': self.speaker_detection.get(),
+            'auto_subtitle': self.auto_subtitle.get(),
+            'add_watermark': self.add_watermark.get(),
+            'podcast_mode': self.podcast_mode.get(),
+            'audio_enhancement': self.audio_enhancement.get(),
+            'previews': self.moment_previews.get(),
+            'quick_top_n': 5 if self.quick_moments.get() else None,
+            'reuse_analysis': self.reuse_analysis.get(),
+            'reframe_formats': ['9:16'] if self.vertical_clips.get() else [],
+            'quality': self.quality_var.get(),
+            'format': self.format_var.get(),
+            'output_dir': self.output_dir_var.get()
+        }
+        
+    def _on_preview(self, index, moment, path):
+        """Pipeline callback (worker thread): tampilkan preview moment di GUI"""
+        self._post_ui(f'preview:{index}', index, moment, path)
+        
+    def _add_preview_row(self, index, moment, path):
+        """Satu baris preview: info moment, tombol putar, centang approve"""
+        self.preview_hint.configure(text="🎞️ Preview moment - hapus centang untuk skip clip di render final")
+        row = ctk.CTkFrame(self.preview_frame)
+        row.pack(fill="x", padx=10, pady=2)
+        
+        start, end = moment['start_time'], moment['end_time']
+        label = ctk.CTkLabel(
+            row,
+            text=f"#{index + 1}  {int(start // 60)}:{int(start % 60):02d} - {int(end // 60)}:{int(end % 60):02d}"
+                 f"  (score {moment.get('score', 0):.2f})  {moment.get('reason', '')}",
+            font=ctk.CTkFont(size=11),
+            anchor="w"
+        )
+        label.pack(side="left", fill="x", expand=True, padx=10)
+        
+        # Approval per moment (start, end): urutan final moments berbeda
+        # dari urutan preview setelah ranking
+        key = self._moment_key(moment)
+        approved = tk.BooleanVar(value=self._moment_approvals.get(key, True))
+        self._moment_approvals[key] = approved.get()
+        approve_cb = ctk.CTkCheckBox(
+            row, text="Pakai", variable=approved,
+            command=lambda: self._moment_approvals.__setitem__(key, approved.get())
+        )
+        approve_cb.pack(side="right", padx=10)
+        
+        play_button = ctk.CTkButton(row, text="▶️ Putar", width=80, command=lambda: self.utils.open_file(path))
+        play_button.pack(side="right", padx=5)
+        
+    def _clear_previews(self):
+        """Hapus preview rows dari job sebelumnya"""
+        for child in self.preview_frame.winfo_children():
+            if child is not self.preview_hint:
+                child.destroy()
+        self._moment_approvals = {}
+        self._review_approved.clear()
+        self.review_button.configure(state="disabled")
+        self.review_button.pack_forget()
+        self.preview_hint.configure(text="🎞️ Preview moment akan muncul di sini - hapus centang untuk skip clip")
+        
+    @staticmethod
+    def _moment_key(moment):
+        return (moment['start_time'], moment['end_time'])
+        
+    def _review_moments(self, moments):
+        """
+        Pipeline callback sebelum video_editing (worker thread, semua preview
+        sudah selesai): tunggu tombol render, lalu buang moments yang di-reject.
+        Tanpa preview tidak ada yang bisa di-review, semua moments dirender.
+        """
+        if not self.moment_previews.get():
+            return moments
+            
+        self._post_ui('review', len(moments))
+        self.update_status("⏸️ Pilih clip dari preview, lalu klik Render clip yang dipilih")
+        while not self._review_approved.wait(timeout=0.5):
+            if not self.is_processing:
+                raise JobCancelled()
+                
+        approved = [m for m in moments if self._moment_approvals.get(self._moment_key(m), False)]
+        skipped = len(moments) - len(approved)
+        if skipped:
+            self.update_status(f"⏭️ {skipped} moment di-skip sesuai pilihan preview")
+        return approved
+        
+    def _show_review(self, count):
+        """Tampilkan tombol render setelah semua preview siap"""
+        self.preview_hint.configure(text=f"🎞️ {count} preview siap - hapus centang untuk skip clip, lalu klik Render")
+        self.review_button.pack(anchor="e", padx=10, pady=(5, 10))
+        self.review_button.configure(state="normal")
+        
+    def _approve_review(self):
+        """Tombol render: lanjutkan video_editing dengan moments yang dicentang"""
+        self.review_button.configure(state="disabled")
+        self._review_approved.set()
+        
+    def _plan_eta(self, duration, plans):
+        """Pipeline callback: rencana kerja per stage (tanpa stages yang dipakai ulang) untuk ETA"""
+        self.eta.plan(duration, plans, job_id=self.metrics.job_id)
+        
+    def _on_stage_event(self, event, stage, **info):
+        """Metrics listener: refresh progress saat stage melaporkan unit kerja"""
+        self.update_progress(self.eta.percent_complete(), self._stage_message)
+        
+    def update_stage(self, message):
+        """Set stage message dan update progress dari ETA model"""
+        self._stage_message = message
+        self.update_progress(self.eta.percent_complete(), message)
+        
+    def _post_ui(self, key, *payload):
+        """
+        Thread-safe UI update: event masuk processing_queue dan di-apply oleh
+        _drain_ui_queue. Events dengan key yang sama digabung (hanya yang terakhir).
+        """
+        self.processing_queue.put((key, payload))
+        
+    def _drain_ui_queue(self):
+        """GUI tick: ambil semua pending events, apply state terakhir per key"""
+        latest = {}
+        try:
+            while True:
+                key, payload = self.processing_queue.get_nowait()
+                latest.pop(key, None)  # Urutan mengikuti event terakhir
+                latest[key] = payload
+        except queue.Empty:
+            pass
+            
+        for key, payload in latest.items():
+            try:
+                self._ui_handlers[key.split(':', 1)[0]](*payload)
+            except Exception as e:
+                print(f"UI update error ({key}): {e}")
+                
+        self.root.after(UI_TICK_MS, self._drain_ui_queue)
+        
+    def _set_controls(self, processing):
+        """Enable / disable tombol start dan stop"""
+        self.start_button.configure(state="disabled" if processing else "normal")
+        self.stop_button.configure(state="normal" if processing else "disabled")
+        
     def update_progress(self, percentage, message):
         """Update progress bar dan message"""
-        self.root.after(0, lambda: self._update_progress_ui(percentage, message))
+        self._post_ui('progress', percentage, message)
         
     def _update_progress_ui(self, percentage, message):
         """Update UI progress (run in main thread)"""
         self.progress_var.set(percentage / 100.0)
         self.progress_text.configure(text=message)
         
-        # Update time estimate
-        if percentage > 0 and hasattr(self, 'process_start_time'):
-            elapsed = time.time() - self.process_start_time
-            estimated_total = elapsed / (percentage / 100.0)
-            remaining = estimated_total - elapsed
+        # Update time estimate dari throughput per stage
+        if 0 < percentage < 100:
+            remaining = self.eta.remaining_seconds()
             
             if remaining > 0:
                 try:
@@ -660,7 +868,7 @@ class SmartclipAI:
         
     def update_status(self, message):
         """Update status bar"""
-        self.root.after(0, lambda: self.status_text.configure(text=message))
+        self._post_ui('status', message)
         
     def show_completion_dialog(self, output_files, processing_time):
         """Show completion dialog"""
@@ -699,9 +907,6 @@ class SmartclipAI:
             
     def run(self):
         """Run the application"""
-        # Set process start time
-        self.process_start_time = time.time()
-        
         # Start main loop
         self.root.mainloop()
 
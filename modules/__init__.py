@@ -1 +1 @@
-#!/usr/bin/env python3\n\"\"\"\nSmartclip AI Modules\nMain modules untuk video processing dengan AI\n\"\"\"\n\nfrom .youtube_downloader import YouTubeDownloader\nfrom .video_analyzer import VideoAnalyzer\nfrom .face_tracker import FaceTracker\nfrom .speaker_diarization import SpeakerDiarization\nfrom .subtitle_generator import SubtitleGenerator\nfrom .video_editor import VideoEditor, EditingOptions\nfrom .utils import Utils, get_utils\n\n__version__ = \"1.0.0\"\n__author__ = \"Smartclip AI Team\"\n__description__ = \"AI-powered video processing modules for YouTube content analysis\"\n\n__all__ = [\n    'YouTubeDownloader',\n    'VideoAnalyzer', \n    'FaceTracker',\n    'SpeakerDiarization',\n    'SubtitleGenerator',\n    'VideoEditor',\n    'EditingOptions',\n    'Utils',\n    'get_utils'\n]
\ No newline at end of file
+#!/usr/bin/env python3\n\"\"\"\nSmartclip AI Modules\nMain modules untuk video processing dengan AI\n\"\"\"\n\nimport importlib\n\n__version__ = \"1.0.0\"\n__author__ = \"Smartclip AI Team\"\n__description__ = \"AI-powered video processing modules for YouTube content analysis\"\n\n# Public classes di-import secara lazy supaya worker processes (modules.parallel)\n# tidak ikut load torch/transformers saat import package ini\n_LAZY_EXPORTS = {\n    'YouTubeDownloader': '.youtube_downloader',\n    'VideoAnalyzer': '.video_analyzer',\n    'FaceTracker': '.face_tracker',\n    'SpeakerDiarization': '.speaker_diarization',\n    'SubtitleGenerator': '.subtitle_generator',\n    'VideoEditor': '.video_editor',\n    'EditingOptions': '.video_editor',\n    'Utils': '.utils',\n    'get_utils': '.utils'\n}\n\ndef __getattr__(name):\n    if name in _LAZY_EXPORTS:\n        module = importlib.import_module(_LAZY_EXPORTS[name], __name__)\n        value = getattr(module, name)\n        globals()[name] = value\n        return value\n    raise AttributeError(f\"module {__name__!r} has no attribute {name!r}\")\n\n__all__ = [\n    'YouTubeDownloader',\n    'VideoAnalyzer', \n    'FaceTracker',\n    'SpeakerDiarization',\n    'SubtitleGenerator',\n    'VideoEditor',\n    'EditingOptions',\n    'Utils',\n    'get_utils'\n]
\ No newline at end of file
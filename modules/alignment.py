@@ -0,0 +1,327 @@
+#!/usr/bin/env python3
+"""
+Alignment Module
+Memetakan timeline video baru (versi trim / re-cut / re-edit) ke timeline
+video yang sudah pernah diproses. Audio kedua video diringkas menjadi
+chroma + energy features (~11 per detik, lihat media_index); setiap block
+video baru dicari posisinya di video lama dengan normalized cross-correlation
+via FFT, lalu blocks dengan offset yang sama digabung menjadi segments.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import List
+
+import numpy as np
+
+# Setup logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+@dataclass
+class AlignedSegment:
+    """
+    Range [start, end) di timeline video baru yang sama dengan
+    [start + offset, end + offset) di video lama
+    """
+    start: float
+    end: float
+    offset: float
+    score: float
+
+    @property
+    def duration(self):
+        return self.end - self.start
+
+def _standardize(features):
+    """Z-score per dimension supaya chroma dan energy punya bobot yang sama"""
+    features = np.asarray(features, dtype=np.float64)
+    return (features - features.mean(axis=0)) / (features.std(axis=0) + 1e-8)
+
+def _window_sums(values, width):
+    """Sliding sum (centered, width frames) per column; di ujung hanya frames yang ada"""
+    kernel = np.ones(max(1, int(width)))
+    return np.apply_along_axis(lambda column: np.convolve(column, kernel, mode='same'), 0, values)
+
+def _local_correlation(query, reference, lo, hi, delta, width):
+    """
+    Correlation per frame antara query[i] dan reference[i + delta], i di [lo, hi),
+    masing-masing dalam window width frames di sekitar i (semua dimensions)
+    """
+    q = query[lo:hi]
+    r = reference[lo + delta:hi + delta]
+    count = _window_sums(np.ones((len(q), 1)), width)
+    sum_q, sum_r = _window_sums(q, width), _window_sums(r, width)
+    cross = (_window_sums(q * r, width) - sum_q * sum_r / count).sum(axis=1)
+    var_q = (_window_sums(q * q, width) - sum_q ** 2 / count).sum(axis=1)
+    var_r = (_window_sums(r * r, width) - sum_r ** 2 / count).sum(axis=1)
+    return cross / (np.sqrt(np.maximum(var_q * var_r, 0)) + 1e-8)
+
+def block_offsets(query, reference, block_frames, step_frames):
+    """
+    Best offset (frames) dan NCC score untuk setiap block query di reference
+
+    Numerator per lag dihitung sekaligus untuk semua lags: FFT reference sekali,
+    per block satu rfft template (dibalik) dan satu irfft dari jumlah semua
+    dimensions. Denominator dari sliding sums (cumsum) reference.
+
+    Returns:
+        List of (block_start, delta, score); reference index = query index + delta
+    """
+    length = block_frames
+    lags = len(reference) - length + 1
+    if lags <= 0 or len(query) < length:
+        return []
+
+    n = 1 << int(np.ceil(np.log2(len(reference) + length)))
+    reference_spectrum = np.fft.rfft(reference.T, n)
+
+    # Variance reference per lag (sum over dimensions) dari sliding sums
+    cumsum = np.concatenate([np.zeros((1, reference.shape[1])), np.cumsum(reference, axis=0)])
+    cumsum_sq = np.concatenate([np.zeros((1, reference.shape[1])), np.cumsum(reference ** 2, axis=0)])
+    window_sum = cumsum[length:] - cumsum[:-length]
+    window_sum_sq = cumsum_sq[length:] - cumsum_sq[:-length]
+    reference_energy = np.maximum((window_sum_sq - window_sum ** 2 / length).sum(axis=1), 0)
+    reference_norm = np.sqrt(reference_energy)
+
+    results = []
+    for block_start in range(0, len(query) - length + 1, step_frames):
+        template = query[block_start:block_start + length]
+        template = template - template.mean(axis=0)
+        template_norm = np.sqrt((template ** 2).sum())
+        if template_norm < 1e-6:
+            continue  # Block datar (silence)
+
+        template_spectrum = np.fft.rfft(template[::-1].T, n)
+        correlation = np.fft.irfft((reference_spectrum * template_spectrum).sum(axis=0), n)
+        correlation = correlation[length - 1:length - 1 + lags]
+        ncc = correlation / (template_norm * reference_norm + 1e-8)
+
+        best = int(np.argmax(ncc))
+        results.append((block_start, best - block_start, float(ncc[best])))
+    return results
+
+def _downsample(features, factor):
+    """Rata-rata per factor frames (coarse search)"""
+    usable = len(features) // factor * factor
+    return features[:usable].reshape(-1, factor, features.shape[1]).mean(axis=1)
+
+def _refine_delta(query, reference, block_start, length, delta, radius):
+    """Delta terbaik (full resolution) di sekitar hasil coarse search"""
+    template = query[block_start:block_start + length]
+    template = template - template.mean(axis=0)
+    best_delta, best_score = delta, -1.0
+    for candidate in range(delta - radius, delta + radius + 1):
+        if block_start + candidate < 0 or block_start + candidate + length > len(reference):
+            continue
+        window = reference[block_start + candidate:block_start + candidate + length]
+        window = window - window.mean(axis=0)
+        score = (template * window).sum() / (np.sqrt((template ** 2).sum() * (window ** 2).sum()) + 1e-8)
+        if score > best_score:
+            best_delta, best_score = candidate, score
+    return best_delta, best_score
+
+def align_timelines(query, reference, hop_seconds, block_seconds=10.0, step_seconds=2.5,
+                    min_correlation=0.7, min_segment_seconds=5.0, tolerance_seconds=0.25, coarse_factor=4):
+    """
+    Aligned segments video baru (query) terhadap video lama (reference)
+
+    Args:
+        query, reference: Feature arrays (frames x dims), satu frame per hop_seconds
+        block_seconds: Panjang block yang dicari di reference
+        step_seconds: Jarak antar block (resolusi boundary sebelum refine)
+        min_correlation: NCC minimal untuk block yang cocok
+        min_segment_seconds: Segment lebih pendek dari ini dibuang
+        tolerance_seconds: Selisih offset antar block dalam satu segment
+        coarse_factor: Block search di features yang di-downsample sekian kali,
+            lalu offset tiap block di-refine di full resolution
+
+    Returns:
+        List of AlignedSegment (urut waktu, tidak overlap)
+    """
+    query = _standardize(query)
+    reference = _standardize(reference)
+    block_frames = int(round(block_seconds / hop_seconds))
+    step_frames = max(1, int(round(step_seconds / hop_seconds)))
+    tolerance = max(1, int(round(tolerance_seconds / hop_seconds)))
+
+    factor = max(1, int(coarse_factor))
+    blocks = []
+    for coarse_start, coarse_delta, _ in block_offsets(
+        _downsample(query, factor), _downsample(reference, factor), block_frames // factor, max(1, step_frames // factor)
+    ):
+        block_start = coarse_start * factor
+        delta, score = _refine_delta(query, reference, block_start, block_frames, coarse_delta * factor, factor)
+        if score >= min_correlation:
+            blocks.append((block_start, delta, score))
+
+    # Blocks berurutan dengan offset yang sama -> satu run
+    step_frames = max(1, step_frames // factor) * factor
+    runs = []
+    for block_start, delta, score in blocks:
+        run = runs[-1] if runs else None
+        if run and block_start - run['last'] <= step_frames and abs(delta - run['deltas'][-1]) <= tolerance:
+            run['last'] = block_start
+            run['deltas'].append(delta)
+            run['scores'].append(score)
+        else:
+            runs.append({'first': block_start, 'last': block_start, 'deltas': [delta], 'scores': [score]})
+
+    segments = []
+    for run in runs:
+        delta = int(np.median(run['deltas']))
+        start, end = run['first'], run['last'] + block_frames
+        start, end = _refine_edges(query, reference, start, end, delta, step_frames, block_frames // 2, hop_seconds)
+        segments.append([start, end, delta, float(np.mean(run['scores']))])
+
+    # Runs yang bertumpuk (block terakhir / pertama) dipotong di tengah
+    segments.sort(key=lambda s: s[0])
+    for previous, current in zip(segments, segments[1:]):
+        if current[0] < previous[1]:
+            middle = (current[0] + previous[1]) // 2
+            previous[1], current[0] = middle, middle
+
+    min_frames = min_segment_seconds / hop_seconds
+    return [
+        AlignedSegment(start=s * hop_seconds, end=e * hop_seconds, offset=delta * hop_seconds, score=score)
+        for s, e, delta, score in segments if e - s >= min_frames
+    ]
+
+def _refine_edges(query, reference, start, end, delta, margin, inner, hop_seconds, threshold=0.5):
+    """
+    Geser boundary segment ke titik local correlation turun: start boleh mundur
+    margin frames atau maju sampai inner frames (block yang cocok bisa
+    sebagian berisi materi lain), end sebaliknya
+    """
+    lo = max(0, start - margin, -delta)
+    hi = min(len(query), end + margin, len(reference) - delta)
+    if hi - lo <= 2 * inner:
+        return start, end
+    good = _local_correlation(query, reference, lo, hi, delta, 1.0 / hop_seconds) >= threshold
+
+    # Start: setelah frame terakhir yang tidak cocok di [start - margin, start + inner)
+    head = good[:start + inner - lo]
+    bad = np.flatnonzero(~head)
+    new_start = lo + int(bad[-1]) + 1 if len(bad) else lo
+
+    # End: frame pertama yang tidak cocok di [end - inner, end + margin)
+    tail_start = end - inner - lo
+    bad = np.flatnonzero(~good[tail_start:])
+    new_end = lo + tail_start + int(bad[0]) if len(bad) else hi
+    return new_start, max(new_end, new_start + 1)
+
+def merge_ranges(ranges):
+    """Gabungkan (start, end) ranges yang bertumpuk / bersambung"""
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+class TimelineMap:
+    """Carry data (dalam timeline video lama) ke timeline video baru lewat aligned segments"""
+
+    def __init__(self, segments: List[AlignedSegment]):
+        self.segments = sorted(segments, key=lambda s: s.start)
+
+    def matched_ranges(self):
+        """Ranges di timeline baru yang ada di video lama"""
+        return [(s.start, s.end) for s in self.segments]
+
+    def unmatched_ranges(self, duration, min_length=1.0):
+        """Ranges di timeline baru yang harus diproses ulang"""
+        ranges = []
+        position = 0.0
+        for segment in self.segments:
+            if segment.start - position >= min_length:
+                ranges.append((position, segment.start))
+            position = max(position, segment.end)
+        if duration - position >= min_length:
+            ranges.append((position, duration))
+        return ranges
+
+    def _segment_for(self, old_start, old_end):
+        for segment in self.segments:
+            if segment.start + segment.offset - 1e-3 <= old_start and old_end <= segment.end + segment.offset + 1e-3:
+                return segment
+        return None
+
+    def carry(self, items, start_key='start_time', end_key='end_time', nested=None):
+        """
+        Items (dicts) yang seluruhnya berada di satu matched segment, dipindah ke
+        timeline baru. Items yang terpotong boundary segment tidak di-carry.
+
+        Args:
+            nested: Optional (list_key, start_key, end_key) untuk child items,
+                e.g. ('words', 'start', 'end') pada transcript segments
+        """
+        carried = []
+        for item in items or []:
+            segment = self._segment_for(item[start_key], item[end_key])
+            if segment is None:
+                continue
+            shifted = {**item, start_key: item[start_key] - segment.offset, end_key: item[end_key] - segment.offset}
+            if nested and item.get(nested[0]):
+                list_key, child_start, child_end = nested
+                shifted[list_key] = [
+                    {**child, child_start: child[child_start] - segment.offset, child_end: child[child_end] - segment.offset}
+                    for child in item[list_key]
+                ]
+            carried.append(shifted)
+        return carried
+
+    def partial_spans(self, items, start_key='start_time', end_key='end_time'):
+        """
+        Bagian (di timeline baru) dari items yang terpotong boundary segment,
+        i.e. tidak ikut di-carry tapi juga tidak ada di unmatched_ranges
+        """
+        spans = []
+        for item in items or []:
+            if self._segment_for(item[start_key], item[end_key]) is not None:
+                continue
+            for segment in self.segments:
+                start = max(segment.start, item[start_key] - segment.offset)
+                end = min(segment.end, item[end_key] - segment.offset)
+                if end > start:
+                    spans.append((start, end))
+        return spans
+
+    def carry_points(self, points, key):
+        """
+        Time points (dicts atau lists) di dalam matched segments
+
+        Args:
+            key: Key / index timestamp di setiap point (e.g. 'timestamp' atau 0)
+        """
+        carried = []
+        for point in points or []:
+            segment = self._segment_for(point[key], point[key])
+            if segment is None:
+                continue
+            if isinstance(point, dict):
+                carried.append({**point, key: point[key] - segment.offset})
+            else:
+                shifted = list(point)
+                shifted[key] = point[key] - segment.offset
+                carried.append(shifted)
+        return carried
+
+# Test function
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+    hop = 0.093
+    reference = np.cumsum(rng.standard_normal((6000, 13)), axis=0) * 0.1 + rng.standard_normal((6000, 13))
+
+    # Re-cut: bagian 100-160s, 30s materi baru, lalu bagian 20-80s
+    def frames(seconds):
+        return int(seconds / hop)
+    query = np.concatenate([
+        reference[frames(100):frames(160)],
+        rng.standard_normal((frames(30), 13)),
+        reference[frames(20):frames(80)]
+    ]) + 0.3 * rng.standard_normal((frames(60) + frames(30) + frames(60), 13))
+
+    for segment in align_timelines(query, reference, hop):
+        print(f"new {segment.start:6.1f}-{segment.end:6.1f}s -> old +{segment.offset:6.1f}s (ncc {segment.score:.2f})")
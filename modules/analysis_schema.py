@@ -0,0 +1,693 @@
+#!/usr/bin/env python3
+"""
+Analysis Schema Module
+Schema typed dan versioned untuk analysis results (moments, face_data,
+speaker_data, subtitle_data). Data numerik yang berulang (face paths, speech
+segments, word timestamps, speaker timeline) disimpan sebagai NumPy structured
+arrays, sehingga format binary (msgpack) untuk cache dan transfer antar process
+hanya menyalin buffer. JSON hanya untuk export yang dibaca manusia.
+
+Modules lain tetap memakai format dict yang sama: from_results() / to_results()
+mengonversi dari dan ke dict tersebut. Keys di luar schema disimpan di `extra`
+dan dikembalikan apa adanya.
+"""
+
+import json
+import logging
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# Setup logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+SCHEMA_NAME = "smartclip.analysis"
+
+# Naikkan jika format record berubah, dan tambahkan migration di _MIGRATIONS
+SCHEMA_VERSION = 2
+
+# msgpack ExtType code untuk NumPy arrays
+NDARRAY_EXT = 1
+
+# (timestamp, x, y, width, height) per face sample
+PATH_DTYPE = np.dtype([('timestamp', '<f8'), ('x', '<i4'), ('y', '<i4'), ('width', '<i4'), ('height', '<i4')])
+
+# Sampled face timeline untuk visualization
+FACE_TIMELINE_DTYPE = np.dtype([
+    ('timestamp', '<f8'), ('confidence', '<f8'), ('size', '<f8'), ('center_x', '<i4'), ('center_y', '<i4'),
+    ('x', '<i4'), ('y', '<i4'), ('width', '<i4'), ('height', '<i4')
+])
+
+SPEECH_DTYPE = np.dtype([('start_time', '<f8'), ('end_time', '<f8'), ('duration', '<f8'), ('confidence', '<f8')])
+
+# Speaker timeline: satu row per (timeline point, speaker aktif)
+ACTIVE_SPEAKER_DTYPE = np.dtype([('point', '<i4'), ('speaker_id', '<i4'), ('confidence', '<f8')])
+
+SEGMENT_DTYPE = np.dtype([
+    ('start_time', '<f8'), ('end_time', '<f8'), ('duration', '<f8'), ('confidence', '<f8'), ('speaker_id', '<i4')
+])
+
+# probability NaN = word tanpa probability
+WORD_DTYPE = np.dtype([('start', '<f8'), ('end', '<f8'), ('probability', '<f8')])
+
+# speaker_id None di SEGMENT_DTYPE
+NO_SPEAKER = -1
+
+MOMENT_KEYS = ('start_time', 'end_time', 'duration', 'score', 'reason', 'features', 'confidence')
+FACE_TRACK_KEYS = (
+    'face_id', 'first_seen', 'last_seen', 'total_duration', 'screen_time_percentage', 'appearances',
+    'average_size', 'average_confidence', 'is_prominent', 'face_encoding', 'path', 'timeline'
+)
+SPEAKER_KEYS = (
+    'speaker_id', 'name', 'total_duration', 'speech_percentage', 'average_energy', 'average_pitch',
+    'voice_embedding', 'characteristics', 'segments'
+)
+SEGMENT_KEYS = ('start_time', 'end_time', 'duration', 'text', 'confidence', 'language', 'speaker_id', 'words')
+WORD_KEYS = ('word', 'start', 'end', 'probability')
+
+# Keys segment yang tidak selalu ada (subtitle cues vs transcript segments)
+OPTIONAL_SEGMENT_KEYS = ('duration', 'language', 'speaker_id')
+
+def _extra(data, keys):
+    """Keys di luar schema"""
+    return {key: value for key, value in data.items() if key not in keys}
+
+def _table(rows, dtype):
+    """List of tuples -> structured array"""
+    return np.array(rows, dtype=dtype) if rows else np.zeros(0, dtype=dtype)
+
+def _columns(data, keys):
+    """Keys schema (selain id) yang ada di source dict"""
+    return [key for key in keys[1:] if key in data]
+
+def _vector(values):
+    """Embedding / encoding -> float64 array (None -> array kosong)"""
+    return np.asarray(values if values is not None else [], dtype=np.float64)
+
+@dataclass
+class Moment:
+    """Satu moment hasil video analysis"""
+    __slots__ = MOMENT_KEYS + ('extra',)
+    start_time: float
+    end_time: float
+    duration: float
+    score: float
+    reason: str
+    features: Dict
+    confidence: float
+    extra: Dict
+
+    @classmethod
+    def from_dict(cls, moment):
+        start, end = float(moment['start_time']), float(moment['end_time'])
+        return cls(
+            start_time=start,
+            end_time=end,
+            duration=float(moment.get('duration', end - start)),
+            score=float(moment.get('score', 0.0)),
+            reason=moment.get('reason', ''),
+            features=moment.get('features') or {},
+            confidence=float(moment.get('confidence', 0.0)),
+            extra=_extra(moment, MOMENT_KEYS)
+        )
+
+    def to_dict(self):
+        return {**{key: getattr(self, key) for key in MOMENT_KEYS}, **self.extra}
+
+    def to_record(self):
+        return [getattr(self, key) for key in self.__slots__]
+
+    @classmethod
+    def from_record(cls, record):
+        return cls(*record)
+
+@dataclass
+class FaceTrackRecord:
+    """Satu face track; path dan timeline sebagai structured arrays"""
+    __slots__ = FACE_TRACK_KEYS + ('columns', 'extra')
+    face_id: int
+    first_seen: float
+    last_seen: float
+    total_duration: float
+    screen_time_percentage: float
+    appearances: int
+    average_size: float
+    average_confidence: float
+    is_prominent: bool
+    face_encoding: np.ndarray
+    path: np.ndarray  # PATH_DTYPE
+    timeline: np.ndarray  # FACE_TIMELINE_DTYPE
+    columns: List[str]  # FACE_TRACK_KEYS yang ada di source track
+    extra: Dict
+
+    @classmethod
+    def from_dict(cls, track):
+        return cls(
+            face_id=int(track['face_id']),
+            first_seen=float(track.get('first_seen', 0.0)),
+            last_seen=float(track.get('last_seen', 0.0)),
+            total_duration=float(track.get('total_duration', 0.0)),
+            screen_time_percentage=float(track.get('screen_time_percentage', 0.0)),
+            appearances=int(track.get('appearances', 0)),
+            average_size=float(track.get('average_size', 0.0)),
+            average_confidence=float(track.get('average_confidence', 0.0)),
+            is_prominent=bool(track.get('is_prominent', False)),
+            face_encoding=_vector(track.get('face_encoding')),
+            path=_table([tuple(point[:5]) for point in track.get('path', [])], PATH_DTYPE),
+            timeline=_table([
+                (point['timestamp'], point['confidence'], point['size'], *point['center'], *point['bounding_box'])
+                for point in track.get('timeline', [])
+            ], FACE_TIMELINE_DTYPE),
+            columns=_columns(track, FACE_TRACK_KEYS),
+            extra=_extra(track, FACE_TRACK_KEYS)
+        )
+
+    def to_dict(self):
+        track = {'face_id': self.face_id}
+        for key in self.columns:
+            if key == 'face_encoding':
+                track[key] = self.face_encoding.tolist()
+            elif key == 'path':
+                track[key] = [list(point) for point in self.path.tolist()]
+            elif key == 'timeline':
+                track[key] = [
+                    {'timestamp': t, 'confidence': confidence, 'size': size, 'center': (cx, cy),
+                     'bounding_box': (x, y, w, h)}
+                    for t, confidence, size, cx, cy, x, y, w, h in self.timeline.tolist()
+                ]
+            else:
+                track[key] = getattr(self, key)
+        track.update(self.extra)
+        return track
+
+    def to_record(self):
+        return [getattr(self, key) for key in self.__slots__]
+
+    @classmethod
+    def from_record(cls, record):
+        return cls(*record)
+
+@dataclass
+class FaceData:
+    """Hasil face tracking"""
+    __slots__ = ('tracks', 'main_speakers', 'statistics', 'total_duration', 'extra')
+    tracks: List[FaceTrackRecord]
+    main_speakers: List[int]  # face_id tracks yang prominent
+    statistics: Optional[Dict]
+    total_duration: Optional[float]
+    extra: Dict
+
+    @classmethod
+    def from_dict(cls, face_data):
+        return cls(
+            tracks=[FaceTrackRecord.from_dict(track) for track in face_data.get('tracks', [])],
+            main_speakers=[int(track['face_id']) for track in face_data.get('main_speakers', [])],
+            statistics=face_data.get('statistics'),
+            total_duration=face_data.get('total_duration'),
+            extra=_extra(face_data, ('tracks', 'main_speakers', 'statistics', 'total_duration'))
+        )
+
+    def to_dict(self):
+        tracks = [track.to_dict() for track in self.tracks]
+        by_id = {track['face_id']: track for track in tracks}
+        face_data = {
+            'tracks': tracks,
+            'main_speakers': [by_id[face_id] for face_id in self.main_speakers if face_id in by_id]
+        }
+        if self.statistics is not None:
+            face_data['statistics'] = self.statistics
+        if self.total_duration is not None:
+            face_data['total_duration'] = self.total_duration
+        face_data.update(self.extra)
+        return face_data
+
+    def to_record(self):
+        return [[track.to_record() for track in self.tracks], self.main_speakers, self.statistics,
+                self.total_duration, self.extra]
+
+    @classmethod
+    def from_record(cls, record):
+        tracks, main_speakers, statistics, total_duration, extra = record
+        return cls([FaceTrackRecord.from_record(track) for track in tracks], main_speakers, statistics,
+                   total_duration, extra)
+
+@dataclass
+class SpeakerRecord:
+    """Satu speaker; speech segments sebagai structured array"""
+    __slots__ = SPEAKER_KEYS + ('columns', 'extra')
+    speaker_id: int
+    name: Optional[str]
+    total_duration: float
+    speech_percentage: float
+    average_energy: float
+    average_pitch: float
+    voice_embedding: np.ndarray
+    characteristics: Dict
+    segments: np.ndarray  # SPEECH_DTYPE
+    columns: List[str]  # SPEAKER_KEYS yang ada di source speaker
+    extra: Dict
+
+    @classmethod
+    def from_dict(cls, speaker):
+        return cls(
+            speaker_id=int(speaker['speaker_id']),
+            name=speaker.get('name'),
+            total_duration=float(speaker.get('total_duration', 0.0)),
+            speech_percentage=float(speaker.get('speech_percentage', 0.0)),
+            average_energy=float(speaker.get('average_energy', 0.0)),
+            average_pitch=float(speaker.get('average_pitch', 0.0)),
+            voice_embedding=_vector(speaker.get('voice_embedding')),
+            characteristics=speaker.get('characteristics') or {},
+            segments=_table([
+                (seg['start_time'], seg['end_time'], seg.get('duration', seg['end_time'] - seg['start_time']),
+                 seg.get('confidence', 0.0))
+                for seg in speaker.get('segments', [])
+            ], SPEECH_DTYPE),
+            columns=_columns(speaker, SPEAKER_KEYS),
+            extra=_extra(speaker, SPEAKER_KEYS)
+        )
+
+    def to_dict(self):
+        speaker = {'speaker_id': self.speaker_id}
+        for key in self.columns:
+            if key == 'voice_embedding':
+                speaker[key] = self.voice_embedding.tolist()
+            elif key == 'segments':
+                speaker[key] = [
+                    {'start_time': start, 'end_time': end, 'duration': duration, 'confidence': confidence}
+                    for start, end, duration, confidence in self.segments.tolist()
+                ]
+            else:
+                speaker[key] = getattr(self, key)
+        speaker.update(self.extra)
+        return speaker
+
+    def to_record(self):
+        return [getattr(self, key) for key in self.__slots__]
+
+    @classmethod
+    def from_record(cls, record):
+        return cls(*record)
+
+@dataclass
+class SpeakerData:
+    """Hasil speaker diarization"""
+    __slots__ = ('speakers', 'timeline_times', 'timeline_active', 'statistics', 'total_duration', 'extra')
+    speakers: List[SpeakerRecord]
+    timeline_times: np.ndarray  # float64 timestamps
+    timeline_active: np.ndarray  # ACTIVE_SPEAKER_DTYPE
+    statistics: Optional[Dict]
+    total_duration: Optional[float]
+    extra: Dict
+
+    @classmethod
+    def from_dict(cls, speaker_data):
+        timeline = speaker_data.get('timeline', [])
+        active = [
+            (point, active_speaker['speaker_id'], active_speaker.get('confidence', 0.0))
+            for point, entry in enumerate(timeline)
+            for active_speaker in entry.get('active_speakers', [])
+        ]
+        return cls(
+            speakers=[SpeakerRecord.from_dict(speaker) for speaker in speaker_data.get('speakers', [])],
+            timeline_times=np.array([entry['timestamp'] for entry in timeline], dtype=np.float64),
+            timeline_active=_table(active, ACTIVE_SPEAKER_DTYPE),
+            statistics=speaker_data.get('statistics'),
+            total_duration=speaker_data.get('total_duration'),
+            extra=_extra(speaker_data, ('speakers', 'timeline', 'statistics', 'total_duration'))
+        )
+
+    def to_dict(self):
+        active = [[] for _ in range(len(self.timeline_times))]
+        for point, speaker_id, confidence in self.timeline_active.tolist():
+            active[point].append({'speaker_id': speaker_id, 'confidence': confidence})
+        speaker_data = {
+            'speakers': [speaker.to_dict() for speaker in self.speakers],
+            'timeline': [
+                {'timestamp': t, 'active_speakers': speakers}
+                for t, speakers in zip(self.timeline_times.tolist(), active)
+            ]
+        }
+        if self.statistics is not None:
+            speaker_data['statistics'] = self.statistics
+        if self.total_duration is not None:
+            speaker_data['total_duration'] = self.total_duration
+        speaker_data.update(self.extra)
+        return speaker_data
+
+    def to_record(self):
+        return [[speaker.to_record() for speaker in self.speakers], self.timeline_times, self.timeline_active,
+                self.statistics, self.total_duration, self.extra]
+
+    @classmethod
+    def from_record(cls, record):
+        speakers, times, active, statistics, total_duration, extra = record
+        return cls([SpeakerRecord.from_record(speaker) for speaker in speakers], times, active, statistics,
+                   total_duration, extra)
+
+@dataclass
+class SegmentTable:
+    """
+    Transcript segments / subtitle cues sebagai columns. Words semua segments
+    di-flatten; words segment i = words[word_offsets[i]:word_offsets[i + 1]].
+    """
+    __slots__ = ('timing', 'text', 'language', 'word_offsets', 'word_timing', 'words', 'word_extra', 'columns',
+                 'extra')
+    timing: np.ndarray  # SEGMENT_DTYPE
+    text: List[str]
+    language: List[Optional[str]]  # Kosong jika 'language' tidak ada di columns
+    word_offsets: np.ndarray  # int64, len(segments) + 1
+    word_timing: np.ndarray  # WORD_DTYPE
+    words: List[str]
+    word_extra: Dict[int, Dict]  # index word (flattened) -> keys di luar WORD_KEYS
+    columns: List[str]  # OPTIONAL_SEGMENT_KEYS yang ada di source segments
+    extra: Dict[int, Dict]  # index segment -> keys di luar schema
+
+    @classmethod
+    def from_dicts(cls, segments):
+        columns = [key for key in OPTIONAL_SEGMENT_KEYS if any(key in segment for segment in segments)]
+        timing, text, language, offsets, word_timing, words, word_extra, extra = [], [], [], [0], [], [], {}, {}
+        for index, segment in enumerate(segments):
+            speaker_id = segment.get('speaker_id')
+            timing.append((segment['start_time'], segment['end_time'], segment.get('duration', np.nan),
+                           segment.get('confidence', 0.0), NO_SPEAKER if speaker_id is None else speaker_id))
+            text.append(segment.get('text', ''))
+            if 'language' in columns:
+                language.append(segment.get('language'))
+            for word in segment.get('words') or []:
+                extra_keys = _extra(word, WORD_KEYS)
+                if extra_keys:
+                    word_extra[len(words)] = extra_keys
+                words.append(word['word'])
+                word_timing.append((word['start'], word['end'], word.get('probability', np.nan)))
+            offsets.append(len(words))
+            segment_extra = _extra(segment, SEGMENT_KEYS)
+            if segment_extra:
+                extra[index] = segment_extra
+        return cls(
+            timing=_table(timing, SEGMENT_DTYPE),
+            text=text,
+            language=language,
+            word_offsets=np.array(offsets, dtype=np.int64),
+            word_timing=_table(word_timing, WORD_DTYPE),
+            words=words,
+            word_extra=word_extra,
+            columns=columns,
+            extra=extra
+        )
+
+    def to_dicts(self):
+        has_duration, has_language, has_speaker = (key in self.columns for key in OPTIONAL_SEGMENT_KEYS)
+        offsets = self.word_offsets.tolist()
+        words = [
+            {'word': word, 'start': start, 'end': end, 'probability': probability}
+            for word, (start, end, probability) in zip(self.words, self.word_timing.tolist())
+        ]
+        # NaN = word tanpa probability
+        for position in np.flatnonzero(np.isnan(self.word_timing['probability'])).tolist():
+            del words[position]['probability']
+        for position, extra_keys in self.word_extra.items():
+            words[position].update(extra_keys)
+
+        segments = []
+        for index, (start, end, duration, confidence, speaker_id) in enumerate(self.timing.tolist()):
+            segment = {'start_time': start, 'end_time': end}
+            if has_duration:
+                segment['duration'] = duration if duration == duration else end - start
+            segment['text'] = self.text[index]
+            segment['confidence'] = confidence
+            if has_language:
+                segment['language'] = self.language[index]
+            if has_speaker:
+                segment['speaker_id'] = None if speaker_id == NO_SPEAKER else speaker_id
+            segment['words'] = words[offsets[index]:offsets[index + 1]]
+            segment.update(self.extra.get(index, {}))
+            segments.append(segment)
+        return segments
+
+    def to_record(self):
+        return [getattr(self, key) for key in self.__slots__]
+
+    @classmethod
+    def from_record(cls, record):
+        table = cls(*record)
+        table.word_extra = {int(index): value for index, value in table.word_extra.items()}
+        table.extra = {int(index): value for index, value in table.extra.items()}
+        return table
+
+@dataclass
+class TranscriptData:
+    """Raw transcript (dipakai ulang untuk restyle subtitle tanpa ASR)"""
+    __slots__ = ('text', 'language', 'segments', 'extra')
+    text: str
+    language: Optional[str]
+    segments: SegmentTable
+    extra: Dict
+
+    @classmethod
+    def from_dict(cls, transcript):
+        return cls(
+            text=transcript.get('text', ''),
+            language=transcript.get('language'),
+            segments=SegmentTable.from_dicts(transcript.get('segments', [])),
+            extra=_extra(transcript, ('text', 'language', 'segments'))
+        )
+
+    def to_dict(self):
+        return {'text': self.text, 'language': self.language, 'segments': self.segments.to_dicts(), **self.extra}
+
+    def to_record(self):
+        return [self.text, self.language, self.segments.to_record(), self.extra]
+
+    @classmethod
+    def from_record(cls, record):
+        text, language, segments, extra = record
+        return cls(text, language, SegmentTable.from_record(segments), extra)
+
+@dataclass
+class SubtitleData:
+    """Hasil subtitle generation"""
+    __slots__ = ('segments', 'subtitle_files', 'statistics', 'language', 'total_duration', 'transcript', 'extra')
+    segments: SegmentTable
+    subtitle_files: Dict[str, str]
+    statistics: Optional[Dict]
+    language: Optional[str]
+    total_duration: Optional[float]
+    transcript: Optional[TranscriptData]
+    extra: Dict
+
+    @classmethod
+    def from_dict(cls, subtitle_data):
+        transcript = subtitle_data.get('transcript')
+        return cls(
+            segments=SegmentTable.from_dicts(subtitle_data.get('segments', [])),
+            subtitle_files=subtitle_data.get('subtitle_files') or {},
+            statistics=subtitle_data.get('statistics'),
+            language=subtitle_data.get('language'),
+            total_duration=subtitle_data.get('total_duration'),
+            transcript=TranscriptData.from_dict(transcript) if transcript is not None else None,
+            extra=_extra(subtitle_data, ('segments', 'subtitle_files', 'statistics', 'language', 'total_duration',
+                                         'transcript'))
+        )
+
+    def to_dict(self):
+        subtitle_data = {'segments': self.segments.to_dicts(), 'subtitle_files': self.subtitle_files}
+        for key in ('statistics', 'language', 'total_duration'):
+            if getattr(self, key) is not None:
+                subtitle_data[key] = getattr(self, key)
+        if self.transcript is not None:
+            subtitle_data['transcript'] = self.transcript.to_dict()
+        subtitle_data.update(self.extra)
+        return subtitle_data
+
+    def to_record(self):
+        return [self.segments.to_record(), self.subtitle_files, self.statistics, self.language,
+                self.total_duration, self.transcript.to_record() if self.transcript is not None else None,
+                self.extra]
+
+    @classmethod
+    def from_record(cls, record):
+        segments, subtitle_files, statistics, language, total_duration, transcript, extra = record
+        return cls(SegmentTable.from_record(segments), subtitle_files, statistics, language, total_duration,
+                   TranscriptData.from_record(transcript) if transcript is not None else None, extra)
+
+# Results key -> schema class per stage
+STAGE_SCHEMAS = {
+    'face_data': FaceData,
+    'speaker_data': SpeakerData,
+    'subtitle_data': SubtitleData
+}
+
+@dataclass
+class AnalysisResult:
+    """
+    Analysis results satu video. Stage yang tidak dijalankan / tidak disimpan
+    bernilai None; keys lain (language, output_files, metrics, ...) di extra.
+    """
+    __slots__ = ('moments', 'face_data', 'speaker_data', 'subtitle_data', 'extra')
+    moments: Optional[List[Moment]]
+    face_data: Optional[FaceData]
+    speaker_data: Optional[SpeakerData]
+    subtitle_data: Optional[SubtitleData]
+    extra: Dict
+
+    @classmethod
+    def from_results(cls, results):
+        """AnalysisResult dari results dict pipeline (moments boleh VideoMoment / dict)"""
+        moments = results.get('moments')
+        if moments is not None:
+            moments = [Moment.from_dict(m if isinstance(m, dict) else vars(m)) for m in moments]
+        stage_data = {
+            key: schema.from_dict(results[key]) if results.get(key) is not None else None
+            for key, schema in STAGE_SCHEMAS.items()
+        }
+        return cls(
+            moments=moments,
+            extra=_extra(results, ('moments',) + tuple(STAGE_SCHEMAS)),
+            **stage_data
+        )
+
+    def to_results(self):
+        """Results dict dalam format yang dipakai modules lain"""
+        results = {'moments': [m.to_dict() for m in self.moments] if self.moments is not None else None}
+        for key in STAGE_SCHEMAS:
+            data = getattr(self, key)
+            results[key] = data.to_dict() if data is not None else None
+        results.update(self.extra)
+        return results
+
+    def to_record(self):
+        record = [[m.to_record() for m in self.moments] if self.moments is not None else None]
+        for key in STAGE_SCHEMAS:
+            data = getattr(self, key)
+            record.append(data.to_record() if data is not None else None)
+        record.append(self.extra)
+        return record
+
+    @classmethod
+    def from_record(cls, record):
+        moments, face_data, speaker_data, subtitle_data, extra = record
+        return cls(
+            moments=[Moment.from_record(m) for m in moments] if moments is not None else None,
+            face_data=FaceData.from_record(face_data) if face_data is not None else None,
+            speaker_data=SpeakerData.from_record(speaker_data) if speaker_data is not None else None,
+            subtitle_data=SubtitleData.from_record(subtitle_data) if subtitle_data is not None else None,
+            extra=extra
+        )
+
+    def to_bytes(self):
+        """Serialize ke msgpack (arrays sebagai raw buffers)"""
+        if not MSGPACK_AVAILABLE:
+            raise RuntimeError("msgpack not installed (pip install msgpack)")
+        envelope = {'schema': SCHEMA_NAME, 'version': SCHEMA_VERSION, 'analysis': self.to_record()}
+        return msgpack.packb(envelope, default=_pack_default, use_bin_type=True)
+
+    @classmethod
+    def from_bytes(cls, data):
+        """Deserialize msgpack; record versi lama di-migrate ke SCHEMA_VERSION"""
+        if not MSGPACK_AVAILABLE:
+            raise RuntimeError("msgpack not installed (pip install msgpack)")
+        envelope = msgpack.unpackb(data, ext_hook=_unpack_ext, raw=False, strict_map_key=False)
+        if not isinstance(envelope, dict) or envelope.get('schema') != SCHEMA_NAME:
+            raise ValueError("Not a Smartclip analysis file")
+
+        version, record = envelope['version'], envelope['analysis']
+        if version > SCHEMA_VERSION:
+            raise ValueError(f"Analysis schema v{version} is newer than supported v{SCHEMA_VERSION}")
+        while version < SCHEMA_VERSION:
+            record = _MIGRATIONS[version](record)
+            version += 1
+        return cls.from_record(record)
+
+    def save(self, path):
+        """Simpan format binary (cache / transfer antar process)"""
+        data = self.to_bytes()
+        with open(path, 'wb') as f:
+            f.write(data)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            return cls.from_bytes(f.read())
+
+    def export_json(self, path, indent=2):
+        """Export JSON untuk dibaca manusia (bukan untuk cache)"""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'schema_version': SCHEMA_VERSION, **self.to_results()}, f,
+                      indent=indent, ensure_ascii=False, default=str)
+
+def _migrate_v1(record):
+    """
+    v1 -> v2: face tracks / speakers mendapat columns (v1 selalu meng-output
+    semua keys), SegmentTable mendapat word_extra (v1 tidak menyimpan word keys lain)
+    """
+    moments, face_data, speaker_data, subtitle_data, extra = record
+    if face_data is not None:
+        for track in face_data[0]:
+            track.insert(-1, list(FACE_TRACK_KEYS[1:]))
+    if speaker_data is not None:
+        for speaker in speaker_data[0]:
+            speaker.insert(-1, list(SPEAKER_KEYS[1:]))
+    if subtitle_data is not None:
+        subtitle_data[0].insert(6, {})
+        transcript = subtitle_data[5]
+        if transcript is not None:
+            transcript[2].insert(6, {})
+    return record
+
+# Version -> function(record) yang meng-upgrade record ke version + 1
+_MIGRATIONS = {1: _migrate_v1}
+
+def _pack_default(obj):
+    """msgpack default: NumPy arrays sebagai ExtType (header + raw buffer), scalars sebagai Python types"""
+    if isinstance(obj, np.ndarray):
+        array = np.ascontiguousarray(obj)
+        spec = array.dtype.descr if array.dtype.names else array.dtype.str
+        header = msgpack.packb([spec, list(array.shape)], use_bin_type=True)
+        return msgpack.ExtType(NDARRAY_EXT, len(header).to_bytes(4, 'little') + header + array.tobytes())
+    if isinstance(obj, np.generic):
+        return obj.item()
+    raise TypeError(f"Cannot serialize {type(obj).__name__}")
+
+def _unpack_ext(code, data):
+    """msgpack ext_hook: NumPy arrays sebagai view (zero-copy) ke buffer"""
+    if code != NDARRAY_EXT:
+        return msgpack.ExtType(code, data)
+    size = int.from_bytes(data[:4], 'little')
+    spec, shape = msgpack.unpackb(data[4:4 + size], raw=False)
+    dtype = np.dtype([tuple(field) for field in spec]) if isinstance(spec, list) else np.dtype(spec)
+    return np.frombuffer(data, dtype=dtype, offset=4 + size).reshape(shape)
+
+# Test function
+if __name__ == "__main__":
+    import sys
+    import time
+
+    if len(sys.argv) < 2:
+        print("Usage: python -m modules.analysis_schema <analysis_results.json | cache file>")
+        sys.exit(1)
+
+    path = Path(sys.argv[1])
+    if path.suffix == '.json':
+        with open(path, 'r', encoding='utf-8') as f:
+            results = json.load(f)
+        results.pop('schema_version', None)
+        analysis = AnalysisResult.from_results(results)
+        data = analysis.to_bytes()
+        print(f"JSON {path.stat().st_size / 1024:.0f} KB -> msgpack {len(data) / 1024:.0f} KB")
+    else:
+        data = path.read_bytes()
+
+    started = time.perf_counter()
+    results = AnalysisResult.from_bytes(data).to_results()
+    print(f"Loaded in {(time.perf_counter() - started) * 1000:.1f} ms: "
+          f"{len(results['moments'] or [])} moments, keys: {', '.join(results)}")
@@ -0,0 +1,455 @@
+#!/usr/bin/env python3
+"""
+ASR Backends Module
+Interface speech-to-text yang pluggable untuk SubtitleGenerator:
+- whisper: reference openai-whisper (PyTorch), paling cepat di GPU
+- faster-whisper: CTranslate2 dengan int8 quantization dan batched decoding,
+  jauh lebih cepat di node CPU-only
+Backend dipilih otomatis berdasarkan hardware dan package yang tersedia.
+"""
+
+import json
+import logging
+import os
+import subprocess
+import sys
+import time
+import types
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+
+from config import AI_SETTINGS
+from .capabilities import ASR_BACKENDS, get_capabilities
+from .memory_budget import get_memory_budget
+
+# Setup logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+try:
+    import whisper
+    WHISPER_AVAILABLE = True
+except ImportError:
+    WHISPER_AVAILABLE = False
+
+try:
+    from faster_whisper import WhisperModel
+    FASTER_WHISPER_AVAILABLE = True
+except ImportError:
+    FASTER_WHISPER_AVAILABLE = False
+
+# Semua backends memakai audio mono 16kHz float32
+SAMPLE_RATE = 16000
+
+# Whisper mel spectrogram: hop 160 sample @ 16kHz = 100 frames per detik audio
+WHISPER_FRAMES_PER_SECOND = 100
+
+# Language detection memakai satu encoder window (30 detik)
+LANGUAGE_WINDOW_SECONDS = 30
+
+def cuda_available():
+    """Check GPU tanpa mewajibkan PyTorch (CTranslate2 punya check sendiri)"""
+    try:
+        import torch
+        return torch.cuda.is_available()
+    except ImportError:
+        pass
+    try:
+        import ctranslate2
+        return ctranslate2.get_cuda_device_count() > 0
+    except (ImportError, AttributeError):
+        return False
+
+def load_audio(path, sample_rate=SAMPLE_RATE):
+    """Decode audio file ke mono float32 dengan ffmpeg (sama dengan whisper.load_audio)"""
+    cmd = [
+        'ffmpeg', '-nostdin', '-threads', '0', '-i', str(path),
+        '-f', 's16le', '-ac', '1', '-acodec', 'pcm_s16le', '-ar', str(sample_rate), '-'
+    ]
+    output = subprocess.run(cmd, capture_output=True, check=True).stdout
+    return np.frombuffer(output, np.int16).flatten().astype(np.float32) / 32768.0
+
+def _block_rms(audio, sample_rate=SAMPLE_RATE):
+    """RMS energy per blok 1 detik"""
+    n_blocks = len(audio) // sample_rate
+    if n_blocks == 0:
+        return np.zeros(0, dtype=np.float32)
+    blocks = audio[:n_blocks * sample_rate].reshape(n_blocks, sample_rate)
+    return np.sqrt(np.mean(blocks ** 2, axis=1))
+
+def sample_speech_regions(audio, count=3, region_seconds=LANGUAGE_WINDOW_SECONDS, sample_rate=SAMPLE_RATE):
+    """
+    Pilih beberapa window untuk language detection: audio dibagi `count` bagian
+    sama besar, dari tiap bagian diambil window dengan energy tertinggi
+    (hampir selalu berisi bicara, bukan intro musik atau silence)
+
+    Returns:
+        List of (start_sample, end_sample)
+    """
+    region_samples = int(region_seconds * sample_rate)
+    if len(audio) <= region_samples:
+        return [(0, len(audio))]
+
+    rms = _block_rms(audio, sample_rate)
+    window_blocks = int(region_seconds)
+    cumulative = np.concatenate([[0.0], np.cumsum(rms)])
+    window_energy = cumulative[window_blocks:] - cumulative[:-window_blocks]
+
+    regions = []
+    bounds = np.linspace(0, len(window_energy), count + 1).astype(int)
+    for lo, hi in zip(bounds[:-1], bounds[1:]):
+        if hi <= lo:
+            continue
+        start = (lo + int(np.argmax(window_energy[lo:hi]))) * sample_rate
+        regions.append((start, start + region_samples))
+    return regions
+
+def split_regions(audio, region_seconds, search_seconds=10, sample_rate=SAMPLE_RATE):
+    """
+    Potong audio panjang menjadi regions +-region_seconds, di titik paling sepi
+    dalam search_seconds terakhir tiap region (tidak memotong kata)
+
+    Returns:
+        List of (start_sample, end_sample)
+    """
+    rms = _block_rms(audio, sample_rate)
+    regions = []
+    start_block = 0
+    while (len(rms) - start_block) > region_seconds + search_seconds:
+        lo = start_block + int(region_seconds) - int(search_seconds)
+        hi = start_block + int(region_seconds)
+        cut = lo + int(np.argmin(rms[lo:hi]))
+        regions.append((start_block * sample_rate, cut * sample_rate))
+        start_block = cut
+    regions.append((start_block * sample_rate, len(audio)))
+    return regions
+
+def _best_language(probabilities):
+    """Language dengan total probability tertinggi: (language, confidence)"""
+    if not probabilities:
+        return None, 0.0
+    total = sum(probabilities.values())
+    language = max(probabilities, key=probabilities.get)
+    return language, probabilities[language] / total if total > 0 else 0.0
+
+@contextmanager
+def whisper_progress(progress_hook):
+    """
+    Teruskan progress bar internal Whisper (dalam mel frames) ke progress_hook
+    sebagai audio seconds yang sudah ditranskripsi
+    """
+    transcribe_module = sys.modules.get('whisper.transcribe')
+    if transcribe_module is None or not hasattr(transcribe_module, 'tqdm'):
+        yield
+        return
+
+    original_tqdm = transcribe_module.tqdm
+
+    class ProgressTqdm(original_tqdm.tqdm):
+        def update(self, n=1):
+            super().update(n)
+            progress_hook(n / WHISPER_FRAMES_PER_SECOND)
+
+    transcribe_module.tqdm = types.SimpleNamespace(tqdm=ProgressTqdm)
+    try:
+        yield
+    finally:
+        transcribe_module.tqdm = original_tqdm
+
+class ASRBackend(ABC):
+    """
+    Base class untuk ASR backends
+
+    transcribe() mengembalikan dict dengan format hasil whisper:
+    {'text', 'language', 'segments': [{'start', 'end', 'text', 'avg_logprob', 'words'}]}
+    """
+    name = 'base'
+
+    def __init__(self, model_size='base', device=None):
+        self.model_size = model_size
+        self.device = device or ('cuda' if cuda_available() else 'cpu')
+        self.model = None
+
+    @property
+    def variant(self):
+        """Identifier untuk throughput history / benchmark"""
+        return f"{self.name}-{self.model_size}"
+
+    @abstractmethod
+    def load(self):
+        """Load model; mengembalikan self"""
+
+    @abstractmethod
+    def transcribe(self, audio, language=None, word_timestamps=True, progress_hook=None):
+        """Transcribe audio mono 16kHz float32"""
+
+    @abstractmethod
+    def language_probabilities(self, clip):
+        """Probability per language untuk satu clip (maksimal 30 detik)"""
+
+    def detect_language(self, clips):
+        """
+        Detect language dari beberapa clips (satu encoder pass per clip),
+        probabilities dijumlahkan antar clips
+
+        Returns:
+            Tuple (language, confidence)
+        """
+        totals = {}
+        for clip in clips:
+            for language, probability in self.language_probabilities(clip).items():
+                totals[language] = totals.get(language, 0.0) + probability
+        return _best_language(totals)
+
+class WhisperBackend(ASRBackend):
+    """Reference openai-whisper (PyTorch)"""
+    name = 'whisper'
+
+    def load(self):
+        if self.model is None:
+            logger.info(f"Loading Whisper model ({self.model_size}) on {self.device}...")
+            self.model = whisper.load_model(self.model_size, device=self.device)
+        return self
+
+    def transcribe(self, audio, language=None, word_timestamps=True, progress_hook=None):
+        self.load()
+        options = {
+            'task': 'transcribe',
+            'language': language,
+            'word_timestamps': word_timestamps,
+            'verbose': False
+        }
+
+        if progress_hook:
+            with whisper_progress(progress_hook):
+                return self.model.transcribe(audio, **options)
+        return self.model.transcribe(audio, **options)
+
+    def language_probabilities(self, clip):
+        self.load()
+        n_mels = getattr(self.model.dims, 'n_mels', 80)
+        mel = whisper.log_mel_spectrogram(whisper.pad_or_trim(clip), n_mels=n_mels).to(self.model.device)
+        _, probabilities = self.model.detect_language(mel)
+        return probabilities
+
+class FasterWhisperBackend(ASRBackend):
+    """CTranslate2 (faster-whisper): int8 di CPU, float16 di GPU, batched decoding"""
+    name = 'faster-whisper'
+
+    def __init__(self, model_size='base', device=None, compute_type='auto', batch_size=8):
+        super().__init__(model_size, device)
+        if compute_type == 'auto':
+            compute_type = 'float16' if self.device == 'cuda' else 'int8'
+        self.compute_type = compute_type
+        self.batch_size = batch_size
+        self.pipeline = None
+
+    @property
+    def variant(self):
+        return f"{self.name}-{self.model_size}-{self.compute_type}"
+
+    def load(self):
+        if self.model is None:
+            logger.info(f"Loading faster-whisper model ({self.model_size}, {self.compute_type}) on {self.device}...")
+            self.model = WhisperModel(
+                self.model_size,
+                device=self.device,
+                compute_type=self.compute_type,
+                cpu_threads=os.cpu_count() or 4
+            )
+            # Batched decoding (beberapa window 30s sekaligus) tersedia sejak faster-whisper 1.0
+            try:
+                from faster_whisper import BatchedInferencePipeline
+                self.pipeline = BatchedInferencePipeline(model=self.model)
+            except ImportError:
+                self.pipeline = None
+        return self
+
+    def transcribe(self, audio, language=None, word_timestamps=True, progress_hook=None):
+        self.load()
+
+        # Batch size turun otomatis saat RAM mendekati memory budget
+        batch_size = get_memory_budget().batch_size(self.batch_size)
+        if self.pipeline is not None and batch_size > 1:
+            segments, info = self.pipeline.transcribe(
+                audio, language=language, word_timestamps=word_timestamps, batch_size=batch_size
+            )
+        else:
+            segments, info = self.model.transcribe(
+                audio, language=language, word_timestamps=word_timestamps
+            )
+
+        # Segments adalah generator: decoding terjadi saat di-iterate
+        result_segments = []
+        position = 0.0
+        for segment in segments:
+            result_segments.append({
+                'start': segment.start,
+                'end': segment.end,
+                'text': segment.text,
+                'avg_logprob': segment.avg_logprob,
+                'words': [
+                    {'word': w.word, 'start': w.start, 'end': w.end, 'probability': w.probability}
+                    for w in (segment.words or [])
+                ]
+            })
+            if progress_hook and segment.end > position:
+                progress_hook(segment.end - position)
+                position = segment.end
+
+        return {
+            'text': ''.join(s['text'] for s in result_segments),
+            'language': info.language,
+            'segments': result_segments
+        }
+
+    def language_probabilities(self, clip):
+        self.load()
+        clip = clip[:LANGUAGE_WINDOW_SECONDS * SAMPLE_RATE]
+        # Segments generator tidak di-iterate: hanya encoder + language detection yang jalan
+        _, info = self.model.transcribe(clip, language=None)
+        return dict(info.all_language_probs or [(info.language, info.language_probability)])
+
+BACKENDS = {
+    'whisper': WhisperBackend,
+    'faster-whisper': FasterWhisperBackend
+}
+
+def available_backends():
+    """Nama backends yang package-nya terinstall"""
+    available = []
+    if FASTER_WHISPER_AVAILABLE:
+        available.append('faster-whisper')
+    if WHISPER_AVAILABLE:
+        available.append('whisper')
+    return available
+
+def load_benchmark(path=None):
+    """Hasil benchmark tersimpan: {device: [{'backend', 'variant', 'rtf', ...}]}"""
+    path = Path(path or AI_SETTINGS['asr_benchmark_path'])
+    try:
+        if path.exists():
+            with open(path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+    except Exception as e:
+        logger.warning(f"Could not load ASR benchmark: {e}")
+    return {}
+
+def save_benchmark(results, path=None):
+    """Simpan hasil benchmark_backends per device (hasil lama device tersebut diganti)"""
+    path = Path(path or AI_SETTINGS['asr_benchmark_path'])
+    entries = load_benchmark(path)
+    for device in {row['device'] for row in results}:
+        entries[device] = [row for row in results if row['device'] == device]
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(entries, f, indent=2)
+    except Exception as e:
+        logger.warning(f"Could not save ASR benchmark: {e}")
+
+def select_backend(preference='auto', device=None):
+    """
+    Pilih backend: preference eksplisit jika tersedia. Untuk 'auto' backend
+    dipilih per device (dari capabilities): backend dengan RTF terendah di
+    benchmark tersimpan untuk device ini, atau urutan default (whisper PyTorch
+    di GPU, faster-whisper int8 di CPU)
+    """
+    available = available_backends()
+    if not available:
+        raise RuntimeError("No ASR backend installed (pip install faster-whisper atau openai-whisper)")
+
+    if preference != 'auto':
+        if preference in available:
+            return preference
+        logger.warning(f"ASR backend '{preference}' not available, selecting automatically")
+
+    device = device or ('cuda' if get_capabilities().cuda else 'cpu')
+
+    benchmarked = [row for row in load_benchmark().get(device, []) if row['backend'] in available]
+    if benchmarked:
+        fastest = min(benchmarked, key=lambda row: row['rtf'])
+        logger.info(f"ASR backend {fastest['backend']} on {device} (benchmark RTF {fastest['rtf']:.3f})")
+        return fastest['backend']
+
+    order = [name for _, name in ASR_BACKENDS['cuda' if device == 'cuda' else 'cpu']]
+    return next(name for name in order if name in available)
+
+def get_asr_backend(name=None, model_size=None, device=None):
+    """
+    Create ASR backend sesuai AI_SETTINGS (asr_backend, whisper_model,
+    asr_compute_type, asr_batch_size)
+    """
+    name = select_backend(name or AI_SETTINGS.get('asr_backend', 'auto'), device)
+    model_size = model_size or AI_SETTINGS.get('whisper_model', 'base')
+
+    if name == 'faster-whisper':
+        return FasterWhisperBackend(
+            model_size, device,
+            compute_type=AI_SETTINGS.get('asr_compute_type', 'auto'),
+            batch_size=AI_SETTINGS.get('asr_batch_size', 8)
+        )
+    return BACKENDS[name](model_size, device)
+
+def benchmark_backends(audio_path, model_size=None, backends=None):
+    """
+    Ukur real-time factor (processing time / audio duration) per backend
+
+    Returns:
+        List of dict (backend, variant, device, load_time, transcribe_time, rtf);
+        simpan dengan save_benchmark() agar dipakai select_backend('auto')
+    """
+    audio = load_audio(audio_path)
+    audio_duration = len(audio) / SAMPLE_RATE
+    results = []
+
+    for name in backends or available_backends():
+        try:
+            backend = get_asr_backend(name, model_size)
+
+            start = time.perf_counter()
+            backend.load()
+            load_time = time.perf_counter() - start
+
+            start = time.perf_counter()
+            backend.transcribe(audio)
+            transcribe_time = time.perf_counter() - start
+
+            results.append({
+                'backend': name,
+                'variant': backend.variant,
+                'device': backend.device,
+                'audio_seconds': audio_duration,
+                'load_time': load_time,
+                'transcribe_time': transcribe_time,
+                'rtf': transcribe_time / max(audio_duration, 1e-6)
+            })
+        except Exception as e:
+            logger.error(f"Benchmark failed for {name}: {e}")
+
+    return results
+
+# Test function / benchmark
+if __name__ == "__main__":
+    print(f"Available ASR backends: {available_backends()}")
+    try:
+        print(f"Auto-selected: {select_backend()} (cuda={cuda_available()})")
+    except RuntimeError as e:
+        print(e)
+        sys.exit(1)
+
+    if len(sys.argv) > 1:
+        model = sys.argv[2] if len(sys.argv) > 2 else None
+        print(f"\nBenchmarking {sys.argv[1]}...")
+        print(f"{'variant':<32} {'device':<6} {'load':>8} {'transcribe':>11} {'RTF':>7}")
+        results = benchmark_backends(sys.argv[1], model)
+        for row in results:
+            print(f"{row['variant']:<32} {row['device']:<6} {row['load_time']:>7.1f}s "
+                  f"{row['transcribe_time']:>10.1f}s {row['rtf']:>7.3f}")
+        # Dipakai select_backend('auto') untuk device ini
+        save_benchmark(results)
+    else:
+        print("Usage: python -m modules.asr_backends <audio_or_video_file> [model_size]")
@@ -0,0 +1,270 @@
+#!/usr/bin/env python3
+"""
+Audio Cache Module
+Audio di-extract sekali per video dengan ffmpeg ke raw PCM (satu file per
+sample rate) di temp dir, lalu dibaca semua stage sebagai np.memmap views:
+ASR dan diarization di 16kHz, moment scoring di VIDEO_SETTINGS['audio_sample_rate'].
+Analysis memakai mono; audio enhancement memakai channel layout source
+(channels=None) agar output tetap stereo / surround.
+Tidak ada decode atau resample ulang per module.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import subprocess
+import threading
+import weakref
+from pathlib import Path
+
+import numpy as np
+
+from config import TEMP_DIR, VIDEO_SETTINGS
+
+# Setup logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Sample rate untuk Whisper, speaker embeddings dan emotion model
+SPEECH_SAMPLE_RATE = 16000
+
+# dtype numpy -> format raw PCM ffmpeg
+PCM_FORMATS = {
+    'float32': 'f32le',
+    'int16': 's16le'
+}
+
+def _remove_pcm(path, deferred=None):
+    """Unlink PCM file (dan cache dir jika sudah kosong)"""
+    if deferred is not None:
+        deferred.discard(path)
+    try:
+        path.unlink(missing_ok=True)
+    except OSError as e:
+        logger.warning(f"Could not delete cached audio {path}: {e}")
+        return
+    try:
+        path.parent.rmdir()
+    except OSError:
+        pass  # Masih ada PCM lain di cache dir
+
+class AudioCache:
+    """Raw PCM per sample rate untuk satu video file"""
+
+    def __init__(self, video_path, cache_dir=None):
+        self.video_path = str(video_path)
+        self.cache_dir = Path(cache_dir) if cache_dir else TEMP_DIR / "audio" / self.cache_key(video_path)
+        self._lock = threading.Lock()
+        self._views = {}
+        self._mapped = {}  # (sample_rate, dtype, channels) -> weakref ke memmap yang dibagikan ke consumers
+        self._deferred = set()  # PCM paths yang menunggu array terakhir dilepas
+        self._layout = None
+        self.has_audio = True
+
+    @staticmethod
+    def cache_key(video_path):
+        """Key dari path, size dan mtime: file berubah = cache baru"""
+        path = Path(video_path).resolve()
+        stat = path.stat()
+        return hashlib.sha1(f"{path}:{stat.st_size}:{stat.st_mtime}".encode('utf-8')).hexdigest()[:16]
+
+    def pcm_path(self, sample_rate, dtype='float32', channels=1):
+        """PCM file: mono (channels=1) atau channel layout source (channels=None)"""
+        suffix = '' if channels == 1 else '_source'
+        return self.cache_dir / f"{int(sample_rate)}_{dtype}{suffix}.pcm"
+
+    def source_layout(self):
+        """(channels, channel_layout) audio stream pertama, dari ffprobe (sekali per cache)"""
+        if self._layout is None:
+            channels, layout = 1, 'mono'
+            try:
+                result = subprocess.run(
+                    ['ffprobe', '-v', 'error', '-select_streams', 'a:0',
+                     '-show_entries', 'stream=channels,channel_layout', '-of', 'json', self.video_path],
+                    capture_output=True, text=True, timeout=30
+                )
+                streams = json.loads(result.stdout or '{}').get('streams') or [{}]
+                channels = int(streams[0].get('channels') or 1)
+                layout = streams[0].get('channel_layout') or ('stereo' if channels == 2 else f"{channels}c")
+            except Exception as e:
+                logger.warning(f"Could not probe audio layout of {self.video_path}: {e}")
+            self._layout = (channels, layout)
+        return self._layout
+
+    def _channel_count(self, channels):
+        return self.source_layout()[0] if channels is None else channels
+
+    def missing_bytes(self, sample_rates, duration, dtype='float32', source_rates=()):
+        """Estimasi ukuran PCM yang belum di-extract (untuk reserve temp quota)"""
+        itemsize = np.dtype(dtype).itemsize
+        total = 0
+        for channels, rates in ((1, sample_rates), (None, source_rates)):
+            total += sum(
+                int(duration * rate * itemsize * self._channel_count(channels))
+                for rate in set(rates) if not self.pcm_path(rate, dtype, channels).exists()
+            )
+        return total
+
+    def prepare(self, sample_rates, dtype='float32', source_rates=()):
+        """
+        Extract semua sample rates yang belum ada dalam satu ffmpeg decode
+        (satu output per sample rate): mono untuk sample_rates, channel
+        layout source untuk source_rates
+        """
+        with self._lock:
+            missing = [
+                (rate, channels)
+                for channels, rates in ((1, sample_rates), (None, source_rates))
+                for rate in sorted(set(rates)) if not self.pcm_path(rate, dtype, channels).exists()
+            ]
+            if not missing or not self.has_audio:
+                return self.has_audio
+
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            cmd = ['ffmpeg', '-nostdin', '-v', 'error', '-y', '-i', self.video_path]
+            temp_paths = []
+            for rate, channels in missing:
+                temp_path = self.pcm_path(rate, dtype, channels).with_suffix('.tmp')
+                temp_paths.append(temp_path)
+                cmd += ['-map', '0:a:0', '-vn'] + (['-ac', '1'] if channels == 1 else [])
+                cmd += ['-ar', str(rate), '-f', PCM_FORMATS[dtype], '-acodec', f"pcm_{PCM_FORMATS[dtype]}", str(temp_path)]
+
+            result = subprocess.run(cmd, capture_output=True)
+            if result.returncode != 0:
+                for temp_path in temp_paths:
+                    temp_path.unlink(missing_ok=True)
+                # Stream audio tidak ada: bukan error, stage audio di-skip
+                if b'matches no streams' in result.stderr:
+                    logger.warning(f"No audio track found in {self.video_path}")
+                    self.has_audio = False
+                    return False
+                raise RuntimeError(f"ffmpeg audio extraction failed: {result.stderr.decode(errors='replace')[-500:]}")
+
+            for (rate, channels), temp_path in zip(missing, temp_paths):
+                os.replace(temp_path, self.pcm_path(rate, dtype, channels))
+            logger.info(f"Extracted audio at {[rate for rate, _ in missing]} Hz to {self.cache_dir}")
+            return True
+
+    def get(self, sample_rate, dtype='float32', channels=1):
+        """
+        Audio sebagai np.memmap (copy-on-write: bisa ditulis consumer tanpa
+        mengubah cache): mono 1-D, atau (samples, channels) untuk channel
+        layout source (channels=None). None jika video tidak punya audio.
+        """
+        key = (int(sample_rate), dtype, channels)
+        view = self._views.get(key)
+        if view is not None:
+            return view
+
+        if channels == 1:
+            prepared = self.prepare([sample_rate], dtype)
+        else:
+            prepared = self.prepare([], dtype, source_rates=[sample_rate])
+        if not prepared:
+            return None
+
+        path = self.pcm_path(sample_rate, dtype, channels)
+        if path.stat().st_size == 0:
+            self.has_audio = False
+            return None
+
+        mapped = np.memmap(path, dtype=dtype, mode='c')
+        # Reshape (interleaved PCM) tetap view dari memmap yang sama
+        view = mapped if channels == 1 else mapped.reshape(-1, self._channel_count(channels))
+        with self._lock:
+            self._views[key] = view
+            self._mapped[key] = weakref.ref(mapped)
+        return view
+
+    def duration(self, sample_rate=SPEECH_SAMPLE_RATE):
+        audio = self.get(sample_rate)
+        return len(audio) / sample_rate if audio is not None else 0.0
+
+    def drop(self, sample_rate, dtype='float32', channels=1):
+        """Lepas view cache satu sample rate (arrays yang dipegang consumers tetap valid)"""
+        with self._lock:
+            self._views.pop((int(sample_rate), dtype, channels), None)
+
+    def unlink(self, sample_rate, dtype='float32', channels=1):
+        """
+        Hapus PCM file satu sample rate (dipanggil TempManager setelah consumer
+        terakhir release). Selama masih ada array yang me-map file (view atau
+        slice-nya di stage lain) unlink ditunda sampai array tersebut
+        di-garbage-collect: file yang masih di-map tidak bisa dihapus di Windows.
+        """
+        key = (int(sample_rate), dtype, channels)
+        path = self.pcm_path(sample_rate, dtype, channels)
+        with self._lock:
+            self._views.pop(key, None)
+            ref = self._mapped.pop(key, None)
+            view = ref() if ref is not None else None
+            if view is not None:
+                self._deferred.add(path)
+                weakref.finalize(view, _remove_pcm, path, self._deferred)
+                logger.debug(f"{path.name} still mapped, deleting after last consumer drops it")
+                return
+        _remove_pcm(path)
+
+    def cleanup(self):
+        """Hapus semua PCM files; file yang masih di-map dihapus setelah array terakhir dilepas"""
+        with self._lock:
+            self._views.clear()
+            keys = list(self._mapped)
+        for sample_rate, dtype, channels in keys:
+            self.unlink(sample_rate, dtype, channels)
+
+        # PCM yang tidak pernah di-map dan sisa .tmp
+        if self.cache_dir.exists():
+            for path in self.cache_dir.iterdir():
+                if path not in self._deferred:
+                    _remove_pcm(path)
+
+# Satu cache per video file, di-share antar stages
+_caches = {}
+_caches_lock = threading.Lock()
+
+def get_audio_cache(video_path):
+    """Get shared AudioCache untuk video file"""
+    key = AudioCache.cache_key(video_path)
+    with _caches_lock:
+        cache = _caches.get(key)
+        if cache is None:
+            cache = AudioCache(video_path)
+            _caches[key] = cache
+        return cache
+
+def release_audio_cache(video_path):
+    """Cleanup cache setelah job selesai"""
+    try:
+        key = AudioCache.cache_key(video_path)
+    except OSError:
+        return
+    with _caches_lock:
+        cache = _caches.pop(key, None)
+    if cache is not None:
+        cache.cleanup()
+
+def required_sample_rates():
+    """Sample rates yang dipakai stages (speech models + moment scoring)"""
+    return [SPEECH_SAMPLE_RATE, VIDEO_SETTINGS['audio_sample_rate']]
+
+# Test function
+if __name__ == "__main__":
+    import sys
+    import time
+
+    if len(sys.argv) < 2:
+        print("Usage: python -m modules.audio_cache <video_file>")
+        sys.exit(1)
+
+    cache = get_audio_cache(sys.argv[1])
+    start = time.perf_counter()
+    cache.prepare(required_sample_rates())
+    print(f"Extraction: {time.perf_counter() - start:.2f}s")
+
+    for rate in required_sample_rates():
+        audio = cache.get(rate)
+        if audio is not None:
+            print(f"{rate} Hz: {len(audio)} samples ({len(audio) / rate:.1f}s), rms={np.sqrt(np.mean(audio ** 2)):.4f}")
+    release_audio_cache(sys.argv[1])
@@ -0,0 +1,352 @@
+#!/usr/bin/env python3
+"""
+Batch Scheduler Module
+Proses banyak video sekaligus dengan stages dari semua jobs dijadwalkan ke
+resource pools terpisah (prepare, vision, asr, encode), masing-masing dengan
+concurrency limit sendiri. Stage analysis satu job tidak saling bergantung,
+jadi job yang ASR-heavy (talk show panjang) dan job yang encode-heavy
+(banyak clips) berjalan bersamaan dan CPU tetap penuh.
+"""
+
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from config import BATCH_SETTINGS, SUPPORTED_FORMATS
+from .eta_estimator import ETAEstimator
+from .job_queue import JobCancelled
+from .pipeline import DEFAULT_OPTIONS, STAGE_TYPES, PipelineJob, get_pipeline
+
+# Setup logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Pool untuk start_job (media index lookup + audio extraction)
+PREPARE_POOL = 'prepare'
+
+@dataclass
+class BatchJob:
+    """Satu video dalam batch"""
+    video_path: str
+    options: dict
+    status: str = 'pending'  # pending, active, done, failed, cancelled
+    stage_seconds: Dict[str, float] = field(default_factory=dict)  # perkiraan per stage
+    profile: Dict[str, float] = field(default_factory=dict)  # perkiraan detik per pool
+    job: Optional[PipelineJob] = None
+    running: set = field(default_factory=set)
+    editing_queued: bool = False
+    remaining: Dict[str, float] = field(default_factory=dict)  # profile yang belum dikerjakan
+    exception: Optional[BaseException] = field(default=None, repr=False)
+    error: Optional[str] = None
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    @property
+    def results(self):
+        return self.job.results if self.job else None
+
+@dataclass
+class _Task:
+    batch_job: BatchJob
+    pool: str
+    entry: Optional[tuple] = None  # Entry pipeline STAGES; None = prepare
+    seconds: float = 0.0
+
+    @property
+    def stage(self):
+        return self.entry[0] if self.entry else None
+
+class BatchScheduler:
+    def __init__(self, pools=None, max_active_jobs=None, pipeline=None, on_event=None):
+        """
+        Initialize batch scheduler
+
+        Args:
+            pools: Dict pool -> jumlah workers (default BATCH_SETTINGS['pools'])
+            max_active_jobs: Jobs yang boleh aktif bersamaan (audio cache, previews di memory)
+            pipeline: ProcessingPipeline (default: shared get_pipeline()); stage
+                limits pipeline di-set sesuai pools
+            on_event: Function(batch_job, event, stage) untuk progress ('start', 'stage',
+                'stage_done', 'done', 'failed', 'cancelled')
+        """
+        self.pools = {pool: max(1, int(size)) for pool, size in (pools or BATCH_SETTINGS['pools']).items()}
+        for pool in set(STAGE_TYPES.values()) | {PREPARE_POOL}:
+            self.pools.setdefault(pool, 1)
+        self.max_active_jobs = max(1, int(max_active_jobs or BATCH_SETTINGS['max_active_jobs']))
+        self.pipeline = pipeline or get_pipeline()
+        self.pipeline.set_stage_limits({pool: size for pool, size in self.pools.items() if pool != PREPARE_POOL})
+        self.on_event = on_event
+        self.jobs: List[BatchJob] = []
+
+        self._cond = threading.Condition()
+        self._ready = {pool: [] for pool in self.pools}
+        self._load = {pool: 0.0 for pool in self.pools}  # Sisa perkiraan detik jobs aktif per pool
+        self._running_stages = set()  # Satu module instance per stage (lihat pipeline._stage_locks)
+        self._active = 0
+        self._started = False  # Admission menunggu run(), supaya packing melihat semua jobs
+        self._cancelled = threading.Event()
+
+    def submit(self, video_path, options=None):
+        """Tambah video ke batch (sebelum atau selama run)"""
+        options = {**DEFAULT_OPTIONS, **(options or {})}
+        batch_job = BatchJob(video_path=str(video_path), options=options)
+        try:
+            duration, plans = self.pipeline.plan_stages(video_path, options)
+            estimator = ETAEstimator()
+            estimator.plan(duration, plans)
+            batch_job.stage_seconds = estimator.stage_seconds()
+        except Exception as e:
+            logger.warning(f"Could not estimate {Path(video_path).name}: {e}")
+        for stage, seconds in batch_job.stage_seconds.items():
+            pool = STAGE_TYPES[stage]
+            batch_job.profile[pool] = batch_job.profile.get(pool, 0.0) + seconds
+
+        with self._cond:
+            self.jobs.append(batch_job)
+            self._admit()
+            self._cond.notify_all()
+        return batch_job
+
+    def submit_folder(self, folder, options=None, output_dir=None, recursive=False):
+        """
+        Submit semua video di folder (SUPPORTED_FORMATS['input'])
+
+        Args:
+            output_dir: Jika diisi, output tiap video ke output_dir/<nama video>
+        """
+        pattern = '**/*' if recursive else '*'
+        paths = sorted(
+            p for p in Path(folder).glob(pattern)
+            if p.is_file() and p.suffix.lower() in SUPPORTED_FORMATS['input']
+        )
+        jobs = []
+        for path in paths:
+            job_options = dict(options or {})
+            if output_dir:
+                job_options['output_dir'] = str(Path(output_dir) / path.stem)
+            jobs.append(self.submit(path, job_options))
+        return jobs
+
+    def cancel(self):
+        """Cancel batch: stage yang berjalan selesai dulu, sisanya tidak dimulai"""
+        self._cancelled.set()
+        with self._cond:
+            for batch_job in self.jobs:
+                if batch_job.status == 'pending':
+                    batch_job.status = 'cancelled'
+            self._cond.notify_all()
+
+    def run(self):
+        """
+        Jalankan semua jobs sampai selesai (blocking). Ctrl+C = cancel()
+
+        Returns:
+            List of BatchJob
+        """
+        workers = []
+        for pool, size in self.pools.items():
+            for i in range(size):
+                thread = threading.Thread(target=self._worker_loop, args=(pool,), name=f"batch-{pool}-{i}", daemon=True)
+                thread.start()
+                workers.append(thread)
+
+        with self._cond:
+            self._started = True
+            self._admit()
+            self._cond.notify_all()
+        try:
+            for thread in workers:
+                thread.join()
+        except KeyboardInterrupt:
+            logger.info("Cancelling batch, waiting for running stages...")
+            self.cancel()
+            for thread in workers:
+                thread.join()
+        return self.jobs
+
+    def _emit(self, batch_job, event, stage=None):
+        if self.on_event:
+            try:
+                self.on_event(batch_job, event, stage)
+            except Exception as e:
+                logger.warning(f"Batch event callback failed: {e}")
+
+    def _finished(self):
+        return self._active == 0 and not any(job.status == 'pending' for job in self.jobs)
+
+    def _admit(self):
+        """
+        Aktifkan pending jobs sampai max_active_jobs. Job berikutnya dipilih
+        supaya pool yang paling penuh (sisa detik / workers) serendah mungkin,
+        i.e. job ASR-heavy dipasangkan dengan job vision / encode-heavy.
+        """
+        while self._started and self._active < self.max_active_jobs and not self._cancelled.is_set():
+            pending = [job for job in self.jobs if job.status == 'pending']
+            if not pending:
+                return
+
+            def bottleneck(job):
+                return max(
+                    (self._load[pool] + job.profile.get(pool, 0.0)) / self.pools[pool]
+                    for pool in self.pools
+                )
+            batch_job = min(pending, key=bottleneck)
+
+            batch_job.status = 'active'
+            batch_job.started_at = time.time()
+            batch_job.job = PipelineJob(
+                video_path=batch_job.video_path, options=batch_job.options,
+                cancel_check=self._cancelled.is_set,
+                status_callback=lambda message, job=batch_job: logger.info(f"{Path(job.video_path).name}: {message}")
+            )
+            batch_job.remaining = dict(batch_job.profile)
+            for pool, seconds in batch_job.profile.items():
+                self._load[pool] += seconds
+            self._active += 1
+            self._ready[PREPARE_POOL].append(_Task(batch_job, PREPARE_POOL))
+            self._emit(batch_job, 'start')
+
+    def _release_load(self, batch_job, pool, seconds):
+        """Perkiraan detik yang sudah dikerjakan / tidak jadi dikerjakan"""
+        seconds = min(seconds, batch_job.remaining.get(pool, 0.0))
+        batch_job.remaining[pool] = batch_job.remaining.get(pool, 0.0) - seconds
+        self._load[pool] = max(0.0, self._load[pool] - seconds)
+
+    def _enqueue_stages(self, batch_job, entries):
+        for entry in entries:
+            pool = STAGE_TYPES[entry[0]]
+            self._ready[pool].append(_Task(batch_job, pool, entry, batch_job.stage_seconds.get(entry[0], 0.0)))
+            batch_job.running.add(entry[0])
+
+    def _next_task(self, pool):
+        """Task terpanjang (LPT) di pool ini yang module instance-nya tidak sedang dipakai"""
+        candidates = [task for task in self._ready[pool] if task.stage not in self._running_stages]
+        if not candidates:
+            return None
+        task = max(candidates, key=lambda t: (t.seconds, -self.jobs.index(t.batch_job)))
+        self._ready[pool].remove(task)
+        if task.stage:
+            self._running_stages.add(task.stage)
+        return task
+
+    def _worker_loop(self, pool):
+        while True:
+            with self._cond:
+                task = self._next_task(pool)
+                while task is None:
+                    if self._finished():
+                        self._cond.notify_all()
+                        return
+                    self._cond.wait()
+                    task = self._next_task(pool)
+
+            try:
+                if task.entry is None:
+                    self._run_prepare(task)
+                else:
+                    self._run_stage(task)
+            finally:
+                with self._cond:
+                    self._running_stages.discard(task.stage)
+                    self._admit()
+                    self._cond.notify_all()
+
+    def _run_prepare(self, task):
+        batch_job = task.batch_job
+        try:
+            self.pipeline.start_job(batch_job.job)
+        except Exception as e:
+            self._close(batch_job, e)
+            return
+
+        # Stages analysis semua boleh jalan bersamaan, video_editing setelahnya
+        analysis = [entry for entry in batch_job.job.stages if entry[0] != 'video_editing']
+        with self._cond:
+            # Stages yang dipakai ulang dari media index tidak memakai pool
+            for stage, seconds in batch_job.stage_seconds.items():
+                if stage not in {entry[0] for entry in batch_job.job.stages}:
+                    self._release_load(batch_job, STAGE_TYPES[stage], seconds)
+            if analysis:
+                self._enqueue_stages(batch_job, analysis)
+            else:
+                self._enqueue_editing(batch_job)
+            # Dicek di dalam lock: setelah lock dilepas stages bisa langsung
+            # selesai dan _run_stage yang menutup job
+            done = not batch_job.running
+        if done:
+            self._close(batch_job)
+
+    def _enqueue_editing(self, batch_job):
+        editing = [entry for entry in batch_job.job.stages if entry[0] == 'video_editing']
+        batch_job.editing_queued = True
+        self._enqueue_stages(batch_job, editing)
+
+    def _run_stage(self, task):
+        batch_job, stage = task.batch_job, task.stage
+        error = None
+        self._emit(batch_job, 'stage', stage)
+        try:
+            self.pipeline.run_stage(batch_job.job, task.entry)
+        except Exception as e:
+            error = e
+
+        with self._cond:
+            self._release_load(batch_job, task.pool, task.seconds)
+            batch_job.running.discard(stage)
+            if error is not None and batch_job.exception is None:
+                # Stage lain job ini yang sudah berjalan dibiarkan selesai
+                batch_job.exception = error
+            if batch_job.exception is None and not batch_job.running and not batch_job.editing_queued:
+                self._enqueue_editing(batch_job)
+            done = not batch_job.running
+        self._emit(batch_job, 'stage_done', stage)
+        if done:
+            self._close(batch_job, batch_job.exception)
+
+    def _close(self, batch_job, error=None):
+        """Finish (index) dan close pipeline job, lalu bebaskan slot active job"""
+        try:
+            if error is None:
+                self.pipeline.finish_job(batch_job.job)
+        except Exception as e:
+            error = e
+        finally:
+            self.pipeline.close_job(batch_job.job)
+
+        if isinstance(error, JobCancelled):
+            batch_job.status = 'cancelled'
+        elif error is not None:
+            batch_job.status = 'failed'
+            batch_job.error = str(error)
+            logger.error(f"Batch job {Path(batch_job.video_path).name} failed: {error}")
+        else:
+            batch_job.status = 'done'
+        batch_job.finished_at = time.time()
+
+        with self._cond:
+            # Sisa perkiraan job ini (stage gagal / cancelled) dilepas
+            for pool in list(batch_job.remaining):
+                self._release_load(batch_job, pool, batch_job.remaining[pool])
+            for pool in self.pools:
+                self._ready[pool] = [t for t in self._ready[pool] if t.batch_job is not batch_job]
+            self._active -= 1
+            self._admit()
+            self._cond.notify_all()
+        self._emit(batch_job, batch_job.status)
+
+# Test function
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) < 2:
+        print("Usage: python -m modules.batch_scheduler <folder>")
+        sys.exit(1)
+
+    scheduler = BatchScheduler(on_event=lambda job, event, stage: print(f"{Path(job.video_path).name}: {event} {stage or ''}"))
+    for batch_job in scheduler.submit_folder(sys.argv[1]):
+        print(f"{Path(batch_job.video_path).name}: " + ', '.join(f"{pool} ~{s:.0f}s" for pool, s in batch_job.profile.items()))
+    for batch_job in scheduler.run():
+        print(f"{Path(batch_job.video_path).name}: {batch_job.status}")
@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Capabilities Module
+Deteksi sekali per environment: Python packages, ffmpeg encoders / filters,
+CPU features (AVX2, jumlah core), GPU dan backend terbaik. Hasil disimpan di
+JSON dengan key environment fingerprint (interpreter, site-packages, ffmpeg
+binary), sehingga keputusan startup (full vs lite, ASR backend, video encoder)
+dibaca dari cache dalam milliseconds tanpa import torch / whisper.
+"""
+
+import hashlib
+import importlib.util
+import json
+import logging
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from config import CAPABILITY_SETTINGS
+
+# Setup logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Import name -> display name untuk packages yang dideteksi
+PACKAGES = {
+    'torch': 'PyTorch (Deep Learning)',
+    'whisper': 'OpenAI Whisper (Speech Recognition)',
+    'faster_whisper': 'faster-whisper (Speech Recognition)',
+    'face_recognition': 'Face Recognition',
+    'cv2': 'OpenCV (Computer Vision)',
+    'transformers': 'Transformers',
+    'ultralytics': 'YOLO (Object Detection)',
+    'librosa': 'Librosa',
+    'pyannote': 'Pyannote (Speaker Diarization)',
+    'speechbrain': 'SpeechBrain',
+    'sklearn': 'Scikit-learn',
+    'scipy': 'SciPy',
+    'moviepy': 'MoviePy',
+    'yt_dlp': 'yt-dlp',
+    'customtkinter': 'CustomTkinter (GUI)',
+    'msgpack': 'msgpack'
+}
+
+# ASR backends (import name, backend name) dalam urutan preferensi per device,
+# dipakai juga oleh asr_backends.select_backend: PyTorch whisper di GPU,
+# CTranslate2 int8 di CPU-only
+ASR_BACKENDS = {
+    'cuda': [('whisper', 'whisper'), ('faster_whisper', 'faster-whisper')],
+    'cpu': [('faster_whisper', 'faster-whisper'), ('whisper', 'whisper')]
+}
+
+# Hardware H.264 encoders yang dikenali (informasi, belum dipakai encoder planner)
+HW_ENCODERS = ['h264_nvenc', 'h264_qsv', 'h264_videotoolbox', 'h264_amf']
+
+# Jumlah environment (venv, interpreter) yang disimpan di cache file
+MAX_CACHED_ENVIRONMENTS = 4
+
+@dataclass
+class Capabilities:
+    """Hasil deteksi capabilities satu environment"""
+    fingerprint: str
+    detected_at: float
+    python: str
+    platform: str
+    packages: Dict[str, bool] = field(default_factory=dict)
+    ffmpeg: Optional[str] = None
+    ffmpeg_version: Optional[str] = None
+    video_encoders: List[str] = field(default_factory=list)
+    audio_encoders: List[str] = field(default_factory=list)
+    filters: List[str] = field(default_factory=list)
+    cpu_count: int = 1
+    cpu_features: List[str] = field(default_factory=list)
+    cuda: bool = False
+    asr_backend: Optional[str] = None
+    video_encoder: str = 'mpeg4'
+    hw_encoders: List[str] = field(default_factory=list)
+    mode: str = 'lite'  # 'full' jika semua full_mode_packages + ASR backend tersedia
+
+    def has(self, package):
+        """True jika package (import name) terinstall"""
+        return self.packages.get(package, False)
+
+    @property
+    def avx2(self):
+        return 'avx2' in self.cpu_features
+
+    def missing(self, packages):
+        """Packages (import names) yang tidak terinstall"""
+        return [package for package in packages if not self.has(package)]
+
+def environment_fingerprint():
+    """
+    Fingerprint murah untuk environment: interpreter, platform, jumlah core,
+    mtime folder site-packages (berubah saat package di-install / di-uninstall)
+    dan binary ffmpeg
+    """
+    parts = [sys.executable, sys.version, platform.platform(), str(os.cpu_count())]
+    for entry in sys.path:
+        if Path(entry).name in ('site-packages', 'dist-packages') and os.path.isdir(entry):
+            parts.append(f"{entry}:{os.stat(entry).st_mtime_ns}")
+    ffmpeg = shutil.which('ffmpeg')
+    if ffmpeg:
+        parts.append(f"{ffmpeg}:{os.stat(ffmpeg).st_mtime_ns}")
+    return hashlib.sha1('|'.join(parts).encode('utf-8')).hexdigest()[:16]
+
+def _package_available(package):
+    try:
+        return importlib.util.find_spec(package) is not None
+    except (ImportError, ValueError):
+        return False
+
+def _cpu_features():
+    """CPU features yang di-enable (NumPy runtime dispatch, fallback /proc/cpuinfo)"""
+    for module in ('numpy._core._multiarray_umath', 'numpy.core._multiarray_umath'):
+        try:
+            features = importlib.import_module(module).__cpu_features__
+            return sorted(name.lower() for name, enabled in features.items() if enabled)
+        except (ImportError, AttributeError):
+            continue
+    try:
+        with open('/proc/cpuinfo', 'r') as f:
+            for line in f:
+                if line.startswith(('flags', 'Features')):
+                    return sorted(set(line.split(':', 1)[1].split()))
+    except OSError:
+        pass
+    return []
+
+def _cuda_available(packages):
+    """GPU check; import torch / ctranslate2 hanya di sini (sekali per environment)"""
+    if packages.get('torch'):
+        try:
+            import torch
+            return bool(torch.cuda.is_available())
+        except Exception:
+            pass
+    if packages.get('faster_whisper'):
+        try:
+            import ctranslate2
+            return ctranslate2.get_cuda_device_count() > 0
+        except Exception:
+            pass
+    return False
+
+def _ffmpeg_output(ffmpeg, flag):
+    result = subprocess.run([ffmpeg, '-hide_banner', flag], capture_output=True, text=True, timeout=30)
+    return result.stdout.splitlines()
+
+def _ffmpeg_capabilities(ffmpeg):
+    """(version, video encoders, audio encoders, filters) dari ffmpeg build ini"""
+    version = None
+    video_encoders, audio_encoders, filters = [], [], []
+    try:
+        first_line = _ffmpeg_output(ffmpeg, '-version')[:1]
+        if first_line and first_line[0].startswith('ffmpeg version'):
+            version = first_line[0].split()[2]
+
+        # Encoders: legend, separator " ------", lalu " V....D libx264  description"
+        lines = _ffmpeg_output(ffmpeg, '-encoders')
+        separator = next((i for i, line in enumerate(lines) if line.strip().startswith('---')), -1)
+        for line in lines[separator + 1:]:
+            parts = line.split()
+            if len(parts) > 1 and parts[0][0] == 'V':
+                video_encoders.append(parts[1])
+            elif len(parts) > 1 and parts[0][0] == 'A':
+                audio_encoders.append(parts[1])
+
+        # Filters: " TSC scale  V->V  description"
+        for line in _ffmpeg_output(ffmpeg, '-filters'):
+            parts = line.split()
+            if len(parts) > 2 and '->' in parts[2]:
+                filters.append(parts[1])
+    except Exception as e:
+        logger.warning(f"Could not query ffmpeg capabilities: {e}")
+    return version, video_encoders, audio_encoders, filters
+
+def detect_capabilities(fingerprint=None):
+    """Deteksi penuh (lambat: ffmpeg subprocesses dan GPU check)"""
+    started = time.time()
+    importlib.invalidate_caches()  # Packages yang baru di-install di process ini (install_ai.py)
+    packages = {package: _package_available(package) for package in PACKAGES}
+
+    ffmpeg = shutil.which('ffmpeg')
+    version, video_encoders, audio_encoders, filters = (
+        _ffmpeg_capabilities(ffmpeg) if ffmpeg else (None, [], [], [])
+    )
+    cuda = _cuda_available(packages)
+    asr_order = ASR_BACKENDS['cuda' if cuda else 'cpu']
+    asr_backend = next((name for package, name in asr_order if packages[package]), None)
+
+    full_mode = all(packages.get(package, _package_available(package))
+                    for package in CAPABILITY_SETTINGS['full_mode_packages'])
+
+    capabilities = Capabilities(
+        fingerprint=fingerprint or environment_fingerprint(),
+        detected_at=time.time(),
+        python=sys.version.split()[0],
+        platform=f"{platform.system()} {platform.machine()}",
+        packages=packages,
+        ffmpeg=ffmpeg,
+        ffmpeg_version=version,
+        video_encoders=video_encoders,
+        audio_encoders=audio_encoders,
+        filters=filters,
+        cpu_count=os.cpu_count() or 1,
+        cpu_features=_cpu_features(),
+        cuda=cuda,
+        asr_backend=asr_backend,
+        # libx264 jika tersedia, mpeg4 sebagai fallback (selalu ada di ffmpeg)
+        video_encoder='libx264' if not video_encoders or 'libx264' in video_encoders else 'mpeg4',
+        hw_encoders=[encoder for encoder in HW_ENCODERS if encoder in video_encoders],
+        mode='full' if full_mode and asr_backend else 'lite'
+    )
+    logger.info(f"Capabilities detected in {time.time() - started:.1f}s ({capabilities.mode} mode)")
+    return capabilities
+
+class CapabilityCache:
+    """Capabilities per environment fingerprint, disimpan di JSON"""
+
+    def __init__(self, cache_path=None, max_age_days=None):
+        self.cache_path = Path(cache_path or CAPABILITY_SETTINGS['cache_path'])
+        self.max_age = (max_age_days if max_age_days is not None else CAPABILITY_SETTINGS['max_age_days']) * 86400
+
+    def _load(self):
+        try:
+            if self.cache_path.exists():
+                with open(self.cache_path, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+        except Exception as e:
+            logger.warning(f"Could not load capability cache: {e}")
+        return {}
+
+    def _save(self, entries):
+        try:
+            self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.cache_path, 'w', encoding='utf-8') as f:
+                json.dump(entries, f, indent=2)
+        except Exception as e:
+            logger.warning(f"Could not save capability cache: {e}")
+
+    def get(self, refresh=False):
+        """Capabilities environment ini: dari cache, atau dideteksi ulang jika tidak ada / expired"""
+        fingerprint = environment_fingerprint()
+        entries = self._load()
+
+        entry = entries.get(fingerprint)
+        if entry and not refresh and time.time() - entry.get('detected_at', 0) < self.max_age:
+            try:
+                return Capabilities(**entry)
+            except TypeError:
+                pass  # Cache dari versi lama dengan fields berbeda
+
+        capabilities = detect_capabilities(fingerprint)
+        entries[fingerprint] = asdict(capabilities)
+        newest = sorted(entries.items(), key=lambda item: item[1].get('detected_at', 0), reverse=True)
+        self._save(dict(newest[:MAX_CACHED_ENVIRONMENTS]))
+        return capabilities
+
+# Singleton instance
+_capabilities = None
+_capabilities_lock = threading.Lock()
+
+def get_capabilities(refresh=False):
+    """Get capabilities environment ini (dideteksi sekali per process, lalu dari memory)"""
+    global _capabilities
+    with _capabilities_lock:
+        if _capabilities is None or refresh:
+            _capabilities = CapabilityCache().get(refresh=refresh)
+        return _capabilities
+
+# Test function
+if __name__ == "__main__":
+    refresh = '--refresh' in sys.argv
+    started = time.perf_counter()
+    capabilities = get_capabilities(refresh=refresh)
+    print(f"Loaded in {(time.perf_counter() - started) * 1000:.1f} ms (fingerprint {capabilities.fingerprint})")
+    print(f"Mode: {capabilities.mode}, ASR backend: {capabilities.asr_backend}, video encoder: {capabilities.video_encoder}")
+    print(f"CPU: {capabilities.cpu_count} cores, AVX2: {capabilities.avx2}, CUDA: {capabilities.cuda}")
+    print(f"ffmpeg: {capabilities.ffmpeg_version or 'not found'} ({len(capabilities.video_encoders)} video encoders, "
+          f"{len(capabilities.filters)} filters)")
+    missing = [PACKAGES[package] for package, available in capabilities.packages.items() if not available]
+    print(f"Missing packages: {', '.join(missing) or '-'}")
@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+"""
+Crop Planner Module
+Crop trajectory per speaker dari face tracks: posisi wajah di-resample ke
+grid waktu, di-smooth (vectorized), lalu direduksi menjadi keyframes hanya
+saat gerakan melewati threshold. Hasilnya di-render sebagai ffmpeg sendcmd
+(expression linear per segment) sehingga crop berjalan sepenuhnya di ffmpeg.
+Untuk auto-reframe (9:16, 1:1) speaker dari diarization di-join dengan face
+tracks, dan crop path mengikuti wajah active speaker dengan cut saat pergantian.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from typing import List, Tuple
+
+import numpy as np
+
+from config import PODCAST_SETTINGS
+
+# Setup logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Resolusi grid waktu crop path (detik)
+CROP_PATH_STEP = 0.2
+
+# Tinggi wajah (dengan padding) relatif terhadap tinggi crop
+FACE_HEIGHT_RATIO = 0.5
+
+# Wajah sedikit di atas tengah crop (headroom), relatif terhadap tinggi crop
+HEADROOM = 0.1
+
+# Output aspect ratios untuk auto-reframe (width / height)
+REFRAME_ASPECTS = {
+    '9:16': 9 / 16,
+    '1:1': 1.0,
+    '4:5': 4 / 5
+}
+
+@dataclass
+class CropPath:
+    """Crop window ukuran tetap dengan posisi (x, y) yang berubah per keyframe"""
+    width: int
+    height: int
+    keyframes: List[Tuple[float, int, int]] = field(default_factory=list)  # (timestamp, x, y)
+
+    def position_at(self, timestamp):
+        """Posisi crop (x, y) pada timestamp (linear di antara keyframes)"""
+        times = [k[0] for k in self.keyframes]
+        x = np.interp(timestamp, times, [k[1] for k in self.keyframes])
+        y = np.interp(timestamp, times, [k[2] for k in self.keyframes])
+        return int(x), int(y)
+
+    def crop_filter(self, target):
+        """Crop filter dengan nama instance (target sendcmd), posisi awal = keyframe pertama"""
+        _, x, y = self.keyframes[0]
+        return f"crop@{target}=w={self.width}:h={self.height}:x={x}:y={y}"
+
+    def sendcmd_lines(self, target):
+        """
+        Commands sendcmd: di awal tiap segment, x dan y di-set ke expression
+        linear dalam t sampai keyframe berikutnya
+        """
+        lines = []
+        for (t0, x0, y0), (t1, x1, y1) in zip(self.keyframes[:-1], self.keyframes[1:]):
+            span = max(t1 - t0, 1e-3)
+            x_expr = f"{x0}+(t-{t0:.3f})*({(x1 - x0) / span:.4f})"
+            y_expr = f"{y0}+(t-{t0:.3f})*({(y1 - y0) / span:.4f})"
+            lines.append(f"{t0:.3f} crop@{target} x '{x_expr}', crop@{target} y '{y_expr}';")
+        return lines
+
+def _even(value):
+    return int(value) // 2 * 2
+
+def crop_size_for_faces(face_heights, frame_size, aspect_ratio, padding=None):
+    """
+    Ukuran crop (w, h) dengan aspect ratio output, cukup besar untuk wajah
+    (median tinggi wajah + padding) dan tidak melebihi frame
+
+    Args:
+        face_heights: Tinggi bounding box wajah (pixels)
+        frame_size: (width, height) video source
+        aspect_ratio: width / height output
+        padding: Padding relatif sekitar wajah (default PODCAST_SETTINGS['face_crop_padding'])
+    """
+    padding = PODCAST_SETTINGS['face_crop_padding'] if padding is None else padding
+    frame_w, frame_h = frame_size
+
+    crop_h = float(np.median(face_heights)) * (1 + 2 * padding) / FACE_HEIGHT_RATIO if len(face_heights) else frame_h
+    crop_h = min(max(crop_h, frame_h * 0.25), frame_h)
+    crop_w = crop_h * aspect_ratio
+    if crop_w > frame_w:
+        crop_w, crop_h = frame_w, frame_w / aspect_ratio
+
+    return _even(crop_w), _even(crop_h)
+
+def _moving_average(values, window):
+    if window <= 1:
+        return values
+    padded = np.pad(values, (window // 2, window - 1 - window // 2), mode='edge')
+    return np.convolve(padded, np.ones(window) / window, mode='valid')
+
+def _select_keyframes(x, y, threshold):
+    """Indices di mana posisi bergeser lebih dari threshold dari keyframe terakhir"""
+    keys = [0]
+    last_x, last_y = x[0], y[0]
+    for i in range(1, len(x)):
+        if abs(x[i] - last_x) > threshold or abs(y[i] - last_y) > threshold:
+            keys.append(i)
+            last_x, last_y = x[i], y[i]
+    if keys[-1] != len(x) - 1:
+        keys.append(len(x) - 1)
+    return keys
+
+def _smoothed_positions(points, times, frame_size, crop_size, smoothing, step):
+    """Posisi crop (x, y) pada times: center wajah di-interpolasi, di-smooth dan di-clip ke frame"""
+    frame_w, frame_h = frame_size
+    crop_w, crop_h = crop_size
+
+    points = np.asarray(points, dtype=np.float64).reshape(-1, 5)
+    if len(points) == 0:
+        # Tanpa wajah: crop tengah frame
+        center_x = np.full(len(times), frame_w / 2)
+        center_y = np.full(len(times), frame_h / 2)
+    else:
+        points = points[np.argsort(points[:, 0])]
+        center_x = np.interp(times, points[:, 0], points[:, 1] + points[:, 3] / 2)
+        center_y = np.interp(times, points[:, 0], points[:, 2] + points[:, 4] / 2) + HEADROOM * crop_h
+
+    window = max(1, int(round(smoothing / step)))
+    x = np.clip(_moving_average(center_x, window) - crop_w / 2, 0, frame_w - crop_w)
+    y = np.clip(_moving_average(center_y, window) - crop_h / 2, 0, frame_h - crop_h)
+    return x, y
+
+def plan_crop_path(points, frame_size, crop_size, duration, smoothing=None, motion_threshold=None,
+                   start=0.0, step=CROP_PATH_STEP):
+    """
+    Smoothed crop trajectory untuk satu face track
+
+    Args:
+        points: Sequence of (timestamp, x, y, width, height) bounding boxes wajah
+        frame_size: (width, height) video source
+        crop_size: (width, height) crop window
+        duration: Durasi segment (detik) mulai dari start
+        smoothing: Window moving average (detik)
+        motion_threshold: Gerakan minimal (fraksi lebar crop) untuk keyframe baru
+        start: Timestamp awal segment (keyframes relatif terhadap start)
+
+    Returns:
+        CropPath
+    """
+    smoothing = PODCAST_SETTINGS.get('crop_smoothing', 1.5) if smoothing is None else smoothing
+    motion_threshold = PODCAST_SETTINGS.get('crop_motion_threshold', 0.05) if motion_threshold is None else motion_threshold
+
+    crop_w, crop_h = crop_size
+    grid = np.arange(0.0, max(duration, step) + step / 2, step)
+    x, y = _smoothed_positions(points, grid + start, frame_size, crop_size, smoothing, step)
+
+    keys = _select_keyframes(x, y, motion_threshold * crop_w)
+    keyframes = [(float(grid[i]), _even(x[i]), _even(y[i])) for i in keys]
+    return CropPath(width=crop_w, height=crop_h, keyframes=keyframes)
+
+def reframe_crop_size(frame_size, aspect_ratio):
+    """Crop full-height (atau full-width jika frame lebih sempit) dengan aspect ratio output"""
+    frame_w, frame_h = frame_size
+    crop_w, crop_h = frame_h * aspect_ratio, frame_h
+    if crop_w > frame_w:
+        crop_w, crop_h = frame_w, frame_w / aspect_ratio
+    return _even(crop_w), _even(crop_h)
+
+def track_points(track):
+    """Bounding boxes (timestamp, x, y, width, height) satu face track"""
+    if track.get('path'):
+        return [tuple(point) for point in track['path']]
+    # Hasil face tracking lama: hanya timeline yang di-sample
+    return [(point['timestamp'], *point['bounding_box']) for point in track.get('timeline', [])]
+
+def face_track_points(face_data, face_id):
+    """track_points untuk face_id di face_data (kosong jika tidak ada)"""
+    for track in face_data.get('tracks', []):
+        if track['face_id'] == face_id:
+            return track_points(track)
+    return []
+
+def assign_speakers_to_faces(speaker_data, face_data):
+    """
+    Join speakers (diarization) dengan face tracks. Per detection timestamp
+    tiap wajah mendapat bobot jika menjadi wajah terbesar (multi-camera edit
+    memotong ke pembicara) atau wajah yang paling bergerak (gerakan kepala
+    saat bicara, untuk wide shot statis). Skor = bobot selama speaker bicara
+    dibanding rata-rata bobot wajah itu sepanjang video.
+
+    Returns:
+        Dict speaker_id -> face_id (satu wajah per speaker)
+    """
+    tracks = [track for track in face_data.get('tracks', []) if track_points(track)]
+    speakers = speaker_data.get('speakers', [])
+    if not tracks or not speakers:
+        return {}
+
+    # Detection timestamp -> (face_id, area, motion) semua wajah yang terlihat
+    detections = {}
+    for track in tracks:
+        points = np.asarray(sorted(track_points(track)), dtype=np.float64).reshape(-1, 5)
+        centers = points[:, 1:3] + points[:, 3:5] / 2
+        motion = np.zeros(len(points))
+        if len(points) > 1:
+            delta = np.abs(np.diff(centers, axis=0)).sum(axis=1) + np.abs(np.diff(points[:, 4]))
+            motion[1:] = delta / np.maximum(points[1:, 4], 1) / np.maximum(np.diff(points[:, 0]), 1e-3)
+        for (t, _, _, w, h), m in zip(points, motion):
+            detections.setdefault(round(float(t), 3), []).append((track['face_id'], w * h, m))
+
+    times = np.array(sorted(detections))
+    face_ids = [track['face_id'] for track in tracks]
+    face_index = {face_id: i for i, face_id in enumerate(face_ids)}
+
+    weights = np.zeros((len(times), len(face_ids)))
+    for row, t in enumerate(times):
+        faces = detections[float(t)]
+        weights[row, face_index[max(faces, key=lambda f: f[1])[0]]] += 1
+        if len(faces) > 1:
+            weights[row, face_index[max(faces, key=lambda f: f[2])[0]]] += 1
+    baseline = np.maximum(weights.mean(axis=0), 1e-6)
+    cumulative = np.vstack([np.zeros(len(face_ids)), np.cumsum(weights, axis=0)])
+
+    scores = {}
+    for speaker in speakers:
+        segments = speaker.get('segments', [])
+        if not segments:
+            continue
+        starts = np.searchsorted(times, [s['start_time'] for s in segments], side='left')
+        ends = np.searchsorted(times, [s['end_time'] for s in segments], side='right')
+        count = (ends - starts).sum()
+        if count > 0:
+            scores[speaker['speaker_id']] = (cumulative[ends] - cumulative[starts]).sum(axis=0) / count / baseline
+
+    # Greedy assignment: pasangan (speaker, face) dengan skor tertinggi dulu
+    pairs = sorted(
+        ((score[i], speaker_id, face_ids[i]) for speaker_id, score in scores.items() for i in range(len(face_ids))),
+        key=lambda p: p[0], reverse=True
+    )
+    mapping, used_faces = {}, set()
+    for score, speaker_id, face_id in pairs:
+        if score <= 0 or speaker_id in mapping or face_id in used_faces:
+            continue
+        mapping[speaker_id] = face_id
+        used_faces.add(face_id)
+    return mapping
+
+def active_face_runs(speaker_data, speaker_faces, start, end, min_hold=None, default_face=None):
+    """
+    Wajah yang di-frame sepanjang [start, end]: mengikuti active speaker,
+    pindah hanya jika giliran bicara baru >= min_hold detik (tidak ada
+    cut untuk interjection pendek); jeda bicara tetap di wajah terakhir.
+
+    Returns:
+        List of (start, end, face_id) yang berurutan dan menutup [start, end]
+    """
+    min_hold = PODCAST_SETTINGS['speaker_switch_threshold'] if min_hold is None else min_hold
+
+    turns = sorted(
+        (max(segment['start_time'], start), min(segment['end_time'], end), speaker_faces[speaker['speaker_id']])
+        for speaker in speaker_data.get('speakers', []) if speaker['speaker_id'] in speaker_faces
+        for segment in speaker.get('segments', [])
+        if segment['end_time'] > start and segment['start_time'] < end
+    )
+
+    runs = []
+    current_face, run_start = default_face, start
+    for turn_start, turn_end, face_id in turns:
+        if face_id == current_face:
+            continue
+        if current_face is None:
+            current_face = face_id
+        elif turn_end - turn_start >= min_hold and turn_start > run_start:
+            runs.append((run_start, turn_start, current_face))
+            current_face, run_start = face_id, turn_start
+
+    if current_face is not None:
+        runs.append((run_start, end, current_face))
+    return runs
+
+def plan_reframe_path(face_points, runs, frame_size, crop_size, duration, smoothing=None,
+                      motion_threshold=None, start=0.0, step=CROP_PATH_STEP):
+    """
+    Crop path yang mengikuti beberapa wajah bergantian: di dalam satu run
+    posisi di-smooth seperti plan_crop_path, di antara runs crop langsung
+    cut ke wajah berikutnya (tanpa pan melintasi frame)
+
+    Args:
+        face_points: Dict face_id -> points (timestamp, x, y, width, height)
+        runs: List of (start, end, face_id) dari active_face_runs (timestamps source)
+        duration: Durasi clip mulai dari start
+
+    Returns:
+        CropPath dengan keyframes relatif terhadap start
+    """
+    smoothing = PODCAST_SETTINGS.get('crop_smoothing', 1.5) if smoothing is None else smoothing
+    motion_threshold = PODCAST_SETTINGS.get('crop_motion_threshold', 0.05) if motion_threshold is None else motion_threshold
+
+    crop_w, crop_h = crop_size
+    grid = np.arange(0.0, max(duration, step) + step / 2, step)
+    if not runs:
+        return plan_crop_path([], frame_size, crop_size, duration, smoothing, motion_threshold, start, step)
+
+    keyframes = []
+    for i, (run_start, run_end, face_id) in enumerate(runs):
+        last_run = i == len(runs) - 1
+        mask = (grid + start >= run_start) & ((grid + start < run_end) | last_run)
+        indices = np.nonzero(mask)[0]
+        if len(indices) == 0:
+            continue
+
+        x, y = _smoothed_positions(
+            face_points.get(face_id, []), grid[indices] + start, frame_size, crop_size, smoothing, step
+        )
+        run_keys = [(float(grid[indices[k]]), _even(x[k]), _even(y[k]))
+                    for k in _select_keyframes(x, y, motion_threshold * crop_w)]
+
+        if keyframes:
+            # Cut: tahan posisi lama sampai tepat sebelum run baru
+            _, last_x, last_y = keyframes[-1]
+            keyframes.append((max(run_keys[0][0] - 0.001, keyframes[-1][0]), last_x, last_y))
+        keyframes.extend(run_keys)
+
+    return CropPath(width=crop_w, height=crop_h, keyframes=keyframes)
+
+def write_sendcmd(paths, output_path):
+    """
+    Tulis sendcmd file untuk beberapa crop paths
+
+    Args:
+        paths: Dict target name -> CropPath
+        output_path: Path file commands
+
+    Returns:
+        Path file, atau None jika semua crop statis (tidak perlu sendcmd)
+    """
+    lines = []
+    for target, path in paths.items():
+        lines.extend(path.sendcmd_lines(target))
+    if not lines:
+        return None
+
+    # sendcmd butuh commands berurutan menurut waktu
+    lines.sort(key=lambda line: float(line.split(' ', 1)[0]))
+    with open(output_path, 'w', encoding='utf-8') as f:
+        f.write('\n'.join(lines) + '\n')
+    return str(output_path)
+
+def escape_filter_path(path):
+    """Escape path untuk dipakai sebagai option value di ffmpeg filtergraph"""
+    return str(path).replace('\\', '/').replace(':', '\\:').replace("'", "\\'")
+
+# Test function
+if __name__ == "__main__":
+    # Wajah bergerak pelan ke kanan dengan jitter deteksi
+    timestamps = np.arange(0, 60, 2.0)
+    jitter = np.random.randn(len(timestamps)) * 8
+    points = [(t, 600 + t * 3 + j, 300 + j, 160, 200) for t, j in zip(timestamps, jitter)]
+
+    size = crop_size_for_faces([p[4] for p in points], (1920, 1080), 1280 / 360)
+    path = plan_crop_path(points, (1920, 1080), size, duration=60)
+    print(f"Crop size: {size}, {len(path.keyframes)} keyframes")
+    print(path.crop_filter('spk0'))
+    for line in path.sendcmd_lines('spk0')[:5]:
+        print(line)
+
+    # Dua wajah statis, speaker bergantian tiap 10 detik -> reframe 9:16 dengan cut
+    # Wide shot: kedua wajah selalu terlihat (wajah 1 selalu terbesar), kepala
+    # speaker yang sedang bicara bergerak
+    timestamps = np.arange(0, 60, 0.5)
+    talking = lambda face, t: int(t // 10) % 2 == face
+    face_data = {'tracks': [
+        {'face_id': face, 'path': [
+            (t, x, 300 + (np.random.randn() * 15 if talking(face, t) else 0), w, h) for t in timestamps
+        ]} for face, x, w, h in ((0, 400, 200, 250), (1, 1300, 220, 260))
+    ]}
+    speaker_data = {'speakers': [
+        {'speaker_id': s, 'segments': [{'start_time': t, 'end_time': t + 10} for t in range(s * 10, 60, 20)]}
+        for s in (0, 1)
+    ]}
+    mapping = assign_speakers_to_faces(speaker_data, face_data)
+    runs = active_face_runs(speaker_data, mapping, 0, 60)
+    size = reframe_crop_size((1920, 1080), REFRAME_ASPECTS['9:16'])
+    points = {track['face_id']: track['path'] for track in face_data['tracks']}
+    path = plan_reframe_path(points, runs, (1920, 1080), size, duration=60)
+    print(f"Speakers -> faces: {mapping}, runs: {runs}")
+    print(f"Reframe {size}: {path.keyframes}")
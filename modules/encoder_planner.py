@@ -0,0 +1,312 @@
+#!/usr/bin/env python3
+"""
+Encoder Planner Module
+Pilih codec, preset, CRF, tune dan thread count per output type (preview,
+clip, reel, podcast, master) berdasarkan throughput encoder yang diukur di
+mesin ini (calibration run dengan ffmpeg testsrc, CPU only). Jika total
+perkiraan waktu encode melebihi time budget job, preset output dengan
+prioritas paling rendah diturunkan dulu.
+"""
+
+import json
+import logging
+import os
+import platform
+import subprocess
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+from config import ENCODER_SETTINGS, SERVER_SETTINGS
+from .capabilities import get_capabilities
+
+# Setup logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# x264 presets dari tercepat ke paling lambat
+X264_PRESETS = ['ultrafast', 'superfast', 'veryfast', 'faster', 'fast', 'medium', 'slow', 'slower', 'veryslow']
+
+# Fallback sebelum calibration: frames/detik 1080p per preset (CPU 8 core)
+DEFAULT_FPS_1080P = {
+    'ultrafast': 300, 'superfast': 220, 'veryfast': 160, 'faster': 110, 'fast': 80,
+    'medium': 60, 'slow': 35, 'slower': 15, 'veryslow': 7
+}
+
+# Resolusi calibration run
+CALIBRATION_SIZE = (1280, 720)
+
+@dataclass
+class EncodeSettings:
+    """Encoder settings untuk satu output"""
+    output_type: str
+    codec: str = 'libx264'
+    preset: str = 'medium'
+    crf: int = 23
+    tune: Optional[str] = None
+    threads: int = 0
+    max_bitrate: Optional[str] = None
+
+    def ffmpeg_args(self):
+        """Video encoder arguments untuk ffmpeg command line"""
+        args = ['-c:v', self.codec]
+        if self.codec == 'libx264':
+            args += ['-preset', self.preset, '-crf', str(self.crf)]
+            if self.tune:
+                args += ['-tune', self.tune]
+        else:
+            # mpeg4 fallback: quality scale dari CRF (2 = terbaik, 31 = terburuk)
+            args += ['-q:v', str(max(2, min(31, self.crf - 18)))]
+        if self.max_bitrate:
+            args += ['-maxrate', self.max_bitrate, '-bufsize', _double_bitrate(self.max_bitrate)]
+        if self.threads:
+            args += ['-threads', str(self.threads)]
+        return args
+
+    def moviepy_kwargs(self):
+        """Arguments untuk MoviePy write_videofile (preset dan threads sebagai kwargs sendiri)"""
+        params = self.ffmpeg_args()[2:]
+        for option in ('-preset', '-threads'):
+            if option in params:
+                index = params.index(option)
+                del params[index:index + 2]
+        return {
+            'codec': self.codec,
+            'preset': self.preset,
+            'threads': self.threads or None,
+            'bitrate': None,
+            'ffmpeg_params': params
+        }
+
+@dataclass
+class PlannedOutput:
+    """Satu output yang akan di-encode dalam job"""
+    output_type: str
+    duration: float
+    width: int
+    height: int
+    fps: float = 30.0
+    settings: EncodeSettings = field(default=None)
+
+    @property
+    def pixels(self):
+        return self.duration * self.fps * self.width * self.height
+
+def _double_bitrate(bitrate):
+    value = str(bitrate)
+    if value[-1:].lower() in ('k', 'm'):
+        return f"{float(value[:-1]) * 2:g}{value[-1]}"
+    return str(int(float(value) * 2))
+
+def _machine_id():
+    """Identifier mesin: hostname, arsitektur dan jumlah core"""
+    return f"{platform.node()}-{platform.machine()}-{os.cpu_count()}"
+
+class EncoderCalibration:
+    """Throughput encoder (pixels/detik per codec|preset) per mesin, disimpan di JSON"""
+
+    def __init__(self, calibration_path=None, alpha=0.3):
+        self.calibration_path = Path(calibration_path or ENCODER_SETTINGS['calibration_path'])
+        self.alpha = alpha
+        self.machine_id = _machine_id()
+        self._lock = threading.Lock()
+        self._data = self._load()
+        self._encoders = None
+
+    def _load(self):
+        try:
+            if self.calibration_path.exists():
+                with open(self.calibration_path, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+        except Exception as e:
+            logger.warning(f"Could not load encoder calibration: {e}")
+        return {}
+
+    def save(self):
+        """Save calibration ke disk"""
+        try:
+            self.calibration_path.parent.mkdir(parents=True, exist_ok=True)
+            with self._lock:
+                payload = json.dumps(self._data, indent=2)
+            with open(self.calibration_path, 'w', encoding='utf-8') as f:
+                f.write(payload)
+        except Exception as e:
+            logger.warning(f"Could not save encoder calibration: {e}")
+
+    def available_encoders(self):
+        """Video encoders yang ada di ffmpeg build ini"""
+        if self._encoders is None:
+            self._encoders = set(get_capabilities().video_encoders)
+        return self._encoders
+
+    def pixel_rate(self, codec, preset):
+        """Pixels/detik yang terukur, atau fallback DEFAULT_FPS_1080P (diskala jumlah core)"""
+        with self._lock:
+            rate = self._data.get(self.machine_id, {}).get(f"{codec}|{preset}")
+        if rate:
+            return rate
+        fps = DEFAULT_FPS_1080P.get(preset, DEFAULT_FPS_1080P['medium'])
+        return fps * 1920 * 1080 * (os.cpu_count() or 8) / 8
+
+    def record(self, codec, preset, pixels, seconds):
+        """Update throughput (EWMA) dari calibration atau encode sungguhan"""
+        if pixels <= 0 or seconds <= 0:
+            return
+        rate = pixels / seconds
+        key = f"{codec}|{preset}"
+        with self._lock:
+            machine = self._data.setdefault(self.machine_id, {})
+            previous = machine.get(key)
+            machine[key] = rate if previous is None else self.alpha * rate + (1 - self.alpha) * previous
+
+    def is_calibrated(self, codec, preset):
+        with self._lock:
+            return f"{codec}|{preset}" in self._data.get(self.machine_id, {})
+
+    def calibrate(self, codec='libx264', presets=None, seconds=None):
+        """
+        Calibration run: encode testsrc2 (CALIBRATION_SIZE, 30 fps) ke null
+        muxer per preset dan ukur waktu wall-clock
+        """
+        presets = presets or X264_PRESETS
+        seconds = seconds or ENCODER_SETTINGS.get('calibration_seconds', 2)
+        width, height = CALIBRATION_SIZE
+        for preset in presets:
+            settings = EncodeSettings('calibration', codec=codec, preset=preset)
+            cmd = ['ffmpeg', '-hide_banner', '-nostdin', '-v', 'error',
+                   '-f', 'lavfi', '-i', f"testsrc2=size={width}x{height}:rate=30",
+                   '-t', str(seconds), '-pix_fmt', 'yuv420p'] + settings.ffmpeg_args() + ['-f', 'null', '-']
+            started = time.perf_counter()
+            result = subprocess.run(cmd, capture_output=True, text=True)
+            elapsed = time.perf_counter() - started
+            if result.returncode != 0:
+                logger.warning(f"Calibration {codec}/{preset} failed: {result.stderr[-200:]}")
+                continue
+            # Ukur ulang dari nol: calibration menggantikan nilai lama
+            with self._lock:
+                self._data.setdefault(self.machine_id, {}).pop(f"{codec}|{preset}", None)
+            self.record(codec, preset, seconds * 30 * width * height, elapsed)
+            logger.info(f"Calibrated {codec}/{preset}: {seconds * 30 / elapsed:.0f} fps at {height}p")
+        self.save()
+
+class EncoderPlanner:
+    def __init__(self, calibration=None, settings=None):
+        """
+        Initialize encoder planner
+
+        Args:
+            calibration: EncoderCalibration (default: file di ENCODER_SETTINGS)
+            settings: Override ENCODER_SETTINGS
+        """
+        self.calibration = calibration or EncoderCalibration()
+        self.settings = settings or ENCODER_SETTINGS
+        self.profiles = self.settings['profiles']
+
+    def codec(self):
+        """libx264 jika tersedia, mpeg4 sebagai fallback (selalu ada di ffmpeg)"""
+        encoders = self.calibration.available_encoders()
+        return 'libx264' if not encoders or 'libx264' in encoders else 'mpeg4'
+
+    def threads(self):
+        """Semua core dibagi rata antar encode stages yang boleh berjalan bersamaan"""
+        parallel = max(1, SERVER_SETTINGS['stage_limits'].get('encode', 1))
+        return max(1, (os.cpu_count() or 1) // parallel)
+
+    def base_settings(self, output_type, max_bitrate=None):
+        """Settings preferensi (sebelum time budget) untuk output type"""
+        profile = self.profiles.get(output_type, self.profiles['clip'])
+        return EncodeSettings(
+            output_type=output_type,
+            codec=self.codec(),
+            preset=profile['preset'],
+            crf=profile['crf'],
+            tune=profile.get('tune'),
+            threads=self.threads(),
+            max_bitrate=max_bitrate
+        )
+
+    def estimate_seconds(self, output):
+        return output.pixels / self.calibration.pixel_rate(output.settings.codec, output.settings.preset)
+
+    def plan(self, outputs, time_budget=None):
+        """
+        Assign EncodeSettings ke setiap PlannedOutput
+
+        Args:
+            outputs: List of PlannedOutput
+            time_budget: Detik maksimal untuk semua encode (None = tanpa batas)
+
+        Returns:
+            outputs (dengan .settings terisi)
+        """
+        for output in outputs:
+            if output.settings is None:
+                output.settings = self.base_settings(output.output_type)
+
+        codec = self.codec()
+        if codec == 'libx264' and ENCODER_SETTINGS.get('auto_calibrate', True):
+            missing = sorted({o.settings.preset for o in outputs if not self.calibration.is_calibrated(codec, o.settings.preset)})
+            if missing:
+                try:
+                    self.calibration.calibrate(codec, missing)
+                except Exception as e:
+                    logger.warning(f"Encoder calibration failed, using defaults: {e}")
+
+        if not time_budget or codec != 'libx264':
+            return outputs
+
+        total = sum(self.estimate_seconds(o) for o in outputs)
+        while total > time_budget:
+            # Turunkan satu step preset output dengan prioritas terendah yang masih bisa
+            candidates = [o for o in outputs if X264_PRESETS.index(o.settings.preset) > 0]
+            if not candidates:
+                logger.warning(f"Encodes need ~{total:.0f}s even at fastest preset (budget {time_budget:.0f}s)")
+                break
+            output = min(candidates, key=lambda o: (
+                self.profiles.get(o.output_type, self.profiles['clip'])['priority'], -self.estimate_seconds(o)
+            ))
+            output.settings.preset = X264_PRESETS[X264_PRESETS.index(output.settings.preset) - 1]
+            total = sum(self.estimate_seconds(o) for o in outputs)
+
+        logger.info(
+            "Encode plan (~%.0fs): %s", total,
+            ', '.join(f"{o.output_type}={o.settings.preset}/crf{o.settings.crf}" for o in outputs)
+        )
+        return outputs
+
+    def job_time_budget(self, source_duration):
+        """Time budget encode untuk satu job dari ENCODER_SETTINGS['time_budget_factor']"""
+        factor = self.settings.get('time_budget_factor')
+        return source_duration * factor if factor else None
+
+# Singleton instance
+_encoder_planner = None
+_encoder_planner_lock = threading.Lock()
+
+def get_encoder_planner():
+    """Get singleton EncoderPlanner instance"""
+    global _encoder_planner
+    with _encoder_planner_lock:
+        if _encoder_planner is None:
+            _encoder_planner = EncoderPlanner()
+        return _encoder_planner
+
+# Test function
+if __name__ == "__main__":
+    import sys
+
+    planner = get_encoder_planner()
+    if '--calibrate' in sys.argv:
+        planner.calibration.calibrate(planner.codec())
+
+    outputs = [
+        PlannedOutput('clip', 30, 1280, 720) for _ in range(5)
+    ] + [
+        PlannedOutput('reel', 150, 1280, 720),
+        PlannedOutput('master', 1800, 1280, 720)
+    ]
+    planner.plan(outputs, time_budget=planner.job_time_budget(1800))
+    for output in outputs:
+        print(output.output_type, output.settings.ffmpeg_args(), f"~{planner.estimate_seconds(output):.0f}s")
@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+ETA Estimator Module
+Perkiraan waktu tersisa berdasarkan throughput per stage (frames/detik,
+audio seconds/detik) yang diukur dan disimpan per mesin, bukan persentase tetap
+"""
+
+import json
+import logging
+import os
+import platform
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Optional
+
+# Setup logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Fallback jika belum ada history: detik processing per menit video
+# (sama dengan baseline di Utils.estimate_processing_time)
+DEFAULT_SECONDS_PER_MINUTE = {
+    'download': 10,
+    'video_analysis': 30,
+    'face_tracking': 45,
+    'speaker_diarization': 60,
+    'subtitle_generation': 40,
+    'video_editing': 20
+}
+
+@dataclass
+class StagePlan:
+    """Data class untuk rencana kerja satu stage"""
+    stage: str
+    total_units: float
+    unit: str = 'frames'
+    variant: str = ''  # e.g. whisper model size, hog/cnn
+    done_units: float = 0.0
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    @property
+    def history_key(self):
+        return f"{self.stage}|{self.variant}" if self.variant else self.stage
+
+class ThroughputHistory:
+    """Throughput per stage per mesin, disimpan sebagai EWMA di JSON file"""
+
+    def __init__(self, history_path=None, alpha=0.3):
+        self.history_path = Path(history_path) if history_path else Path(__file__).parent.parent / "models" / "throughput_history.json"
+        self.alpha = alpha
+        self.machine_id = self._machine_id()
+        self._lock = threading.Lock()
+        self._data = self._load()
+
+    def _machine_id(self):
+        """Identifier mesin: hostname, arsitektur dan jumlah core"""
+        return f"{platform.node()}-{platform.machine()}-{os.cpu_count()}"
+
+    def _load(self):
+        try:
+            if self.history_path.exists():
+                with open(self.history_path, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+        except Exception as e:
+            logger.warning(f"Could not load throughput history: {e}")
+        return {}
+
+    def save(self):
+        """Save history ke disk"""
+        try:
+            self.history_path.parent.mkdir(parents=True, exist_ok=True)
+            with self._lock:
+                payload = json.dumps(self._data, indent=2)
+            with open(self.history_path, 'w', encoding='utf-8') as f:
+                f.write(payload)
+        except Exception as e:
+            logger.warning(f"Could not save throughput history: {e}")
+
+    def get(self, key):
+        """Get throughput (units/detik) untuk stage key di mesin ini"""
+        with self._lock:
+            entry = self._data.get(self.machine_id, {}).get(key)
+        return entry['units_per_second'] if entry else None
+
+    def update(self, key, units, seconds):
+        """Update EWMA throughput dengan hasil run yang baru selesai"""
+        if units <= 0 or seconds <= 0.5:
+            return  # Run terlalu pendek untuk diukur dengan akurat
+
+        measured = units / seconds
+        with self._lock:
+            machine = self._data.setdefault(self.machine_id, {})
+            entry = machine.get(key)
+            if entry:
+                entry['units_per_second'] = (1 - self.alpha) * entry['units_per_second'] + self.alpha * measured
+                entry['runs'] += 1
+            else:
+                machine[key] = {'units_per_second': measured, 'runs': 1}
+            machine[key]['updated_at'] = time.time()
+
+class ETAEstimator:
+    """
+    Menghitung progress dan waktu tersisa dari rencana kerja per stage.
+    Register sebagai listener di MetricsCollector supaya menerima
+    progress per frame / audio second dari setiap module.
+    """
+
+    def __init__(self, history=None):
+        self.history = history or ThroughputHistory()
+        self._lock = threading.Lock()
+        self._plans: Dict[str, StagePlan] = {}
+        self._duration = 0.0
+        self._job_id = None
+
+    def plan(self, video_duration, stages, job_id=None):
+        """
+        Set rencana kerja untuk job baru
+
+        Args:
+            video_duration: Durasi video dalam detik
+            stages: List of StagePlan untuk stage yang di-enable saja
+            job_id: Hanya events dari collector job ini yang dihitung
+                (None = semua events, e.g. estimator tanpa listener)
+        """
+        with self._lock:
+            self._duration = max(video_duration, 1.0)
+            self._plans = {plan.stage: plan for plan in stages}
+            self._job_id = job_id
+
+    def _rate(self, plan):
+        """Units/detik untuk stage: live rate, history, atau default"""
+        history_rate = self.history.get(plan.history_key)
+
+        if history_rate is None:
+            seconds_per_minute = DEFAULT_SECONDS_PER_MINUTE.get(plan.stage, 30)
+            expected_seconds = (self._duration / 60.0) * seconds_per_minute
+            history_rate = plan.total_units / max(expected_seconds, 1.0)
+
+        # Blend dengan rate yang sedang diukur untuk stage yang berjalan
+        if plan.started_at and not plan.finished_at and plan.done_units > 0:
+            elapsed = time.time() - plan.started_at
+            if elapsed > 2.0:
+                live_rate = plan.done_units / elapsed
+                # Semakin banyak progress, semakin percaya live rate
+                weight = min(plan.done_units / max(plan.total_units, 1.0) * 2, 0.8)
+                return (1 - weight) * history_rate + weight * live_rate
+
+        return max(history_rate, 1e-6)
+
+    def _expected_seconds(self, plan):
+        return plan.total_units / self._rate(plan)
+
+    def stage_seconds(self):
+        """Perkiraan durasi (detik) setiap stage di rencana kerja"""
+        with self._lock:
+            return {stage: self._expected_seconds(plan) for stage, plan in self._plans.items()}
+
+    def on_metrics_event(self, event, stage, **info):
+        """Listener untuk MetricsCollector events (events job lain diabaikan)"""
+        with self._lock:
+            if self._job_id is not None and info.get('job_id') != self._job_id:
+                return
+            plan = self._plans.get(stage)
+            if plan is None:
+                return
+
+            if event == 'start':
+                plan.started_at = plan.started_at or time.time()
+            elif event == 'advance':
+                plan.done_units = min(info.get('work_done', 0.0), plan.total_units)
+            elif event == 'finish':
+                plan.finished_at = time.time()
+                plan.done_units = plan.total_units
+                key = plan.history_key
+            else:
+                return
+
+        if event == 'finish':
+            self.history.update(key, info.get('work', 0.0), info.get('seconds', 0.0))
+            self.history.save()
+
+    def percent_complete(self):
+        """Progress keseluruhan (0-100) yang ditimbang dengan expected time per stage"""
+        with self._lock:
+            if not self._plans:
+                return 0.0
+
+            total = 0.0
+            done = 0.0
+            for plan in self._plans.values():
+                expected = self._expected_seconds(plan)
+                total += expected
+                if plan.finished_at:
+                    done += expected
+                elif plan.total_units > 0:
+                    done += expected * (plan.done_units / plan.total_units)
+
+        return min(100.0 * done / total, 99.0) if total > 0 else 0.0
+
+    def remaining_seconds(self):
+        """Perkiraan waktu tersisa dalam detik"""
+        with self._lock:
+            remaining = 0.0
+            for plan in self._plans.values():
+                if plan.finished_at:
+                    continue
+                remaining_units = max(plan.total_units - plan.done_units, 0.0)
+                remaining += remaining_units / self._rate(plan)
+        return remaining
+
+    def current_stage(self):
+        """Nama stage yang sedang berjalan (jika ada)"""
+        with self._lock:
+            for plan in self._plans.values():
+                if plan.started_at and not plan.finished_at:
+                    return plan.stage
+        return None
+
+# Test function
+if __name__ == "__main__":
+    estimator = ETAEstimator(ThroughputHistory(history_path="/tmp/throughput_history_test.json"))
+    estimator.plan(600, [
+        StagePlan('video_analysis', total_units=1800, unit='steps'),
+        StagePlan('subtitle_generation', total_units=600, unit='audio_seconds', variant='base')
+    ])
+
+    estimator.on_metrics_event('start', 'video_analysis')
+    estimator.on_metrics_event('advance', 'video_analysis', work_done=900)
+    print(f"Progress: {estimator.percent_complete():.1f}%")
+    print(f"Remaining: {estimator.remaining_seconds():.1f}s")
@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+Job Queue Module
+Persistent job queue (SQLite) untuk server mode: submit, status, cancel
+dan result untuk clip jobs, dengan priority classes
+"""
+
+import json
+import logging
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Setup logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Priority classes: angka kecil diproses lebih dulu
+PRIORITY_CLASSES = {
+    'high': 0,
+    'normal': 1,
+    'low': 2
+}
+
+# Job status
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id TEXT PRIMARY KEY,
+    status TEXT NOT NULL,
+    priority INTEGER NOT NULL,
+    input_source TEXT NOT NULL,
+    is_url INTEGER NOT NULL DEFAULT 0,
+    options TEXT NOT NULL DEFAULT '{}',
+    stage TEXT,
+    progress REAL NOT NULL DEFAULT 0,
+    result TEXT,
+    error TEXT,
+    cancel_requested INTEGER NOT NULL DEFAULT 0,
+    created_at REAL NOT NULL,
+    started_at REAL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_jobs_claim ON jobs (status, priority, created_at);
+"""
+
+@dataclass
+class Job:
+    """Data class untuk satu clip job"""
+    id: str
+    status: str
+    priority: int
+    input_source: str
+    is_url: bool
+    options: Dict
+    stage: Optional[str]
+    progress: float
+    result: Optional[Dict]
+    error: Optional[str]
+    cancel_requested: bool
+    created_at: float
+    started_at: Optional[float]
+    finished_at: Optional[float]
+
+    @property
+    def priority_class(self):
+        for name, value in PRIORITY_CLASSES.items():
+            if value == self.priority:
+                return name
+        return str(self.priority)
+
+    def to_status(self):
+        """Status dict untuk API (tanpa result yang bisa besar)"""
+        return {
+            'id': self.id,
+            'status': self.status,
+            'priority': self.priority_class,
+            'input': self.input_source,
+            'stage': self.stage,
+            'progress': self.progress,
+            'error': self.error,
+            'cancel_requested': self.cancel_requested,
+            'created_at': self.created_at,
+            'started_at': self.started_at,
+            'finished_at': self.finished_at
+        }
+
+class JobCancelled(Exception):
+    """Raised oleh pipeline saat job di-cancel di tengah proses"""
+    pass
+
+class JobQueue:
+    """SQLite-backed job queue, aman dipakai dari banyak threads"""
+
+    def __init__(self, db_path=None):
+        self.db_path = Path(db_path) if db_path else Path(__file__).parent.parent / "models" / "jobs.db"
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._claim_lock = threading.Lock()
+        self._job_available = threading.Condition()
+
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        """Connection per operasi (sqlite3 connections tidak di-share antar threads)"""
+        conn = sqlite3.connect(str(self.db_path), timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _row_to_job(self, row):
+        return Job(
+            id=row['id'],
+            status=row['status'],
+            priority=row['priority'],
+            input_source=row['input_source'],
+            is_url=bool(row['is_url']),
+            options=json.loads(row['options'] or '{}'),
+            stage=row['stage'],
+            progress=row['progress'],
+            result=json.loads(row['result']) if row['result'] else None,
+            error=row['error'],
+            cancel_requested=bool(row['cancel_requested']),
+            created_at=row['created_at'],
+            started_at=row['started_at'],
+            finished_at=row['finished_at']
+        )
+
+    def submit(self, input_source, options=None, priority='normal', is_url=None):
+        """
+        Submit job baru
+
+        Args:
+            input_source: Path video lokal atau URL YouTube
+            options: Dict processing options (lihat ProcessingPipeline.run)
+            priority: 'high', 'normal' atau 'low'
+
+        Returns:
+            Job id
+        """
+        if priority not in PRIORITY_CLASSES:
+            raise ValueError(f"Unknown priority class: {priority}")
+        if is_url is None:
+            is_url = str(input_source).startswith(('http://', 'https://'))
+
+        job_id = uuid.uuid4().hex
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT INTO jobs (id, status, priority, input_source, is_url, options, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (job_id, QUEUED, PRIORITY_CLASSES[priority], str(input_source),
+                 int(is_url), json.dumps(options or {}), time.time())
+            )
+
+        with self._job_available:
+            self._job_available.notify()
+
+        logger.info(f"Job {job_id} queued ({priority})")
+        return job_id
+
+    def claim(self, timeout=None):
+        """
+        Ambil job queued berikutnya (priority, lalu FIFO) dan tandai running
+
+        Returns:
+            Job, atau None jika tidak ada job sampai timeout
+        """
+        deadline = time.time() + timeout if timeout is not None else None
+
+        while True:
+            with self._claim_lock, self._connect() as conn:
+                row = conn.execute(
+                    "SELECT * FROM jobs WHERE status = ? ORDER BY priority, created_at LIMIT 1",
+                    (QUEUED,)
+                ).fetchone()
+                if row is not None:
+                    conn.execute(
+                        "UPDATE jobs SET status = ?, started_at = ? WHERE id = ?",
+                        (RUNNING, time.time(), row['id'])
+                    )
+                    job = self._row_to_job(row)
+                    job.status = RUNNING
+                    return job
+
+            remaining = deadline - time.time() if deadline is not None else None
+            if remaining is not None and remaining <= 0:
+                return None
+            with self._job_available:
+                self._job_available.wait(timeout=min(remaining, 5.0) if remaining is not None else 5.0)
+
+    def get(self, job_id) -> Optional[Job]:
+        """Get job by id"""
+        with self._connect() as conn:
+            row = conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return self._row_to_job(row) if row else None
+
+    def list_jobs(self, status=None, limit=100) -> List[Job]:
+        """List jobs terbaru (optional filter status)"""
+        with self._connect() as conn:
+            if status:
+                rows = conn.execute(
+                    "SELECT * FROM jobs WHERE status = ? ORDER BY created_at DESC LIMIT ?",
+                    (status, limit)
+                ).fetchall()
+            else:
+                rows = conn.execute(
+                    "SELECT * FROM jobs ORDER BY created_at DESC LIMIT ?", (limit,)
+                ).fetchall()
+        return [self._row_to_job(row) for row in rows]
+
+    def update_progress(self, job_id, progress, stage=None):
+        """Update progress (0-100) dan stage yang sedang berjalan"""
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET progress = ?, stage = COALESCE(?, stage) WHERE id = ?",
+                (progress, stage, job_id)
+            )
+
+    def finish(self, job_id, result):
+        """Tandai job selesai dengan result dict"""
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, progress = 100, result = ?, finished_at = ? WHERE id = ?",
+                (DONE, json.dumps(result, default=str), time.time(), job_id)
+            )
+
+    def fail(self, job_id, error):
+        """Tandai job gagal"""
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, error = ?, finished_at = ? WHERE id = ?",
+                (FAILED, str(error), time.time(), job_id)
+            )
+
+    def mark_cancelled(self, job_id):
+        """Tandai running job sudah berhenti karena cancel"""
+        with self._connect() as conn:
+            conn.execute(
+                "UPDATE jobs SET status = ?, finished_at = ? WHERE id = ?",
+                (CANCELLED, time.time(), job_id)
+            )
+
+    def cancel(self, job_id):
+        """
+        Cancel job: queued job langsung cancelled, running job diberi
+        cancel_requested dan berhenti di boundary stage berikutnya
+
+        Returns:
+            Status job setelah cancel, atau None jika job tidak ada
+        """
+        with self._claim_lock, self._connect() as conn:
+            row = conn.execute("SELECT status FROM jobs WHERE id = ?", (job_id,)).fetchone()
+            if row is None:
+                return None
+
+            if row['status'] == QUEUED:
+                conn.execute(
+                    "UPDATE jobs SET status = ?, finished_at = ? WHERE id = ?",
+                    (CANCELLED, time.time(), job_id)
+                )
+                return CANCELLED
+            if row['status'] == RUNNING:
+                conn.execute("UPDATE jobs SET cancel_requested = 1 WHERE id = ?", (job_id,))
+            return row['status']
+
+    def is_cancel_requested(self, job_id):
+        """Check apakah running job diminta berhenti"""
+        with self._connect() as conn:
+            row = conn.execute("SELECT cancel_requested FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return bool(row and row['cancel_requested'])
+
+    def recover(self):
+        """
+        Requeue jobs yang masih 'running' dari server sebelumnya (crash/restart)
+
+        Returns:
+            Jumlah jobs yang di-requeue
+        """
+        with self._connect() as conn:
+            cursor = conn.execute(
+                "UPDATE jobs SET status = ?, started_at = NULL, stage = NULL, progress = 0 "
+                "WHERE status = ? AND cancel_requested = 0",
+                (QUEUED, RUNNING)
+            )
+            conn.execute(
+                "UPDATE jobs SET status = ?, finished_at = ? WHERE status = ?",
+                (CANCELLED, time.time(), RUNNING)
+            )
+            return cursor.rowcount
+
+# Test function
+if __name__ == "__main__":
+    job_queue = JobQueue(db_path="/tmp/smartclip_jobs_test.db")
+
+    low = job_queue.submit("/path/to/low.mp4", priority='low')
+    high = job_queue.submit("/path/to/high.mp4", priority='high')
+
+    job = job_queue.claim(timeout=1)
+    print(f"Claimed: {job.id} ({job.priority_class}) - {job.input_source}")
+    job_queue.update_progress(job.id, 50, 'video_analysis')
+    job_queue.finish(job.id, {'output_files': []})
+
+    print(f"Cancel low priority job: {job_queue.cancel(low)}")
+    for job in job_queue.list_jobs():
+        print(job.to_status())
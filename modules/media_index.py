@@ -0,0 +1,534 @@
+#!/usr/bin/env python3
+"""
+Media Index Module
+Index persistent (SQLite di MODELS_DIR) berisi fingerprint setiap source video
+yang pernah diproses: audio fingerprint (sub-fingerprint 32-bit per hop, gaya
+Haitsma-Kalker) untuk lookup kandidat, chroma + energy features untuk
+alignment (modules.alignment) dan pHash dari sampled frames. Video yang sama
+di-upload ulang (URL lain, re-encode) atau versi yang di-trim / re-cut dikenali
+sebelum pipeline jalan, sehingga cached analysis bisa dipakai ulang.
+Analysis cache memakai msgpack (analysis_schema); tanpa msgpack index tidak
+dipakai sama sekali.
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import subprocess
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from config import MEDIA_INDEX
+from .alignment import AlignedSegment, TimelineMap, align_timelines
+from .analysis_schema import MSGPACK_AVAILABLE, AnalysisResult
+
+# Setup logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Audio fingerprint: mono 5512 Hz, frame 2048 samples (~0.37s), hop 256 samples (~46ms),
+# 33 log-spaced bands 300-2000 Hz -> 32 bits per hop
+FINGERPRINT_SAMPLE_RATE = 5512
+FINGERPRINT_FRAME = 2048
+FINGERPRINT_HOP = 256
+FINGERPRINT_BANDS = 33
+HOP_SECONDS = FINGERPRINT_HOP / FINGERPRINT_SAMPLE_RATE
+
+# Alignment features: 12 chroma bins + log energy, rata-rata per 2 hops (~93ms)
+FEATURE_STRIDE = 2
+FEATURE_SECONDS = FEATURE_STRIDE * HOP_SECONDS
+CHROMA_RANGE = (80, 2700)
+
+# Hanya setiap N-th sub-fingerprint masuk lookup table (query memakai semua hop)
+KEY_STRIDE = 2
+
+# Jumlah key hits minimal untuk kandidat match
+MIN_KEY_HITS = 20
+
+# Frames pHash yang dicek ulang per match (verifikasi visual)
+VERIFY_FRAMES = 4
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS media (
+    id TEXT PRIMARY KEY,
+    content_key TEXT NOT NULL,
+    path TEXT NOT NULL,
+    duration REAL NOT NULL,
+    audio_hashes BLOB,
+    frame_times BLOB,
+    frame_hashes BLOB,
+    audio_features BLOB,
+    analysis_path TEXT,
+    sample_key TEXT,
+    stages TEXT NOT NULL DEFAULT '[]',
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_media_content ON media (content_key);
+CREATE TABLE IF NOT EXISTS audio_keys (
+    key INTEGER NOT NULL,
+    media_id TEXT NOT NULL,
+    hop INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_audio_keys ON audio_keys (key);
+CREATE INDEX IF NOT EXISTS idx_audio_keys_media ON audio_keys (media_id);
+"""
+
+@dataclass
+class MediaFingerprint:
+    """Fingerprint satu video file"""
+    content_key: str
+    duration: float
+    audio_hashes: np.ndarray  # uint32 per hop (HOP_SECONDS)
+    audio_features: np.ndarray  # float32 (frames x 13) per FEATURE_SECONDS
+    frame_times: np.ndarray  # float64 detik
+    frame_hashes: np.ndarray  # uint64 pHash per frame_times
+    sample_key: str = ''  # sample_key(): konfirmasi exact match content_key
+
+@dataclass
+class MediaMatch:
+    """
+    Video di index yang cocok dengan input. segments: bagian video baru yang
+    ada di video lama, masing-masing dengan offset sendiri (waktu di video
+    lama = waktu di video baru + offset), jadi re-cut dengan urutan berbeda
+    juga bisa dipetakan.
+    """
+    media_id: str
+    kind: str  # 'exact', 'duplicate' atau 'partial'
+    segments: List[AlignedSegment]
+    coverage: float
+    analysis_path: Optional[str] = None
+    stages: List[str] = field(default_factory=list)
+
+    @property
+    def timeline(self):
+        return TimelineMap(self.segments)
+
+    @property
+    def ranges(self) -> List[Tuple[float, float]]:
+        return self.timeline.matched_ranges()
+
+    @property
+    def offset(self):
+        """Offset segment terpanjang (untuk logging)"""
+        return max(self.segments, key=lambda s: s.duration).offset if self.segments else 0.0
+
+    def carry_moments(self, moments, min_duration=0.0):
+        """
+        Moments dari cached analysis yang seluruhnya berada di satu matched
+        segment, dipindah ke timeline video baru
+        """
+        return [m for m in self.timeline.carry(moments) if m['end_time'] - m['start_time'] >= min_duration]
+
+    def unmatched_ranges(self, duration, min_length=1.0):
+        """Bagian video baru yang tidak ada di video lama (perlu dianalisis)"""
+        return self.timeline.unmatched_ranges(duration, min_length)
+
+def content_key(video_path, chunk_size=1024 * 1024):
+    """Key murah untuk file yang identik byte-per-byte: size + head + tail"""
+    path = Path(video_path)
+    size = path.stat().st_size
+    digest = hashlib.sha1(str(size).encode('utf-8'))
+    with open(path, 'rb') as f:
+        digest.update(f.read(chunk_size))
+        if size > 2 * chunk_size:
+            f.seek(size - chunk_size)
+            digest.update(f.read(chunk_size))
+    return digest.hexdigest()
+
+def sample_key(video_path, chunk_size=1024 * 1024):
+    """Hash 1 MB di tengah file: exact match (content_key) harus cocok juga di sini"""
+    path = Path(video_path)
+    size = path.stat().st_size
+    with open(path, 'rb') as f:
+        f.seek(max(size // 2 - chunk_size // 2, 0))
+        return hashlib.sha1(f.read(chunk_size)).hexdigest()
+
+def _probe_duration(video_path):
+    result = subprocess.run(
+        ['ffprobe', '-v', 'error', '-show_entries', 'format=duration', '-of', 'csv=p=0', str(video_path)],
+        capture_output=True, text=True, timeout=30
+    )
+    try:
+        return float(result.stdout.strip())
+    except ValueError:
+        return 0.0
+
+def _band_matrix():
+    """Power spectrum (rfft bins) -> energies per log-spaced band"""
+    freqs = np.fft.rfftfreq(FINGERPRINT_FRAME, 1.0 / FINGERPRINT_SAMPLE_RATE)
+    edges = np.geomspace(300, 2000, FINGERPRINT_BANDS + 1)
+    band = np.digitize(freqs, edges) - 1
+    matrix = np.zeros((len(freqs), FINGERPRINT_BANDS), dtype=np.float32)
+    inside = (band >= 0) & (band < FINGERPRINT_BANDS)
+    matrix[np.where(inside)[0], band[inside]] = 1.0
+    return matrix
+
+def _chroma_matrix():
+    """Power spectrum (rfft bins) -> 12 pitch classes (CHROMA_RANGE Hz)"""
+    freqs = np.fft.rfftfreq(FINGERPRINT_FRAME, 1.0 / FINGERPRINT_SAMPLE_RATE)
+    matrix = np.zeros((len(freqs), 12), dtype=np.float32)
+    inside = np.where((freqs >= CHROMA_RANGE[0]) & (freqs <= CHROMA_RANGE[1]))[0]
+    pitch_class = np.round(12 * np.log2(freqs[inside] / 440.0) + 69).astype(int) % 12
+    matrix[inside, pitch_class] = 1.0
+    return matrix
+
+def audio_signatures(video_path, chunk_seconds=60):
+    """
+    Dua signature dari satu pass FFT:
+
+    - Sub-fingerprints 32-bit per hop: tanda perubahan energy antar band yang
+      bertetangga dari frame ke frame (robust terhadap re-encode dan volume),
+      untuk lookup kandidat
+    - Chroma (dinormalisasi per frame) + log energy per FEATURE_SECONDS,
+      untuk alignment dengan cross-correlation
+
+    Audio dibaca dari ffmpeg per chunk, jadi memory tetap kecil.
+
+    Returns:
+        Tuple (uint32 hashes, float32 features (frames x 13)); kosong jika tidak ada audio
+    """
+    cmd = ['ffmpeg', '-nostdin', '-v', 'error', '-i', str(video_path), '-map', '0:a:0', '-vn',
+           '-ac', '1', '-ar', str(FINGERPRINT_SAMPLE_RATE), '-f', 'f32le', '-']
+    process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+
+    window = np.hanning(FINGERPRINT_FRAME).astype(np.float32)
+    bands = _band_matrix()
+    chroma_bins = _chroma_matrix()
+    energies, features = [], []
+    buffer = np.zeros(0, dtype=np.float32)
+    chunk_bytes = int(chunk_seconds * FINGERPRINT_SAMPLE_RATE) * 4
+    try:
+        while True:
+            data = process.stdout.read(chunk_bytes)
+            if not data:
+                break
+            buffer = np.concatenate([buffer, np.frombuffer(data[:len(data) // 4 * 4], dtype=np.float32)])
+            if len(buffer) < FINGERPRINT_FRAME:
+                continue
+            frames = np.lib.stride_tricks.sliding_window_view(buffer, FINGERPRINT_FRAME)[::FINGERPRINT_HOP]
+            spectrum = np.abs(np.fft.rfft(frames * window, axis=1)) ** 2
+            energies.append((spectrum @ bands).astype(np.float32))
+            chroma = spectrum @ chroma_bins
+            total = spectrum.sum(axis=1, keepdims=True)
+            features.append(np.hstack([chroma / (chroma.sum(axis=1, keepdims=True) + 1e-10),
+                                       np.log10(total + 1e-10)]).astype(np.float32))
+            buffer = buffer[len(frames) * FINGERPRINT_HOP:]
+    finally:
+        process.stdout.close()
+        process.wait()
+
+    empty = (np.zeros(0, dtype=np.uint32), np.zeros((0, 13), dtype=np.float32))
+    if not energies:
+        return empty
+    energies = np.concatenate(energies)
+    if len(energies) < 2:
+        return empty
+
+    band_diff = energies[:, :-1] - energies[:, 1:]
+    bits = (band_diff[1:] - band_diff[:-1]) > 0
+    packed = np.packbits(bits, axis=1, bitorder='big')
+    hashes = packed.view('>u4').reshape(-1).astype(np.uint32)
+
+    features = np.concatenate(features)
+    usable = len(features) // FEATURE_STRIDE * FEATURE_STRIDE
+    features = features[:usable].reshape(-1, FEATURE_STRIDE, features.shape[1]).mean(axis=1)
+    return hashes, features.astype(np.float32)
+
+# DCT-II matrix 32x32 untuk pHash
+_DCT = np.cos(np.pi * (2 * np.arange(32)[None, :] + 1) * np.arange(32)[:, None] / 64)
+
+def frame_phash(video_path, t):
+    """
+    pHash 63-bit dari frame di waktu t: grayscale 32x32, DCT, 8x8 koefisien
+    frekuensi rendah (tanpa DC) dibandingkan dengan median
+    """
+    result = subprocess.run(
+        ['ffmpeg', '-nostdin', '-v', 'error', '-ss', f"{max(t, 0):.3f}", '-i', str(video_path),
+         '-frames:v', '1', '-vf', 'scale=32:32:flags=area,format=gray', '-f', 'rawvideo', '-'],
+        capture_output=True, timeout=30
+    )
+    if len(result.stdout) < 32 * 32:
+        return None
+    pixels = np.frombuffer(result.stdout[:32 * 32], dtype=np.uint8).reshape(32, 32).astype(np.float64)
+    coefficients = (_DCT @ pixels @ _DCT.T)[:8, :8].reshape(-1)[1:]
+    bits = coefficients > np.median(coefficients)
+    return int(sum(1 << i for i, bit in enumerate(bits) if bit))
+
+def _hamming(a, b):
+    return bin(int(a) ^ int(b)).count('1')
+
+def compute_fingerprint(video_path, frame_interval=None, max_frames=None):
+    """Fingerprint lengkap (content key, audio signatures, sampled-frame pHash)"""
+    frame_interval = frame_interval or MEDIA_INDEX['frame_interval']
+    max_frames = max_frames or MEDIA_INDEX['max_frame_samples']
+
+    duration = _probe_duration(video_path)
+    audio_hashes, audio_features = audio_signatures(video_path)
+    if not duration:
+        duration = len(audio_hashes) * HOP_SECONDS
+
+    if duration / frame_interval > max_frames:
+        frame_interval = duration / max_frames
+    frame_times, frame_hashes = [], []
+    for t in np.arange(frame_interval / 2, duration, frame_interval):
+        phash = frame_phash(video_path, t)
+        if phash is not None:
+            frame_times.append(float(t))
+            frame_hashes.append(phash)
+
+    return MediaFingerprint(
+        content_key=content_key(video_path),
+        sample_key=sample_key(video_path),
+        duration=duration,
+        audio_hashes=audio_hashes,
+        audio_features=audio_features,
+        frame_times=np.array(frame_times, dtype=np.float64),
+        frame_hashes=np.array(frame_hashes, dtype=np.uint64)
+    )
+
+class MediaIndex:
+    """SQLite-backed media index + analysis cache (satu analysis file per media)"""
+
+    def __init__(self, db_path=None, cache_dir=None, settings=None):
+        self.settings = settings or MEDIA_INDEX
+        self.db_path = Path(db_path or self.settings['db_path'])
+        self.cache_dir = Path(cache_dir or self.settings['cache_dir'])
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._write_lock = threading.Lock()
+
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+            columns = {row['name'] for row in conn.execute("PRAGMA table_info(media)")}
+            if 'audio_features' not in columns:
+                conn.execute("ALTER TABLE media ADD COLUMN audio_features BLOB")
+            if 'sample_key' not in columns:
+                conn.execute("ALTER TABLE media ADD COLUMN sample_key TEXT")
+
+    @contextmanager
+    def _connect(self):
+        """Connection per operasi (sqlite3 connections tidak di-share antar threads)"""
+        conn = sqlite3.connect(str(self.db_path), timeout=30)
+        conn.row_factory = sqlite3.Row
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            yield conn
+            conn.commit()
+        finally:
+            conn.close()
+
+    def find_match(self, video_path, fingerprint) -> Optional[MediaMatch]:
+        """
+        Cari video di index yang sama (exact / duplicate) atau overlap
+        sebagian (partial) dengan input. Hanya entries dengan cached analysis.
+        Exact (semua stage results dipakai ulang) hanya jika content key,
+        durasi ffprobe dan sample tengah file semuanya cocok; selain itu
+        lewat audio alignment + verifikasi frames.
+        """
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT id, duration, analysis_path, sample_key, stages FROM media "
+                "WHERE content_key = ? AND analysis_path IS NOT NULL ORDER BY created_at DESC LIMIT 1",
+                (fingerprint.content_key,)
+            ).fetchone()
+        if row is not None and not self._confirm_exact(row, fingerprint):
+            logger.info(f"Content key matches media {row['id']} but duration / mid-file sample differ")
+        elif row is not None:
+            return MediaMatch(
+                media_id=row['id'], kind='exact', segments=[AlignedSegment(0.0, fingerprint.duration, 0.0, 1.0)],
+                coverage=1.0, analysis_path=row['analysis_path'], stages=json.loads(row['stages'])
+            )
+
+        if len(fingerprint.audio_hashes) == 0:
+            return None
+
+        best = None
+        for media_id in self._candidates(fingerprint.audio_hashes):
+            match = self._align(video_path, fingerprint, media_id)
+            if match is not None and (best is None or match.coverage > best.coverage):
+                best = match
+        return best
+
+    def _confirm_exact(self, row, fingerprint):
+        """Konfirmasi match content_key (size + head + tail) dengan durasi dan sample tengah file"""
+        return (bool(row['sample_key']) and row['sample_key'] == fingerprint.sample_key
+                and abs(row['duration'] - fingerprint.duration) < 0.1)
+
+    def _candidates(self, audio_hashes, limit=3):
+        """
+        Media ids dengan key hits terbanyak (pada satu offset) di lookup table.
+        Offset-nya tidak dipakai: re-cut punya beberapa offset, dicari ulang
+        oleh alignment.
+        """
+        query = [(int(key), hop) for hop, key in enumerate(audio_hashes) if key not in (0, 0xFFFFFFFF)]
+        with self._connect() as conn:
+            conn.execute("CREATE TEMP TABLE query_keys (key INTEGER NOT NULL, hop INTEGER NOT NULL)")
+            conn.executemany("INSERT INTO query_keys (key, hop) VALUES (?, ?)", query)
+            rows = conn.execute(
+                "SELECT a.media_id AS media_id, a.hop - q.hop AS delta, COUNT(*) AS hits "
+                "FROM audio_keys a JOIN query_keys q ON a.key = q.key "
+                "GROUP BY a.media_id, delta HAVING hits >= ? ORDER BY hits DESC LIMIT 50",
+                (MIN_KEY_HITS,)
+            ).fetchall()
+
+        candidates = []
+        seen = set()
+        for row in rows:
+            if row['media_id'] in seen:
+                continue
+            seen.add(row['media_id'])
+            candidates.append(row['media_id'])
+            if len(candidates) >= limit:
+                break
+        return candidates
+
+    def _align(self, video_path, fingerprint, media_id):
+        """Aligned segments video baru terhadap satu kandidat (chroma + energy features)"""
+        with self._connect() as conn:
+            row = conn.execute(
+                "SELECT * FROM media WHERE id = ? AND analysis_path IS NOT NULL", (media_id,)
+            ).fetchone()
+        if row is None or not row['audio_features']:
+            return None  # Entry lama tanpa features: tidak bisa di-align
+        reference = np.frombuffer(row['audio_features'], dtype=np.float16).reshape(-1, 13).astype(np.float32)
+
+        segments = align_timelines(
+            fingerprint.audio_features, reference, FEATURE_SECONDS,
+            block_seconds=self.settings['align_block_seconds'],
+            min_correlation=self.settings['min_correlation'],
+            min_segment_seconds=self.settings['min_overlap_seconds']
+        )
+        segments = [s for s in segments if self._verify_frames(video_path, row, s)]
+        if not segments:
+            return None
+
+        coverage = sum(s.duration for s in segments) / max(fingerprint.duration, 1e-6)
+        same_cut = (len(segments) == 1 and abs(segments[0].offset) < 0.5
+                    and abs(fingerprint.duration - row['duration']) < 1.0)
+        kind = 'duplicate' if same_cut and coverage >= self.settings['duplicate_coverage'] else 'partial'
+        if kind == 'duplicate':
+            segments = [AlignedSegment(0.0, fingerprint.duration, 0.0, segments[0].score)]
+        return MediaMatch(
+            media_id=media_id, kind=kind, segments=segments, coverage=coverage,
+            analysis_path=row['analysis_path'], stages=json.loads(row['stages'])
+        )
+
+    def _verify_frames(self, video_path, row, segment):
+        """pHash frames video lama vs frame di posisi yang sama di video baru (per segment)"""
+        frame_times = np.frombuffer(row['frame_times'] or b'', dtype=np.float64)
+        frame_hashes = np.frombuffer(row['frame_hashes'] or b'', dtype=np.uint64)
+        offset = segment.offset
+        inside = [
+            (t, h) for t, h in zip(frame_times, frame_hashes)
+            if segment.start + 1.0 <= t - offset <= segment.end - 1.0
+        ]
+        if not inside:
+            return True  # Tidak ada frame untuk dicek: percaya audio
+        step = max(1, len(inside) // VERIFY_FRAMES)
+        distances = []
+        for t, old_hash in inside[::step][:VERIFY_FRAMES]:
+            new_hash = frame_phash(video_path, t - offset)
+            if new_hash is not None:
+                distances.append(_hamming(old_hash, new_hash))
+        if distances and np.median(distances) > self.settings['max_phash_distance']:
+            logger.info(f"Audio matches media {row['id']} at {segment.start:.0f}-{segment.end:.0f}s but frames differ")
+            return False
+        return True
+
+    def load_analysis(self, match):
+        """Cached analysis results (dict) untuk match, atau None"""
+        if Path(match.analysis_path).suffix != '.analysis':
+            logger.info(f"Ignoring legacy analysis cache {match.analysis_path}")
+            return None
+        try:
+            return AnalysisResult.load(match.analysis_path).to_results()
+        except Exception as e:
+            logger.warning(f"Could not load cached analysis {match.analysis_path}: {e}")
+            return None
+
+    def store(self, video_path, fingerprint, analysis, stages):
+        """
+        Simpan fingerprint + analysis results. Entry lama dengan content key
+        yang sama diganti.
+
+        Args:
+            analysis: Dict stage results (moments, face_data, speaker_data, subtitle_data, ...)
+            stages: Stages yang hasilnya lengkap dan boleh dipakai ulang
+
+        Returns:
+            media_id, atau None jika msgpack tidak terinstall (tidak di-cache)
+        """
+        if not MSGPACK_AVAILABLE:
+            logger.warning("msgpack not installed, analysis results not cached (pip install msgpack)")
+            return None
+        media_id = uuid.uuid4().hex
+        analysis_path = self.cache_dir / f"{media_id}.analysis"
+        AnalysisResult.from_results(analysis).save(analysis_path)
+
+        keys = [(int(key), media_id, hop) for hop, key in enumerate(fingerprint.audio_hashes)
+                if hop % KEY_STRIDE == 0 and key not in (0, 0xFFFFFFFF)]
+        with self._write_lock, self._connect() as conn:
+            for old in conn.execute("SELECT id, analysis_path FROM media WHERE content_key = ?",
+                                    (fingerprint.content_key,)).fetchall():
+                self._delete(conn, old)
+            conn.execute(
+                "INSERT INTO media (id, content_key, path, duration, audio_hashes, frame_times, frame_hashes, "
+                "audio_features, analysis_path, sample_key, stages, created_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (media_id, fingerprint.content_key, str(video_path), fingerprint.duration,
+                 fingerprint.audio_hashes.astype(np.uint32).tobytes(),
+                 fingerprint.frame_times.astype(np.float64).tobytes(),
+                 fingerprint.frame_hashes.astype(np.uint64).tobytes(),
+                 fingerprint.audio_features.astype(np.float16).tobytes(),
+                 str(analysis_path), fingerprint.sample_key, json.dumps(sorted(stages)), time.time())
+            )
+            conn.executemany("INSERT INTO audio_keys (key, media_id, hop) VALUES (?, ?, ?)", keys)
+
+        logger.info(f"Indexed {Path(video_path).name} as {media_id} ({len(keys)} audio keys)")
+        return media_id
+
+    def _delete(self, conn, row):
+        conn.execute("DELETE FROM audio_keys WHERE media_id = ?", (row['id'],))
+        conn.execute("DELETE FROM media WHERE id = ?", (row['id'],))
+        if row['analysis_path']:
+            Path(row['analysis_path']).unlink(missing_ok=True)
+
+# Singleton instance
+_media_index = None
+_media_index_lock = threading.Lock()
+
+def get_media_index():
+    """Get singleton MediaIndex instance"""
+    global _media_index
+    with _media_index_lock:
+        if _media_index is None:
+            _media_index = MediaIndex()
+        return _media_index
+
+# Test function
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) < 2:
+        print("Usage: python -m modules.media_index <video_file>")
+        sys.exit(1)
+
+    index = get_media_index()
+    fingerprint = compute_fingerprint(sys.argv[1])
+    print(f"Duration {fingerprint.duration:.1f}s, {len(fingerprint.audio_hashes)} audio hashes, "
+          f"{len(fingerprint.frame_hashes)} frame hashes")
+    match = index.find_match(sys.argv[1], fingerprint)
+    if match:
+        print(f"Match {match.media_id}: {match.kind}, coverage {match.coverage:.0%}")
+        for segment in match.segments:
+            print(f"  {segment.start:.1f}-{segment.end:.1f}s -> offset {segment.offset:+.2f}s")
+    else:
+        print("No match in index")
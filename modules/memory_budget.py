@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Memory Budget Module
+Batas RAM global (PROCESSING['memory_budget_gb']) untuk semua jobs di process
+ini. Stages me-reserve perkiraan working set sebelum mulai dan menunggu jika
+budget penuh (backpressure antar stages dan jobs), frame queues ke process pool
+dibatasi dalam bytes, batch sizes turun otomatis saat RSS mendekati budget, dan
+intermediate arrays besar di-spill ke memmap di TEMP_DIR.
+"""
+
+import logging
+import os
+import shutil
+import threading
+import time
+import uuid
+import weakref
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+import psutil
+
+from config import PROCESSING, TEMP_DIR
+
+# Setup logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Budget jika memory_budget_gb None: fraksi dari RAM fisik
+DEFAULT_BUDGET_FRACTION = 0.7
+
+# Pressure (RSS / budget): batch size dipotong setengah per level yang terlewati
+PRESSURE_LEVELS = (0.75, 0.85, 0.95)
+
+# Bagian dari sisa budget yang boleh dipakai satu bounded frame queue
+QUEUE_FRACTION = 0.25
+
+# Interval (detik) cek ulang RSS selama reservation menunggu
+RESERVE_POLL_INTERVAL = 1.0
+
+def _remove_spill_file(path):
+    try:
+        path.unlink(missing_ok=True)
+    except OSError:
+        pass  # Windows: file masih di-map, dibersihkan saat start berikutnya
+
+class MemoryBudget:
+    def __init__(self, budget_bytes=None, wait_timeout=None, spill_threshold=None, spill_dir=None):
+        """
+        Initialize memory budget
+
+        Args:
+            budget_bytes: Batas RAM process + worker processes (None = dari config)
+            wait_timeout: Maksimal detik stage menunggu budget sebelum tetap lanjut
+            spill_threshold: Arrays sebesar ini (bytes) atau lebih di-spill ke memmap
+            spill_dir: Folder untuk spill files (default TEMP_DIR/spill); tiap
+                process memakai subfolder pid-<pid> di dalamnya
+        """
+        if budget_bytes is None:
+            if PROCESSING.get('memory_budget_gb'):
+                budget_bytes = int(PROCESSING['memory_budget_gb'] * 1024 ** 3)
+            else:
+                budget_bytes = int(psutil.virtual_memory().total * DEFAULT_BUDGET_FRACTION)
+        self.budget_bytes = budget_bytes
+        self.wait_timeout = wait_timeout if wait_timeout is not None else PROCESSING.get('memory_wait', 600)
+        if spill_threshold is None:
+            spill_threshold = int(PROCESSING.get('spill_threshold_mb', 256) * 1024 ** 2)
+        self.spill_threshold = spill_threshold
+        self.spill_root = Path(spill_dir or TEMP_DIR / "spill")
+        self.spill_dir = self.spill_root / f"pid-{os.getpid()}"
+
+        self._process = psutil.Process(os.getpid())
+        self._reserved = 0
+        self._condition = threading.Condition()
+        self._last_batch_sizes = {}
+
+        self._cleanup_spill_dir()
+
+    def _cleanup_spill_dir(self):
+        """
+        Hapus spill folders sisa process yang sudah mati (crash / Windows).
+        Folder process lain yang masih berjalan (server + batch di mesin yang
+        sama) tidak disentuh.
+        """
+        if not self.spill_root.exists():
+            return
+        for path in self.spill_root.glob("pid-*"):
+            try:
+                pid = int(path.name[len("pid-"):])
+            except ValueError:
+                continue
+            if pid != os.getpid() and not psutil.pid_exists(pid):
+                shutil.rmtree(path, ignore_errors=True)
+
+    def rss(self):
+        """RSS process ini ditambah child processes (worker pools)"""
+        try:
+            rss = self._process.memory_info().rss
+            for child in self._process.children(recursive=True):
+                try:
+                    rss += child.memory_info().rss
+                except (psutil.NoSuchProcess, psutil.AccessDenied):
+                    continue
+            return rss
+        except Exception:
+            return 0
+
+    def pressure(self):
+        """RSS sebagai fraksi dari budget (> 1.0 = over budget)"""
+        return self.rss() / max(self.budget_bytes, 1)
+
+    def _committed(self):
+        # Reservations adalah perkiraan working set stages yang sedang berjalan,
+        # dan RSS sudah termasuk working set tersebut: ambil yang terbesar
+        return max(self._reserved, self.rss())
+
+    @contextmanager
+    def reserve(self, nbytes):
+        """
+        Reserve RAM sebelum stage mulai. Block selama budget penuh; jika tidak
+        ada reservation lain yang bisa selesai atau wait_timeout habis, stage
+        tetap lanjut (soft budget, tidak deadlock).
+        """
+        nbytes = max(int(nbytes), 0)
+        with self._condition:
+            deadline = time.monotonic() + self.wait_timeout
+            waited = False
+            while self._reserved > 0 and self._committed() + nbytes > self.budget_bytes:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    logger.warning(f"Memory budget still full after {self.wait_timeout}s, continuing anyway")
+                    break
+                if not waited:
+                    logger.info(f"Memory budget full ({self._committed() / 1024 ** 3:.1f} GB), waiting...")
+                    waited = True
+                # RSS turun tanpa notify (GC, worker selesai): cek ulang berkala
+                self._condition.wait(timeout=min(remaining, RESERVE_POLL_INTERVAL))
+            self._reserved += nbytes
+
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._reserved -= nbytes
+                self._condition.notify_all()
+
+    def batch_size(self, base=None):
+        """
+        Batch size untuk pressure saat ini: base (default PROCESSING['batch_size'])
+        dipotong setengah untuk setiap level di PRESSURE_LEVELS yang terlewati, minimal 1
+        """
+        base = max(1, int(base or PROCESSING.get('batch_size', 8)))
+        level = sum(1 for threshold in PRESSURE_LEVELS if self.pressure() >= threshold)
+        size = max(1, base >> level)
+
+        if self._last_batch_sizes.get(base) != size:
+            if size < base:
+                logger.info(f"Memory pressure high, batch size {base} -> {size}")
+            self._last_batch_sizes[base] = size
+        return size
+
+    def queue_slots(self, item_bytes, default, minimum=2):
+        """
+        Kapasitas bounded queue: default, dibatasi supaya item in-flight
+        tidak melewati QUEUE_FRACTION dari sisa budget
+        """
+        with self._condition:
+            headroom = max(self.budget_bytes - self._committed(), 0)
+        limit = int(headroom * QUEUE_FRACTION) // max(int(item_bytes), 1)
+        return max(minimum, min(int(default), limit))
+
+    def empty(self, shape, dtype=np.float32):
+        """Array kosong: di RAM, atau memmap di spill_dir jika >= spill_threshold"""
+        shape = tuple(np.atleast_1d(shape).astype(int))
+        dtype = np.dtype(dtype)
+        nbytes = int(np.prod(shape)) * dtype.itemsize
+        if nbytes == 0 or nbytes < self.spill_threshold:
+            return np.empty(shape, dtype=dtype)
+
+        self.spill_dir.mkdir(parents=True, exist_ok=True)
+        path = self.spill_dir / f"{uuid.uuid4().hex}.mmap"
+        array = np.memmap(path, dtype=dtype, mode='w+', shape=shape)
+        # Views (slices) menyimpan referensi ke array ini, file dihapus setelah semuanya hilang
+        weakref.finalize(array, _remove_spill_file, path)
+        logger.debug(f"Spilled {nbytes / 1024 ** 2:.0f} MB array to {path}")
+        return array
+
+    def spill(self, array):
+        """Pindahkan array >= spill_threshold ke memmap; array kecil dikembalikan apa adanya"""
+        if array.nbytes < self.spill_threshold or isinstance(array, np.memmap):
+            return array
+        spilled = self.empty(array.shape, array.dtype)
+        spilled[...] = array
+        return spilled
+
+    def concatenate(self, arrays, dtype=None):
+        """np.concatenate (axis 0) tanpa copy penuh di RAM jika hasilnya besar"""
+        arrays = [np.asarray(a) for a in arrays]
+        if not arrays:
+            return np.zeros(0, dtype=dtype or np.float32)
+
+        dtype = dtype or np.result_type(*arrays)
+        out = self.empty((sum(len(a) for a in arrays),) + arrays[0].shape[1:], dtype)
+        position = 0
+        for a in arrays:
+            out[position:position + len(a)] = a
+            position += len(a)
+        return out
+
+    def stats(self):
+        """Snapshot untuk logging / metrics"""
+        with self._condition:
+            return {
+                'budget_bytes': self.budget_bytes,
+                'rss_bytes': self.rss(),
+                'reserved_bytes': self._reserved,
+                'spill_threshold': self.spill_threshold
+            }
+
+# Singleton instance
+_memory_budget = None
+_memory_budget_lock = threading.Lock()
+
+def get_memory_budget():
+    """Get singleton MemoryBudget instance (di-share semua jobs di process ini)"""
+    global _memory_budget
+    with _memory_budget_lock:
+        if _memory_budget is None:
+            _memory_budget = MemoryBudget()
+        return _memory_budget
+
+# Test function
+if __name__ == "__main__":
+    import tempfile
+
+    budget = MemoryBudget(spill_threshold=1024 * 1024, spill_dir=tempfile.mkdtemp())
+    print(budget.stats())
+    print(f"Pressure: {budget.pressure():.2f}, batch size: {budget.batch_size(8)}")
+    print(f"1080p frame queue slots: {budget.queue_slots(1920 * 1080 * 3, 8)}")
+
+    audio = budget.concatenate([np.ones(200_000, dtype=np.float32), np.zeros(200_000, dtype=np.float32)])
+    print(f"Concatenated {type(audio).__name__} {audio.shape}, sum={audio.sum():.0f}")
+    print(f"Spill files: {[p.name for p in budget.spill_dir.iterdir()]}")
+    del audio
+    print(f"Spill files after del: {[p.name for p in budget.spill_dir.iterdir()]}")
@@ -0,0 +1,450 @@
+#!/usr/bin/env python3
+"""
+Metrics Module
+Instrumentasi per-stage untuk capacity planning: wall time, CPU time,
+frames/samples yang diproses, cache hits dan peak memory.
+Satu MetricsCollector per job (PipelineJob.metrics); modules memakai
+get_metrics(), yang mengembalikan collector job yang sedang dijalankan di
+thread ini (use_metrics). Registry global hanya untuk Prometheus export
+(total semua jobs di process ini).
+Hasil bisa di-export ke JSON, Prometheus text file, atau endpoint HTTP lokal.
+"""
+
+import contextvars
+import json
+import logging
+import os
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass, asdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import psutil
+
+# Setup logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+METRIC_PREFIX = "smartclip"
+
+# Collector job dan stage yang sedang berjalan di thread / context ini
+_current_collector = contextvars.ContextVar('metrics_collector', default=None)
+_current_stage = contextvars.ContextVar('metrics_stage', default=None)
+
+@dataclass
+class StageMetrics:
+    """Data class untuk metrics satu stage pipeline"""
+    stage: str
+    runs: int = 0
+    wall_time: float = 0.0
+    cpu_time: float = 0.0  # Thread stage + worker processes yang dilaporkan (add_cpu_time)
+    frames: int = 0
+    samples: int = 0
+    cache_hits: int = 0
+    cache_misses: int = 0
+    peak_rss: int = 0  # bytes, process + child processes
+    work_done: float = 0.0  # progress dalam unit kerja stage (frames, audio seconds)
+    last_started: Optional[float] = None
+    last_finished: Optional[float] = None
+
+class MetricsCollector:
+    """Collector thread-safe untuk satu job, menerima laporan dari semua modules"""
+
+    def __init__(self, job_id=None, sample_interval=0.2):
+        self.job_id = job_id or uuid.uuid4().hex[:8]
+        self.sample_interval = sample_interval
+        self._lock = threading.Lock()
+        self._stages: Dict[str, StageMetrics] = {}
+        self._active: Dict[str, int] = {}  # stage -> nesting depth
+        self._process = psutil.Process(os.getpid())
+
+        self._sampler = None
+        self._listeners: List[Callable] = []
+
+    def add_listener(self, listener):
+        """
+        Register listener untuk stage events
+
+        Listener dipanggil sebagai listener(event, stage, **info) dengan event:
+        'start', 'advance' (info: work_done) dan 'finish' (info: work, seconds);
+        info selalu berisi job_id collector ini
+        """
+        with self._lock:
+            if listener not in self._listeners:
+                self._listeners.append(listener)
+
+    def remove_listener(self, listener):
+        """Unregister listener"""
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+    def _notify(self, event, stage, **info):
+        """Panggil semua listeners (di luar lock)"""
+        with self._lock:
+            listeners = list(self._listeners)
+        for listener in listeners:
+            try:
+                listener(event, stage, job_id=self.job_id, **info)
+            except Exception as e:
+                logger.warning(f"Metrics listener error: {e}")
+
+    def _get_stage(self, stage):
+        """Get atau create StageMetrics (caller harus memegang lock)"""
+        metrics = self._stages.get(stage)
+        if metrics is None:
+            metrics = StageMetrics(stage=stage)
+            self._stages[stage] = metrics
+        return metrics
+
+    def _current_rss(self):
+        """RSS process ini ditambah child processes (worker pools)"""
+        try:
+            rss = self._process.memory_info().rss
+            for child in self._process.children(recursive=True):
+                try:
+                    rss += child.memory_info().rss
+                except (psutil.NoSuchProcess, psutil.AccessDenied):
+                    continue
+            return rss
+        except Exception:
+            return 0
+
+    def _update_peak(self):
+        """Sample RSS dan update peak untuk semua stage yang sedang aktif"""
+        rss = self._current_rss()
+        with self._lock:
+            for stage in self._active:
+                metrics = self._get_stage(stage)
+                if rss > metrics.peak_rss:
+                    metrics.peak_rss = rss
+
+    def _sampler_loop(self):
+        """Background sampler untuk peak memory; berhenti saat tidak ada stage aktif"""
+        while True:
+            with self._lock:
+                if not self._active:
+                    self._sampler = None
+                    return
+            self._update_peak()
+            time.sleep(self.sample_interval)
+
+    def _ensure_sampler(self):
+        with self._lock:
+            if self._sampler is None:
+                self._sampler = threading.Thread(target=self._sampler_loop, name=f"metrics-{self.job_id}", daemon=True)
+                self._sampler.start()
+
+    @contextmanager
+    def stage(self, stage):
+        """
+        Context manager untuk mengukur satu run dari stage
+
+        Usage:
+            with get_metrics().stage('face_tracking'):
+                ...
+        """
+        wall_start = time.perf_counter()
+        # CPU time thread ini saja: jobs lain di process yang sama tidak ikut terhitung
+        cpu_start = time.thread_time()
+
+        with self._lock:
+            metrics = self._get_stage(stage)
+            metrics.runs += 1
+            metrics.last_started = time.time()
+            self._active[stage] = self._active.get(stage, 0) + 1
+            work_start = metrics.work_done
+
+        self._ensure_sampler()
+        self._update_peak()
+        self._notify('start', stage)
+
+        collector_token = _current_collector.set(self)
+        stage_token = _current_stage.set(stage)
+        try:
+            yield metrics
+        finally:
+            _current_stage.reset(stage_token)
+            _current_collector.reset(collector_token)
+            self._update_peak()
+            wall = time.perf_counter() - wall_start
+            cpu = time.thread_time() - cpu_start
+
+            with self._lock:
+                metrics.wall_time += wall
+                metrics.cpu_time += cpu
+                metrics.last_finished = time.time()
+                run_work = metrics.work_done - work_start
+
+                depth = self._active.get(stage, 1) - 1
+                if depth > 0:
+                    self._active[stage] = depth
+                else:
+                    self._active.pop(stage, None)
+
+            self._notify('finish', stage, work=run_work, seconds=wall)
+
+    def record(self, stage, frames=0, samples=0, cache_hits=0, cache_misses=0):
+        """Tambahkan counters untuk stage (frames, audio samples, cache)"""
+        with self._lock:
+            metrics = self._get_stage(stage)
+            metrics.frames += frames
+            metrics.samples += samples
+            metrics.cache_hits += cache_hits
+            metrics.cache_misses += cache_misses
+
+    def add_cpu_time(self, seconds, stage=None):
+        """
+        CPU time dari worker processes (parallel.py) untuk stage yang sedang
+        berjalan di context ini (default) atau stage yang disebutkan
+        """
+        stage = stage or _current_stage.get()
+        if not stage or seconds <= 0:
+            return
+        with self._lock:
+            self._get_stage(stage).cpu_time += seconds
+
+    def merge(self, other):
+        """Tambahkan counters collector lain (registry: total jobs yang sudah selesai)"""
+        with other._lock:
+            stages = [StageMetrics(**asdict(metrics)) for metrics in other._stages.values()]
+        with self._lock:
+            for theirs in stages:
+                ours = self._get_stage(theirs.stage)
+                for attribute in ('runs', 'wall_time', 'cpu_time', 'frames', 'samples',
+                                  'cache_hits', 'cache_misses', 'work_done'):
+                    setattr(ours, attribute, getattr(ours, attribute) + getattr(theirs, attribute))
+                ours.peak_rss = max(ours.peak_rss, theirs.peak_rss)
+                ours.last_started = max(filter(None, (ours.last_started, theirs.last_started)), default=None)
+                ours.last_finished = max(filter(None, (ours.last_finished, theirs.last_finished)), default=None)
+
+    def advance(self, stage, units):
+        """
+        Laporkan progress stage dalam unit kerjanya sendiri
+        (sampled frames, audio seconds, output frames)
+        """
+        with self._lock:
+            metrics = self._get_stage(stage)
+            metrics.work_done += units
+            work_done = metrics.work_done
+        self._notify('advance', stage, work_done=work_done)
+
+    def to_dict(self):
+        """Export metrics ke dict yang JSON-serializable"""
+        with self._lock:
+            stages = {name: asdict(metrics) for name, metrics in self._stages.items()}
+
+        totals = {
+            'wall_time': sum(s['wall_time'] for s in stages.values()),
+            'cpu_time': sum(s['cpu_time'] for s in stages.values()),
+            'frames': sum(s['frames'] for s in stages.values()),
+            'samples': sum(s['samples'] for s in stages.values()),
+            'cache_hits': sum(s['cache_hits'] for s in stages.values()),
+            'peak_rss': max((s['peak_rss'] for s in stages.values()), default=0)
+        }
+
+        return {
+            'job_id': self.job_id,
+            'collected_at': time.time(),
+            'hostname': os.uname().nodename if hasattr(os, 'uname') else '',
+            'stages': stages,
+            'totals': totals
+        }
+
+    def to_prometheus(self):
+        """Export metrics dalam Prometheus text exposition format"""
+        definitions = [
+            ('stage_runs_total', 'counter', 'Number of times the stage ran', 'runs'),
+            ('stage_wall_seconds_total', 'counter', 'Wall clock seconds spent in the stage', 'wall_time'),
+            ('stage_cpu_seconds_total', 'counter', 'CPU seconds of the stage thread and its worker tasks', 'cpu_time'),
+            ('stage_frames_total', 'counter', 'Video frames processed by the stage', 'frames'),
+            ('stage_samples_total', 'counter', 'Audio samples processed by the stage', 'samples'),
+            ('stage_cache_hits_total', 'counter', 'Cache hits reported by the stage', 'cache_hits'),
+            ('stage_cache_misses_total', 'counter', 'Cache misses reported by the stage', 'cache_misses'),
+            ('stage_peak_rss_bytes', 'gauge', 'Peak resident memory observed during the stage', 'peak_rss'),
+            ('stage_work_units_total', 'counter', 'Work units (frames or audio seconds) completed by the stage', 'work_done')
+        ]
+
+        with self._lock:
+            stages = sorted(self._stages.values(), key=lambda m: m.stage)
+
+        lines = []
+        for metric_name, metric_type, help_text, attribute in definitions:
+            full_name = f"{METRIC_PREFIX}_{metric_name}"
+            lines.append(f"# HELP {full_name} {help_text}")
+            lines.append(f"# TYPE {full_name} {metric_type}")
+            for metrics in stages:
+                value = getattr(metrics, attribute)
+                lines.append(f'{full_name}{{stage="{metrics.stage}"}} {value}')
+
+        return "\n".join(lines) + "\n"
+
+    def write_json(self, output_path):
+        """Save metrics ke JSON file"""
+        try:
+            with open(output_path, 'w', encoding='utf-8') as f:
+                json.dump(self.to_dict(), f, indent=2)
+            return True
+        except Exception as e:
+            logger.error(f"Error saving metrics JSON: {e}")
+            return False
+
+    def write_prometheus(self, output_path):
+        """
+        Tulis Prometheus text file secara atomic
+        (compatible dengan node_exporter textfile collector)
+        """
+        try:
+            output_path = Path(output_path)
+            tmp_path = output_path.with_suffix(output_path.suffix + '.tmp')
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(self.to_prometheus())
+            os.replace(tmp_path, output_path)
+            return True
+        except Exception as e:
+            logger.error(f"Error writing Prometheus text file: {e}")
+            return False
+
+class MetricsRegistry:
+    """
+    Semua job collectors di process ini, hanya untuk export (Prometheus,
+    /metrics.json): total jobs yang sudah selesai ditambah jobs yang sedang berjalan
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._active: Dict[str, MetricsCollector] = {}
+        self._finished = MetricsCollector(job_id='finished')
+        # Untuk laporan di luar job (module test blocks, tools)
+        self.default = MetricsCollector(job_id='default')
+        self._http_server = None
+
+    def register(self, collector):
+        """Collector job yang mulai berjalan"""
+        with self._lock:
+            self._active[collector.job_id] = collector
+
+    def unregister(self, collector):
+        """Job selesai: counters-nya masuk ke total finished jobs"""
+        with self._lock:
+            if self._active.pop(collector.job_id, None) is None:
+                return
+        self._finished.merge(collector)
+
+    def snapshot(self):
+        """Collector baru berisi total semua jobs (finished + active + default)"""
+        with self._lock:
+            collectors = [self._finished, self.default] + list(self._active.values())
+        total = MetricsCollector(job_id='total')
+        for collector in collectors:
+            total.merge(collector)
+        return total
+
+    def to_prometheus(self):
+        return self.snapshot().to_prometheus()
+
+    def to_dict(self):
+        with self._lock:
+            active_jobs = list(self._active)
+        result = self.snapshot().to_dict()
+        result['active_jobs'] = active_jobs
+        return result
+
+    def write_prometheus(self, output_path):
+        return self.snapshot().write_prometheus(output_path)
+
+    def start_http_server(self, port, host='127.0.0.1'):
+        """
+        Start endpoint HTTP lokal: /metrics (Prometheus) dan /metrics.json
+        """
+        if self._http_server is not None:
+            return self._http_server
+
+        registry = self
+
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path == '/metrics':
+                    body = registry.to_prometheus().encode('utf-8')
+                    content_type = 'text/plain; version=0.0.4; charset=utf-8'
+                elif self.path == '/metrics.json':
+                    body = json.dumps(registry.to_dict()).encode('utf-8')
+                    content_type = 'application/json'
+                else:
+                    self.send_error(404)
+                    return
+
+                self.send_response(200)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # Jangan spam console
+
+        try:
+            self._http_server = ThreadingHTTPServer((host, port), MetricsHandler)
+            thread = threading.Thread(target=self._http_server.serve_forever, daemon=True)
+            thread.start()
+            logger.info(f"Metrics endpoint available at http://{host}:{port}/metrics")
+        except Exception as e:
+            logger.error(f"Error starting metrics endpoint: {e}")
+            self._http_server = None
+
+        return self._http_server
+
+    def stop_http_server(self):
+        """Stop endpoint HTTP jika berjalan"""
+        if self._http_server is not None:
+            self._http_server.shutdown()
+            self._http_server.server_close()
+            self._http_server = None
+
+# Singleton instance
+_registry = None
+_registry_lock = threading.Lock()
+
+def get_metrics_registry():
+    """Get singleton MetricsRegistry (export semua jobs di process ini)"""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = MetricsRegistry()
+        return _registry
+
+def get_metrics():
+    """
+    MetricsCollector job yang sedang berjalan di context ini (lihat use_metrics);
+    di luar job: collector default registry
+    """
+    collector = _current_collector.get()
+    return collector if collector is not None else get_metrics_registry().default
+
+@contextmanager
+def use_metrics(collector):
+    """Laporan get_metrics() di dalam block ini masuk ke collector (satu job)"""
+    token = _current_collector.set(collector)
+    try:
+        yield collector
+    finally:
+        _current_collector.reset(token)
+
+# Test function
+if __name__ == "__main__":
+    registry = get_metrics_registry()
+    collector = MetricsCollector(job_id='test')
+    registry.register(collector)
+
+    with use_metrics(collector):
+        with get_metrics().stage('test_stage'):
+            data = [i * i for i in range(200000)]
+            get_metrics().record('test_stage', frames=10, samples=len(data), cache_hits=1)
+
+    print(json.dumps(collector.to_dict(), indent=2))
+    registry.unregister(collector)
+    print(registry.to_prometheus())
@@ -0,0 +1,621 @@
+#!/usr/bin/env python3
+"""
+Parallel Processing Module
+Process pool untuk CPU-bound stages (face detection, feature extraction,
+scene detection). Frames dikirim ke workers lewat ring buffer di shared memory,
+bukan dengan pickling NumPy arrays.
+"""
+
+import atexit
+import contextvars
+import logging
+import math
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from multiprocessing import shared_memory
+from typing import Tuple
+
+import numpy as np
+
+from config import PROCESSING
+from .memory_budget import get_memory_budget
+from .metrics import get_metrics
+
+# Setup logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Nice value untuk worker processes supaya GUI (Tk event loop) tetap responsive
+WORKER_NICE_INCREMENT = 10
+
+# Shard minimal (detik) supaya overhead seek/startup decoder tetap kecil
+MIN_SHARD_SECONDS = 60.0
+
+# Gap (detik) antar sample di atas ini lebih murah di-seek daripada grab()
+SEEK_THRESHOLD = 5.0
+
+# Tinggi wajah (relatif ke tinggi frame) yang dianggap close-up penuh (size = 1.0)
+FACE_CLOSEUP_HEIGHT = 0.4
+
+@dataclass(frozen=True)
+class FrameRef:
+    """Referensi ringan ke satu frame di shared memory (murah untuk di-pickle)"""
+    shm_name: str
+    slot: int
+    shape: Tuple[int, ...]
+    dtype: str
+
+@dataclass(frozen=True)
+class TimeShard:
+    """
+    Potongan timeline untuk satu worker. [start, core_end) di-decode,
+    tapi hanya [core_start, core_end) yang "dimiliki" shard ini saat merge;
+    bagian overlap di depan hanya untuk konteks (frame sebelumnya).
+    """
+    index: int
+    start: float
+    core_start: float
+    core_end: float
+
+    def timestamps(self, step):
+        """Sample timestamps di grid global i * step (sama dengan mode sequential)"""
+        first = math.ceil(self.start / step - 1e-9)
+        last = math.ceil(self.core_end / step - 1e-9)
+        return [i * step for i in range(first, last)]
+
+class SharedFrameRing:
+    """
+    Ring buffer di shared memory dengan N slot berukuran satu frame.
+    acquire() block jika semua slot sedang dipakai workers (backpressure).
+    """
+
+    def __init__(self, frame_shape, slots, dtype=np.uint8):
+        self.frame_shape = tuple(frame_shape)
+        self.dtype = np.dtype(dtype)
+        self.slots = slots
+
+        slot_bytes = int(np.prod(self.frame_shape)) * self.dtype.itemsize
+        self.shm = shared_memory.SharedMemory(create=True, size=slot_bytes * slots)
+        self.buffer = np.ndarray((slots,) + self.frame_shape, dtype=self.dtype, buffer=self.shm.buf)
+
+        self._free = queue.Queue()
+        for slot in range(slots):
+            self._free.put(slot)
+
+    def acquire(self, timeout=None):
+        """Ambil slot kosong (block sampai ada yang di-release)"""
+        return self._free.get(timeout=timeout)
+
+    def release(self, slot):
+        """Kembalikan slot ke ring"""
+        self._free.put(slot)
+
+    def write(self, slot, frame):
+        """Copy frame ke slot dan return FrameRef untuk worker"""
+        self.buffer[slot] = frame
+        return FrameRef(self.shm.name, slot, self.frame_shape, self.dtype.str)
+
+    def close(self):
+        """Release shared memory"""
+        try:
+            del self.buffer
+            self.shm.close()
+            self.shm.unlink()
+        except Exception as e:
+            logger.warning(f"Error closing shared frame ring: {e}")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+# Shared memory segments yang sudah di-attach oleh worker process ini
+_attached_segments = {}
+
+def resolve_frame(frame):
+    """
+    Return frame sebagai ndarray: FrameRef di-resolve jadi view (zero-copy)
+    ke shared memory, ndarray biasa dikembalikan apa adanya
+    """
+    if not isinstance(frame, FrameRef):
+        return frame
+
+    shm = _attached_segments.get(frame.shm_name)
+    if shm is None:
+        shm = shared_memory.SharedMemory(name=frame.shm_name)
+        try:
+            # Segment dimiliki parent; jangan biarkan resource tracker worker unlink
+            from multiprocessing import resource_tracker
+            resource_tracker.unregister(shm._name, 'shared_memory')
+        except Exception:
+            pass
+        _attached_segments[frame.shm_name] = shm
+
+    dtype = np.dtype(frame.dtype)
+    slot_size = int(np.prod(frame.shape))
+    flat = np.frombuffer(shm.buf, dtype=dtype, count=slot_size,
+                         offset=frame.slot * slot_size * dtype.itemsize)
+    return flat.reshape(frame.shape)
+
+def _init_worker():
+    """Initializer worker: prioritas rendah dan satu thread per library"""
+    try:
+        os.nice(WORKER_NICE_INCREMENT)
+    except (AttributeError, OSError):
+        pass  # Windows / tidak diizinkan
+
+    os.environ.setdefault('OMP_NUM_THREADS', '1')
+    os.environ.setdefault('OPENBLAS_NUM_THREADS', '1')
+    try:
+        import cv2
+        cv2.setNumThreads(1)
+    except ImportError:
+        pass
+
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_worker_count():
+    """Jumlah worker processes dari PROCESSING['max_workers']"""
+    return max(1, min(int(PROCESSING.get('max_workers', 1)), os.cpu_count() or 1))
+
+def get_process_pool():
+    """
+    Get singleton ProcessPoolExecutor (spawn context supaya aman
+    dengan CUDA/Tk di parent). Return None jika parallel processing tidak dipakai.
+    """
+    global _pool
+    if get_worker_count() <= 1:
+        return None
+
+    with _pool_lock:
+        if _pool is None:
+            try:
+                _pool = ProcessPoolExecutor(
+                    max_workers=get_worker_count(),
+                    mp_context=multiprocessing.get_context('spawn'),
+                    initializer=_init_worker
+                )
+                logger.info(f"Process pool started with {get_worker_count()} workers")
+            except Exception as e:
+                logger.warning(f"Could not start process pool, running in-process: {e}")
+                _pool = None
+        return _pool
+
+def shutdown_process_pool():
+    """Shutdown process pool (dipanggil otomatis saat exit)"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False)
+            _pool = None
+
+atexit.register(shutdown_process_pool)
+
+def should_shard(duration):
+    """True jika video cukup panjang untuk time-sharded processing"""
+    if duration < PROCESSING.get('shard_min_duration', 600):
+        return False
+    return get_process_pool() is not None
+
+def plan_shards(duration, step, overlap=0.0, shard_count=None):
+    """
+    Bagi timeline jadi shards dengan boundary di grid sample (kelipatan step)
+
+    Args:
+        duration: Durasi video dalam detik
+        step: Sample interval stage yang memakai shards
+        overlap: Detik konteks sebelum core_start yang ikut di-decode
+        shard_count: Default max_workers * PROCESSING['shards_per_worker']
+
+    Returns:
+        List of TimeShard
+    """
+    shard_count = shard_count or get_worker_count() * PROCESSING.get('shards_per_worker', 2)
+    shard_count = max(1, min(shard_count, int(duration // MIN_SHARD_SECONDS)))
+
+    boundaries = [round(duration * i / shard_count / step) * step for i in range(shard_count)]
+    boundaries.append(duration)
+
+    shards = []
+    for i in range(shard_count):
+        core_start, core_end = boundaries[i], boundaries[i + 1]
+        if core_end <= core_start:
+            continue
+        shards.append(TimeShard(
+            index=len(shards),
+            start=max(0.0, core_start - overlap),
+            core_start=core_start,
+            core_end=core_end
+        ))
+    return shards
+
+def _timed_call(worker_fn, *args):
+    """Jalankan task di worker: (hasil, CPU seconds worker untuk task ini)"""
+    cpu_start = time.process_time()
+    result = worker_fn(*args)
+    return result, time.process_time() - cpu_start
+
+def submit_shards(worker_fn, shards, *args, on_done=None):
+    """
+    Submit satu task per shard ke process pool
+
+    Args:
+        worker_fn: Top-level function worker_fn(shard, *args)
+        on_done: Optional callback(result) saat shard selesai (dari thread pool,
+            dengan context caller supaya get_metrics() tetap collector job ini)
+
+    Returns:
+        List of futures dalam urutan shard (baca hasilnya dengan gather_shards)
+    """
+    pool = get_process_pool()
+    context = contextvars.copy_context()
+    futures = []
+    for shard in shards:
+        future = pool.submit(_timed_call, worker_fn, shard, *args)
+        if on_done is not None:
+            future.add_done_callback(
+                lambda f: context.copy().run(on_done, f.result()[0])
+                if not f.cancelled() and f.exception() is None else None
+            )
+        futures.append(future)
+    return futures
+
+def gather_shards(futures):
+    """Yield hasil shards dalam urutan timeline; sisa futures di-cancel jika error"""
+    try:
+        for future in futures:
+            result, cpu_seconds = future.result()
+            get_metrics().add_cpu_time(cpu_seconds)
+            yield result
+    finally:
+        for future in futures:
+            future.cancel()
+
+def map_frames(frames, worker_fn, *args, slots=None, use_pool=True):
+    """
+    Proses stream frames dengan worker_fn di process pool, hasil dalam urutan input
+
+    Args:
+        frames: Iterable of (key, frame ndarray), e.g. (timestamp, frame)
+        worker_fn: Top-level function worker_fn(frame_or_ref, *args)
+        slots: Jumlah slot ring buffer (default 2x jumlah workers, dibatasi memory budget)
+        use_pool: False untuk selalu proses di process ini (e.g. model GPU)
+
+    Yields:
+        (key, result) dalam urutan yang sama dengan input
+    """
+    pool = get_process_pool() if use_pool else None
+
+    if pool is None:
+        # Fallback sequential di process ini
+        for key, frame in frames:
+            yield key, worker_fn(frame, *args)
+        return
+
+    ring = None
+    pending = deque()
+
+    def collect_oldest():
+        key, slot, future = pending.popleft()
+        try:
+            result, cpu_seconds = future.result()
+            get_metrics().add_cpu_time(cpu_seconds)
+            return key, result
+        finally:
+            ring.release(slot)
+
+    try:
+        for key, frame in frames:
+            if ring is None:
+                slots = slots or get_memory_budget().queue_slots(frame.nbytes, get_worker_count() * 2)
+                ring = SharedFrameRing(frame.shape, slots, dtype=frame.dtype)
+
+            # Backpressure: tunggu hasil paling lama jika ring penuh
+            while len(pending) >= slots:
+                yield collect_oldest()
+
+            slot = ring.acquire()
+            if frame.shape == ring.frame_shape and frame.dtype == ring.dtype:
+                payload = ring.write(slot, frame)
+            else:
+                # Resolusi berubah di tengah video: kirim frame langsung (slot tetap dipakai untuk backpressure)
+                payload = np.ascontiguousarray(frame)
+            pending.append((key, slot, pool.submit(_timed_call, worker_fn, payload, *args)))
+
+        while pending:
+            yield collect_oldest()
+
+    finally:
+        for _, _, future in pending:
+            future.cancel()
+        if ring is not None:
+            # Tunggu futures yang sedang berjalan sebelum unlink shared memory
+            for _, _, future in pending:
+                try:
+                    future.result()
+                except Exception:
+                    pass
+            ring.close()
+
+# Worker functions (top-level supaya bisa di-pickle ke spawned workers).
+# Import berat (cv2, face_recognition) dilakukan di dalam function.
+
+_face_cascade = None
+
+def _get_face_cascade():
+    """Haar cascade di-load sekali per worker process"""
+    global _face_cascade
+    if _face_cascade is None:
+        import cv2
+        _face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
+    return _face_cascade
+
+def scene_histogram(frame):
+    """Grayscale histogram (64x48) untuk scene change detection"""
+    import cv2
+    frame = resolve_frame(frame)
+    gray = cv2.resize(cv2.cvtColor(frame, cv2.COLOR_RGB2GRAY), (64, 48))
+    return cv2.calcHist([gray], [0], None, [256], [0, 256])
+
+def visual_frame_features(frame, motion_width=320):
+    """
+    Visual features per frame: color variance, brightness dan thumbnail
+    grayscale kecil untuk motion detection di parent (faces: face_prominence)
+    """
+    import cv2
+    frame = resolve_frame(frame)
+    gray_frame = cv2.cvtColor(frame, cv2.COLOR_RGB2GRAY)
+
+    height, width = gray_frame.shape[:2]
+    thumb_height = max(1, int(height * motion_width / max(width, 1)))
+    thumbnail = cv2.resize(gray_frame, (motion_width, thumb_height), interpolation=cv2.INTER_AREA)
+
+    return {
+        'color_variance': float(np.std(frame.reshape(-1, 3), axis=0).mean()),
+        'brightness': float(np.mean(gray_frame) / 255.0),
+        'thumbnail': thumbnail
+    }
+
+def face_prominence(frame, detect_width=320):
+    """
+    Face prominence untuk satu frame: Haar cascade pada frame grayscale yang
+    di-downscale ke detect_width (jauh lebih murah dari face tracking penuh).
+    Prominence per wajah = size (tinggi relatif, FACE_CLOSEUP_HEIGHT = 1.0) x
+    centrality; frame = wajah paling prominent + 0.1 per wajah tambahan.
+
+    Returns:
+        Dict dengan 'face_count' dan 'prominence' (0-1)
+    """
+    import cv2
+    frame = resolve_frame(frame)
+    gray = cv2.cvtColor(frame, cv2.COLOR_RGB2GRAY)
+    height, width = gray.shape[:2]
+    if width > detect_width:
+        gray = cv2.resize(gray, (detect_width, max(1, int(height * detect_width / width))), interpolation=cv2.INTER_AREA)
+    height, width = gray.shape[:2]
+
+    try:
+        faces = _get_face_cascade().detectMultiScale(gray, 1.2, 4, minSize=(16, 16))
+    except Exception:
+        faces = ()
+
+    scores = []
+    max_distance = np.hypot(0.5, 0.5)
+    for x, y, w, h in faces:
+        size = min(h / (FACE_CLOSEUP_HEIGHT * height), 1.0)
+        distance = np.hypot((x + w / 2) / width - 0.5, (y + h / 2) / height - 0.5)
+        centrality = 1.0 - min(distance / max_distance, 1.0)
+        scores.append(size * (0.5 + 0.5 * centrality))
+
+    prominence = min(1.0, max(scores) + 0.1 * (len(scores) - 1)) if scores else 0.0
+    return {'face_count': len(scores), 'prominence': float(prominence)}
+
+def detect_faces(frame, model='hog', min_face_size=0.02, confidence_threshold=0.5):
+    """
+    Face detection + encoding untuk satu frame
+
+    Returns:
+        List of dict (bounding_box, landmarks, encoding, size, center, confidence);
+        track assignment dilakukan di parent
+    """
+    import cv2
+    import face_recognition
+
+    frame = resolve_frame(frame)
+    detections = []
+
+    # Convert BGR to RGB untuk face_recognition
+    rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    frame_height, frame_width = frame.shape[:2]
+
+    # Resize frame untuk performance jika terlalu besar
+    scale_factor = 1.0
+    if frame_width > 1280:
+        scale_factor = 1280 / frame_width
+        new_width = int(frame_width * scale_factor)
+        new_height = int(frame_height * scale_factor)
+        rgb_frame = cv2.resize(rgb_frame, (new_width, new_height))
+
+    # Detect face locations
+    face_locations = face_recognition.face_locations(rgb_frame, model=model)
+    if not face_locations:
+        return detections
+
+    # Get face encodings
+    face_encodings = face_recognition.face_encodings(rgb_frame, face_locations)
+
+    for face_location, face_encoding in zip(face_locations, face_encodings):
+        top, right, bottom, left = face_location
+
+        # Scale back jika frame diresize
+        if scale_factor != 1.0:
+            top = int(top / scale_factor)
+            right = int(right / scale_factor)
+            bottom = int(bottom / scale_factor)
+            left = int(left / scale_factor)
+
+        width = right - left
+        height = bottom - top
+        relative_size = (width * height) / (frame_width * frame_height)
+
+        # Filter out faces yang terlalu kecil
+        if relative_size < min_face_size:
+            continue
+
+        # Estimate confidence berdasarkan size (simple heuristic)
+        confidence = min(relative_size * 10, 1.0)
+        if confidence < confidence_threshold:
+            continue
+
+        # Get facial landmarks (simplified)
+        landmarks = []
+        try:
+            face_landmarks_list = face_recognition.face_landmarks(rgb_frame, [face_location])
+            if face_landmarks_list:
+                for feature_points in face_landmarks_list[0].values():
+                    landmarks.extend(feature_points)
+        except Exception:
+            landmarks = None
+
+        detections.append({
+            'bounding_box': (left, top, width, height),
+            'landmarks': landmarks,
+            'encoding': face_encoding,
+            'size': relative_size,
+            'center': (left + width // 2, top + height // 2),
+            'confidence': confidence
+        })
+
+    return detections
+
+def iter_video_frames(video_path, timestamps):
+    """
+    Seek-based decoder untuk satu shard: seek ke timestamp pertama lalu
+    grab() sequential; seek ulang hanya jika gap antar sample besar
+
+    Yields:
+        (timestamp, RGB frame)
+    """
+    import cv2
+
+    if not timestamps:
+        return
+
+    cap = cv2.VideoCapture(str(video_path))
+    try:
+        if not cap.isOpened():
+            raise IOError(f"Could not open video: {video_path}")
+
+        fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+        half_frame = 0.5 / fps
+        cap.set(cv2.CAP_PROP_POS_MSEC, timestamps[0] * 1000.0)
+
+        for t in timestamps:
+            position = cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
+            if t - position > SEEK_THRESHOLD:
+                cap.set(cv2.CAP_PROP_POS_MSEC, t * 1000.0)
+                position = cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
+
+            # Skip frames tanpa decode ke RGB sampai mendekati timestamp
+            while position + half_frame < t:
+                if not cap.grab():
+                    return
+                position = cap.get(cv2.CAP_PROP_POS_MSEC) / 1000.0
+
+            ok, frame = cap.read()
+            if not ok:
+                return
+            yield t, cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+    finally:
+        cap.release()
+
+def analyze_frames_shard(shard, video_path, step, scene_threshold=0.8, face_interval=None, face_width=320):
+    """
+    Scene cuts + visual features untuk satu shard dalam satu decode pass.
+    Frame overlap (sebelum core_start) hanya dipakai sebagai frame sebelumnya
+    untuk histogram compare dan motion. Face prominence hanya di-sample setiap
+    face_interval detik (grid global, sama dengan mode sequential).
+    """
+    import cv2
+
+    result = {
+        'cuts': [],
+        'timestamps': [],
+        'motion': [],
+        'color_variance': [],
+        'brightness': [],
+        'face_timestamps': [],
+        'face_prominence': [],
+        'face_count': []
+    }
+    face_stride = max(1, round((face_interval or step) / step))
+
+    prev_histogram = None
+    prev_thumbnail = None
+    for t, frame in iter_video_frames(video_path, shard.timestamps(step)):
+        histogram = scene_histogram(frame)
+        features = visual_frame_features(frame)
+        thumbnail = features['thumbnail']
+
+        if t >= shard.core_start:
+            if prev_histogram is not None:
+                if cv2.compareHist(prev_histogram, histogram, cv2.HISTCMP_CORREL) < scene_threshold:
+                    result['cuts'].append(t)
+
+            motion_score = 0.0
+            if prev_thumbnail is not None and prev_thumbnail.shape == thumbnail.shape:
+                motion_score = float(np.mean(cv2.absdiff(prev_thumbnail, thumbnail)) / 255.0)
+
+            result['timestamps'].append(t)
+            result['motion'].append(motion_score)
+            result['color_variance'].append(features['color_variance'])
+            result['brightness'].append(features['brightness'])
+
+            if round(t / step) % face_stride == 0:
+                faces = face_prominence(frame, face_width)
+                result['face_timestamps'].append(t)
+                result['face_prominence'].append(faces['prominence'])
+                result['face_count'].append(faces['face_count'])
+
+        prev_histogram = histogram
+        prev_thumbnail = thumbnail
+
+    return result
+
+def detect_faces_shard(shard, video_path, step, model='hog', min_face_size=0.02, confidence_threshold=0.5):
+    """
+    Face detection + encoding untuk satu shard
+
+    Returns:
+        List of (timestamp, detections); track association di-replay oleh
+        parent dalam urutan waktu supaya tracks tersambung antar shard
+    """
+    results = []
+    for t, frame in iter_video_frames(video_path, shard.timestamps(step)):
+        if t < shard.core_start:
+            continue
+        try:
+            results.append((t, detect_faces(frame, model, min_face_size, confidence_threshold)))
+        except Exception:
+            results.append((t, []))
+    return results
+
+def _frame_mean(frame):
+    return float(resolve_frame(frame).mean())
+
+# Test function
+if __name__ == "__main__":
+    def frame_source():
+        for i in range(16):
+            yield i, np.full((90, 160, 3), i, dtype=np.uint8)
+
+    for key, value in map_frames(frame_source(), _frame_mean):
+        print(f"Frame {key}: mean={value}")
@@ -0,0 +1,606 @@
+#!/usr/bin/env python3
+"""
+Processing Pipeline Module
+Pipeline lengkap (analysis -> face tracking -> diarization -> subtitle -> editing)
+yang dipakai GUI dan server mode. Module instances (dan model AI di dalamnya)
+tetap warm antar jobs, dengan concurrency limit per stage type.
+"""
+
+import logging
+import threading
+import uuid
+from contextlib import contextmanager
+from functools import partial
+from dataclasses import asdict, dataclass, field, is_dataclass
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+from config import MEDIA_INDEX, PROCESSING, SERVER_SETTINGS, VIDEO_SETTINGS
+from .alignment import merge_ranges
+from .analysis_schema import MSGPACK_AVAILABLE
+from .audio_cache import get_audio_cache, release_audio_cache, SPEECH_SAMPLE_RATE
+from .eta_estimator import StagePlan
+from .job_queue import JobCancelled
+from .media_index import compute_fingerprint, get_media_index
+from .memory_budget import get_memory_budget
+from .metrics import MetricsCollector, get_metrics_registry, use_metrics
+from .preview_renderer import PreviewRenderer
+from .temp_manager import get_temp_manager
+from .utils import Utils
+
+# Setup logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Stage -> resource type untuk concurrency limits
+STAGE_TYPES = {
+    'video_analysis': 'vision',
+    'face_tracking': 'vision',
+    'speaker_diarization': 'asr',
+    'subtitle_generation': 'asr',
+    'video_editing': 'encode'
+}
+
+# Stage -> sample rate audio yang dibaca dari audio cache
+AUDIO_STAGE_RATES = {
+    'video_analysis': [VIDEO_SETTINGS['audio_sample_rate'], SPEECH_SAMPLE_RATE],
+    'speaker_diarization': [SPEECH_SAMPLE_RATE],
+    'subtitle_generation': [SPEECH_SAMPLE_RATE]
+}
+
+# Stage -> key di results yang bisa disimpan / dipakai ulang lewat media index
+STAGE_RESULTS = {
+    'video_analysis': 'moments',
+    'face_tracking': 'face_data',
+    'speaker_diarization': 'speaker_data',
+    'subtitle_generation': 'subtitle_data'
+}
+
+# Stage -> (option yang meng-enable stage, module attribute, status message)
+STAGES = [
+    ('video_analysis', 'detect_moments', 'video_analyzer', "🎯 Menganalisis moment terbaik dengan AI..."),
+    ('face_tracking', 'face_tracking', 'face_tracker', "👤 Melakukan face tracking..."),
+    ('speaker_diarization', 'speaker_detection', 'speaker_diarization', "🎙️ Mengidentifikasi pembicara..."),
+    ('subtitle_generation', 'auto_subtitle', 'subtitle_generator', "📝 Menggenerate subtitle otomatis..."),
+    ('video_editing', None, 'video_editor', "🎬 Mengedit dan memproses video final...")
+]
+
+DEFAULT_OPTIONS = {
+    'detect_moments': True,
+    'face_tracking': True,
+    'speaker_detection': True,
+    'auto_subtitle': True,
+    'add_watermark': False,
+    'podcast_mode': False,
+    'audio_enhancement': False,
+    'reframe_formats': [],  # e.g. ['9:16', '1:1']
+    'previews': False,  # Preview 360p per moment selama stage lain berjalan
+    'quick_top_n': None,  # e.g. 5: stop analysis setelah 5 moments high-confidence
+    'reuse_analysis': True,  # Pakai cached analysis untuk video yang sama / versi trim (media index)
+    'quality': '720p',
+    'format': 'mp4',
+    'language': None,
+    'output_dir': None
+}
+
+@dataclass
+class PipelineJob:
+    """State satu video selama diproses (start_job -> run_stage... -> finish_job -> close_job)"""
+    video_path: str
+    options: dict
+    status_callback: Optional[Callable] = None
+    cancel_check: Optional[Callable] = None
+    preview_callback: Optional[Callable] = None
+    moment_review: Optional[Callable] = None
+    run_id: str = field(default_factory=lambda: uuid.uuid4().hex[:8])
+    metrics: Optional[MetricsCollector] = None  # Default collector baru (job_id = run_id)
+    results: dict = field(default_factory=lambda: {
+        'moments': None,
+        'face_data': None,
+        'speaker_data': None,
+        'subtitle_data': None,
+        'output_files': [],
+        'preview_files': []
+    })
+    stages: list = field(default_factory=list)
+    reused: set = field(default_factory=set)
+    carried: dict = field(default_factory=dict)
+    indexable: set = field(default_factory=set)
+    fingerprint: Any = None
+    match: Any = None
+    previews: Any = None
+    completed: bool = False
+
+class ProcessingPipeline:
+    def __init__(self, stage_limits=None):
+        """Initialize pipeline (module instances dibuat lazy saat pertama dipakai)"""
+        self.utils = Utils()
+        self.temp_manager = get_temp_manager()
+        self.memory_budget = get_memory_budget()
+        self._modules = {}
+        self._modules_lock = threading.Lock()
+
+        # Satu job per module instance (modules menyimpan state per run)
+        self._stage_locks = {stage: threading.Lock() for stage in STAGE_TYPES}
+        self.set_stage_limits(stage_limits or SERVER_SETTINGS['stage_limits'])
+
+    def set_stage_limits(self, stage_limits):
+        """
+        Concurrency limit per stage type (e.g. pools batch scheduler). Stage
+        yang sedang berjalan melepas slot di semaphore lama.
+        """
+        self._type_semaphores = {
+            stage_type: threading.BoundedSemaphore(max(1, int(limit)))
+            for stage_type, limit in stage_limits.items()
+        }
+
+    def get_module(self, name):
+        """Get warm module instance (dibuat sekali, dipakai ulang antar jobs)"""
+        with self._modules_lock:
+            module = self._modules.get(name)
+            if module is None:
+                module = self._create_module(name)
+                self._modules[name] = module
+            return module
+
+    def _create_module(self, name):
+        if name == 'youtube_dl':
+            from .youtube_downloader import YouTubeDownloader
+            return YouTubeDownloader()
+        if name == 'video_analyzer':
+            from .video_analyzer import VideoAnalyzer
+            return VideoAnalyzer()
+        if name == 'face_tracker':
+            from .face_tracker import FaceTracker
+            return FaceTracker()
+        if name == 'speaker_diarization':
+            from .speaker_diarization import SpeakerDiarization
+            return SpeakerDiarization()
+        if name == 'subtitle_generator':
+            from .subtitle_generator import SubtitleGenerator
+            return SubtitleGenerator()
+        if name == 'video_editor':
+            from .video_editor import VideoEditor
+            return VideoEditor()
+        raise ValueError(f"Unknown module: {name}")
+
+    def preload(self, options=None):
+        """Load models untuk semua stage yang di-enable (warm start server)"""
+        for stage, _, module_name, _ in self._enabled_stages(options):
+            logger.info(f"Preloading {module_name}...")
+            self.get_module(module_name)
+
+    def _enabled_stages(self, options):
+        options = {**DEFAULT_OPTIONS, **(options or {})}
+        return [entry for entry in STAGES if entry[1] is None or options.get(entry[1])]
+
+    @contextmanager
+    def _stage_slot(self, stage):
+        """
+        Tunggu slot untuk stage type (asr/vision/encode), module instance dan
+        working set stage di memory budget (backpressure jika RAM penuh)
+        """
+        stage_type = STAGE_TYPES[stage]
+        semaphore = self._type_semaphores.get(stage_type)
+        if semaphore is not None:
+            semaphore.acquire()
+        try:
+            with self._stage_locks[stage]:
+                stage_memory = PROCESSING.get('stage_memory_mb', {}).get(stage_type, 0) * 1024 ** 2
+                with self.memory_budget.reserve(stage_memory):
+                    yield
+        finally:
+            if semaphore is not None:
+                semaphore.release()
+
+    def resolve_input(self, input_source, is_url=False):
+        """Download video jika input berupa URL, return path video lokal"""
+        if not is_url:
+            return input_source
+        return self.get_module('youtube_dl').download(input_source)
+
+    def plan_stages(self, video_path, options=None, stages=None):
+        """
+        Build rencana kerja per stage (unit kerja x throughput) untuk ETA
+
+        Args:
+            stages: Entries yang akan dijalankan (default semua stage yang
+                di-enable; setelah start_job: job.stages, tanpa stages yang
+                dipakai ulang dari media index)
+
+        Returns:
+            Tuple (duration, list of StagePlan)
+        """
+        options = {**DEFAULT_OPTIONS, **(options or {})}
+        duration = self.utils.get_video_duration(video_path)
+        if stages is None:
+            stages = self._enabled_stages(options)
+
+        plans = []
+        for stage, _, module_name, _ in stages:
+            module = self.get_module(module_name)
+            if stage == 'video_analysis':
+                plans.append(StagePlan(stage, module.estimate_work_units(duration), unit='steps'))
+            elif stage == 'face_tracking':
+                plans.append(StagePlan(
+                    stage, module.estimate_work_units(duration),
+                    unit='frames', variant=module.face_detection_model
+                ))
+            elif stage == 'speaker_diarization':
+                plans.append(StagePlan(stage, module.estimate_work_units(duration), unit='audio_seconds'))
+            elif stage == 'subtitle_generation':
+                plans.append(StagePlan(
+                    stage, module.estimate_work_units(duration),
+                    unit='audio_seconds', variant=module.asr_variant
+                ))
+            elif stage == 'video_editing':
+                plans.append(StagePlan(
+                    stage, module.estimate_work_units(
+                        duration, podcast_mode=options['podcast_mode'], reframe_formats=options['reframe_formats']
+                    ),
+                    unit='frames', variant=options['quality']
+                ))
+
+        return duration, plans
+
+    def _prepare_audio(self, video_path, stages, options, run_id, status_callback=None):
+        """
+        Extract audio untuk semua stage sekaligus (satu ffmpeg decode, semua
+        sample rates). Tiap PCM file di-register ke TempManager dengan stages
+        yang membacanya, sehingga dihapus setelah consumer terakhir selesai.
+        """
+        consumers = {}
+        for stage, _, _, _ in stages:
+            for rate in AUDIO_STAGE_RATES.get(stage, []):
+                consumers.setdefault(rate, []).append((run_id, stage))
+        # Audio enhancement memakai channel layout source (output tetap stereo / surround)
+        source_consumers = {}
+        if options['audio_enhancement']:
+            source_consumers[VIDEO_SETTINGS['audio_sample_rate']] = [(run_id, 'video_editing')]
+        if not consumers and not source_consumers:
+            return
+
+        try:
+            audio_cache = get_audio_cache(video_path)
+            duration = self.utils.get_video_duration(video_path) or 0
+            missing = audio_cache.missing_bytes(consumers, duration, source_rates=source_consumers)
+            with self.temp_manager.reserve(missing):
+                if not audio_cache.prepare(consumers, source_rates=source_consumers):
+                    return
+                for channels, by_rate in ((1, consumers), (None, source_consumers)):
+                    for rate, rate_consumers in by_rate.items():
+                        self.temp_manager.register(
+                            audio_cache.pcm_path(rate, channels=channels), rate_consumers,
+                            on_delete=partial(audio_cache.drop, rate, channels=channels),
+                            unlink=partial(audio_cache.unlink, rate, channels=channels)
+                        )
+        except Exception as e:
+            logger.error(f"Audio extraction failed: {e}")
+            if status_callback:
+                status_callback(f"Warning: audio extraction failed - {e}")
+
+    def _editing_input(self, results, options, moments=None):
+        """Susun analysis_results untuk VideoEditor.process_video"""
+        from .video_editor import EditingOptions
+
+        return {
+            'moments': (results['moments'] if moments is None else moments) or [],
+            'face_data': results['face_data'] or {},
+            'speaker_data': results['speaker_data'] or {},
+            'subtitle_data': results['subtitle_data'] or {},
+            'options': EditingOptions(
+                podcast_mode=options['podcast_mode'],
+                enhance_audio=options['audio_enhancement'],
+                reframe_formats=list(options['reframe_formats'] or []),
+                output_quality=options['quality'],
+                output_format=options['format']
+            )
+        }
+
+    def _lookup_media(self, video_path, options):
+        """
+        Fingerprint input dan cari video yang sama / overlap di media index
+
+        Returns:
+            Tuple (fingerprint, match, cached analysis); match dan cached None
+            jika tidak ada yang bisa dipakai ulang
+        """
+        # Analysis cache butuh msgpack: tanpa itu fingerprint tidak ada gunanya
+        if not (options['reuse_analysis'] and MEDIA_INDEX['enabled'] and MSGPACK_AVAILABLE):
+            return None, None, None
+        try:
+            fingerprint = compute_fingerprint(video_path)
+            media_index = get_media_index()
+            match = media_index.find_match(video_path, fingerprint)
+            cached = media_index.load_analysis(match) if match else None
+            if cached is None:
+                return fingerprint, None, None
+            logger.info(
+                f"Media index: {match.kind} match {match.media_id} "
+                f"(offset {match.offset:.2f}s, coverage {match.coverage:.0%})"
+            )
+            return fingerprint, match, cached
+        except Exception as e:
+            logger.warning(f"Media index lookup failed: {e}")
+            return None, None, None
+
+    def _reusable_stages(self, match, cached, stages, options):
+        """Stages yang hasilnya langsung diambil dari cached analysis (exact / duplicate)"""
+        if match is None or match.kind == 'partial':
+            return set()
+        reusable = set()
+        for stage, _, _, _ in stages:
+            key = STAGE_RESULTS.get(stage)
+            if key is None or stage not in match.stages or cached.get(key) is None:
+                continue
+            if stage == 'subtitle_generation' and cached.get('language') != options['language']:
+                continue
+            reusable.add(stage)
+        return reusable
+
+    def _carried_results(self, match, cached, fingerprint, options):
+        """
+        Partial match (trim / re-cut): hasil per stage dari cached analysis yang
+        berada di matched segments, dipindah ke timeline video ini, plus ranges
+        yang masih harus dianalisis stage tersebut
+
+        Returns:
+            Dict stage -> (carried data, ranges)
+        """
+        if match is None or match.kind != 'partial':
+            return {}
+        timeline = match.timeline
+        unmatched = match.unmatched_ranges(fingerprint.duration)
+        carried = {}
+
+        if 'video_analysis' in match.stages and cached.get('moments') is not None:
+            carried['video_analysis'] = (cached['moments'], unmatched)
+
+        face_data = cached.get('face_data')
+        if 'face_tracking' in match.stages and face_data:
+            tracks = []
+            for track in face_data.get('tracks', []):
+                path = timeline.carry_points(track.get('path'), 0)
+                if path:
+                    tracks.append({**track, 'path': path,
+                                   'timeline': timeline.carry_points(track.get('timeline'), 'timestamp')})
+            carried['face_tracking'] = (tracks, unmatched)
+
+        speaker_data = cached.get('speaker_data')
+        if 'speaker_diarization' in match.stages and speaker_data:
+            speakers, partial = [], []
+            for speaker in speaker_data.get('speakers', []):
+                speakers.append({**speaker, 'segments': timeline.carry(speaker.get('segments'))})
+                partial += timeline.partial_spans(speaker.get('segments'))
+            carried['speaker_diarization'] = (speakers, merge_ranges(unmatched + partial))
+
+        subtitle_data = cached.get('subtitle_data')
+        transcript = (subtitle_data or {}).get('transcript')
+        if ('subtitle_generation' in match.stages and transcript
+                and cached.get('language') == options['language']):
+            segments = transcript.get('segments')
+            carried['subtitle_generation'] = (
+                {**transcript, 'segments': timeline.carry(segments, nested=('words', 'start', 'end'))},
+                merge_ranges(unmatched + timeline.partial_spans(segments))
+            )
+        return carried
+
+    def _index_results(self, video_path, fingerprint, results, stages, options):
+        """Simpan fingerprint + hasil stages yang lengkap ke media index"""
+        if fingerprint is None or not stages:
+            return
+        analysis = {STAGE_RESULTS[stage]: results[STAGE_RESULTS[stage]] for stage in stages}
+        analysis['language'] = options['language']
+        try:
+            get_media_index().store(video_path, fingerprint, analysis, stages)
+        except Exception as e:
+            logger.warning(f"Could not index analysis results: {e}")
+
+    def _start_previews(self, video_path, options, preview_callback=None):
+        """Background preview renderer untuk moments job ini (output_dir/previews)"""
+        editor = self.get_module('video_editor')
+        output_dir = Path(options['output_dir'] or editor.output_dir) / "previews"
+        return PreviewRenderer(editor, video_path, output_dir, on_preview=preview_callback)
+
+    def run(self, video_path, options=None, stage_callback=None, status_callback=None, cancel_check=None,
+            preview_callback=None, moment_review=None, plan_callback=None, metrics=None):
+        """
+        Jalankan semua stage yang di-enable untuk satu video
+
+        Args:
+            video_path: Path video lokal
+            options: Dict processing options (lihat DEFAULT_OPTIONS)
+            stage_callback: Function(stage, message, percent) saat stage dimulai
+            status_callback: Function(message) untuk warnings per stage
+            cancel_check: Function() -> True jika job harus berhenti
+            preview_callback: Function(index, moment, path) setiap preview moment selesai
+            moment_review: Function(moments) -> moments yang di-approve, dipanggil
+                sebelum video_editing setelah semua preview selesai; boleh block
+                menunggu approval user. None (server, batch): semua moments dirender
+            plan_callback: Function(duration, plans) setelah media index lookup,
+                dengan StagePlan hanya untuk stages yang benar-benar dijalankan
+            metrics: MetricsCollector untuk job ini (default collector baru, job.metrics)
+
+        Returns:
+            Dict dengan moments, face_data, speaker_data, subtitle_data, output_files, preview_files
+
+        Raises:
+            JobCancelled jika cancel_check mengembalikan True di boundary stage
+        """
+        job = PipelineJob(
+            video_path=video_path, options={**DEFAULT_OPTIONS, **(options or {})},
+            status_callback=status_callback, cancel_check=cancel_check,
+            preview_callback=preview_callback, moment_review=moment_review, metrics=metrics
+        )
+        try:
+            self.start_job(job)
+            if plan_callback:
+                plan_callback(*self.plan_stages(job.video_path, job.options, job.stages))
+            for index, entry in enumerate(job.stages):
+                if stage_callback:
+                    stage_callback(entry[0], entry[3], 100.0 * index / len(job.stages))
+                self.run_stage(job, entry)
+            self.finish_job(job)
+            return job.results
+        finally:
+            self.close_job(job)
+
+    def start_job(self, job):
+        """
+        Lookup media index dan extract audio; setelah ini job.stages berisi
+        stages yang masih harus dijalankan (run_stage)
+        """
+        if job.metrics is None:
+            job.metrics = MetricsCollector(job_id=job.run_id)
+        get_metrics_registry().register(job.metrics)
+
+        stages = self._enabled_stages(job.options)
+
+        # Video yang sama (atau versi trim) sudah pernah dianalisis: pakai ulang
+        job.fingerprint, job.match, cached = self._lookup_media(job.video_path, job.options)
+        job.reused = self._reusable_stages(job.match, cached, stages, job.options)
+        for stage in job.reused:
+            job.results[STAGE_RESULTS[stage]] = cached[STAGE_RESULTS[stage]]
+        job.carried = self._carried_results(job.match, cached, job.fingerprint, job.options)
+        if job.status_callback and (job.reused or job.carried):
+            job.status_callback(
+                f"♻️ Memakai ulang analysis video sebelumnya ({job.match.kind}, {job.match.coverage:.0%} cocok)"
+            )
+
+        job.stages = [entry for entry in stages if entry[0] not in job.reused]
+        if 'video_analysis' in job.reused and job.options['previews'] and job.results['moments']:
+            job.previews = self._start_previews(job.video_path, job.options, job.preview_callback)
+            job.previews.submit_all(job.results['moments'])
+        # Stages dengan hasil lengkap untuk media index (quick_top_n = moments tidak lengkap)
+        job.indexable = set(job.reused)
+
+        self._prepare_audio(job.video_path, job.stages, job.options, job.run_id, job.status_callback)
+
+    def run_stage(self, job, entry):
+        """
+        Jalankan satu stage job (entry dari job.stages). Stage analysis satu
+        job tidak saling bergantung, jadi boleh berjalan bersamaan di threads
+        berbeda; video_editing harus terakhir.
+
+        Raises:
+            JobCancelled jika cancel_check mengembalikan True sebelum stage dimulai
+        """
+        stage, _, module_name, _ = entry
+        video_path, options, results, carried = job.video_path, job.options, job.results, job.carried
+        if job.cancel_check and job.cancel_check():
+            raise JobCancelled()
+
+        module = self.get_module(module_name)
+        with self._stage_slot(stage), use_metrics(job.metrics):
+            try:
+                if stage == 'video_analysis' and stage in carried:
+                    # Versi trim / re-cut: hanya bagian yang tidak cocok yang dianalisis
+                    cached_moments, ranges = carried[stage]
+                    moments = module.analyze_ranges(
+                        video_path, ranges, job.match.carry_moments(cached_moments, module.min_moment_duration)
+                    )
+                    results['moments'] = [asdict(m) for m in moments]
+                    if options['previews']:
+                        job.previews = self._start_previews(video_path, options, job.preview_callback)
+                        job.previews.submit_all(results['moments'])
+                elif stage == 'video_analysis' and (options['previews'] or options['quick_top_n']):
+                    # Streaming: preview tiap moment dimulai begitu moment di-yield,
+                    # ranking (max_moments, tanpa overlap) setelah scan selesai
+                    streamed = []
+                    for moment in module.iter_moments(video_path, top_k=options['quick_top_n']):
+                        streamed.append(moment)
+                        if options['previews']:
+                            if job.previews is None:
+                                job.previews = self._start_previews(video_path, options, job.preview_callback)
+                            job.previews.submit(len(streamed) - 1, asdict(moment))
+                        if job.cancel_check and job.cancel_check():
+                            raise JobCancelled()
+                    moments = module.rank_moments(streamed)
+                    if options['quick_top_n']:
+                        moments = moments[:options['quick_top_n']]
+                    results['moments'] = [asdict(m) for m in moments]
+                elif stage == 'video_analysis':
+                    moments = module.analyze_video(video_path)
+                    results['moments'] = [asdict(m) if is_dataclass(m) else m for m in moments]
+                elif stage == 'face_tracking' and stage in carried:
+                    tracks, ranges = carried[stage]
+                    results['face_data'] = module.track_faces(video_path, ranges=ranges, carried=tracks)
+                elif stage == 'face_tracking':
+                    results['face_data'] = module.track_faces(video_path)
+                elif stage == 'speaker_diarization' and stage in carried:
+                    speakers, ranges = carried[stage]
+                    results['speaker_data'] = module.identify_speakers(video_path, ranges=ranges, carried=speakers)
+                elif stage == 'speaker_diarization':
+                    results['speaker_data'] = module.identify_speakers(video_path)
+                elif stage == 'subtitle_generation':
+                    transcript, ranges = carried.get(stage, (None, None))
+                    results['subtitle_data'] = module.generate_subtitles(
+                        video_path, language=options['language'], ranges=ranges, carried_transcript=transcript
+                    )
+                elif stage == 'video_editing':
+                    if options['output_dir']:
+                        module.output_dir = Path(options['output_dir'])
+                        module.output_dir.mkdir(parents=True, exist_ok=True)
+                    moments = results['moments']
+                    if job.moment_review and moments:
+                        # Review setelah semua preview selesai, bukan saat sebagian belum terlihat
+                        if job.previews is not None and not job.previews.drain(job.cancel_check):
+                            raise JobCancelled()
+                        moments = job.moment_review(moments)
+                    results['output_files'] = module.process_video(
+                        video_path, self._editing_input(results, options, moments)
+                    ) or []
+                # Hasil kosong (module gagal diam-diam) tidak di-cache
+                if stage in STAGE_RESULTS and results[STAGE_RESULTS[stage]]:
+                    if not (stage == 'video_analysis' and options['quick_top_n'] and stage not in carried):
+                        job.indexable.add(stage)
+            except JobCancelled:
+                raise
+            except Exception as e:
+                logger.error(f"Stage {stage} failed: {e}")
+                if job.status_callback:
+                    job.status_callback(f"Warning: {stage} failed - {e}")
+            finally:
+                # Intermediate files tanpa consumer lain langsung dihapus
+                self.temp_manager.release((job.run_id, stage))
+
+    def finish_job(self, job):
+        """Semua stages selesai: simpan hasil baru ke media index"""
+        if job.cancel_check and job.cancel_check():
+            raise JobCancelled()
+
+        job.completed = True
+        if job.indexable - job.reused:
+            self._index_results(job.video_path, job.fingerprint, job.results, job.indexable, job.options)
+
+    def close_job(self, job):
+        """Selalu dipanggil (done, failed atau cancelled): tutup previews dan lepas artifacts"""
+        if job.previews is not None:
+            job.results['preview_files'] = job.previews.close(wait=job.completed)
+            job.previews = None
+        # Lepas semua artifacts job ini; cache dir dihapus jika tidak ada job
+        # lain yang masih memakainya
+        self.temp_manager.release_owner(job.run_id)
+        if not self.temp_manager.has_artifacts(get_audio_cache(job.video_path).cache_dir):
+            release_audio_cache(job.video_path)
+        if job.metrics is not None:
+            get_metrics_registry().unregister(job.metrics)
+
+# Singleton instance
+_pipeline_instance = None
+_pipeline_lock = threading.Lock()
+
+def get_pipeline():
+    """Get singleton ProcessingPipeline instance"""
+    global _pipeline_instance
+    with _pipeline_lock:
+        if _pipeline_instance is None:
+            _pipeline_instance = ProcessingPipeline()
+        return _pipeline_instance
+
+# Test function
+if __name__ == "__main__":
+    pipeline = get_pipeline()
+    duration, plans = pipeline.plan_stages("test_video.mp4", {'auto_subtitle': False})
+    for plan in plans:
+        print(f"{plan.stage}: {plan.total_units:.0f} {plan.unit}")
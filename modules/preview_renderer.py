@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Preview Renderer Module
+Preview 360p (preset ultrafast) untuk setiap moment begitu video analysis
+menghasilkannya. Dirender di background thread sementara stage lain (face
+tracking, diarization, subtitle) berjalan, sehingga user bisa approve /
+reject clips sebelum render full-quality di stage video_editing.
+"""
+
+import logging
+import queue
+import threading
+from pathlib import Path
+
+# Setup logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class PreviewRenderer:
+    def __init__(self, editor, video_path, output_dir, on_preview=None):
+        """
+        Initialize preview renderer
+
+        Args:
+            editor: VideoEditor (render_preview)
+            video_path: Path video source
+            output_dir: Folder untuk preview files
+            on_preview: Function(index, moment, path) setiap preview selesai
+        """
+        self.editor = editor
+        self.video_path = str(video_path)
+        self.output_dir = Path(output_dir)
+        self.on_preview = on_preview
+        self.files = {}
+
+        self._queue = queue.Queue()
+        self._pending = 0  # Previews yang di-submit tapi belum selesai
+        self._idle = threading.Condition()
+        self._cancelled = threading.Event()
+        self._thread = threading.Thread(target=self._worker, name="preview-renderer", daemon=True)
+        self._thread.start()
+
+    def submit(self, index, moment):
+        """Antrikan preview untuk moment (index = nomor preview untuk nama file dan label)"""
+        if not self._cancelled.is_set():
+            with self._idle:
+                self._pending += 1
+            self._queue.put((index, moment))
+
+    def submit_all(self, moments):
+        """Antrikan semua moments, score tertinggi dulu"""
+        order = sorted(range(len(moments)), key=lambda i: moments[i].get('score', 0), reverse=True)
+        for index in order:
+            self.submit(index, moments[index])
+
+    def _worker(self):
+        while True:
+            item = self._queue.get()
+            if item is None or self._cancelled.is_set():
+                break
+            index, moment = item
+            try:
+                path = self.editor.render_preview(self.video_path, moment, index, self.output_dir)
+                if path:
+                    self.files[index] = path
+                    if self.on_preview:
+                        self.on_preview(index, moment, path)
+            except Exception as e:
+                logger.warning(f"Error rendering preview for moment {index}: {e}")
+            finally:
+                with self._idle:
+                    self._pending -= 1
+                    self._idle.notify_all()
+
+    def drain(self, cancel_check=None, poll_interval=0.5):
+        """
+        Tunggu semua preview yang sudah di-submit selesai dirender (sebelum
+        moment review). Returns False jika cancel_check() True saat menunggu.
+        """
+        with self._idle:
+            while self._pending > 0 and not self._cancelled.is_set():
+                if cancel_check and cancel_check():
+                    return False
+                self._idle.wait(timeout=poll_interval)
+        return True
+
+    def close(self, wait=True):
+        """
+        Selesai submit. wait=True: tunggu antrian habis; False: preview yang
+        belum dimulai dibatalkan (job cancelled / failed)
+        """
+        if not wait:
+            self._cancelled.set()
+        self._queue.put(None)
+        if wait:
+            self._thread.join()
+        return [self.files[index] for index in sorted(self.files)]
+
+# Test function
+if __name__ == "__main__":
+    import sys
+    from .video_editor import VideoEditor
+
+    if len(sys.argv) < 2:
+        print("Usage: python -m modules.preview_renderer <video_file>")
+        sys.exit(1)
+
+    renderer = PreviewRenderer(
+        VideoEditor(), sys.argv[1], Path("output") / "previews",
+        on_preview=lambda index, moment, path: print(f"Moment {index}: {path}")
+    )
+    renderer.submit_all([
+        {'start_time': 10.0, 'end_time': 25.0, 'score': 0.9},
+        {'start_time': 60.0, 'end_time': 70.0, 'score': 0.7}
+    ])
+    print(renderer.close())
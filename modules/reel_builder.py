@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Reel Builder Module
+Highlights reel tanpa re-encode seluruh video: bagian tengah tiap highlight
+di-stream-copy dari keyframe ke keyframe, hanya head (title), tail dan
+crossfade antar highlight yang di-encode ulang. Semua pieces ditulis sebagai
+MPEG-TS (H.264 Annex B) lalu digabung dengan ffmpeg concat demuxer.
+"""
+
+import json
+import logging
+import subprocess
+from dataclasses import dataclass, field
+from fractions import Fraction
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+# Setup logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Durasi title overlay "Highlight N" di awal tiap highlight (detik)
+TITLE_DURATION = 2.0
+
+# Pixel formats yang bisa di-encode ulang identik dengan source oleh libx264
+COPY_PIXEL_FORMATS = ('yuv420p', 'yuvj420p')
+
+@dataclass
+class StreamParams:
+    """Parameter stream source yang harus sama antara pieces copy dan encode"""
+    codec: str
+    width: int
+    height: int
+    pix_fmt: str
+    fps: Fraction
+    constant_fps: bool
+    has_audio: bool
+    sample_rate: int = 44100
+    channels: int = 2
+    channel_layout: str = 'stereo'
+
+@dataclass
+class ReelPiece:
+    """
+    Satu file dalam concat list: 'copy' = satu range stream copy,
+    'encode' = satu atau lebih ranges yang di-crossfade dan di-encode ulang
+    """
+    kind: str
+    ranges: List[Tuple[float, float, Optional[str]]] = field(default_factory=list)  # (start, end, title)
+
+    @property
+    def duration(self):
+        return sum(end - start for start, end, _ in self.ranges)
+
+def probe_stream_params(video_path):
+    """Stream parameters source via ffprobe (None jika tidak ada video stream)"""
+    result = subprocess.run(
+        [
+            'ffprobe', '-v', 'error', '-show_streams',
+            '-show_entries', 'stream=codec_type,codec_name,width,height,pix_fmt,r_frame_rate,avg_frame_rate,'
+                              'sample_rate,channels,channel_layout',
+            '-of', 'json', str(video_path)
+        ],
+        capture_output=True, text=True, timeout=30
+    )
+    streams = json.loads(result.stdout or '{}').get('streams', [])
+    video = next((s for s in streams if s.get('codec_type') == 'video'), None)
+    audio = next((s for s in streams if s.get('codec_type') == 'audio'), None)
+    if video is None:
+        return None
+
+    channels = int(audio.get('channels', 2)) if audio else 2
+    r_rate = Fraction(video.get('r_frame_rate', '0/1'))
+    avg_rate = Fraction(video.get('avg_frame_rate', '0/1')) if video.get('avg_frame_rate', '0/0') != '0/0' else r_rate
+    return StreamParams(
+        codec=video.get('codec_name', ''),
+        width=int(video.get('width', 0)),
+        height=int(video.get('height', 0)),
+        pix_fmt=video.get('pix_fmt', ''),
+        fps=r_rate,
+        constant_fps=r_rate > 0 and abs(float(r_rate - avg_rate)) < 0.01,
+        has_audio=audio is not None,
+        sample_rate=int(audio.get('sample_rate', 44100)) if audio else 44100,
+        channels=channels,
+        channel_layout=(audio.get('channel_layout') if audio else None) or _default_layout(channels)
+    )
+
+def _default_layout(channels):
+    return {1: 'mono', 2: 'stereo'}.get(channels, f"{channels}c")
+
+def audio_format_filter(params):
+    """
+    Format audio yang sama untuk semua pieces (sample rate, sample format,
+    channel layout source), agar concat demuxer bisa stream-copy audio
+    """
+    return f"aresample={params.sample_rate},aformat=sample_fmts=fltp:channel_layouts={params.channel_layout}"
+
+def keyframe_times(video_path, intervals, padding=10.0):
+    """
+    Timestamps keyframes video di sekitar intervals, dari packet flags
+    (tanpa decode, hanya membaca packets di sekitar tiap interval)
+
+    Args:
+        intervals: List of (start, end) detik
+        padding: Detik tambahan di kiri/kanan tiap interval
+    """
+    read_intervals = ','.join(f"{max(start - padding, 0):.3f}%{end + padding:.3f}" for start, end in intervals)
+    result = subprocess.run(
+        [
+            'ffprobe', '-v', 'error', '-select_streams', 'v:0',
+            '-read_intervals', read_intervals,
+            '-show_entries', 'packet=pts_time,flags', '-of', 'csv=p=0', str(video_path)
+        ],
+        capture_output=True, text=True, timeout=120
+    )
+    times = set()
+    for line in result.stdout.splitlines():
+        pts, _, flags = line.partition(',')
+        if 'K' in flags and pts not in ('', 'N/A'):
+            times.add(round(float(pts), 6))
+    return np.array(sorted(times))
+
+def plan_reel_pieces(clips, keyframes, transition, title_duration=TITLE_DURATION):
+    """
+    Bagi highlights menjadi pieces copy / encode
+
+    Per clip: head (title + crossfade masuk) di-encode dari start persis
+    sampai keyframe berikutnya, body di-copy sampai keyframe terakhir sebelum
+    crossfade keluar, tail di-encode bersama head clip berikutnya. Clip tanpa
+    keyframe di tengahnya di-encode seluruhnya. Start / end highlight tidak
+    digeser ke keyframe.
+
+    Args:
+        clips: List of (start, end, title) detik di source
+        keyframes: Sorted keyframe timestamps (keyframe_times)
+        transition: Durasi crossfade (detik)
+
+    Returns:
+        List of ReelPiece
+    """
+    keyframes = np.asarray(keyframes, dtype=np.float64)
+    pieces = []
+    pending = []
+
+    for start, end, title in clips:
+        head_end_index = np.searchsorted(keyframes, start + max(title_duration, transition) - 1e-6)
+        tail_start_index = np.searchsorted(keyframes, end - transition, side='right') - 1
+        head_end = keyframes[head_end_index] if head_end_index < len(keyframes) else None
+        tail_start = keyframes[tail_start_index] if tail_start_index >= 0 else None
+
+        if head_end is None or tail_start is None or tail_start <= head_end:
+            # Tidak ada body yang bisa di-copy
+            pending.append((start, end, title))
+            continue
+
+        pending.append((start, float(head_end), title))
+        pieces.append(ReelPiece('encode', pending))
+        pieces.append(ReelPiece('copy', [(float(head_end), float(tail_start), None)]))
+        pending = [(float(tail_start), end, None)]
+
+    if pending:
+        pieces.append(ReelPiece('encode', pending))
+    return pieces
+
+def _title_filter(title):
+    text = title.replace('\\', '\\\\').replace(':', '\\:').replace("'", "\\'")
+    return (f"drawtext=text='{text}':fontsize=30:fontcolor=white:x=(w-text_w)/2:y=50"
+            f":enable='lt(t,{TITLE_DURATION})',")
+
+def encode_piece_command(piece, video_path, params, output_path, transition, video_args, audio_bitrate):
+    """
+    ffmpeg command untuk piece 'encode': ranges di-crossfade berurutan (xfade /
+    acrossfade) dan di-encode dengan parameter yang sama dengan source
+
+    Args:
+        video_args: H.264 encoder arguments (EncodeSettings.ffmpeg_args)
+    """
+    cmd = ['ffmpeg', '-y', '-hide_banner', '-nostdin', '-v', 'error']
+    filters = []
+    fps = f"{params.fps.numerator}/{params.fps.denominator}"
+    for i, (start, end, title) in enumerate(piece.ranges):
+        cmd += ['-ss', f"{start:.6f}", '-t', f"{end - start:.6f}", '-i', str(video_path)]
+        title_filter = _title_filter(title) if title else ''
+        filters.append(f"[{i}:v]{title_filter}fps={fps},format={params.pix_fmt},settb=AVTB,setpts=PTS-STARTPTS[v{i}]")
+        if params.has_audio:
+            filters.append(f"[{i}:a]{audio_format_filter(params)},asetpts=PTS-STARTPTS[a{i}]")
+
+    video_label, audio_label = 'v0', 'a0'
+    offset = piece.ranges[0][1] - piece.ranges[0][0]
+    for i in range(1, len(piece.ranges)):
+        # Crossfade tidak boleh lebih panjang dari range yang di-fade
+        fade = min(transition, offset, piece.ranges[i][1] - piece.ranges[i][0]) * 0.999
+        filters.append(f"[{video_label}][v{i}]xfade=transition=fade:duration={fade:.3f}:offset={offset - fade:.3f}[vx{i}]")
+        video_label = f"vx{i}"
+        if params.has_audio:
+            filters.append(f"[{audio_label}][a{i}]acrossfade=d={fade:.3f}[ax{i}]")
+            audio_label = f"ax{i}"
+        offset += piece.ranges[i][1] - piece.ranges[i][0] - fade
+
+    cmd += ['-filter_complex', ';'.join(filters), '-map', f"[{video_label}]"]
+    if params.has_audio:
+        cmd += ['-map', f"[{audio_label}]", '-c:a', 'aac', '-b:a', audio_bitrate]
+    cmd += list(video_args) + ['-pix_fmt', params.pix_fmt, '-f', 'mpegts', str(output_path)]
+    return cmd
+
+def copy_piece_command(piece, video_path, params, output_path, audio_bitrate):
+    """
+    ffmpeg command untuk piece 'copy': video stream copy dari keyframe,
+    audio di-encode ulang (murah) supaya sync tepat di tiap sambungan
+    """
+    start, end, _ = piece.ranges[0]
+    # Seek sedikit setelah keyframe: input seek + copy mulai dari keyframe <= posisi
+    cmd = ['ffmpeg', '-y', '-hide_banner', '-nostdin', '-v', 'error',
+           '-ss', f"{start + 0.001:.6f}", '-i', str(video_path), '-t', f"{end - start:.6f}",
+           '-map', '0:v:0', '-c:v', 'copy', '-bsf:v', 'h264_mp4toannexb']
+    if params.has_audio:
+        cmd += ['-map', '0:a:0', '-af', audio_format_filter(params), '-c:a', 'aac', '-b:a', audio_bitrate]
+    cmd += ['-f', 'mpegts', str(output_path)]
+    return cmd
+
+def concat_command(list_path, output_path, output_format):
+    """ffmpeg concat demuxer: gabung pieces tanpa re-encode"""
+    cmd = ['ffmpeg', '-y', '-hide_banner', '-nostdin', '-v', 'error',
+           '-f', 'concat', '-safe', '0', '-i', str(list_path), '-c', 'copy']
+    if output_format in ('mp4', 'mov'):
+        cmd += ['-bsf:a', 'aac_adtstoasc', '-movflags', '+faststart']
+    cmd.append(str(output_path))
+    return cmd
+
+def write_concat_list(paths, list_path):
+    """Concat demuxer list file"""
+    with open(list_path, 'w', encoding='utf-8') as f:
+        for path in paths:
+            escaped = str(path).replace('\\', '/').replace("'", "'\\''")
+            f.write(f"file '{escaped}'\n")
+    return list_path
+
+# Test function
+if __name__ == "__main__":
+    # Keyframes tiap 2 detik, tiga highlights
+    keyframes = np.arange(0, 300, 2.0)
+    clips = [(10.3, 25.3, "Highlight 1"), (60.0, 62.5, "Highlight 2"), (120.9, 135.9, "Highlight 3")]
+    pieces = plan_reel_pieces(clips, keyframes, transition=0.5)
+
+    copied = sum(p.duration for p in pieces if p.kind == 'copy')
+    encoded = sum(p.duration for p in pieces if p.kind == 'encode')
+    for piece in pieces:
+        print(piece.kind, [(round(s, 2), round(e, 2), t) for s, e, t in piece.ranges])
+    print(f"Stream copy: {copied:.1f}s, re-encode: {encoded:.1f}s")
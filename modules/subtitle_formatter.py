@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+"""
+Subtitle Formatter Module
+Cue model, line-breaking engine (max chars, max lines, reading speed) dan
+writer SRT/VTT/ASS dalam satu streaming pass. Tidak butuh ASR: cukup
+transcript dengan word-level timestamps, jadi styling bisa diubah tanpa
+transcribe ulang.
+"""
+
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+# Setup logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# ASS alignment (numpad layout) per posisi subtitle
+ASS_ALIGNMENT = {
+    'bottom': 2,
+    'center': 5,
+    'top': 8
+}
+
+# Warna ASS dalam format &HAABBGGRR
+ASS_COLORS = {
+    'white': 'FFFFFF',
+    'black': '000000',
+    'yellow': '00FFFF',
+    'red': '0000FF',
+    'green': '00FF00',
+    'blue': 'FF0000'
+}
+
+@dataclass
+class Cue:
+    """Data class untuk satu subtitle cue (1..max_lines baris)"""
+    start_time: float
+    end_time: float
+    lines: List[str]
+    confidence: float = 0.0
+    speaker_id: Optional[int] = None
+    words: List[Dict] = field(default_factory=list)
+
+    @property
+    def text(self):
+        return '\n'.join(self.lines)
+
+    @property
+    def char_count(self):
+        return sum(len(line) for line in self.lines)
+
+    def to_segment(self):
+        """Format segment dict yang dipakai modules lain (VideoEditor, results JSON)"""
+        return {
+            'start_time': self.start_time,
+            'end_time': self.end_time,
+            'duration': self.end_time - self.start_time,
+            'text': self.text,
+            'confidence': self.confidence,
+            'speaker_id': self.speaker_id,
+            'words': self.words
+        }
+
+def segment_words(segment):
+    """
+    Word list dengan timestamps untuk satu transcript segment. Jika ASR tidak
+    memberi word timestamps, waktu segment dibagi proporsional dengan panjang kata.
+    """
+    words = [w for w in segment.get('words') or [] if w.get('word', '').strip()]
+    if words:
+        return [
+            {
+                'word': w['word'].strip(),
+                'start': float(w['start']),
+                'end': float(w['end']),
+                'probability': w.get('probability', 1.0)
+            }
+            for w in words
+        ]
+
+    tokens = segment.get('text', '').split()
+    if not tokens:
+        return []
+
+    start, end = segment['start_time'], segment['end_time']
+    total_chars = sum(len(t) for t in tokens)
+    result = []
+    position = start
+    for token in tokens:
+        word_duration = (end - start) * len(token) / total_chars
+        result.append({'word': token, 'start': position, 'end': position + word_duration, 'probability': 1.0})
+        position += word_duration
+    return result
+
+def _balance_lines(words, max_chars):
+    """
+    Split kata-kata satu cue menjadi 2 baris yang panjangnya seimbang
+    (linear dalam jumlah kata cue)
+    """
+    tokens = [w['word'] for w in words]
+    total = sum(len(t) for t in tokens) + len(tokens) - 1
+
+    best_split, best_diff = None, None
+    first_len = -1
+    for i in range(1, len(tokens)):
+        first_len += len(tokens[i - 1]) + 1
+        second_len = total - first_len - 1
+        if first_len > max_chars or second_len > max_chars:
+            continue
+        diff = abs(first_len - second_len)
+        if best_diff is None or diff < best_diff:
+            best_split, best_diff = i, diff
+
+    if best_split is None:
+        return None
+    return [' '.join(tokens[:best_split]), ' '.join(tokens[best_split:])]
+
+def build_cues(segments, options):
+    """
+    Greedy line breaker: isi baris sampai max_chars_per_line, maksimal
+    max_lines_per_subtitle baris per cue. Cue ditutup di akhir segment, saat
+    jeda bicara panjang, atau jika waktu baca (chars / max_chars_per_second)
+    akan melebihi max_duration. O(n) dalam jumlah kata.
+
+    Args:
+        segments: Transcript segments (start_time, end_time, text, words, confidence)
+        options: SubtitleOptions
+
+    Returns:
+        List of Cue (sudah di-retime, lihat retime_cues)
+    """
+    cues = []
+
+    for segment in segments:
+        words = segment_words(segment)
+
+        lines = []
+        current = []
+        current_len = 0
+        cue_words = []
+
+        def close_cue():
+            if current:
+                lines.append(' '.join(w['word'] for w in current))
+            if not lines:
+                return
+            cue_lines = lines[:]
+            if len(cue_lines) == 2:
+                cue_lines = _balance_lines(cue_words, options.max_chars_per_line) or cue_lines
+            cues.append(Cue(
+                start_time=cue_words[0]['start'],
+                end_time=cue_words[-1]['end'],
+                lines=cue_lines,
+                confidence=segment.get('confidence', 0.0),
+                speaker_id=segment.get('speaker_id'),
+                words=cue_words[:]
+            ))
+
+        for word in words:
+            token = word['word']
+
+            if cue_words:
+                # Jeda bicara panjang: mulai cue baru
+                pause = word['start'] - cue_words[-1]['end']
+                cue_chars = sum(len(line) for line in lines) + current_len + len(token)
+                reading_time = cue_chars / options.max_chars_per_second
+                too_long = max(word['end'] - cue_words[0]['start'], reading_time) > options.max_duration
+
+                if pause > options.max_pause or too_long:
+                    close_cue()
+                    lines, current, current_len, cue_words = [], [], 0, []
+
+            added_len = len(token) + (1 if current else 0)
+            if current and current_len + added_len > options.max_chars_per_line:
+                if len(lines) + 1 < options.max_lines_per_subtitle:
+                    # Pindah ke baris berikutnya dalam cue yang sama
+                    lines.append(' '.join(w['word'] for w in current))
+                    current, current_len = [], 0
+                else:
+                    close_cue()
+                    lines, current, current_len, cue_words = [], [], 0, []
+                added_len = len(token)
+
+            current.append(word)
+            cue_words.append(word)
+            current_len += added_len
+
+        close_cue()
+
+    return retime_cues(cues, options)
+
+def retime_cues(cues, options):
+    """
+    Atur timing dari word timestamps: perpanjang cue sampai minimal
+    min_duration dan waktu baca (max_chars_per_second), tanpa overlap
+    dengan cue berikutnya
+    """
+    for i, cue in enumerate(cues):
+        reading_time = cue.char_count / options.max_chars_per_second
+        end_time = max(cue.end_time, cue.start_time + options.min_duration, cue.start_time + reading_time)
+        end_time = min(end_time, cue.start_time + options.max_duration)
+
+        if i + 1 < len(cues):
+            end_time = min(end_time, cues[i + 1].start_time - options.min_gap)
+
+        cue.end_time = max(end_time, cue.start_time + 0.001)
+
+    return cues
+
+def _split_time(seconds):
+    total_ms = int(round(max(seconds, 0.0) * 1000))
+    hours, rest = divmod(total_ms, 3600000)
+    minutes, rest = divmod(rest, 60000)
+    secs, ms = divmod(rest, 1000)
+    return hours, minutes, secs, ms
+
+def srt_time(seconds):
+    """00:00:01,500"""
+    h, m, s, ms = _split_time(seconds)
+    return f"{h:02d}:{m:02d}:{s:02d},{ms:03d}"
+
+def vtt_time(seconds):
+    """00:00:01.500"""
+    h, m, s, ms = _split_time(seconds)
+    return f"{h:02d}:{m:02d}:{s:02d}.{ms:03d}"
+
+def ass_time(seconds):
+    """0:00:01.50"""
+    h, m, s, ms = _split_time(seconds)
+    return f"{h:d}:{m:02d}:{s:02d}.{ms // 10:02d}"
+
+def _ass_color(name, opacity=1.0):
+    alpha = int(round((1.0 - opacity) * 255))
+    return f"&H{alpha:02X}{ASS_COLORS.get(name, 'FFFFFF')}"
+
+def _ass_header(options):
+    alignment = ASS_ALIGNMENT.get(options.position, 2)
+    primary = _ass_color(options.font_color)
+    back = _ass_color(options.background_color, options.background_opacity)
+    if options.background_opacity > 0:
+        # BorderStyle 3 (opaque box): renderers menggambar box dengan
+        # OutlineColour, Outline = padding box
+        border_style, outline_color, outline = 3, back, 4
+    else:
+        border_style, outline_color, outline = 1, '&H00000000', 2
+    return (
+        "[Script Info]\n"
+        "Title: Auto-generated Subtitles\n"
+        "ScriptType: v4.00+\n"
+        "\n"
+        "[V4+ Styles]\n"
+        "Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, BackColour, "
+        "Bold, Italic, Underline, StrikeOut, ScaleX, ScaleY, Spacing, Angle, BorderStyle, Outline, Shadow, "
+        "Alignment, MarginL, MarginR, MarginV, Encoding\n"
+        f"Style: Default,Arial,{options.font_size},{primary},&H000000FF,{outline_color},{back},"
+        f"0,0,0,0,100,100,0,0,{border_style},{outline},0,{alignment},{options.margin},{options.margin},{options.margin},1\n"
+        "\n"
+        "[Events]\n"
+        "Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text\n"
+    )
+
+def _ass_text(lines):
+    # Kurung kurawal adalah override tags di ASS
+    return '\\N'.join(line.replace('{', '(').replace('}', ')') for line in lines)
+
+def write_subtitle_files(cues, output_paths, options):
+    """
+    Tulis semua format sekaligus dalam satu pass atas cues
+
+    Args:
+        cues: List of Cue
+        output_paths: Dict format -> path, e.g. {'srt': ..., 'vtt': ..., 'ass': ...}
+        options: SubtitleOptions (styling untuk ASS)
+
+    Returns:
+        Dict format -> path untuk file yang berhasil ditulis
+    """
+    handles = {}
+    try:
+        for fmt, path in output_paths.items():
+            if fmt not in ('srt', 'vtt', 'ass'):
+                logger.warning(f"Unsupported subtitle format: {fmt}")
+                continue
+            handles[fmt] = open(path, 'w', encoding='utf-8')
+
+        if 'vtt' in handles:
+            handles['vtt'].write("WEBVTT\n\n")
+        if 'ass' in handles:
+            handles['ass'].write(_ass_header(options))
+
+        srt_file = handles.get('srt')
+        vtt_file = handles.get('vtt')
+        ass_file = handles.get('ass')
+
+        for index, cue in enumerate(cues, 1):
+            text = cue.text
+            if srt_file:
+                srt_file.write(f"{index}\n{srt_time(cue.start_time)} --> {srt_time(cue.end_time)}\n{text}\n\n")
+            if vtt_file:
+                vtt_file.write(f"{vtt_time(cue.start_time)} --> {vtt_time(cue.end_time)}\n{text}\n\n")
+            if ass_file:
+                ass_file.write(
+                    f"Dialogue: 0,{ass_time(cue.start_time)},{ass_time(cue.end_time)},Default,,0,0,0,,{_ass_text(cue.lines)}\n"
+                )
+
+        return {fmt: str(output_paths[fmt]) for fmt in handles}
+
+    except Exception as e:
+        logger.error(f"Error writing subtitle files: {e}")
+        return {}
+    finally:
+        for handle in handles.values():
+            handle.close()
+
+# Test function
+if __name__ == "__main__":
+    from types import SimpleNamespace
+
+    options = SimpleNamespace(
+        max_chars_per_line=32, max_lines_per_subtitle=2, min_duration=1.0, max_duration=7.0,
+        max_chars_per_second=17.0, max_pause=1.0, min_gap=0.1, font_size=20, font_color='white',
+        background_color='black', background_opacity=0.7, position='bottom', margin=50
+    )
+    sample = [{
+        'start_time': 0.0, 'end_time': 6.0, 'confidence': -0.2,
+        'text': "Halo semuanya, selamat datang kembali di podcast kita hari ini yang membahas AI."
+    }]
+
+    cues = build_cues(sample, options)
+    for cue in cues:
+        print(f"{srt_time(cue.start_time)} --> {srt_time(cue.end_time)} | {cue.lines}")
+    print(write_subtitle_files(cues, {'srt': '/tmp/test.srt', 'vtt': '/tmp/test.vtt', 'ass': '/tmp/test.ass'}, options))
@@ -0,0 +1,209 @@
+#!/usr/bin/env python3
+"""
+Temp Manager Module
+Lifecycle untuk intermediate files di TEMP_DIR: setiap artifact punya daftar
+consumers (stage yang masih membacanya) dan dihapus begitu consumer terakhir
+selesai. Producers me-reserve ruang disk dulu dan menunggu jika quota
+(PROCESSING['temp_quota_gb']) penuh, sehingga beberapa jobs bisa berjalan
+bersamaan di satu SSD.
+"""
+
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Optional, Set
+
+from config import PROCESSING
+
+# Setup logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+@dataclass
+class TempArtifact:
+    """Data class untuk satu intermediate file"""
+    path: Path
+    size: int
+    consumers: Set = field(default_factory=set)
+    on_delete: Optional[Callable] = None
+    unlink: Optional[Callable] = None  # Pengganti path.unlink (e.g. tunggu memmap dilepas)
+
+class TempManager:
+    def __init__(self, quota_bytes=None, wait_timeout=None, cleanup=None):
+        """
+        Initialize temp manager
+
+        Args:
+            quota_bytes: Batas total bytes intermediate files (None = tanpa batas)
+            wait_timeout: Maksimal detik producer menunggu quota sebelum lanjut
+            cleanup: False = artifact tidak dihapus (debugging)
+        """
+        if quota_bytes is None and PROCESSING.get('temp_quota_gb'):
+            quota_bytes = int(PROCESSING['temp_quota_gb'] * 1024 ** 3)
+        self.quota_bytes = quota_bytes
+        self.wait_timeout = wait_timeout if wait_timeout is not None else PROCESSING.get('temp_quota_wait', 600)
+        self.cleanup = PROCESSING.get('temp_cleanup', True) if cleanup is None else cleanup
+
+        self._artifacts = {}
+        self._reserved = 0
+        self._condition = threading.Condition()
+
+    def usage(self):
+        """Bytes yang dipakai artifacts + reservations aktif"""
+        with self._condition:
+            return self._usage()
+
+    def _usage(self):
+        return sum(a.size for a in self._artifacts.values()) + self._reserved
+
+    @contextmanager
+    def reserve(self, nbytes):
+        """
+        Reserve ruang disk sebelum menulis artifact. Block selama quota penuh;
+        jika tidak ada yang bisa dibebaskan (usage 0) atau wait_timeout habis,
+        producer tetap lanjut (soft quota, tidak deadlock).
+        """
+        nbytes = max(int(nbytes), 0)
+        with self._condition:
+            if self.quota_bytes:
+                deadline = time.monotonic() + self.wait_timeout
+                waited = False
+                while self._usage() > 0 and self._usage() + nbytes > self.quota_bytes:
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        logger.warning(f"Temp quota still full after {self.wait_timeout}s, continuing anyway")
+                        break
+                    if not waited:
+                        logger.info(f"Temp quota full ({self._usage() / 1024 ** 2:.0f} MB), waiting for space...")
+                        waited = True
+                    self._condition.wait(timeout=remaining)
+            self._reserved += nbytes
+
+        try:
+            yield
+        finally:
+            with self._condition:
+                self._reserved -= nbytes
+                self._condition.notify_all()
+
+    def register(self, path, consumers, on_delete=None, unlink=None):
+        """
+        Track artifact. Register ulang path yang sama menambah consumers
+        (artifact di-share antar jobs).
+
+        Args:
+            path: File path
+            consumers: Iterable of consumer keys, e.g. (run_id, stage)
+            on_delete: Callback sebelum file dihapus (e.g. drop memmap view)
+            unlink: Callback yang menghapus file, menggantikan path.unlink
+                (e.g. AudioCache.unlink menunda sampai memmap terakhir dilepas)
+        """
+        path = Path(path)
+        consumers = set(consumers)
+        with self._condition:
+            artifact = self._artifacts.get(path)
+            if artifact is None:
+                size = path.stat().st_size if path.exists() else 0
+                artifact = TempArtifact(path=path, size=size, on_delete=on_delete, unlink=unlink)
+                self._artifacts[path] = artifact
+            artifact.consumers |= consumers
+
+            if not artifact.consumers:
+                self._delete(artifact)
+
+    def release(self, consumer):
+        """Consumer selesai: hapus artifacts yang tidak punya consumer lagi"""
+        self._release_where(lambda c: c == consumer)
+
+    def release_owner(self, owner):
+        """Semua consumers (owner, stage) milik satu job selesai (done, failed atau cancelled)"""
+        self._release_where(lambda c: isinstance(c, tuple) and c and c[0] == owner)
+
+    def _release_where(self, predicate):
+        with self._condition:
+            for artifact in list(self._artifacts.values()):
+                artifact.consumers = {c for c in artifact.consumers if not predicate(c)}
+                if not artifact.consumers:
+                    self._delete(artifact)
+
+    def has_artifacts(self, directory):
+        """True jika masih ada artifact yang di-track di dalam directory"""
+        directory = Path(directory)
+        with self._condition:
+            return any(directory in artifact.path.parents for artifact in self._artifacts.values())
+
+    def discard(self, path):
+        """Hapus artifact sekarang juga (producer sendiri yang selesai memakainya)"""
+        with self._condition:
+            artifact = self._artifacts.get(Path(path))
+            if artifact is None:
+                artifact = TempArtifact(path=Path(path), size=0)
+            self._delete(artifact)
+
+    def _delete(self, artifact):
+        # Dipanggil dengan lock dipegang
+        self._artifacts.pop(artifact.path, None)
+        try:
+            if artifact.on_delete:
+                artifact.on_delete()
+            if self.cleanup and artifact.unlink:
+                artifact.unlink()
+            elif self.cleanup:
+                artifact.path.unlink(missing_ok=True)
+                logger.debug(f"Deleted temp artifact {artifact.path} ({artifact.size / 1024 ** 2:.1f} MB)")
+        except Exception as e:
+            logger.warning(f"Could not delete temp artifact {artifact.path}: {e}")
+        self._condition.notify_all()
+
+    def stats(self):
+        """Snapshot untuk logging / metrics"""
+        with self._condition:
+            return {
+                'artifacts': len(self._artifacts),
+                'bytes': sum(a.size for a in self._artifacts.values()),
+                'reserved_bytes': self._reserved,
+                'quota_bytes': self.quota_bytes
+            }
+
+# Singleton instance
+_temp_manager = None
+_temp_manager_lock = threading.Lock()
+
+def get_temp_manager():
+    """Get singleton TempManager instance (di-share semua jobs di process ini)"""
+    global _temp_manager
+    with _temp_manager_lock:
+        if _temp_manager is None:
+            _temp_manager = TempManager()
+        return _temp_manager
+
+# Test function
+if __name__ == "__main__":
+    import tempfile
+
+    manager = TempManager(quota_bytes=1024 * 1024, wait_timeout=5)
+    temp_dir = Path(tempfile.mkdtemp())
+
+    def produce(name, consumers):
+        path = temp_dir / name
+        with manager.reserve(800 * 1024):
+            path.write_bytes(os.urandom(800 * 1024))
+            manager.register(path, consumers)
+        print(f"{name} written, usage={manager.usage() / 1024:.0f} KB")
+
+    produce("a.pcm", [('job1', 'analysis'), ('job1', 'subtitle')])
+
+    # Producer kedua menunggu sampai a.pcm dilepas consumer terakhir
+    waiter = threading.Thread(target=produce, args=("b.pcm", [('job2', 'analysis')]))
+    waiter.start()
+    time.sleep(0.5)
+    manager.release(('job1', 'analysis'))
+    print(f"a.pcm exists after first consumer: {(temp_dir / 'a.pcm').exists()}")
+    manager.release_owner('job1')
+    waiter.join()
+    print(f"a.pcm exists after job1: {(temp_dir / 'a.pcm').exists()}")
+    print(manager.stats())
@@ -1 +1 @@
-#!/usr/bin/env python3\n\"\"\"\nVideo Analyzer Module\nMenganalisis video untuk mendeteksi moment terbaik menggunakan AI\nFitur: Scene detection, audio analysis, visual engagement, content analysis\n\"\"\"\n\nimport cv2\nimport numpy as np\nimport torch\nimport librosa\nimport logging\nfrom pathlib import Path\nfrom typing import List, Dict, Tuple\nimport json\nfrom dataclasses import dataclass\nfrom moviepy.editor import VideoFileClip\nimport matplotlib.pyplot as plt\nfrom scipy import signal\nfrom sklearn.cluster import KMeans\nfrom transformers import pipeline\nimport warnings\nwarnings.filterwarnings('ignore')\n\n# Setup logging\nlogging.basicConfig(level=logging.INFO)\nlogger = logging.getLogger(__name__)\n\n@dataclass\nclass VideoMoment:\n    \"\"\"Data class untuk menyimpan informasi moment video\"\"\"\n    start_time: float\n    end_time: float\n    duration: float\n    score: float\n    reason: str\n    features: Dict\n    confidence: float\n    \nclass VideoAnalyzer:\n    def __init__(self, models_dir=None):\n        \"\"\"Initialize video analyzer\"\"\"\n        self.models_dir = Path(models_dir) if models_dir else Path(__file__).parent.parent / \"models\"\n        self.models_dir.mkdir(exist_ok=True)\n        \n        # Initialize AI models\n        self.device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')\n        logger.info(f\"Using device: {self.device}\")\n        \n        # Load pre-trained models\n        self._load_models()\n        \n        # Analysis parameters\n        self.window_size = 5.0  # seconds\n        self.step_size = 1.0    # seconds\n        self.min_moment_duration = 5.0\n        self.max_moment_duration = 60.0\n        \n    def _load_models(self):\n        \"\"\"Load AI models untuk analysis\"\"\"\n        try:\n            # Audio classification untuk mood detection\n            logger.info(\"Loading audio analysis models...\")\n            \n            # Emotion detection dari audio (jika available)\n            try:\n                self.emotion_classifier = pipeline(\n                    \"audio-classification\",\n                    model=\"ehcalabres/wav2vec2-lg-xlsr-en-speech-emotion-recognition\",\n                    device=0 if torch.cuda.is_available() else -1\n                )\n                logger.info(\"Audio emotion model loaded\")\n            except Exception as e:\n                logger.warning(f\"Could not load emotion model: {e}\")\n                self.emotion_classifier = None\n                \n            # Visual scene analysis\n            logger.info(\"Loading visual analysis models...\")\n            \n            # Object detection untuk content analysis\n            try:\n                from ultralytics import YOLO\n                self.object_detector = YOLO('yolov8n.pt')  # Lightweight model\n                logger.info(\"Object detection model loaded\")\n            except Exception as e:\n                logger.warning(f\"Could not load object detection: {e}\")\n                self.object_detector = None\n                \n            logger.info(\"Models loaded successfully\")\n            \n        except Exception as e:\n            logger.error(f\"Error loading models: {e}\")\n            \n    def analyze_video(self, video_path, progress_callback=None):\n        \"\"\"\n        Main function untuk menganalisis video dan menemukan moment terbaik\n        \n        Args:\n            video_path: Path ke file video\n            progress_callback: Function untuk update progress\n            \n        Returns:\n            List of VideoMoment objects\n        \"\"\"\n        try:\n            logger.info(f\"Starting video analysis: {video_path}\")\n            \n            # Load video\n            video = VideoFileClip(video_path)\n            duration = video.duration\n            fps = video.fps\n            \n            if progress_callback:\n                progress_callback(5, \"Menganalisis struktur video...\")\n                \n            # Step 1: Scene detection\n            scenes = self._detect_scenes(video, progress_callback)\n            \n            if progress_callback:\n                progress_callback(25, \"Menganalisis audio...\")\n                \n            # Step 2: Audio analysis\n            audio_features = self._analyze_audio(video, progress_callback)\n            \n            if progress_callback:\n                progress_callback(50, \"Menganalisis visual content...\")\n                \n            # Step 3: Visual analysis\n            visual_features = self._analyze_visual_content(video, progress_callback)\n            \n            if progress_callback:\n                progress_callback(75, \"Menghitung moment scores...\")\n                \n            # Step 4: Combine features dan score moments\n            moments = self._score_moments(scenes, audio_features, visual_features, duration)\n            \n            if progress_callback:\n                progress_callback(90, \"Memfilter moment terbaik...\")\n                \n            # Step 5: Filter dan rank moments\n            best_moments = self._filter_and_rank_moments(moments)\n            \n            # Cleanup\n            video.close()\n            \n            if progress_callback:\n                progress_callback(100, f\"Analisis selesai - {len(best_moments)} moment terdeteksi\")\n                \n            logger.info(f\"Analysis complete. Found {len(best_moments)} best moments\")\n            return best_moments\n            \n        except Exception as e:\n            logger.error(f\"Error analyzing video: {e}\")\n            return []\n            \n    def _detect_scenes(self, video, progress_callback=None):\n        \"\"\"\n        Detect scene changes dalam video\n        \"\"\"\n        try:\n            scenes = []\n            duration = video.duration\n            \n            # Sample frames untuk scene detection\n            sample_interval = 1.0  # Every second\n            frames = []\n            timestamps = []\n            \n            for t in np.arange(0, duration, sample_interval):\n                try:\n                    frame = video.get_frame(t)\n                    frames.append(frame)\n                    timestamps.append(t)\n                except:\n                    continue\n                    \n            if len(frames) < 2:\n                return [(0, duration)]\n                \n            # Calculate frame differences\n            scene_changes = [0]  # Start dengan frame pertama\n            \n            for i in range(1, len(frames)):\n                # Convert ke grayscale dan resize untuk efficiency\n                frame1 = cv2.cvtColor(frames[i-1], cv2.COLOR_RGB2GRAY)\n                frame2 = cv2.cvtColor(frames[i], cv2.COLOR_RGB2GRAY)\n                \n                frame1 = cv2.resize(frame1, (64, 48))\n                frame2 = cv2.resize(frame2, (64, 48))\n                \n                # Calculate histogram difference\n                diff = cv2.compareHist(\n                    cv2.calcHist([frame1], [0], None, [256], [0, 256]),\n                    cv2.calcHist([frame2], [0], None, [256], [0, 256]),\n                    cv2.HISTCMP_CORREL\n                )\n                \n                # Threshold untuk scene change (semakin rendah = scene change)\n                if diff < 0.8:  # Tunable parameter\n                    scene_changes.append(timestamps[i])\n                    \n            scene_changes.append(duration)  # End dengan frame terakhir\n            \n            # Convert ke scene segments\n            for i in range(len(scene_changes) - 1):\n                start_time = scene_changes[i]\n                end_time = scene_changes[i + 1]\n                scenes.append((start_time, end_time))\n                \n            logger.info(f\"Detected {len(scenes)} scenes\")\n            return scenes\n            \n        except Exception as e:\n            logger.error(f\"Error detecting scenes: {e}\")\n            return [(0, video.duration)]  # Fallback: whole video as one scene\n            \n    def _analyze_audio(self, video, progress_callback=None):\n        \"\"\"\n        Analyze audio features untuk menentukan engagement\n        \"\"\"\n        try:\n            # Extract audio\n            audio = video.audio\n            if not audio:\n                return {'energy': [], 'tempo': [], 'spectral_features': [], 'emotions': []}\n                \n            # Get audio array\n            audio_array = audio.to_soundarray()\n            if len(audio_array.shape) > 1:\n                audio_array = np.mean(audio_array, axis=1)  # Convert to mono\n                \n            sample_rate = audio.fps\n            duration = len(audio_array) / sample_rate\n            \n            # Calculate audio features in windows\n            window_length = int(self.window_size * sample_rate)\n            step_length = int(self.step_size * sample_rate)\n            \n            features = {\n                'energy': [],\n                'tempo': [],\n                'spectral_features': [],\n                'emotions': [],\n                'timestamps': []\n            }\n            \n            for start in range(0, len(audio_array) - window_length, step_length):\n                window = audio_array[start:start + window_length]\n                timestamp = start / sample_rate\n                \n                # Energy (RMS)\n                energy = np.sqrt(np.mean(window ** 2))\n                \n                # Tempo estimation\n                try:\n                    tempo, _ = librosa.beat.beat_track(y=window, sr=sample_rate)\n                    tempo = float(tempo) if not np.isnan(tempo) else 120.0\n                except:\n                    tempo = 120.0\n                    \n                # Spectral features\n                spectral_centroid = np.mean(librosa.feature.spectral_centroid(y=window, sr=sample_rate))\n                spectral_rolloff = np.mean(librosa.feature.spectral_rolloff(y=window, sr=sample_rate))\n                zero_crossing_rate = np.mean(librosa.feature.zero_crossing_rate(window))\n                \n                # Emotion detection (if model available)\n                emotion_score = 0.5  # Default neutral\n                if self.emotion_classifier and len(window) > 1024:\n                    try:\n                        # Resample untuk model jika perlu\n                        if sample_rate != 16000:\n                            window_resampled = librosa.resample(window, orig_sr=sample_rate, target_sr=16000)\n                        else:\n                            window_resampled = window\n                            \n                        emotion_result = self.emotion_classifier(window_resampled)\n                        # Extract positive emotion score\n                        emotion_score = max([r['score'] for r in emotion_result if r['label'] in ['happy', 'excited', 'positive']], default=0.5)\n                    except:\n                        emotion_score = 0.5\n                        \n                features['energy'].append(energy)\n                features['tempo'].append(tempo)\n                features['spectral_features'].append({\n                    'centroid': float(spectral_centroid),\n                    'rolloff': float(spectral_rolloff),\n                    'zcr': float(zero_crossing_rate)\n                })\n                features['emotions'].append(emotion_score)\n                features['timestamps'].append(timestamp)\n                \n            return features\n            \n        except Exception as e:\n            logger.error(f\"Error analyzing audio: {e}\")\n            return {'energy': [], 'tempo': [], 'spectral_features': [], 'emotions': []}\n            \n    def _analyze_visual_content(self, video, progress_callback=None):\n        \"\"\"\n        Analyze visual content untuk engagement scoring\n        \"\"\"\n        try:\n            duration = video.duration\n            features = {\n                'motion': [],\n                'objects': [],\n                'face_count': [],\n                'color_variance': [],\n                'brightness': [],\n                'timestamps': []\n            }\n            \n            # Sample frames\n            sample_interval = self.step_size\n            \n            prev_frame = None\n            for t in np.arange(0, duration, sample_interval):\n                try:\n                    frame = video.get_frame(t)\n                    gray_frame = cv2.cvtColor(frame, cv2.COLOR_RGB2GRAY)\n                    \n                    # Motion detection\n                    motion_score = 0.0\n                    if prev_frame is not None:\n                        diff = cv2.absdiff(prev_frame, gray_frame)\n                        motion_score = np.mean(diff) / 255.0\n                        \n                    prev_frame = gray_frame\n                    \n                    # Object detection\n                    object_count = 0\n                    object_confidence = 0.0\n                    if self.object_detector:\n                        try:\n                            results = self.object_detector(frame, verbose=False)\n                            if len(results) > 0 and len(results[0].boxes) > 0:\n                                object_count = len(results[0].boxes)\n                                object_confidence = float(np.mean([box.conf.cpu().numpy() for box in results[0].boxes]))\n                        except:\n                            pass\n                            \n                    # Face detection (simple)\n                    face_count = 0\n                    try:\n                        face_cascade = cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')\n                        faces = face_cascade.detectMultiScale(gray_frame, 1.3, 5)\n                        face_count = len(faces)\n                    except:\n                        pass\n                        \n                    # Color variance (diversity)\n                    color_var = np.std(frame.reshape(-1, 3), axis=0).mean()\n                    \n                    # Brightness\n                    brightness = np.mean(gray_frame) / 255.0\n                    \n                    features['motion'].append(motion_score)\n                    features['objects'].append({'count': object_count, 'confidence': object_confidence})\n                    features['face_count'].append(face_count)\n                    features['color_variance'].append(color_var)\n                    features['brightness'].append(brightness)\n                    features['timestamps'].append(t)\n                    \n                except Exception as e:\n                    logger.warning(f\"Error processing frame at {t}s: {e}\")\n                    continue\n                    \n            return features\n            \n        except Exception as e:\n            logger.error(f\"Error analyzing visual content: {e}\")\n            return {'motion': [], 'objects': [], 'face_count': [], 'color_variance': [], 'brightness': [], 'timestamps': []}\n            \n    def _score_moments(self, scenes, audio_features, visual_features, duration):\n        \"\"\"\n        Score moments berdasarkan combined features\n        \"\"\"\n        try:\n            moments = []\n            \n            # Normalize features untuk scoring\n            audio_energy = np.array(audio_features.get('energy', [0]))\n            audio_emotions = np.array(audio_features.get('emotions', [0.5]))\n            visual_motion = np.array(visual_features.get('motion', [0]))\n            face_counts = np.array(visual_features.get('face_count', [0]))\n            \n            # Normalize arrays\n            if len(audio_energy) > 0:\n                audio_energy = (audio_energy - np.min(audio_energy)) / (np.max(audio_energy) - np.min(audio_energy) + 1e-8)\n            if len(visual_motion) > 0:\n                visual_motion = (visual_motion - np.min(visual_motion)) / (np.max(visual_motion) - np.min(visual_motion) + 1e-8)\n                \n            # Score each scene\n            for start_time, end_time in scenes:\n                scene_duration = end_time - start_time\n                \n                if scene_duration < self.min_moment_duration:\n                    continue\n                    \n                # Find features dalam time range\n                audio_timestamps = audio_features.get('timestamps', [])\n                visual_timestamps = visual_features.get('timestamps', [])\n                \n                # Audio features untuk scene\n                audio_indices = [i for i, t in enumerate(audio_timestamps) if start_time <= t <= end_time]\n                visual_indices = [i for i, t in enumerate(visual_timestamps) if start_time <= t <= end_time]\n                \n                if not audio_indices and not visual_indices:\n                    continue\n                    \n                # Calculate scores\n                audio_score = 0.0\n                if audio_indices:\n                    scene_energy = np.mean([audio_energy[i] for i in audio_indices] if len(audio_energy) > 0 else [0])\n                    scene_emotion = np.mean([audio_emotions[i] for i in audio_indices] if len(audio_emotions) > 0 else [0.5])\n                    audio_score = 0.6 * scene_energy + 0.4 * scene_emotion\n                    \n                visual_score = 0.0\n                if visual_indices:\n                    scene_motion = np.mean([visual_motion[i] for i in visual_indices] if len(visual_motion) > 0 else [0])\n                    scene_faces = np.mean([face_counts[i] for i in visual_indices] if len(face_counts) > 0 else [0])\n                    visual_score = 0.7 * scene_motion + 0.3 * min(scene_faces / 3.0, 1.0)  # Normalize face count\n                    \n                # Combined score\n                combined_score = 0.4 * audio_score + 0.6 * visual_score\n                \n                # Boost score untuk optimal duration\n                duration_factor = 1.0\n                if 15 <= scene_duration <= 45:  # Optimal range\n                    duration_factor = 1.2\n                elif scene_duration > 60:\n                    duration_factor = 0.8\n                    \n                final_score = combined_score * duration_factor\n                \n                # Create moment\n                moment = VideoMoment(\n                    start_time=start_time,\n                    end_time=end_time,\n                    duration=scene_duration,\n                    score=final_score,\n                    reason=self._generate_reason(audio_score, visual_score, scene_duration),\n                    features={\n                        'audio_score': audio_score,\n                        'visual_score': visual_score,\n                        'scene_duration': scene_duration,\n                        'face_count': np.mean([face_counts[i] for i in visual_indices]) if visual_indices and len(face_counts) > 0 else 0\n                    },\n                    confidence=min(final_score, 1.0)\n                )\n                \n                moments.append(moment)\n                \n            return moments\n            \n        except Exception as e:\n            logger.error(f\"Error scoring moments: {e}\")\n            return []\n            \n    def _filter_and_rank_moments(self, moments, max_moments=10):\n        \"\"\"\n        Filter dan rank moments untuk mendapatkan yang terbaik\n        \"\"\"\n        try:\n            if not moments:\n                return []\n                \n            # Sort by score descending\n            moments.sort(key=lambda x: x.score, reverse=True)\n            \n            # Filter overlapping moments (ambil yang score tertinggi)\n            filtered_moments = []\n            \n            for moment in moments:\n                # Check overlap dengan moments yang sudah dipilih\n                overlaps = False\n                for selected_moment in filtered_moments:\n                    if (moment.start_time < selected_moment.end_time and \n                        moment.end_time > selected_moment.start_time):\n                        overlaps = True\n                        break\n                        \n                if not overlaps:\n                    filtered_moments.append(moment)\n                    \n                if len(filtered_moments) >= max_moments:\n                    break\n                    \n            # Additional filtering berdasarkan score threshold\n            threshold = 0.3  # Minimum score\n            final_moments = [m for m in filtered_moments if m.score >= threshold]\n            \n            return final_moments\n            \n        except Exception as e:\n            logger.error(f\"Error filtering moments: {e}\")\n            return moments[:max_moments] if moments else []\n            \n    def _generate_reason(self, audio_score, visual_score, duration):\n        \"\"\"\n        Generate human-readable reason untuk moment selection\n        \"\"\"\n        reasons = []\n        \n        if audio_score > 0.7:\n            reasons.append(\"Audio engaging\")\n        if visual_score > 0.7:\n            reasons.append(\"Visual menarik\")\n        if 15 <= duration <= 45:\n            reasons.append(\"Durasi optimal\")\n        if audio_score > 0.6 and visual_score > 0.6:\n            reasons.append(\"Kombinasi audio-visual bagus\")\n            \n        if not reasons:\n            if audio_score > visual_score:\n                reasons.append(\"Audio cukup menarik\")\n            else:\n                reasons.append(\"Visual cukup menarik\")\n                \n        return \", \".join(reasons)\n        \n    def save_analysis_results(self, moments, output_path):\n        \"\"\"\n        Save analysis results ke file JSON\n        \"\"\"\n        try:\n            results = {\n                'analysis_timestamp': str(pd.Timestamp.now()),\n                'total_moments': len(moments),\n                'moments': []\n            }\n            \n            for moment in moments:\n                moment_data = {\n                    'start_time': moment.start_time,\n                    'end_time': moment.end_time,\n                    'duration': moment.duration,\n                    'score': moment.score,\n                    'reason': moment.reason,\n                    'confidence': moment.confidence,\n                    'features': moment.features\n                }\n                results['moments'].append(moment_data)\n                \n            with open(output_path, 'w', encoding='utf-8') as f:\n                json.dump(results, f, indent=2, ensure_ascii=False)\n                \n            logger.info(f\"Analysis results saved to {output_path}\")\n            \n        except Exception as e:\n            logger.error(f\"Error saving analysis results: {e}\")\n\n# Test function\nif __name__ == \"__main__\":\n    # Test analyzer\n    analyzer = VideoAnalyzer()\n    \n    def test_progress(progress, message):\n        print(f\"Progress: {progress}% - {message}\")\n    \n    # Test dengan sample video (ganti dengan path video actual)\n    # video_path = \"test_video.mp4\"\n    # moments = analyzer.analyze_video(video_path, test_progress)\n    # \n    # for i, moment in enumerate(moments):\n    #     print(f\"Moment {i+1}: {moment.start_time:.1f}s - {moment.end_time:.1f}s\")\n    #     print(f\"  Score: {moment.score:.3f}, Reason: {moment.reason}\")\n    \n    print(\"Video Analyzer module loaded successfully\")
\ No newline at end of file
+#!/usr/bin/env python3\n\"\"\"\nVideo Analyzer Module\nMenganalisis video untuk mendeteksi moment terbaik menggunakan AI\nFitur: Scene detection, audio analysis, visual engagement, content analysis\n\"\"\"\n\nimport cv2\nimport numpy as np\nimport torch\nimport librosa\nimport logging\nfrom pathlib import Path\nfrom typing import List, Dict, Tuple, Iterator\nimport json\nfrom dataclasses import dataclass\nfrom moviepy.editor import VideoFileClip\nimport matplotlib.pyplot as plt\nfrom scipy import signal\nfrom sklearn.cluster import KMeans\nfrom transformers import pipeline\nimport warnings\n\nfrom config import VIDEO_SETTINGS, MOMENT_DETECTION\nfrom .metrics import get_metrics\nfrom .audio_cache import get_audio_cache, SPEECH_SAMPLE_RATE\nfrom .parallel import (map_frames, scene_histogram, visual_frame_features, face_prominence,\n                       should_shard, plan_shards, submit_shards, gather_shards, analyze_frames_shard)\nwarnings.filterwarnings('ignore')\n\n# Setup logging\nlogging.basicConfig(level=logging.INFO)\nlogger = logging.getLogger(__name__)\n\n@dataclass\nclass VideoMoment:\n    \"\"\"Data class untuk menyimpan informasi moment video\"\"\"\n    start_time: float\n    end_time: float\n    duration: float\n    score: float\n    reason: str\n    features: Dict\n    confidence: float\n    \nclass VideoAnalyzer:\n    def __init__(self, models_dir=None):\n        \"\"\"Initialize video analyzer\"\"\"\n        self.models_dir = Path(models_dir) if models_dir else Path(__file__).parent.parent / \"models\"\n        self.models_dir.mkdir(exist_ok=True)\n        \n        # Initialize AI models\n        self.device = torch.device('cuda' if torch.cuda.is_available() else 'cpu')\n        logger.info(f\"Using device: {self.device}\")\n        \n        # Load pre-trained models\n        self._load_models()\n        \n        # Analysis parameters\n        self.window_size = 5.0  # seconds\n        self.step_size = 1.0    # seconds\n        self.audio_sample_rate = VIDEO_SETTINGS['audio_sample_rate']\n        self.min_moment_duration = 5.0\n        self.max_moment_duration = 60.0\n        self.scene_sample_interval = 1.0  # seconds\n        self.scene_threshold = 0.8  # Histogram correlation di bawah ini = scene change\n        self.face_sample_interval = MOMENT_DETECTION.get('face_sample_interval', 2.0)\n        self.face_detect_width = MOMENT_DETECTION.get('face_detect_width', 320)\n        \n    def estimate_work_units(self, duration):\n        \"\"\"\n        Estimasi jumlah unit kerja analysis (sampled frames + audio windows)\n        untuk ETA berbasis throughput\n        \"\"\"\n        scene_frames = duration / self.scene_sample_interval\n        visual_frames = duration / self.step_size\n        audio_windows = max(duration - self.window_size, 0) / self.step_size\n        return scene_frames + visual_frames + audio_windows\n        \n    def _load_models(self):\n        \"\"\"Load AI models untuk analysis\"\"\"\n        try:\n            # Audio classification untuk mood detection\n            logger.info(\"Loading audio analysis models...\")\n            \n            # Emotion detection dari audio (jika available)\n            try:\n                self.emotion_classifier = pipeline(\n                    \"audio-classification\",\n                    model=\"ehcalabres/wav2vec2-lg-xlsr-en-speech-emotion-recognition\",\n                    device=0 if torch.cuda.is_available() else -1\n                )\n                logger.info(\"Audio emotion model loaded\")\n            except Exception as e:\n                logger.warning(f\"Could not load emotion model: {e}\")\n                self.emotion_classifier = None\n                \n            # Visual scene analysis\n            logger.info(\"Loading visual analysis models...\")\n            \n            # Object detection untuk content analysis\n            try:\n                from ultralytics import YOLO\n                self.object_detector = YOLO('yolov8n.pt')  # Lightweight model\n                logger.info(\"Object detection model loaded\")\n            except Exception as e:\n                logger.warning(f\"Could not load object detection: {e}\")\n                self.object_detector = None\n                \n            logger.info(\"Models loaded successfully\")\n            \n        except Exception as e:\n            logger.error(f\"Error loading models: {e}\")\n            \n    def analyze_video(self, video_path, progress_callback=None):\n        \"\"\"\n        Main function untuk menganalisis video dan menemukan moment terbaik\n        \n        Args:\n            video_path: Path ke file video\n            progress_callback: Function untuk update progress\n            \n        Returns:\n            List of VideoMoment objects\n        \"\"\"\n        try:\n            logger.info(f\"Starting video analysis: {video_path}\")\n            \n            with get_metrics().stage('video_analysis'):\n                # Load video\n                video = VideoFileClip(video_path)\n                duration = video.duration\n                fps = video.fps\n            \n                if progress_callback:\n                    progress_callback(5, \"Menganalisis struktur video...\")\n                \n                # Video panjang: scene + visual features per time shard di workers,\n                # sementara audio dianalisis di process ini\n                shard_futures = None\n                if should_shard(duration):\n                    shard_futures = self._submit_frame_shards(video_path, duration)\n                else:\n                    # Step 1: Scene detection\n                    scenes = self._detect_scenes(video, progress_callback)\n            \n                if progress_callback:\n                    progress_callback(25, \"Menganalisis audio...\")\n                \n                # Step 2: Audio analysis\n                audio_features = self._analyze_audio(video_path, progress_callback)\n            \n                if progress_callback:\n                    progress_callback(50, \"Menganalisis visual content...\")\n                \n                # Step 3: Visual analysis\n                if shard_futures is not None:\n                    scenes, visual_features = self._merge_frame_shards(shard_futures, duration)\n                else:\n                    visual_features = self._analyze_visual_content(video, progress_callback)\n            \n                if progress_callback:\n                    progress_callback(75, \"Menghitung moment scores...\")\n                \n                # Step 4: Combine features dan score moments\n                moments = self._score_moments(scenes, audio_features, visual_features, duration)\n            \n                if progress_callback:\n                    progress_callback(90, \"Memfilter moment terbaik...\")\n                \n                # Step 5: Filter dan rank moments\n                best_moments = self.rank_moments(moments)\n            \n                # Cleanup\n                video.close()\n            \n                if progress_callback:\n                    progress_callback(100, f\"Analisis selesai - {len(best_moments)} moment terdeteksi\")\n                \n            logger.info(f\"Analysis complete. Found {len(best_moments)} best moments\")\n            return best_moments\n            \n        except Exception as e:\n            logger.error(f\"Error analyzing video: {e}\")\n            return []\n            \n    def iter_moments(self, video_path, top_k=None, min_confidence=None, progress_callback=None) -> Iterator[VideoMoment]:\n        \"\"\"\n        Incremental analysis: video di-scan per chunk (MOMENT_DETECTION['scan_chunk_seconds'])\n        dan setiap scene yang sudah ditutup scene cut langsung di-score dan di-yield,\n        sehingga consumer (preview, clip rendering) bisa mulai sebelum scan selesai.\n        Normalisasi features memakai semua yang sudah di-scan, jadi score bisa\n        sedikit berbeda dari analyze_video.\n        \n        Args:\n            video_path: Path ke file video\n            top_k: Berhenti setelah top_k moments dengan confidence >= min_confidence (\"top N cepat\")\n            min_confidence: Threshold early stopping (default MOMENT_DETECTION['quick_min_confidence'])\n            progress_callback: Function untuk update progress\n            \n        Yields:\n            VideoMoment dalam urutan waktu dengan score >= MOMENT_DETECTION['min_score']\n        \"\"\"\n        if min_confidence is None:\n            min_confidence = MOMENT_DETECTION.get('quick_min_confidence', 0.6)\n        min_score = MOMENT_DETECTION.get('min_score', 0.3)\n        chunk_seconds = MOMENT_DETECTION.get('scan_chunk_seconds', 120)\n        \n        logger.info(f\"Starting incremental video analysis: {video_path}\")\n        video = VideoFileClip(video_path)\n        try:\n            with get_metrics().stage('video_analysis'):\n                duration = video.duration\n                audio_features = {'energy': [], 'emotions': [], 'timestamps': []}\n                visual_features = {'motion': [], 'face_count': [], 'face_prominence': [], 'timestamps': []}\n                scene_start = 0.0\n                confident = 0\n                \n                for chunk_start in np.arange(0, duration, chunk_seconds):\n                    chunk_end = min(chunk_start + chunk_seconds, duration)\n                    cuts = self._detect_scene_cuts(video, chunk_start, chunk_end) or []\n                    \n                    # Features chunk ini ditambahkan ke features sebelumnya (scene bisa melewati chunk)\n                    chunk_audio = self._analyze_audio(video_path, None, chunk_start, chunk_end)\n                    chunk_visual = self._analyze_visual_content(video, None, chunk_start, chunk_end)\n                    for features, chunk in ((audio_features, chunk_audio), (visual_features, chunk_visual)):\n                        for key in features:\n                            features[key].extend(chunk.get(key, []))\n                                \n                    # Scene yang sudah ditutup cut (atau akhir video) bisa di-score\n                    closed = []\n                    for cut in cuts + ([duration] if chunk_end >= duration else []):\n                        if cut > scene_start:\n                            closed.append((scene_start, cut))\n                            scene_start = cut\n                            \n                    for moment in self._score_moments(closed, audio_features, visual_features, duration):\n                        if moment.score < min_score:\n                            continue\n                        yield moment\n                        \n                        if moment.confidence >= min_confidence:\n                            confident += 1\n                        if top_k and confident >= top_k:\n                            logger.info(f\"Found {confident} high-confidence moments at {chunk_end:.0f}s, stopping early\")\n                            return\n                            \n                    if progress_callback:\n                        progress_callback(100 * chunk_end / duration, f\"Scan {chunk_end:.0f}/{duration:.0f}s\")\n        finally:\n            video.close()\n            \n    def analyze_ranges(self, video_path, ranges, carried_moments=None, progress_callback=None):\n        \"\"\"\n        Analysis hanya untuk sebagian timeline (e.g. bagian video yang tidak ada\n        di versi yang sudah pernah dianalisis). Moments dari analysis sebelumnya\n        (carried_moments, sudah dalam timeline video ini) ikut di-filter dan di-rank.\n        \n        Args:\n            video_path: Path ke file video\n            ranges: List of (start, end) detik yang perlu dianalisis\n            carried_moments: List of VideoMoment / dict dari cached analysis\n            progress_callback: Function untuk update progress\n            \n        Returns:\n            List of VideoMoment objects\n        \"\"\"\n        try:\n            fields = VideoMoment.__dataclass_fields__\n            moments = [\n                m if isinstance(m, VideoMoment) else VideoMoment(**{k: v for k, v in m.items() if k in fields})\n                for m in carried_moments or []\n            ]\n            logger.info(f\"Analyzing {len(ranges)} ranges, {len(moments)} moments carried over\")\n            \n            with get_metrics().stage('video_analysis'):\n                video = VideoFileClip(video_path)\n                try:\n                    for index, (start, end) in enumerate(ranges):\n                        cuts = self._detect_scene_cuts(video, start, end) or []\n                        boundaries = [start] + [c for c in cuts if start < c < end] + [end]\n                        scenes = list(zip(boundaries[:-1], boundaries[1:]))\n                        \n                        audio_features = self._analyze_audio(video_path, None, start, end)\n                        visual_features = self._analyze_visual_content(video, None, start, end)\n                        moments.extend(self._score_moments(scenes, audio_features, visual_features, video.duration))\n                        \n                        if progress_callback:\n                            progress_callback(100 * (index + 1) / len(ranges), f\"Range {index + 1}/{len(ranges)}\")\n                finally:\n                    video.close()\n                    \n            return self.rank_moments(moments)\n            \n        except Exception as e:\n            logger.error(f\"Error analyzing ranges: {e}\")\n            return []\n            \n    def _detect_scenes(self, video, progress_callback=None):\n        \"\"\"\n        Detect scene changes dalam video\n        \"\"\"\n        try:\n            duration = video.duration\n            cuts = self._detect_scene_cuts(video)\n            if cuts is None:\n                return [(0, duration)]\n                \n            # Convert ke scene segments\n            scene_changes = [0] + cuts + [duration]\n            scenes = list(zip(scene_changes[:-1], scene_changes[1:]))\n                \n            logger.info(f\"Detected {len(scenes)} scenes\")\n            return scenes\n            \n        except Exception as e:\n            logger.error(f\"Error detecting scenes: {e}\")\n            return [(0, video.duration)]  # Fallback: whole video as one scene\n            \n    def _detect_scene_cuts(self, video, start=0.0, end=None):\n        \"\"\"\n        Timestamps scene change di dalam (start, end). Range setelah 0 mulai\n        satu sample lebih awal supaya cut tepat di start tetap terdeteksi.\n        \n        Returns:\n            List of cut timestamps, atau None jika frames tidak cukup\n        \"\"\"\n        duration = video.duration if end is None else min(end, video.duration)\n        \n        # Sample frames untuk scene detection\n        sample_interval = self.scene_sample_interval\n        first_sample = max(start - sample_interval, 0.0)\n        histograms = []\n        timestamps = []\n        \n        def frame_source():\n            for t in np.arange(first_sample, duration, sample_interval):\n                try:\n                    yield t, video.get_frame(t)\n                except:\n                    continue\n        \n        # Histogram dihitung di process pool (frames lewat shared memory)\n        for t, histogram in map_frames(frame_source(), scene_histogram):\n            histograms.append(histogram)\n            timestamps.append(t)\n            get_metrics().advance('video_analysis', 1)\n                \n        get_metrics().record('video_analysis', frames=len(histograms))\n            \n        if len(histograms) < 2:\n            return None\n            \n        # Calculate frame differences\n        cuts = []\n        for i in range(1, len(histograms)):\n            # Calculate histogram difference\n            diff = cv2.compareHist(histograms[i-1], histograms[i], cv2.HISTCMP_CORREL)\n            \n            # Threshold untuk scene change (semakin rendah = scene change)\n            if diff < self.scene_threshold and timestamps[i] >= start:\n                cuts.append(timestamps[i])\n                \n        return cuts\n        \n    def _submit_frame_shards(self, video_path, duration):\n        \"\"\"\n        Submit scene + visual analysis per time shard; setiap worker punya\n        decoder sendiri dan overlap satu sample untuk konteks di boundary\n        \"\"\"\n        shards = plan_shards(duration, self.step_size, overlap=self.step_size)\n        logger.info(f\"Analyzing {len(shards)} time shards in parallel\")\n        \n        def on_done(result):\n            # Satu decode pass menggantikan scene + visual sampling\n            get_metrics().advance('video_analysis', 2 * len(result['timestamps']))\n            \n        return submit_shards(\n            analyze_frames_shard, shards, str(video_path), self.step_size, self.scene_threshold,\n            self.face_sample_interval, self.face_detect_width,\n            on_done=on_done\n        )\n        \n    def _merge_frame_shards(self, shard_futures, duration):\n        \"\"\"\n        Gabungkan hasil shards: scene cuts dari core range setiap shard\n        (tanpa duplikat di overlap) dan visual features dalam urutan waktu\n        \"\"\"\n        try:\n            features = {\n                'motion': [],\n                'objects': [],\n                'face_count': [],\n                'face_prominence': [],\n                'color_variance': [],\n                'brightness': [],\n                'timestamps': []\n            }\n            scene_changes = {0}\n            face_stats = {}\n            \n            for result in gather_shards(shard_futures):\n                scene_changes.update(t for t in result['cuts'] if 0 < t < duration)\n                for key in ('motion', 'color_variance', 'brightness', 'timestamps'):\n                    features[key].extend(result[key])\n                # Object detection (YOLO) tidak dijalankan di shard workers\n                features['objects'].extend({'count': 0, 'confidence': 0.0} for _ in result['timestamps'])\n                for t, prominence, count in zip(result['face_timestamps'], result['face_prominence'], result['face_count']):\n                    face_stats[t] = {'prominence': prominence, 'face_count': count}\n                    \n            features['face_prominence'], features['face_count'] = self._face_prominence_curve(face_stats, features['timestamps'])\n            get_metrics().record('video_analysis', frames=len(features['timestamps']))\n            \n            scene_changes = sorted(scene_changes) + [duration]\n            scenes = list(zip(scene_changes[:-1], scene_changes[1:]))\n            \n            logger.info(f\"Detected {len(scenes)} scenes\")\n            return scenes, features\n            \n        except Exception as e:\n            logger.error(f\"Error merging analysis shards: {e}\")\n            return [(0, duration)], {'motion': [], 'objects': [], 'face_count': [], 'face_prominence': [], 'color_variance': [], 'brightness': [], 'timestamps': []}\n            \n    def _analyze_audio(self, video_path, progress_callback=None, start=0.0, end=None):\n        \"\"\"\n        Analyze audio features untuk menentukan engagement\n        (windows yang mulai di dalam range [start, end))\n        \"\"\"\n        try:\n            # Mono audio dari shared audio cache (memmap, di-extract sekali per video)\n            audio_cache = get_audio_cache(video_path)\n            audio_array = audio_cache.get(self.audio_sample_rate)\n            if audio_array is None:\n                return {'energy': [], 'tempo': [], 'spectral_features': [], 'emotions': []}\n                \n            # Emotion model butuh 16kHz: ambil dari cache, tidak resample per window\n            speech_audio = audio_cache.get(SPEECH_SAMPLE_RATE) if self.emotion_classifier else None\n            speech_window = int(self.window_size * SPEECH_SAMPLE_RATE)\n                \n            sample_rate = self.audio_sample_rate\n            duration = len(audio_array) / sample_rate\n            get_metrics().record('video_analysis', samples=len(audio_array))\n            \n            # Calculate audio features in windows\n            window_length = int(self.window_size * sample_rate)\n            step_length = int(self.step_size * sample_rate)\n            \n            features = {\n                'energy': [],\n                'tempo': [],\n                'spectral_features': [],\n                'emotions': [],\n                'timestamps': []\n            }\n            \n            first_window = int(np.ceil(start * sample_rate / step_length)) * step_length\n            last_window = len(audio_array) - window_length\n            if end is not None:\n                last_window = min(last_window, int(end * sample_rate))\n                \n            for window_start in range(first_window, last_window, step_length):\n                window = audio_array[window_start:window_start + window_length]\n                timestamp = window_start / sample_rate\n                \n                # Energy (RMS)\n                energy = np.sqrt(np.mean(window ** 2))\n                \n                # Tempo estimation\n                try:\n                    tempo, _ = librosa.beat.beat_track(y=window, sr=sample_rate)\n                    tempo = float(tempo) if not np.isnan(tempo) else 120.0\n                except:\n                    tempo = 120.0\n                    \n                # Spectral features\n                spectral_centroid = np.mean(librosa.feature.spectral_centroid(y=window, sr=sample_rate))\n                spectral_rolloff = np.mean(librosa.feature.spectral_rolloff(y=window, sr=sample_rate))\n                zero_crossing_rate = np.mean(librosa.feature.zero_crossing_rate(window))\n                \n                # Emotion detection (if model available)\n                emotion_score = 0.5  # Default neutral\n                if self.emotion_classifier and len(window) > 1024:\n                    try:\n                        speech_start = int(timestamp * SPEECH_SAMPLE_RATE)\n                        speech_window_audio = np.asarray(speech_audio[speech_start:speech_start + speech_window])\n                            \n                        emotion_result = self.emotion_classifier(speech_window_audio)\n                        # Extract positive emotion score\n                        emotion_score = max([r['score'] for r in emotion_result if r['label'] in ['happy', 'excited', 'positive']], default=0.5)\n                    except:\n                        emotion_score = 0.5\n                        \n                features['energy'].append(energy)\n                features['tempo'].append(tempo)\n                features['spectral_features'].append({\n                    'centroid': float(spectral_centroid),\n                    'rolloff': float(spectral_rolloff),\n                    'zcr': float(zero_crossing_rate)\n                })\n                features['emotions'].append(emotion_score)\n                features['timestamps'].append(timestamp)\n                get_metrics().advance('video_analysis', 1)\n                \n            return features\n            \n        except Exception as e:\n            logger.error(f\"Error analyzing audio: {e}\")\n            return {'energy': [], 'tempo': [], 'spectral_features': [], 'emotions': []}\n            \n    def _analyze_visual_content(self, video, progress_callback=None, start=0.0, end=None):\n        \"\"\"\n        Analyze visual content untuk engagement scoring (atau range [start, end))\n        \"\"\"\n        try:\n            duration = video.duration if end is None else min(end, video.duration)\n            features = {\n                'motion': [],\n                'objects': [],\n                'face_count': [],\n                'color_variance': [],\n                'brightness': [],\n                'timestamps': []\n            }\n            \n            # Sample frames\n            sample_interval = self.step_size\n            \n            object_stats = {}\n            face_stats = {}\n            face_stride = max(1, round(self.face_sample_interval / sample_interval))\n            \n            # Satu sample sebelum range sebagai referensi motion (tidak di-output)\n            first_sample = max(start - sample_interval, 0.0) if start > 0 else 0.0\n            \n            def frame_source():\n                for t in np.arange(first_sample, duration, sample_interval):\n                    try:\n                        frame = video.get_frame(t)\n                    except Exception as e:\n                        logger.warning(f\"Error processing frame at {t}s: {e}\")\n                        continue\n                    # Object detection (YOLO) tetap di process ini, sementara\n                    # CPU features untuk frame sebelumnya dihitung di workers\n                    object_stats[t] = self._detect_objects(frame)\n                    # Face prominence hanya di sparse samples (low-res Haar, murah)\n                    if round(t / sample_interval) % face_stride == 0:\n                        face_stats[t] = face_prominence(frame, self.face_detect_width)\n                    yield t, frame\n            \n            prev_thumbnail = None\n            for t, frame_features in map_frames(frame_source(), visual_frame_features):\n                try:\n                    thumbnail = frame_features['thumbnail']\n                    \n                    # Motion detection (pada thumbnail grayscale dari worker)\n                    motion_score = 0.0\n                    if prev_thumbnail is not None and prev_thumbnail.shape == thumbnail.shape:\n                        diff = cv2.absdiff(prev_thumbnail, thumbnail)\n                        motion_score = np.mean(diff) / 255.0\n                        \n                    prev_thumbnail = thumbnail\n                    object_count, object_confidence = object_stats.pop(t, (0, 0.0))\n                    if t < start:\n                        continue\n                    \n                    features['motion'].append(motion_score)\n                    features['objects'].append({'count': object_count, 'confidence': object_confidence})\n                    features['color_variance'].append(frame_features['color_variance'])\n                    features['brightness'].append(frame_features['brightness'])\n                    features['timestamps'].append(t)\n                    get_metrics().record('video_analysis', frames=1)\n                    get_metrics().advance('video_analysis', 1)\n                    \n                except Exception as e:\n                    logger.warning(f\"Error processing frame at {t}s: {e}\")\n                    continue\n                    \n            features['face_prominence'], features['face_count'] = self._face_prominence_curve(face_stats, features['timestamps'])\n            return features\n            \n        except Exception as e:\n            logger.error(f\"Error analyzing visual content: {e}\")\n            return {'motion': [], 'objects': [], 'face_count': [], 'face_prominence': [], 'color_variance': [], 'brightness': [], 'timestamps': []}\n            \n    def _face_prominence_curve(self, face_stats, timestamps):\n        \"\"\"\n        Interpolasi face prominence / face count dari sparse samples\n        (setiap face_sample_interval) ke timestamps visual features\n        \n        Returns:\n            Tuple (prominence list, face_count list)\n        \"\"\"\n        if not face_stats or not len(timestamps):\n            return [0.0] * len(timestamps), [0.0] * len(timestamps)\n            \n        sample_times = sorted(face_stats)\n        prominence = np.interp(timestamps, sample_times, [face_stats[t]['prominence'] for t in sample_times])\n        face_count = np.interp(timestamps, sample_times, [face_stats[t]['face_count'] for t in sample_times])\n        return prominence.tolist(), face_count.tolist()\n        \n    def _detect_objects(self, frame):\n        \"\"\"\n        Object detection (YOLO) untuk satu frame\n        \n        Returns:\n            Tuple (object_count, object_confidence)\n        \"\"\"\n        if not self.object_detector:\n            return 0, 0.0\n            \n        try:\n            results = self.object_detector(frame, verbose=False)\n            if len(results) > 0 and len(results[0].boxes) > 0:\n                return len(results[0].boxes), float(np.mean([box.conf.cpu().numpy() for box in results[0].boxes]))\n        except:\n            pass\n        return 0, 0.0\n            \n    def _score_moments(self, scenes, audio_features, visual_features, duration):\n        \"\"\"\n        Score moments berdasarkan combined features\n        \"\"\"\n        try:\n            moments = []\n            \n            # Normalize features untuk scoring\n            audio_energy = np.array(audio_features.get('energy', [0]))\n            audio_emotions = np.array(audio_features.get('emotions', [0.5]))\n            visual_motion = np.array(visual_features.get('motion', [0]))\n            face_counts = np.array(visual_features.get('face_count', [0]))\n            face_prominence = np.array(visual_features.get('face_prominence', []))\n            face_weight = MOMENT_DETECTION.get('face_prominence_weight', 0.3)\n            \n            # Normalize arrays\n            if len(audio_energy) > 0:\n                audio_energy = (audio_energy - np.min(audio_energy)) / (np.max(audio_energy) - np.min(audio_energy) + 1e-8)\n            if len(visual_motion) > 0:\n                visual_motion = (visual_motion - np.min(visual_motion)) / (np.max(visual_motion) - np.min(visual_motion) + 1e-8)\n                \n            # Score each scene\n            for start_time, end_time in scenes:\n                scene_duration = end_time - start_time\n                \n                if scene_duration < self.min_moment_duration:\n                    continue\n                    \n                # Find features dalam time range\n                audio_timestamps = audio_features.get('timestamps', [])\n                visual_timestamps = visual_features.get('timestamps', [])\n                \n                # Audio features untuk scene\n                audio_indices = [i for i, t in enumerate(audio_timestamps) if start_time <= t <= end_time]\n                visual_indices = [i for i, t in enumerate(visual_timestamps) if start_time <= t <= end_time]\n                \n                if not audio_indices and not visual_indices:\n                    continue\n                    \n                # Calculate scores\n                audio_score = 0.0\n                if audio_indices:\n                    scene_energy = np.mean([audio_energy[i] for i in audio_indices] if len(audio_energy) > 0 else [0])\n                    scene_emotion = np.mean([audio_emotions[i] for i in audio_indices] if len(audio_emotions) > 0 else [0.5])\n                    audio_score = 0.6 * scene_energy + 0.4 * scene_emotion\n                    \n                visual_score = 0.0\n                if visual_indices:\n                    scene_motion = np.mean([visual_motion[i] for i in visual_indices] if len(visual_motion) > 0 else [0])\n                    if len(face_prominence) > 0:\n                        scene_faces = np.mean([face_prominence[i] for i in visual_indices])\n                    else:\n                        # Features tanpa prominence: normalize face count\n                        scene_faces = min(np.mean([face_counts[i] for i in visual_indices] if len(face_counts) > 0 else [0]) / 3.0, 1.0)\n                    visual_score = (1 - face_weight) * scene_motion + face_weight * scene_faces\n                    \n                # Combined score\n                combined_score = 0.4 * audio_score + 0.6 * visual_score\n                \n                # Boost score untuk optimal duration\n                duration_factor = 1.0\n                if 15 <= scene_duration <= 45:  # Optimal range\n                    duration_factor = 1.2\n                elif scene_duration > 60:\n                    duration_factor = 0.8\n                    \n                final_score = combined_score * duration_factor\n                \n                # Create moment\n                moment = VideoMoment(\n                    start_time=start_time,\n                    end_time=end_time,\n                    duration=scene_duration,\n                    score=final_score,\n                    reason=self._generate_reason(audio_score, visual_score, scene_duration),\n                    features={\n                        'audio_score': audio_score,\n                        'visual_score': visual_score,\n                        'scene_duration': scene_duration,\n                        'face_count': np.mean([face_counts[i] for i in visual_indices]) if visual_indices and len(face_counts) > 0 else 0,\n                        'face_prominence': np.mean([face_prominence[i] for i in visual_indices]) if visual_indices and len(face_prominence) > 0 else 0\n                    },\n                    confidence=min(final_score, 1.0)\n                )\n                \n                moments.append(moment)\n                \n            return moments\n            \n        except Exception as e:\n            logger.error(f\"Error scoring moments: {e}\")\n            return []\n            \n    def rank_moments(self, moments, max_moments=10):\n        \"\"\"\n        Filter dan rank moments untuk mendapatkan yang terbaik: score tertinggi\n        dulu, tanpa overlap, maksimal max_moments, di atas min_score. Dipakai\n        analyze_video dan pipeline untuk moments dari iter_moments.\n        \n        Returns:\n            List of VideoMoment (list input tidak diubah)\n        \"\"\"\n        try:\n            if not moments:\n                return []\n                \n            # Sort by score descending\n            moments = sorted(moments, key=lambda x: x.score, reverse=True)\n            \n            # Filter overlapping moments (ambil yang score tertinggi)\n            filtered_moments = []\n            \n            for moment in moments:\n                # Check overlap dengan moments yang sudah dipilih\n                overlaps = False\n                for selected_moment in filtered_moments:\n                    if (moment.start_time < selected_moment.end_time and \n                        moment.end_time > selected_moment.start_time):\n                        overlaps = True\n                        break\n                        \n                if not overlaps:\n                    filtered_moments.append(moment)\n                    \n                if len(filtered_moments) >= max_moments:\n                    break\n                    \n            # Additional filtering berdasarkan score threshold\n            threshold = MOMENT_DETECTION.get('min_score', 0.3)  # Minimum score\n            final_moments = [m for m in filtered_moments if m.score >= threshold]\n            \n            return final_moments\n            \n        except Exception as e:\n            logger.error(f\"Error filtering moments: {e}\")\n            return moments[:max_moments] if moments else []\n            \n    def _generate_reason(self, audio_score, visual_score, duration):\n        \"\"\"\n        Generate human-readable reason untuk moment selection\n        \"\"\"\n        reasons = []\n        \n        if audio_score > 0.7:\n            reasons.append(\"Audio engaging\")\n        if visual_score > 0.7:\n            reasons.append(\"Visual menarik\")\n        if 15 <= duration <= 45:\n            reasons.append(\"Durasi optimal\")\n        if audio_score > 0.6 and visual_score > 0.6:\n            reasons.append(\"Kombinasi audio-visual bagus\")\n            \n        if not reasons:\n            if audio_score > visual_score:\n                reasons.append(\"Audio cukup menarik\")\n            else:\n                reasons.append(\"Visual cukup menarik\")\n                \n        return \", \".join(reasons)\n        \n    def save_analysis_results(self, moments, output_path):\n        \"\"\"\n        Save analysis results ke file JSON\n        \"\"\"\n        try:\n            results = {\n                'analysis_timestamp': str(pd.Timestamp.now()),\n                'total_moments': len(moments),\n                'moments': []\n            }\n            \n            for moment in moments:\n                moment_data = {\n                    'start_time': moment.start_time,\n                    'end_time': moment.end_time,\n                    'duration': moment.duration,\n                    'score': moment.score,\n                    'reason': moment.reason,\n                    'confidence': moment.confidence,\n                    'features': moment.features\n                }\n                results['moments'].append(moment_data)\n                \n            with open(output_path, 'w', encoding='utf-8') as f:\n                json.dump(results, f, indent=2, ensure_ascii=False)\n                \n            logger.info(f\"Analysis results saved to {output_path}\")\n            \n        except Exception as e:\n            logger.error(f\"Error saving analysis results: {e}\")\n\n# Test function\nif __name__ == \"__main__\":\n    # Test analyzer\n    analyzer = VideoAnalyzer()\n    \n    def test_progress(progress, message):\n        print(f\"Progress: {progress}% - {message}\")\n    \n    # Test dengan sample video (ganti dengan path video actual)\n    # video_path = \"test_video.mp4\"\n    # moments = analyzer.analyze_video(video_path, test_progress)\n    # \n    # for i, moment in enumerate(moments):\n    #     print(f\"Moment {i+1}: {moment.start_time:.1f}s - {moment.end_time:.1f}s\")\n    #     print(f\"  Score: {moment.score:.3f}, Reason: {moment.reason}\")\n    \n    print(\"Video Analyzer module loaded successfully\")
\ No newline at end of file
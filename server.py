@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+Smartclip AI - Server Mode
+Local HTTP API untuk submit clip jobs dari tools lain (tanpa GUI).
+Jobs disimpan di SQLite queue dan diproses oleh worker threads yang
+memakai model AI yang sama (warm) antar jobs.
+
+Endpoints:
+    POST   /jobs               {"input": "/path/video.mp4", "options": {...}, "priority": "normal"}
+    GET    /jobs               List jobs (?status=queued|running|done|failed|cancelled)
+    GET    /jobs/<id>          Status dan progress job
+    GET    /jobs/<id>/result   Result job yang sudah selesai
+    POST   /jobs/<id>/cancel   Cancel job (DELETE /jobs/<id> juga bisa)
+    GET    /metrics            Prometheus metrics
+    GET    /health             Health check
+"""
+
+import argparse
+import json
+import logging
+import os
+import sys
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import urlparse, parse_qs
+
+from config import METRICS_SETTINGS, SERVER_SETTINGS
+from modules.job_queue import JobQueue, JobCancelled, PRIORITY_CLASSES, DONE
+from modules.pipeline import get_pipeline
+from modules.analysis_schema import AnalysisResult
+from modules.metrics import MetricsCollector, get_metrics_registry
+
+# Setup logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+class JobServer:
+    def __init__(self, db_path=None, job_workers=None):
+        """Initialize job server"""
+        self.job_queue = JobQueue(db_path or SERVER_SETTINGS['db_path'])
+        self.pipeline = get_pipeline()
+        self.job_workers = job_workers or SERVER_SETTINGS['job_workers']
+        self.jobs_output_dir = Path(SERVER_SETTINGS['jobs_output_dir'])
+        self._stop = threading.Event()
+        self._threads = []
+
+    def start_workers(self):
+        """Start worker threads yang mengambil jobs dari queue"""
+        recovered = self.job_queue.recover()
+        if recovered:
+            logger.info(f"Requeued {recovered} interrupted jobs")
+
+        if SERVER_SETTINGS['preload_models']:
+            self.pipeline.preload()
+
+        for i in range(self.job_workers):
+            thread = threading.Thread(target=self._worker_loop, name=f"job-worker-{i}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def stop(self):
+        self._stop.set()
+
+    def _worker_loop(self):
+        while not self._stop.is_set():
+            job = self.job_queue.claim(timeout=5)
+            if job is not None:
+                self._run_job(job)
+
+    def _run_job(self, job):
+        """Proses satu job dengan pipeline yang sama seperti GUI"""
+        logger.info(f"Starting job {job.id}: {job.input_source}")
+        start_time = time.time()
+
+        def stage_callback(stage, message, percent):
+            self.job_queue.update_progress(job.id, percent, stage)
+
+        def cancel_check():
+            return self.job_queue.is_cancel_requested(job.id)
+
+        warnings = []
+
+        try:
+            video_path = self.pipeline.resolve_input(job.input_source, job.is_url)
+            if not video_path:
+                raise RuntimeError("Could not load input video")
+
+            options = dict(job.options)
+            output_dir = Path(options.get('output_dir') or self.jobs_output_dir / job.id)
+            output_dir.mkdir(parents=True, exist_ok=True)
+            options['output_dir'] = str(output_dir)
+
+            metrics = MetricsCollector(job_id=job.id)
+            results = self.pipeline.run(
+                video_path, options,
+                stage_callback=stage_callback,
+                status_callback=warnings.append,
+                cancel_check=cancel_check,
+                metrics=metrics
+            )
+
+            results.update({
+                'video_path': str(video_path),
+                'processed_at': datetime.now().isoformat(),
+                'processing_time': time.time() - start_time,
+                'warnings': warnings
+            })
+            if METRICS_SETTINGS['enabled'] and METRICS_SETTINGS['write_to_results']:
+                results['metrics'] = metrics.to_dict()
+            try:
+                AnalysisResult.from_results(results).export_json(output_dir / "analysis_results.json")
+            except Exception as e:
+                logger.error(f"Could not export analysis results for job {job.id}: {e}")
+
+            self.job_queue.finish(job.id, results)
+            logger.info(f"Job {job.id} done in {results['processing_time']:.1f}s")
+
+        except JobCancelled:
+            self.job_queue.mark_cancelled(job.id)
+            logger.info(f"Job {job.id} cancelled")
+        except Exception as e:
+            logger.error(f"Job {job.id} failed: {e}")
+            self.job_queue.fail(job.id, e)
+
+def make_handler(server):
+    """Build request handler yang terhubung ke JobServer"""
+    job_queue = server.job_queue
+
+    class JobAPIHandler(BaseHTTPRequestHandler):
+        def _send_json(self, status, payload):
+            body = json.dumps(payload, default=str).encode('utf-8')
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _read_json(self):
+            length = int(self.headers.get('Content-Length') or 0)
+            if length == 0:
+                return {}
+            return json.loads(self.rfile.read(length).decode('utf-8'))
+
+        def _route(self):
+            parsed = urlparse(self.path)
+            parts = [p for p in parsed.path.split('/') if p]
+            return parts, parse_qs(parsed.query)
+
+        def do_GET(self):
+            parts, query = self._route()
+
+            if parts == ['health']:
+                self._send_json(200, {'status': 'ok'})
+            elif parts == ['metrics']:
+                body = get_metrics_registry().to_prometheus().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4; charset=utf-8')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            elif parts == ['jobs']:
+                status = query.get('status', [None])[0]
+                jobs = job_queue.list_jobs(status=status)
+                self._send_json(200, {'jobs': [job.to_status() for job in jobs]})
+            elif len(parts) == 2 and parts[0] == 'jobs':
+                job = job_queue.get(parts[1])
+                if job is None:
+                    self._send_json(404, {'error': 'job not found'})
+                else:
+                    self._send_json(200, job.to_status())
+            elif len(parts) == 3 and parts[0] == 'jobs' and parts[2] == 'result':
+                job = job_queue.get(parts[1])
+                if job is None:
+                    self._send_json(404, {'error': 'job not found'})
+                elif job.status != DONE:
+                    self._send_json(409, {'error': f'job is {job.status}', 'status': job.status})
+                else:
+                    self._send_json(200, job.result)
+            else:
+                self._send_json(404, {'error': 'not found'})
+
+        def do_POST(self):
+            parts, _ = self._route()
+
+            if parts == ['jobs']:
+                try:
+                    payload = self._read_json()
+                except (ValueError, UnicodeDecodeError):
+                    self._send_json(400, {'error': 'invalid JSON body'})
+                    return
+
+                if not isinstance(payload, dict):
+                    self._send_json(400, {'error': 'JSON body must be an object'})
+                    return
+
+                input_source = payload.get('input')
+                priority = payload.get('priority', 'normal')
+                options = payload.get('options') or {}
+                is_url = isinstance(input_source, str) and input_source.startswith(('http://', 'https://'))
+
+                if not input_source:
+                    self._send_json(400, {'error': "'input' is required"})
+                elif not isinstance(input_source, str):
+                    self._send_json(400, {'error': "'input' must be a string"})
+                elif not isinstance(options, dict):
+                    self._send_json(400, {'error': "'options' must be an object"})
+                elif not isinstance(priority, str) or priority not in PRIORITY_CLASSES:
+                    self._send_json(400, {'error': f"priority must be one of {list(PRIORITY_CLASSES)}"})
+                elif not is_url and not os.path.isfile(input_source):
+                    self._send_json(400, {'error': f'input file not found: {input_source}'})
+                else:
+                    job_id = job_queue.submit(input_source, options, priority=priority, is_url=is_url)
+                    self._send_json(201, {'id': job_id, 'status': 'queued'})
+
+            elif len(parts) == 3 and parts[0] == 'jobs' and parts[2] == 'cancel':
+                self._cancel(parts[1])
+            else:
+                self._send_json(404, {'error': 'not found'})
+
+        def do_DELETE(self):
+            parts, _ = self._route()
+            if len(parts) == 2 and parts[0] == 'jobs':
+                self._cancel(parts[1])
+            else:
+                self._send_json(404, {'error': 'not found'})
+
+        def _cancel(self, job_id):
+            status = job_queue.cancel(job_id)
+            if status is None:
+                self._send_json(404, {'error': 'job not found'})
+            else:
+                self._send_json(202, {'id': job_id, 'status': status})
+
+        def log_message(self, format, *args):
+            logger.debug(format % args)
+
+    return JobAPIHandler
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(description="Smartclip AI local job server")
+    parser.add_argument('--host', default=SERVER_SETTINGS['host'])
+    parser.add_argument('--port', type=int, default=SERVER_SETTINGS['port'])
+    parser.add_argument('--workers', type=int, default=SERVER_SETTINGS['job_workers'],
+                        help="Jumlah jobs yang diproses bersamaan")
+    parser.add_argument('--db', default=SERVER_SETTINGS['db_path'], help="Path SQLite job database")
+    args = parser.parse_args()
+
+    server = JobServer(db_path=args.db, job_workers=args.workers)
+    server.start_workers()
+
+    httpd = ThreadingHTTPServer((args.host, args.port), make_handler(server))
+    print(f"🎬 Smartclip AI server listening on http://{args.host}:{args.port}")
+
+    try:
+        httpd.serve_forever()
+    except KeyboardInterrupt:
+        print("\nShutting down...")
+    finally:
+        server.stop()
+        httpd.server_close()
+
+if __name__ == "__main__":
+    sys.exit(main())
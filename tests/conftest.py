@@ -0,0 +1,12 @@
+"""
+Pytest configuration: repo root di sys.path supaya `modules` dan `config`
+bisa di-import tanpa install
+"""
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
@@ -0,0 +1,79 @@
+"""Alignment timeline video re-cut ke video lama dan carry data lewat TimelineMap"""
+
+import numpy as np
+import pytest
+
+from modules.alignment import AlignedSegment, TimelineMap, align_timelines, block_offsets, merge_ranges
+
+HOP = 0.093
+
+def _frames(seconds):
+    return int(seconds / HOP)
+
+@pytest.fixture(scope='module')
+def recut():
+    """Reference 9+ menit; query = bagian 100-160s, 30s materi baru, lalu bagian 20-80s (dengan noise)"""
+    rng = np.random.default_rng(0)
+    reference = np.cumsum(rng.standard_normal((6000, 13)), axis=0) * 0.1 + rng.standard_normal((6000, 13))
+    parts = [reference[_frames(100):_frames(160)], rng.standard_normal((_frames(30), 13)),
+             reference[_frames(20):_frames(80)]]
+    query = np.concatenate(parts)
+    query = query + 0.3 * rng.standard_normal(query.shape)
+    return query, reference
+
+def test_block_offsets_find_exact_shift():
+    rng = np.random.default_rng(1)
+    reference = rng.standard_normal((400, 4))
+    query = reference[150:250]
+    offsets = block_offsets(query, reference, block_frames=40, step_frames=20)
+    assert [start for start, _, _ in offsets] == [0, 20, 40, 60]
+    assert all(delta == 150 and score > 0.99 for _, delta, score in offsets)
+
+def test_block_offsets_too_short():
+    assert block_offsets(np.zeros((10, 2)), np.zeros((5, 2)), 8, 4) == []
+
+def test_align_recut_video(recut):
+    query, reference = recut
+    segments = align_timelines(query, reference, HOP)
+    assert len(segments) == 2
+
+    first, second = segments
+    assert first.offset == pytest.approx(_frames(100) * HOP, abs=2 * HOP)
+    assert first.start == pytest.approx(0.0, abs=0.5)
+    assert first.end == pytest.approx(_frames(60) * HOP, abs=0.5)
+
+    new_start = (_frames(60) + _frames(30)) * HOP
+    assert second.offset == pytest.approx(_frames(20) * HOP - new_start, abs=2 * HOP)
+    assert second.start == pytest.approx(new_start, abs=0.5)
+    assert second.end == pytest.approx(len(query) * HOP, abs=0.5)
+    assert first.score >= 0.7 and second.score >= 0.7
+
+def test_unrelated_audio_has_no_segments():
+    rng = np.random.default_rng(2)
+    assert align_timelines(rng.standard_normal((1500, 13)), rng.standard_normal((3000, 13)), HOP) == []
+
+def test_merge_ranges():
+    assert merge_ranges([(5, 7), (0, 2), (2, 3), (6, 9)]) == [(0, 3), (5, 9)]
+
+def test_timeline_map_carries_items_inside_segments():
+    timeline = TimelineMap([
+        AlignedSegment(start=40.0, end=60.0, offset=-30.0, score=0.9),
+        AlignedSegment(start=0.0, end=30.0, offset=100.0, score=0.9)
+    ])
+    assert timeline.matched_ranges() == [(0.0, 30.0), (40.0, 60.0)]
+    assert timeline.unmatched_ranges(70.0) == [(30.0, 40.0), (60.0, 70.0)]
+    assert timeline.unmatched_ranges(60.5) == [(30.0, 40.0)]
+
+    segments = [
+        {'start_time': 105.0, 'end_time': 108.0, 'text': 'a', 'words': [{'word': 'a', 'start': 105.0, 'end': 106.0}]},
+        {'start_time': 128.0, 'end_time': 133.0, 'text': 'terpotong'},
+        {'start_time': 12.0, 'end_time': 14.0, 'text': 'b'}
+    ]
+    carried = timeline.carry(segments, nested=('words', 'start', 'end'))
+    assert [(s['start_time'], s['end_time'], s['text']) for s in carried] == [(5.0, 8.0, 'a'), (42.0, 44.0, 'b')]
+    assert carried[0]['words'] == [{'word': 'a', 'start': 5.0, 'end': 6.0}]
+    assert segments[0]['start_time'] == 105.0
+
+    assert timeline.partial_spans(segments) == [(28.0, 30.0)]
+    assert timeline.carry_points([[106.0, 1, 2], [200.0, 1, 2]], 0) == [[6.0, 1, 2]]
+    assert timeline.carry_points([{'timestamp': 15.0}], 'timestamp') == [{'timestamp': 45.0}]
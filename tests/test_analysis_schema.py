@@ -0,0 +1,131 @@
+"""Round trip analysis results dict <-> AnalysisResult <-> msgpack"""
+
+import copy
+
+import pytest
+
+from modules.analysis_schema import (
+    FACE_TRACK_KEYS, MSGPACK_AVAILABLE, SCHEMA_NAME, SPEAKER_KEYS, AnalysisResult
+)
+
+def _face_track(face_id, first_seen, prominent):
+    return {
+        'face_id': face_id,
+        'first_seen': first_seen,
+        'last_seen': first_seen + 4.0,
+        'total_duration': 4.0,
+        'screen_time_percentage': 40.0,
+        'appearances': 8,
+        'average_size': 0.12,
+        'average_confidence': 0.91,
+        'is_prominent': prominent,
+        'face_encoding': [0.1, -0.25, 0.5],
+        'path': [[first_seen, 100, 80, 64, 64], [first_seen + 0.5, 104, 82, 64, 64]],
+        'timeline': [
+            {'timestamp': first_seen, 'confidence': 0.9, 'size': 0.12, 'center': (132, 112),
+             'bounding_box': (100, 80, 64, 64)}
+        ]
+    }
+
+@pytest.fixture
+def results():
+    """Results dict dalam format output pipeline (VideoAnalyzer, FaceTracker, SpeakerDiarization, SubtitleGenerator)"""
+    tracks = [_face_track(0, 0.0, True), _face_track(1, 2.0, False)]
+    words = [
+        {'word': ' Halo', 'start': 0.0, 'end': 0.4, 'probability': 0.98},
+        {'word': ' semua', 'start': 0.4, 'end': 0.9, 'probability': 0.95}
+    ]
+    return {
+        'moments': [{
+            'start_time': 0.0, 'end_time': 12.5, 'duration': 12.5, 'score': 0.82, 'reason': 'High audio energy',
+            'features': {'audio_energy': 0.7}, 'confidence': 0.9
+        }],
+        'face_data': {
+            'tracks': tracks,
+            'main_speakers': [tracks[0]],
+            'statistics': {'total_faces_detected': 2, 'main_speakers_count': 1},
+            'total_duration': 10.0
+        },
+        'speaker_data': {
+            'speakers': [{
+                'speaker_id': 0,
+                'name': 'Speaker 1',
+                'total_duration': 6.0,
+                'speech_percentage': 100.0,
+                'average_energy': 0.05,
+                'average_pitch': 180.0,
+                'voice_embedding': [0.3, 0.2],
+                'characteristics': {'gender': 'unknown'},
+                'segments': [{'start_time': 0.0, 'end_time': 6.0, 'duration': 6.0, 'confidence': 0.8}]
+            }],
+            'timeline': [
+                {'timestamp': 0.0, 'active_speakers': [{'speaker_id': 0, 'confidence': 0.8}]},
+                {'timestamp': 0.5, 'active_speakers': []}
+            ],
+            'statistics': {'total_speakers': 1, 'dominant_speaker': 0},
+            'total_duration': 10.0
+        },
+        'subtitle_data': {
+            'segments': [{
+                'start_time': 0.0, 'end_time': 0.9, 'duration': 0.9, 'text': 'Halo semua', 'confidence': -0.2,
+                'speaker_id': None, 'words': copy.deepcopy(words)
+            }],
+            'subtitle_files': {'srt': 'output/video.srt'},
+            'statistics': {'total_segments': 1},
+            'language': 'id',
+            'total_duration': 0.9,
+            'transcript': {
+                'text': ' Halo semua',
+                'language': 'id',
+                'segments': [{
+                    'start_time': 0.0, 'end_time': 0.9, 'text': 'Halo semua', 'confidence': -0.2,
+                    'language': 'id', 'words': copy.deepcopy(words)
+                }]
+            }
+        },
+        'language': 'id',
+        'output_files': ['output/clip_001.mp4']
+    }
+
+def test_results_round_trip(results):
+    assert AnalysisResult.from_results(copy.deepcopy(results)).to_results() == results
+
+@pytest.mark.skipif(not MSGPACK_AVAILABLE, reason="msgpack not installed")
+def test_msgpack_round_trip(results):
+    data = AnalysisResult.from_results(results).to_bytes()
+    assert AnalysisResult.from_bytes(data).to_results() == results
+
+def test_missing_optional_keys_are_not_emitted(results):
+    results['face_data']['tracks'] = [{'face_id': 3, 'path': [[1.0, 10, 20, 30, 40]]}]
+    results['face_data']['main_speakers'] = []
+    results['speaker_data']['speakers'] = [
+        {'speaker_id': 1, 'segments': [{'start_time': 1.0, 'end_time': 2.0, 'duration': 1.0, 'confidence': 0.5}]}
+    ]
+    assert AnalysisResult.from_results(copy.deepcopy(results)).to_results() == results
+
+def test_extra_keys_are_kept(results):
+    results['face_data']['tracks'][0]['label'] = 'host'
+    results['speaker_data']['speakers'][0]['face_id'] = 0
+    results['subtitle_data']['segments'][0]['words'][1]['highlight'] = True
+    assert AnalysisResult.from_results(copy.deepcopy(results)).to_results() == results
+
+@pytest.mark.skipif(not MSGPACK_AVAILABLE, reason="msgpack not installed")
+def test_v1_records_are_migrated(results):
+    import msgpack
+    from modules.analysis_schema import _pack_default
+
+    # Record v1: tanpa columns di face tracks / speakers dan tanpa word_extra
+    record = AnalysisResult.from_results(results).to_record()
+    for track in record[1][0]:
+        del track[-2]
+    for speaker in record[2][0]:
+        del speaker[-2]
+    del record[3][0][6]
+    del record[3][5][2][6]
+    envelope = {'schema': SCHEMA_NAME, 'version': 1, 'analysis': record}
+    data = msgpack.packb(envelope, default=_pack_default, use_bin_type=True)
+
+    migrated = AnalysisResult.from_bytes(data).to_results()
+    assert migrated == results
+    assert set(FACE_TRACK_KEYS) <= set(migrated['face_data']['tracks'][0])
+    assert set(SPEAKER_KEYS) <= set(migrated['speaker_data']['speakers'][0])
@@ -0,0 +1,142 @@
+"""Batch scheduler: packing order jobs, LPT per pool dan urutan stages per job"""
+
+import threading
+
+import pytest
+
+import modules.batch_scheduler as batch_scheduler
+from modules.batch_scheduler import BatchScheduler, _Task
+from modules.eta_estimator import StagePlan
+
+POOLS = {'prepare': 1, 'vision': 1, 'asr': 1, 'encode': 1}
+
+class FakeEstimator:
+    """Perkiraan detik per stage = total_units (tanpa throughput history)"""
+
+    def plan(self, duration, plans):
+        self.plans = plans
+
+    def stage_seconds(self):
+        return {plan.stage: plan.total_units for plan in self.plans}
+
+class FakePipeline:
+    """Pipeline tanpa modules AI: stages per video dari profiles"""
+
+    def __init__(self, profiles, failing=()):
+        self.profiles = profiles
+        self.failing = set(failing)
+        self.stage_limits = None
+        self.calls = []
+        self.finished = []
+        self.closed = []
+        self._lock = threading.Lock()
+
+    def set_stage_limits(self, stage_limits):
+        self.stage_limits = stage_limits
+
+    def plan_stages(self, video_path, options):
+        profile = self.profiles[video_path]
+        return 60.0, [StagePlan(stage, seconds) for stage, seconds in profile.items()]
+
+    def start_job(self, job):
+        job.stages = [(stage,) for stage in self.profiles[job.video_path]]
+
+    def run_stage(self, job, entry):
+        with self._lock:
+            self.calls.append((job.video_path, entry[0]))
+        if (job.video_path, entry[0]) in self.failing:
+            raise RuntimeError(f"{entry[0]} failed")
+
+    def finish_job(self, job):
+        self.finished.append(job.video_path)
+
+    def close_job(self, job):
+        self.closed.append(job.video_path)
+
+@pytest.fixture(autouse=True)
+def fake_estimator(monkeypatch):
+    monkeypatch.setattr(batch_scheduler, 'ETAEstimator', FakeEstimator)
+
+def _scheduler(profiles, max_active_jobs=3, failing=()):
+    pipeline = FakePipeline(profiles, failing)
+    events = []
+    scheduler = BatchScheduler(pools=POOLS, max_active_jobs=max_active_jobs, pipeline=pipeline,
+                               on_event=lambda job, event, stage: events.append((job.video_path, event, stage)))
+    for video_path in profiles:
+        scheduler.submit(video_path)
+    return scheduler, pipeline, events
+
+def test_pool_limits_are_applied_to_pipeline():
+    scheduler, pipeline, _ = _scheduler({'a.mp4': {'video_editing': 1.0}})
+    assert pipeline.stage_limits == {'vision': 1, 'asr': 1, 'encode': 1}
+    assert scheduler.jobs[0].profile == {'encode': 1.0}
+
+def test_asr_heavy_job_is_packed_with_vision_heavy_job():
+    profiles = {
+        'talkshow_a.mp4': {'subtitle_generation': 100.0, 'video_editing': 5.0},
+        'talkshow_b.mp4': {'subtitle_generation': 90.0, 'video_editing': 5.0},
+        'sports.mp4': {'face_tracking': 120.0, 'video_editing': 5.0}
+    }
+    scheduler, _, events = _scheduler(profiles, max_active_jobs=2)
+    scheduler.run()
+
+    # Bottleneck terkecil dulu (talkshow_b), lalu job yang memakai pool lain
+    # (sports) bukan talkshow kedua yang antre di pool asr yang sama
+    started = [video for video, event, _ in events if event == 'start']
+    assert started == ['talkshow_b.mp4', 'sports.mp4', 'talkshow_a.mp4']
+    assert all(job.status == 'done' for job in scheduler.jobs)
+
+def test_longest_task_first_within_pool():
+    scheduler, _, _ = _scheduler({'a.mp4': {}, 'b.mp4': {}, 'c.mp4': {}})
+    jobs = scheduler.jobs
+    scheduler._ready['asr'] = [
+        _Task(jobs[0], 'asr', ('subtitle_generation',), 10.0),
+        _Task(jobs[1], 'asr', ('speaker_diarization',), 50.0),
+        _Task(jobs[2], 'asr', ('subtitle_generation',), 30.0)
+    ]
+    first = scheduler._next_task('asr')
+    assert (first.batch_job, first.stage) == (jobs[1], 'speaker_diarization')
+
+    # subtitle_generation c (30s) sebelum a (10s); setelah diambil, stage yang
+    # sama tidak boleh berjalan dua kali bersamaan
+    second = scheduler._next_task('asr')
+    assert (second.batch_job, second.stage) == (jobs[2], 'subtitle_generation')
+    assert scheduler._next_task('asr') is None
+
+    scheduler._running_stages.discard('subtitle_generation')
+    assert scheduler._next_task('asr').batch_job is jobs[0]
+
+def test_editing_runs_after_all_analysis_stages():
+    stages = {'video_analysis': 3.0, 'face_tracking': 2.0, 'speaker_diarization': 4.0,
+              'subtitle_generation': 5.0, 'video_editing': 1.0}
+    profiles = {f"video_{i}.mp4": dict(stages) for i in range(3)}
+    scheduler, pipeline, _ = _scheduler(profiles)
+    scheduler.run()
+
+    for video_path in profiles:
+        calls = [stage for video, stage in pipeline.calls if video == video_path]
+        assert sorted(calls) == sorted(stages)
+        assert calls[-1] == 'video_editing'
+    assert sorted(pipeline.finished) == sorted(profiles)
+    assert sorted(pipeline.closed) == sorted(profiles)
+
+def test_failed_stage_fails_only_its_job():
+    profiles = {
+        'ok.mp4': {'video_analysis': 1.0, 'video_editing': 1.0},
+        'broken.mp4': {'video_analysis': 1.0, 'subtitle_generation': 1.0, 'video_editing': 1.0}
+    }
+    scheduler, pipeline, _ = _scheduler(profiles, failing={('broken.mp4', 'subtitle_generation')})
+    jobs = {job.video_path: job for job in scheduler.run()}
+
+    assert jobs['ok.mp4'].status == 'done'
+    assert jobs['broken.mp4'].status == 'failed'
+    assert 'subtitle_generation failed' in jobs['broken.mp4'].error
+    assert ('broken.mp4', 'video_editing') not in pipeline.calls
+    assert 'broken.mp4' in pipeline.closed and 'broken.mp4' not in pipeline.finished
+    assert all(load == 0.0 for load in scheduler._load.values())
+
+def test_cancel_before_run_skips_pending_jobs():
+    scheduler, pipeline, _ = _scheduler({'a.mp4': {'video_editing': 1.0}, 'b.mp4': {'video_editing': 1.0}})
+    scheduler.cancel()
+    assert [job.status for job in scheduler.run()] == ['cancelled', 'cancelled']
+    assert pipeline.calls == []
@@ -0,0 +1,107 @@
+"""Crop size, smoothed crop paths dan speaker -> face reframing"""
+
+import numpy as np
+
+from modules.crop_planner import (
+    REFRAME_ASPECTS, CropPath, active_face_runs, assign_speakers_to_faces, crop_size_for_faces,
+    face_track_points, plan_crop_path, plan_reframe_path, reframe_crop_size, track_points, write_sendcmd
+)
+
+FRAME = (1920, 1080)
+
+def test_crop_size_keeps_aspect_and_fits_frame():
+    width, height = crop_size_for_faces([200, 210, 190], FRAME, 16 / 9, padding=0.2)
+    assert width % 2 == 0 and height % 2 == 0
+    assert abs(width / height - 16 / 9) < 0.02
+    assert width <= FRAME[0] and height <= FRAME[1]
+
+    # Wajah besar: crop dibatasi ukuran frame
+    assert crop_size_for_faces([2000], FRAME, 16 / 9, padding=0.2) == (1920, 1080)
+
+def test_reframe_crop_size():
+    assert reframe_crop_size(FRAME, REFRAME_ASPECTS['9:16']) == (606, 1080)
+    assert reframe_crop_size(FRAME, REFRAME_ASPECTS['1:1']) == (1080, 1080)
+
+def test_static_face_gives_single_segment():
+    points = [(t, 800, 400, 160, 200) for t in np.arange(0, 10, 0.5)]
+    path = plan_crop_path(points, FRAME, (640, 360), duration=10, smoothing=1.0, motion_threshold=0.05)
+    assert len(path.keyframes) == 2
+    assert path.keyframes[0][1:] == path.keyframes[-1][1:]
+    x, y = path.position_at(5.0)
+    assert 0 <= x <= FRAME[0] - 640 and 0 <= y <= FRAME[1] - 360
+
+def test_moving_face_is_followed_and_clipped():
+    points = [(t, 100 + t * 100, 400, 160, 200) for t in np.arange(0, 20, 0.5)]
+    path = plan_crop_path(points, FRAME, (640, 360), duration=20, smoothing=1.0, motion_threshold=0.05)
+    xs = [x for _, x, _ in path.keyframes]
+    assert len(path.keyframes) > 2
+    assert xs == sorted(xs)
+    assert min(xs) >= 0 and max(xs) <= FRAME[0] - 640
+
+def test_no_faces_centers_crop():
+    path = plan_crop_path([], FRAME, (640, 360), duration=5)
+    assert path.keyframes[0][1:] == ((1920 - 640) // 2, (1080 - 360) // 2)
+
+def test_sendcmd_lines_are_linear_segments(tmp_path):
+    path = CropPath(width=640, height=360, keyframes=[(0.0, 0, 0), (2.0, 100, 50), (4.0, 100, 50)])
+    assert path.crop_filter('spk0') == "crop@spk0=w=640:h=360:x=0:y=0"
+    lines = path.sendcmd_lines('spk0')
+    assert len(lines) == 2
+    assert lines[0].startswith("0.000 crop@spk0 x '0+(t-0.000)*(50.0000)'")
+
+    output = write_sendcmd({'spk0': path}, tmp_path / 'crop.cmd')
+    assert (tmp_path / 'crop.cmd').read_text().splitlines() == lines
+    assert output == str(tmp_path / 'crop.cmd')
+    assert write_sendcmd({'spk0': CropPath(640, 360, [(0.0, 0, 0)])}, tmp_path / 'static.cmd') is None
+
+def test_track_points_fall_back_to_timeline():
+    track = {'face_id': 2, 'timeline': [{'timestamp': 1.0, 'bounding_box': (10, 20, 30, 40)}]}
+    assert track_points(track) == [(1.0, 10, 20, 30, 40)]
+    assert face_track_points({'tracks': [track]}, 2) == [(1.0, 10, 20, 30, 40)]
+    assert face_track_points({'tracks': [track]}, 3) == []
+
+def _two_speaker_wide_shot():
+    """Dua wajah selalu terlihat; kepala speaker yang bicara bergerak, bergantian tiap 10 detik"""
+    rng = np.random.RandomState(0)
+    timestamps = np.arange(0, 40, 0.5)
+    talking = lambda face, t: int(t // 10) % 2 == face
+    face_data = {'tracks': [
+        {'face_id': face, 'path': [
+            (t, x, 300 + (rng.randn() * 15 if talking(face, t) else 0), w, h) for t in timestamps
+        ]} for face, x, w, h in ((0, 400, 200, 250), (1, 1300, 220, 260))
+    ]}
+    speaker_data = {'speakers': [
+        {'speaker_id': s, 'segments': [{'start_time': t, 'end_time': t + 10} for t in range(s * 10, 40, 20)]}
+        for s in (0, 1)
+    ]}
+    return face_data, speaker_data
+
+def test_speakers_are_assigned_to_moving_faces():
+    face_data, speaker_data = _two_speaker_wide_shot()
+    assert assign_speakers_to_faces(speaker_data, face_data) == {0: 0, 1: 1}
+    assert assign_speakers_to_faces({'speakers': []}, face_data) == {}
+
+def test_active_face_runs_skip_short_interjections():
+    speaker_data = {'speakers': [
+        {'speaker_id': 0, 'segments': [{'start_time': 0, 'end_time': 10}, {'start_time': 12, 'end_time': 20}]},
+        {'speaker_id': 1, 'segments': [{'start_time': 10, 'end_time': 10.5}, {'start_time': 20, 'end_time': 30}]}
+    ]}
+    runs = active_face_runs(speaker_data, {0: 5, 1: 6}, 0, 30, min_hold=2.0)
+    assert runs == [(0, 20, 5), (20, 30, 6)]
+
+def test_reframe_path_cuts_between_faces():
+    face_data, speaker_data = _two_speaker_wide_shot()
+    runs = active_face_runs(speaker_data, {0: 0, 1: 1}, 0, 40, min_hold=2.0)
+    assert [face for _, _, face in runs] == [0, 1, 0, 1]
+
+    size = reframe_crop_size(FRAME, REFRAME_ASPECTS['9:16'])
+    points = {track['face_id']: track['path'] for track in face_data['tracks']}
+    path = plan_reframe_path(points, runs, FRAME, size, duration=40, smoothing=1.0, motion_threshold=0.05)
+    times = [t for t, _, _ in path.keyframes]
+    assert times == sorted(times)
+
+    # Crop di tengah tiap run berada di wajah yang aktif
+    for run_start, run_end, face in runs:
+        x, _ = path.position_at((run_start + run_end) / 2)
+        face_x = 400 if face == 0 else 1300
+        assert x <= face_x <= x + size[0]
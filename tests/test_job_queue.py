@@ -0,0 +1,104 @@
+"""Job queue: claim order, cancel dan recover setelah restart"""
+
+import threading
+import time
+
+import pytest
+
+from modules.job_queue import CANCELLED, DONE, FAILED, QUEUED, RUNNING, JobQueue
+
+@pytest.fixture
+def job_queue(tmp_path):
+    return JobQueue(db_path=tmp_path / 'jobs.db')
+
+def _submit(job_queue, *args, **kwargs):
+    job_id = job_queue.submit(*args, **kwargs)
+    time.sleep(0.002)  # created_at berbeda untuk urutan FIFO
+    return job_id
+
+def test_claim_by_priority_then_fifo(job_queue):
+    low = _submit(job_queue, '/videos/low.mp4', priority='low')
+    first = _submit(job_queue, '/videos/a.mp4')
+    second = _submit(job_queue, '/videos/b.mp4')
+    high = _submit(job_queue, 'https://youtube.com/watch?v=x', priority='high')
+
+    claimed = [job_queue.claim(timeout=0) for _ in range(4)]
+    assert [job.id for job in claimed] == [high, first, second, low]
+    assert all(job.status == RUNNING for job in claimed)
+    assert claimed[0].is_url and not claimed[1].is_url
+    assert job_queue.get(high).started_at is not None
+    assert job_queue.claim(timeout=0) is None
+
+def test_submit_rejects_unknown_priority(job_queue):
+    with pytest.raises(ValueError):
+        job_queue.submit('/videos/a.mp4', priority='urgent')
+
+def test_claim_waits_for_submit(job_queue):
+    timer = threading.Timer(0.1, job_queue.submit, args=('/videos/late.mp4',))
+    timer.start()
+    try:
+        job = job_queue.claim(timeout=5)
+    finally:
+        timer.cancel()
+    assert job is not None and job.input_source == '/videos/late.mp4'
+
+def test_cancel_queued_and_running(job_queue):
+    queued = _submit(job_queue, '/videos/a.mp4')
+    running = _submit(job_queue, '/videos/b.mp4', priority='high')
+    assert job_queue.claim(timeout=0).id == running
+
+    assert job_queue.cancel(queued) == CANCELLED
+    assert job_queue.get(queued).finished_at is not None
+    assert job_queue.claim(timeout=0) is None
+
+    # Running job hanya diberi flag; pipeline berhenti di stage boundary
+    assert job_queue.cancel(running) == RUNNING
+    assert job_queue.is_cancel_requested(running)
+    job_queue.mark_cancelled(running)
+    assert job_queue.get(running).status == CANCELLED
+
+    assert job_queue.cancel('missing') is None
+    assert not job_queue.is_cancel_requested('missing')
+
+def test_progress_finish_and_fail(job_queue):
+    done = _submit(job_queue, '/videos/a.mp4', options={'clips': 3})
+    failed = _submit(job_queue, '/videos/b.mp4')
+    job = job_queue.claim(timeout=0)
+    assert job.options == {'clips': 3}
+
+    job_queue.update_progress(done, 40, 'video_analysis')
+    job_queue.update_progress(done, 60)
+    assert (job_queue.get(done).progress, job_queue.get(done).stage) == (60, 'video_analysis')
+
+    job_queue.finish(done, {'output_files': ['clip_001.mp4']})
+    job_queue.claim(timeout=0)
+    job_queue.fail(failed, RuntimeError('ffmpeg failed'))
+
+    finished = job_queue.get(done)
+    assert (finished.status, finished.progress, finished.result) == (DONE, 100, {'output_files': ['clip_001.mp4']})
+    assert (job_queue.get(failed).status, job_queue.get(failed).error) == (FAILED, 'ffmpeg failed')
+    assert [job.id for job in job_queue.list_jobs(status=DONE)] == [done]
+    assert job_queue.get(done).to_status()['priority'] == 'normal'
+
+def test_recover_requeues_interrupted_jobs(tmp_path):
+    db_path = tmp_path / 'jobs.db'
+    job_queue = JobQueue(db_path=db_path)
+    interrupted = _submit(job_queue, '/videos/a.mp4')
+    cancelling = _submit(job_queue, '/videos/b.mp4')
+    waiting = _submit(job_queue, '/videos/c.mp4')
+    job_queue.claim(timeout=0)
+    job_queue.claim(timeout=0)
+    job_queue.update_progress(interrupted, 70, 'video_editing')
+    job_queue.cancel(cancelling)
+
+    # Server restart: queue baru di database yang sama
+    restarted = JobQueue(db_path=db_path)
+    assert restarted.recover() == 1
+
+    job = restarted.get(interrupted)
+    assert (job.status, job.stage, job.progress, job.started_at) == (QUEUED, None, 0, None)
+    assert restarted.get(cancelling).status == CANCELLED
+    assert restarted.get(waiting).status == QUEUED
+
+    # Job yang di-requeue tetap di urutan FIFO semula
+    assert restarted.claim(timeout=0).id == interrupted
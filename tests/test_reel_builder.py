@@ -0,0 +1,70 @@
+"""Pembagian highlights menjadi pieces copy / encode dan ffmpeg commands"""
+
+from fractions import Fraction
+
+import numpy as np
+import pytest
+
+from modules.reel_builder import (
+    ReelPiece, StreamParams, audio_format_filter, concat_command, copy_piece_command, encode_piece_command,
+    plan_reel_pieces, write_concat_list
+)
+
+KEYFRAMES = np.arange(0, 300, 2.0)
+CLIPS = [(10.3, 25.3, "Highlight 1"), (60.0, 62.5, "Highlight 2"), (120.9, 135.9, "Highlight 3")]
+
+PARAMS = StreamParams(codec='h264', width=1280, height=720, pix_fmt='yuv420p', fps=Fraction(30000, 1001),
+                      constant_fps=True, has_audio=True, sample_rate=48000, channels=6, channel_layout='5.1')
+
+def _ranges(pieces):
+    return [(piece.kind, [(round(start, 3), round(end, 3), title) for start, end, title in piece.ranges])
+            for piece in pieces]
+
+def test_plan_reel_pieces():
+    pieces = plan_reel_pieces(CLIPS, KEYFRAMES, transition=0.5)
+    assert _ranges(pieces) == [
+        ('encode', [(10.3, 14.0, "Highlight 1")]),
+        ('copy', [(14.0, 24.0, None)]),
+        ('encode', [(24.0, 25.3, None), (60.0, 62.5, "Highlight 2"), (120.9, 124.0, "Highlight 3")]),
+        ('copy', [(124.0, 134.0, None)]),
+        ('encode', [(134.0, 135.9, None)])
+    ]
+
+def test_pieces_cover_clips_exactly():
+    pieces = plan_reel_pieces(CLIPS, KEYFRAMES, transition=0.5)
+    covered = sorted(r for piece in pieces for r in piece.ranges)
+    assert covered[0][0] == CLIPS[0][0] and covered[-1][1] == CLIPS[-1][1]
+    assert sum(piece.duration for piece in pieces) == pytest.approx(sum(end - start for start, end, _ in CLIPS))
+
+    # Copy pieces mulai dan berakhir di keyframe
+    for piece in pieces:
+        if piece.kind == 'copy':
+            start, end, _ = piece.ranges[0]
+            assert start in KEYFRAMES and end in KEYFRAMES
+
+def test_no_keyframes_encodes_everything():
+    pieces = plan_reel_pieces(CLIPS, [], transition=0.5)
+    assert len(pieces) == 1 and pieces[0].kind == 'encode'
+    assert pieces[0].ranges == CLIPS
+
+def test_audio_format_matches_between_piece_kinds(tmp_path):
+    audio_filter = audio_format_filter(PARAMS)
+    assert audio_filter == "aresample=48000,aformat=sample_fmts=fltp:channel_layouts=5.1"
+
+    encode = encode_piece_command(ReelPiece('encode', [(0.0, 4.0, "Highlight 1"), (10.0, 12.0, None)]),
+                                  'in.mp4', PARAMS, tmp_path / 'a.ts', 0.5, ['-c:v', 'libx264'], '192k')
+    copy = copy_piece_command(ReelPiece('copy', [(4.0, 10.0, None)]), 'in.mp4', PARAMS, tmp_path / 'b.ts', '192k')
+    filter_graph = encode[encode.index('-filter_complex') + 1]
+    assert filter_graph.count(audio_filter) == 2
+    assert 'xfade=transition=fade' in filter_graph and 'acrossfade' in filter_graph
+    assert copy[copy.index('-af') + 1] == audio_filter
+    assert copy[copy.index('-c:v') + 1] == 'copy'
+
+def test_concat_list_and_command(tmp_path):
+    list_path = write_concat_list([tmp_path / "it's.ts", tmp_path / 'b.ts'], tmp_path / 'list.txt')
+    lines = (tmp_path / 'list.txt').read_text().splitlines()
+    assert lines[0] == f"file '{tmp_path.as_posix()}/it'\\''s.ts'"
+
+    cmd = concat_command(list_path, tmp_path / 'out.mp4', 'mp4')
+    assert cmd[cmd.index('-c') + 1] == 'copy' and '+faststart' in cmd
+    assert '+faststart' not in concat_command(list_path, tmp_path / 'out.mkv', 'mkv')
@@ -0,0 +1,105 @@
+"""Line breaking, retiming dan writer SRT/VTT/ASS"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from modules.subtitle_formatter import (
+    Cue, ass_time, build_cues, retime_cues, segment_words, srt_time, vtt_time, write_subtitle_files
+)
+
+def _options(**overrides):
+    options = dict(
+        max_chars_per_line=32, max_lines_per_subtitle=2, min_duration=1.0, max_duration=7.0,
+        max_chars_per_second=17.0, max_pause=1.0, min_gap=0.1, font_size=20, font_color='white',
+        background_color='black', background_opacity=0.7, position='bottom', margin=50
+    )
+    options.update(overrides)
+    return SimpleNamespace(**options)
+
+def _timed_words(text, start=0.0, word_duration=0.3, pause_after=None):
+    """Word timestamps berurutan; pause_after = {index kata: jeda setelahnya}"""
+    words, position = [], start
+    for index, token in enumerate(text.split()):
+        words.append({'word': f" {token}", 'start': position, 'end': position + word_duration, 'probability': 0.9})
+        position += word_duration + (pause_after or {}).get(index, 0.0)
+    return words
+
+def _segment(text, **kwargs):
+    words = _timed_words(text, **kwargs)
+    return {'start_time': words[0]['start'], 'end_time': words[-1]['end'], 'text': text, 'words': words,
+            'confidence': -0.2}
+
+def test_segment_words_without_timestamps_split_proportionally():
+    words = segment_words({'start_time': 1.0, 'end_time': 3.0, 'text': 'ab abcd ab'})
+    assert [w['word'] for w in words] == ['ab', 'abcd', 'ab']
+    assert words[0]['start'] == 1.0 and words[-1]['end'] == pytest.approx(3.0)
+    assert words[1]['end'] - words[1]['start'] == pytest.approx(1.0)
+
+def test_segment_words_strip_and_skip_empty():
+    segment = {'start_time': 0, 'end_time': 1, 'words': [{'word': ' Halo', 'start': 0, 'end': 0.5},
+                                                          {'word': ' ', 'start': 0.5, 'end': 0.6}]}
+    assert segment_words(segment) == [{'word': 'Halo', 'start': 0.0, 'end': 0.5, 'probability': 1.0}]
+
+def test_lines_respect_max_chars_and_max_lines():
+    text = "Halo semuanya, selamat datang kembali di podcast kita hari ini yang membahas AI dan masa depan kerja."
+    options = _options(max_duration=30.0)
+    cues = build_cues([_segment(text, word_duration=0.2)], options)
+    assert len(cues) > 1
+    for cue in cues:
+        assert 1 <= len(cue.lines) <= 2
+        assert all(len(line) <= options.max_chars_per_line for line in cue.lines)
+    assert ' '.join(' '.join(cue.lines) for cue in cues) == text
+
+def test_two_line_cues_are_balanced():
+    cues = build_cues([_segment("satu dua tiga empat lima enam tujuh delapan sembilan")], _options())
+    assert len(cues) == 1
+    first, second = cues[0].lines
+    assert abs(len(first) - len(second)) <= 6
+
+def test_long_pause_starts_new_cue():
+    cues = build_cues([_segment("halo semua apa kabar", pause_after={1: 2.0})], _options())
+    assert [cue.lines for cue in cues] == [['halo semua'], ['apa kabar']]
+    assert cues[1].start_time == pytest.approx(2.6)
+
+def test_max_duration_closes_cue():
+    cues = build_cues([_segment("a b c d e f g h", word_duration=1.0)], _options(max_duration=3.0))
+    assert all(cue.end_time - cue.start_time <= 3.0 + 1e-9 for cue in cues)
+    assert [w['word'] for cue in cues for w in cue.words] == list("abcdefgh")
+
+def test_retime_extends_to_min_duration_without_overlap():
+    options = _options()
+    cues = retime_cues([
+        Cue(start_time=0.0, end_time=0.2, lines=['hi']),
+        Cue(start_time=0.6, end_time=0.8, lines=['x' * 34]),
+        Cue(start_time=5.0, end_time=5.2, lines=['ok'])
+    ], options)
+    # Dipotong oleh cue berikutnya (min_gap)
+    assert cues[0].end_time == pytest.approx(0.5)
+    # Waktu baca 34 chars / 17 cps = 2 detik
+    assert cues[1].end_time == pytest.approx(2.6)
+    assert cues[2].end_time == pytest.approx(6.0)
+
+def test_cue_segment_format():
+    cue = Cue(start_time=1.0, end_time=2.5, lines=['a', 'b'], confidence=-0.1, speaker_id=2)
+    assert cue.to_segment() == {'start_time': 1.0, 'end_time': 2.5, 'duration': 1.5, 'text': 'a\nb',
+                                'confidence': -0.1, 'speaker_id': 2, 'words': []}
+
+def test_time_formats():
+    assert srt_time(3723.4567) == "01:02:03,457"
+    assert vtt_time(1.5) == "00:00:01.500"
+    assert ass_time(61.239) == "0:01:01.23"
+    assert srt_time(-1) == "00:00:00,000"
+
+def test_write_all_formats_in_one_pass(tmp_path):
+    cues = [Cue(start_time=0.0, end_time=1.5, lines=['Halo {semua}', 'baris dua'])]
+    paths = {fmt: tmp_path / f"out.{fmt}" for fmt in ('srt', 'vtt', 'ass', 'txt')}
+    written = write_subtitle_files(cues, paths, _options())
+    assert set(written) == {'srt', 'vtt', 'ass'}
+
+    assert (tmp_path / 'out.srt').read_text(encoding='utf-8') == (
+        "1\n00:00:00,000 --> 00:00:01,500\nHalo {semua}\nbaris dua\n\n"
+    )
+    assert (tmp_path / 'out.vtt').read_text(encoding='utf-8').startswith("WEBVTT\n\n00:00:00.000 --> 00:00:01.500\n")
+    ass = (tmp_path / 'out.ass').read_text(encoding='utf-8')
+    assert ass.rstrip('\n').endswith("Dialogue: 0,0:00:00.00,0:00:01.50,Default,,0,0,0,,Halo (semua)\\Nbaris dua")